@@ -6,13 +6,21 @@ logger = logging.getLogger(__name__)
 
 # Script para remoção de tabelas e extensões
 script_sql = """
+DROP TABLE IF EXISTS embedding_documento;
+DROP TABLE IF EXISTS cache_embedding;
+DROP TABLE IF EXISTS cache_llm;
+DROP TABLE IF EXISTS resumo_pesquisador;
 DROP TABLE IF EXISTS software;
 DROP TABLE IF EXISTS patente;
 DROP TABLE IF EXISTS livro;
+DROP TABLE IF EXISTS autoria;
+DROP TABLE IF EXISTS publicacao;
 DROP TABLE IF EXISTS artigo;
 DROP TABLE IF EXISTS periodico;
 DROP TABLE IF EXISTS instituicao;
 DROP TABLE IF EXISTS pesquisador;
+DROP FUNCTION IF EXISTS f_chave_publicacao(TEXT, TEXT, INTEGER, UUID);
+DROP FUNCTION IF EXISTS f_unaccent(TEXT);
 DROP EXTENSION IF EXISTS "uuid-ossp";
 """
 
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict
+
+from psycopg import OperationalError
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+from banco.pool_conexoes import PoolEsgotadoError
+from config import configuracoes
+
+# Logger do módulo de conexão assíncrona
+logger = logging.getLogger(__name__)
+
+class ConexaoAsync:
+    """
+    Gerencia um pool assíncrono de conexões PostgreSQL usando psycopg 3.
+    Usado pelos DAOs assíncronos, que rodam direto no event loop,
+    sem ocupar threads do threadpool do Starlette.
+    """
+
+    _pool: AsyncConnectionPool = None
+    _trava = asyncio.Lock()
+
+    @classmethod
+    async def inicializar_pool(cls) -> AsyncConnectionPool:
+        """
+        Inicializa e abre o pool assíncrono se ainda não existir.
+        """
+        async with cls._trava:
+            if cls._pool is None:
+                pool = AsyncConnectionPool(
+                    kwargs={
+                        "host": configuracoes.DB_HOST,
+                        "dbname": configuracoes.DB_NAME,
+                        "user": configuracoes.DB_USER,
+                        "password": configuracoes.DB_PASS,
+                        "port": configuracoes.DB_PORT,
+                    },
+                    min_size=configuracoes.DB_MIN_CONEXOES,
+                    max_size=configuracoes.DB_MAX_CONEXOES,
+                    timeout=configuracoes.DB_POOL_TIMEOUT,
+                    max_lifetime=configuracoes.DB_CONEXAO_IDADE_MAXIMA,
+                    max_idle=configuracoes.DB_CONEXAO_OCIOSA_MAXIMA,
+                    check=AsyncConnectionPool.check_connection,
+                    open=False
+                )
+                try:
+                    await pool.open(wait=True, timeout=configuracoes.DB_POOL_TIMEOUT)
+                except (OperationalError, PoolTimeout) as erro:
+                    await pool.close()
+                    logger.error("Falha ao criar pool assíncrono de conexões: %s", erro)
+                    raise RuntimeError("Não foi possível inicializar o pool assíncrono de conexões.") from erro
+
+                cls._pool = pool
+                logger.info(
+                    "Pool assíncrono de conexões criado: %d a %d conexões.",
+                    configuracoes.DB_MIN_CONEXOES,
+                    configuracoes.DB_MAX_CONEXOES
+                )
+
+        return cls._pool
+
+    @classmethod
+    @asynccontextmanager
+    async def conexao(cls):
+        """
+        Empresta uma conexão assíncrona pelo tempo do bloco `async with`.
+        Ao sair, a transação é confirmada (ou desfeita, em caso de exceção)
+        e a conexão volta ao pool.
+
+            async with ConexaoAsync.conexao() as conexao, conexao.cursor() as cursor:
+                await cursor.execute(...)
+        """
+        if cls._pool is None:
+            await cls.inicializar_pool()
+
+        try:
+            async with cls._pool.connection() as conexao:
+                yield conexao
+        except PoolTimeout as erro:
+            logger.warning("Pool assíncrono de conexões esgotado: %s", erro)
+            raise PoolEsgotadoError(str(erro)) from erro
+
+    @classmethod
+    async def fechar_pool(cls):
+        """
+        Fecha todas as conexões do pool assíncrono.
+        """
+        if cls._pool:
+            await cls._pool.close()
+            cls._pool = None
+            logger.info("Pool assíncrono de conexões fechado.")
+
+    @classmethod
+    def metricas(cls) -> Dict:
+        """
+        Retorna as estatísticas do pool assíncrono.
+        """
+        if cls._pool is None:
+            return {"inicializado": False}
+        return {"inicializado": True, **cls._pool.get_stats()}
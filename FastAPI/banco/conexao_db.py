@@ -1,8 +1,10 @@
 import threading
 import logging
-from psycopg2.pool import SimpleConnectionPool
+from contextlib import contextmanager
+from typing import Dict, Optional
 from psycopg2 import OperationalError
 
+from banco.pool_conexoes import PoolConexoes, PoolEsgotadoError
 from config import configuracoes
 
 # Logger do módulo de conexão
@@ -11,10 +13,11 @@ logger = logging.getLogger(__name__)
 class Conexao:
     """
     Gerencia um pool de conexões PostgreSQL usando psycopg2.
-    Singleton thread-safe com verificação de conexões ativas.
+    Singleton thread-safe: o pool espera por conexões livres quando está cheio,
+    valida conexões ociosas antes de entregá-las e recicla conexões antigas.
     """
 
-    _pool: SimpleConnectionPool = None
+    _pool: PoolConexoes = None
     _trava = threading.Lock()
     
     @classmethod
@@ -25,9 +28,13 @@ class Conexao:
         with cls._trava:
             if cls._pool is None:
                 try:                    
-                    cls._pool = SimpleConnectionPool(
+                    cls._pool = PoolConexoes(
                         configuracoes.DB_MIN_CONEXOES,
                         configuracoes.DB_MAX_CONEXOES,
+                        timeout_espera=configuracoes.DB_POOL_TIMEOUT,
+                        idade_maxima=configuracoes.DB_CONEXAO_IDADE_MAXIMA,
+                        ociosidade_maxima=configuracoes.DB_CONEXAO_OCIOSA_MAXIMA,
+                        validar_apos=configuracoes.DB_CONEXAO_VALIDAR_APOS,
                         host=configuracoes.DB_HOST,
                         database=configuracoes.DB_NAME,
                         user=configuracoes.DB_USER,
@@ -35,9 +42,10 @@ class Conexao:
                         port=configuracoes.DB_PORT
                     )                    
                     logger.info(
-                        "Pool de conexões criado: %d a %d conexões.",
+                        "Pool de conexões criado: %d a %d conexões (espera máxima de %.1fs).",
                         configuracoes.DB_MIN_CONEXOES,
-                        configuracoes.DB_MAX_CONEXOES
+                        configuracoes.DB_MAX_CONEXOES,
+                        configuracoes.DB_POOL_TIMEOUT
                     )
 
                 except OperationalError as erro:
@@ -47,56 +55,65 @@ class Conexao:
         return cls._pool
 
     @classmethod
-    def obter_conexao(cls, max_tentativas: int = 3):
+    def obter_conexao(cls, timeout: Optional[float] = None):
         """
         Retorna uma conexão do pool. Inicializa o pool se necessário.
-        Se a conexão estiver fechada, descarta e obtém outra até max_tentativas.
+        Se o pool estiver cheio, espera até `timeout` segundos (padrão DB_POOL_TIMEOUT)
+        e então levanta PoolEsgotadoError.
         """
         if cls._pool is None:
             cls.inicializar_pool()
 
-        tentativa = 0
-        while tentativa < max_tentativas:
-            tentativa += 1
-            try:
-                conexao = cls._pool.getconn()
-                if getattr(conexao, 'closed', False):
-                    logger.warning(
-                        "Tentativa %d: conexão fechada detectada, descartando e obtendo nova.",
-                        tentativa
-                    )
-                    cls._pool.putconn(conexao, close=True)
-                    continue
-                logger.debug(
-                    "Conexão ativa obtida no pool na tentativa %d.",
-                    tentativa
-                )
-                return conexao
-            except Exception as erro:
-                logger.error(
-                    "Erro ao obter conexão do pool na tentativa %d: %s",
-                    tentativa, erro
-                )
-                
-        # Se não obteve conexão válida em max_tentativas
-        raise RuntimeError(
-            f"Não foi possível obter conexão ativa após {max_tentativas} tentativas."
-        )
+        try:
+            conexao = cls._pool.getconn(timeout)
+        except PoolEsgotadoError as erro:
+            logger.warning("Pool de conexões esgotado: %s", erro)
+            raise
+        except OperationalError as erro:
+            logger.error("Erro ao abrir nova conexão do pool: %s", erro)
+            raise RuntimeError("Não foi possível obter conexão ativa com o banco.") from erro
+
+        logger.debug("Conexão ativa obtida no pool.")
+        return conexao
 
     @classmethod
     def devolver_conexao(cls, conexao, fechar: bool = False):
         """
         Devolve a conexão ao pool.
-        Se fechar=True, descarta a conexão.
+        Se fechar=True (ou se o pool já foi fechado), descarta a conexão.
         """
-        if cls._pool and not cls._pool.closed and conexao:
+        if cls._pool and conexao:
             try:
                 cls._pool.putconn(conexao, close=fechar)
                 logger.debug("Conexão devolvida ao pool: fechar=%s", fechar)
             except Exception as e:
                 logger.warning("Falha ao devolver conexão ao pool: %s", str(e))
         else:
-            logger.debug("Pool fechado ou conexão ausente. Conexão não devolvida.")
+            logger.debug("Pool inexistente ou conexão ausente. Conexão não devolvida.")
+
+    @classmethod
+    @contextmanager
+    def conexao(cls):
+        """
+        Empresta uma conexão do pool pelo tempo do bloco `with` e a devolve ao sair.
+        Se o bloco terminar com exceção, desfaz a transação pendente;
+        conexões que caíram durante o uso são descartadas em vez de voltar ao pool.
+
+            with Conexao.conexao() as conexao, conexao.cursor() as cursor:
+                cursor.execute(...)
+        """
+        conexao = cls.obter_conexao()
+        try:
+            yield conexao
+        except Exception:
+            if not conexao.closed:
+                try:
+                    conexao.rollback()
+                except Exception as erro:
+                    logger.warning("Falha ao desfazer transação da conexão emprestada: %s", erro)
+            raise
+        finally:
+            cls.devolver_conexao(conexao, fechar=bool(conexao.closed))
 
     @classmethod
     def fechar_todas_conexoes(cls):
@@ -105,4 +122,13 @@ class Conexao:
         """
         if cls._pool:
             cls._pool.closeall()
-            logger.info("Todas as conexões do pool foram fechadas.")
\ No newline at end of file
+            logger.info("Todas as conexões do pool foram fechadas.")
+
+    @classmethod
+    def metricas(cls) -> Dict:
+        """
+        Retorna as métricas do pool (em uso, livres, fila de espera, latência de empréstimo).
+        """
+        if cls._pool is None:
+            return {"inicializado": False}
+        return {"inicializado": True, **cls._pool.metricas()}
@@ -0,0 +1,48 @@
+import logging
+import uuid
+from typing import Iterator, Union, Dict, Tuple
+
+from banco.conexao_db import Conexao
+
+# Logger do módulo de cursores no servidor
+logger = logging.getLogger(__name__)
+
+# Quantidade de linhas trazidas do servidor a cada ida ao banco
+TAMANHO_LOTE_PADRAO = 2000
+
+
+def iterar_consulta(
+    sql: str,
+    parametros: tuple = (),
+    como_dict: bool = True,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO
+) -> Iterator[Union[Dict, Tuple]]:
+    """
+    Executa a consulta em um cursor nomeado (server-side) e entrega as linhas
+    uma a uma, buscando-as em lotes de `tamanho_lote`.
+    O resultado nunca é materializado inteiro em memória, o que permite
+    exportações completas de tabelas grandes.
+    A conexão fica emprestada do pool apenas enquanto a iteração durar; ao final
+    (ou se o consumidor abandonar a iteração) a transação de leitura é encerrada
+    e a conexão devolvida.
+    """
+    nome_cursor = f"cursor_{uuid.uuid4().hex}"
+    with Conexao.conexao() as conexao:
+        try:
+            with conexao.cursor(name=nome_cursor) as cursor:
+                cursor.itersize = tamanho_lote
+                cursor.execute(sql, parametros)
+
+                colunas = None
+                for linha in cursor:
+                    if not como_dict:
+                        yield linha
+                        continue
+                    if colunas is None:
+                        colunas = [desc[0] for desc in cursor.description]
+                    yield dict(zip(colunas, linha))
+        finally:
+            try:
+                conexao.rollback()
+            except Exception as erro:
+                logger.warning("Falha ao encerrar transação do cursor %s: %s", nome_cursor, erro)
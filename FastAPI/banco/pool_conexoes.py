@@ -0,0 +1,265 @@
+import threading
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+# Logger do pool de conexões
+logger = logging.getLogger(__name__)
+
+
+class PoolEsgotadoError(TimeoutError):
+    """
+    Nenhuma conexão ficou disponível dentro do tempo de espera do pool.
+    """
+
+
+class PoolConexoes:
+    """
+    Pool de conexões psycopg2 seguro para uso entre threads.
+
+    - Quando todas as conexões estão em uso, quem pede espera em fila
+      (até `timeout_espera` segundos) em vez de falhar na hora.
+    - Conexões ociosas há mais de `validar_apos` segundos são testadas
+      com `SELECT 1` antes de serem entregues (0 = testa sempre).
+    - Conexões mais velhas que `idade_maxima` ou ociosas há mais de
+      `ociosidade_maxima` segundos são fechadas e recriadas.
+    - Mantém métricas de uso (latência de empréstimo, em uso, fila de espera).
+    """
+
+    def __init__(
+        self,
+        minimo: int,
+        maximo: int,
+        timeout_espera: float = 10.0,
+        idade_maxima: float = 1800.0,
+        ociosidade_maxima: float = 300.0,
+        validar_apos: float = 5.0,
+        **parametros_conexao
+    ):
+        if minimo < 0 or maximo < 1 or minimo > maximo:
+            raise ValueError("Limites do pool inválidos: é preciso 0 <= mínimo <= máximo e máximo >= 1.")
+
+        self.minimo = minimo
+        self.maximo = maximo
+        self.timeout_espera = timeout_espera
+        self.idade_maxima = idade_maxima
+        self.ociosidade_maxima = ociosidade_maxima
+        self.validar_apos = validar_apos
+        self._parametros_conexao = parametros_conexao
+
+        self._condicao = threading.Condition()
+        # Conexões livres: (conexão, criada_em, devolvida_em)
+        self._livres: Deque[Tuple[object, float, float]] = deque()
+        # Conexões emprestadas: id(conexão) -> criada_em
+        self._em_uso: Dict[int, float] = {}
+        # Conexões existentes (livres + em uso + sendo criadas)
+        self._total = 0
+        self._aguardando = 0
+        self.closed = False
+
+        # Métricas acumuladas
+        self._emprestimos = 0
+        self._esperas_esgotadas = 0
+        self._conexoes_criadas = 0
+        self._conexoes_descartadas = 0
+        self._latencia_total = 0.0
+        self._latencia_maxima = 0.0
+
+        for _ in range(minimo):
+            conexao = self._criar_conexao()
+            agora = time.monotonic()
+            with self._condicao:
+                self._total += 1
+                self._livres.append((conexao, agora, agora))
+
+    def _criar_conexao(self):
+        conexao = psycopg2.connect(**self._parametros_conexao)
+        with self._condicao:
+            self._conexoes_criadas += 1
+        return conexao
+
+    def _fechar(self, conexao) -> None:
+        with self._condicao:
+            self._conexoes_descartadas += 1
+        try:
+            conexao.close()
+        except Exception as erro:
+            logger.debug("Falha ao fechar conexão descartada: %s", erro)
+
+    def _expirada(self, criada_em: float, devolvida_em: float, agora: float) -> bool:
+        if self.idade_maxima and agora - criada_em > self.idade_maxima:
+            return True
+        if self.ociosidade_maxima and agora - devolvida_em > self.ociosidade_maxima:
+            return True
+        return False
+
+    def _valida(self, conexao) -> bool:
+        """
+        Pre-ping: confirma que a conexão ainda responde antes de entregá-la.
+        """
+        if conexao.closed:
+            return False
+        try:
+            with conexao.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conexao.rollback()
+            return True
+        except Exception as erro:
+            logger.warning("Conexão ociosa não respondeu ao teste e será descartada: %s", erro)
+            return False
+
+    def getconn(self, timeout: Optional[float] = None):
+        """
+        Empresta uma conexão, esperando até `timeout` segundos se o pool estiver cheio.
+        Levanta PoolEsgotadoError se nenhuma conexão ficar disponível a tempo.
+        """
+        timeout = self.timeout_espera if timeout is None else timeout
+        inicio = time.monotonic()
+        prazo = inicio + timeout
+
+        while True:
+            candidata = None
+            criar = False
+
+            with self._condicao:
+                if self.closed:
+                    raise PoolError("O pool de conexões está fechado.")
+
+                while True:
+                    agora = time.monotonic()
+
+                    # Reaproveita a conexão livre mais recente, descartando as vencidas
+                    while self._livres:
+                        conexao, criada_em, devolvida_em = self._livres.pop()
+                        if conexao.closed or self._expirada(criada_em, devolvida_em, agora):
+                            self._total -= 1
+                            self._fechar(conexao)
+                            continue
+                        candidata = (conexao, criada_em, devolvida_em)
+                        break
+
+                    if candidata:
+                        break
+
+                    if self._total < self.maximo:
+                        # Reserva a vaga e cria a conexão fora da trava
+                        self._total += 1
+                        criar = True
+                        break
+
+                    restante = prazo - agora
+                    if restante <= 0:
+                        self._esperas_esgotadas += 1
+                        raise PoolEsgotadoError(
+                            f"Nenhuma conexão disponível após {timeout:.1f}s "
+                            f"({self.maximo} em uso, {self._aguardando} aguardando)."
+                        )
+
+                    self._aguardando += 1
+                    try:
+                        self._condicao.wait(restante)
+                    finally:
+                        self._aguardando -= 1
+
+            if criar:
+                try:
+                    conexao = self._criar_conexao()
+                except Exception:
+                    with self._condicao:
+                        self._total -= 1
+                        self._condicao.notify()
+                    raise
+                criada_em = time.monotonic()
+            else:
+                conexao, criada_em, devolvida_em = candidata
+                if time.monotonic() - devolvida_em >= self.validar_apos and not self._valida(conexao):
+                    with self._condicao:
+                        self._total -= 1
+                        self._condicao.notify()
+                    self._fechar(conexao)
+                    continue
+
+            latencia = time.monotonic() - inicio
+            with self._condicao:
+                self._em_uso[id(conexao)] = criada_em
+                self._emprestimos += 1
+                self._latencia_total += latencia
+                self._latencia_maxima = max(self._latencia_maxima, latencia)
+            return conexao
+
+    def putconn(self, conexao, close: bool = False) -> None:
+        """
+        Devolve a conexão ao pool. Transações pendentes são desfeitas;
+        conexões quebradas, vencidas ou com close=True são descartadas.
+        """
+        with self._condicao:
+            criada_em = self._em_uso.pop(id(conexao), None)
+        if criada_em is None:
+            raise PoolError("Conexão não pertence a este pool.")
+
+        descartar = close or self.closed or conexao.closed
+        if not descartar:
+            try:
+                status = conexao.info.transaction_status
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    descartar = True
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    conexao.rollback()
+            except Exception as erro:
+                logger.warning("Falha ao restaurar conexão devolvida; ela será descartada: %s", erro)
+                descartar = True
+
+        agora = time.monotonic()
+        if not descartar and self.idade_maxima and agora - criada_em > self.idade_maxima:
+            descartar = True
+
+        with self._condicao:
+            if descartar:
+                self._total -= 1
+            else:
+                self._livres.append((conexao, criada_em, agora))
+            self._condicao.notify()
+
+        if descartar:
+            self._fechar(conexao)
+
+    def closeall(self) -> None:
+        """
+        Fecha as conexões livres e impede novos empréstimos.
+        Conexões em uso são fechadas quando forem devolvidas.
+        """
+        with self._condicao:
+            self.closed = True
+            livres = list(self._livres)
+            self._livres.clear()
+            self._total -= len(livres)
+            self._condicao.notify_all()
+
+        for conexao, _, _ in livres:
+            self._fechar(conexao)
+
+    def metricas(self) -> Dict:
+        """
+        Retorna um retrato do estado e das estatísticas de uso do pool.
+        """
+        with self._condicao:
+            emprestimos = self._emprestimos
+            return {
+                "minimo": self.minimo,
+                "maximo": self.maximo,
+                "total": self._total,
+                "em_uso": len(self._em_uso),
+                "livres": len(self._livres),
+                "aguardando": self._aguardando,
+                "emprestimos": emprestimos,
+                "esperas_esgotadas": self._esperas_esgotadas,
+                "conexoes_criadas": self._conexoes_criadas,
+                "conexoes_descartadas": self._conexoes_descartadas,
+                "latencia_emprestimo_media_ms": round(1000 * self._latencia_total / emprestimos, 3) if emprestimos else 0.0,
+                "latencia_emprestimo_maxima_ms": round(1000 * self._latencia_maxima, 3),
+            }
@@ -33,26 +33,6 @@ CREATE TABLE IF NOT EXISTS pesquisador (
     PRIMARY KEY (id_pesquisador)
 );
 
-CREATE TABLE IF NOT EXISTS artigo (
-    id_artigo UUID NOT NULL DEFAULT uuid_generate_v4(),
-    nome TEXT NOT NULL,
-    ano INTEGER NOT NULL, 
-    doi VARCHAR(100),
-    id_pesquisador UUID NOT NULL,
-    id_periodico UUID NOT NULL,
-    PRIMARY KEY (id_artigo), 
-    CONSTRAINT fk_artigo_pesquisador 
-        FOREIGN KEY (id_pesquisador)
-        REFERENCES pesquisador (id_pesquisador) 
-        ON UPDATE NO ACTION 
-        ON DELETE NO ACTION,
-    CONSTRAINT fk_artigo_periodico
-        FOREIGN KEY (id_periodico)
-        REFERENCES periodico (id_periodico) 
-        ON UPDATE NO ACTION 
-        ON DELETE NO ACTION
-);
-
 CREATE TABLE IF NOT EXISTS livro (
     id_livro UUID NOT NULL DEFAULT uuid_generate_v4(),
     nome_livro TEXT NOT NULL,
@@ -98,6 +78,202 @@ CREATE TABLE IF NOT EXISTS software (
 );
 """
 
+# Script de migração: leva bancos já criados ao esquema atual (idempotente)
+script_sql_migracao = """
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+ALTER TABLE pesquisador ADD COLUMN IF NOT EXISTS foto_sincronizada BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE pesquisador ADD COLUMN IF NOT EXISTS id_instituicao UUID REFERENCES instituicao (id_instituicao);
+-- Sincronização das fotos: quando, código K do Lattes e versão da foto (ETag e SHA-256)
+ALTER TABLE pesquisador ADD COLUMN IF NOT EXISTS foto_sincronizada_em TIMESTAMPTZ;
+ALTER TABLE pesquisador ADD COLUMN IF NOT EXISTS foto_codigo_k VARCHAR(10);
+ALTER TABLE pesquisador ADD COLUMN IF NOT EXISTS foto_etag TEXT;
+ALTER TABLE pesquisador ADD COLUMN IF NOT EXISTS foto_hash VARCHAR(64);
+ALTER TABLE IF EXISTS artigo ADD COLUMN IF NOT EXISTS resumo TEXT;
+ALTER TABLE IF EXISTS artigo ADD COLUMN IF NOT EXISTS resumo_sincronizado BOOLEAN NOT NULL DEFAULT FALSE;
+
+CREATE OR REPLACE FUNCTION f_unaccent(texto TEXT)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, texto) $$;
+
+-- Publicações canônicas (uma por DOI ou impressão digital do título) e autorias
+CREATE OR REPLACE FUNCTION f_chave_publicacao(doi TEXT, nome TEXT, ano INTEGER, id_periodico UUID)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT coalesce(
+        'doi:' || nullif(regexp_replace(lower(trim(doi)), '^(https?://(dx[.])?doi[.]org/|doi:)', ''), ''),
+        'titulo:' || regexp_replace(lower(f_unaccent(nome)), '[^a-z0-9]+', '', 'g') || '|' || ano || '|' || id_periodico
+    )
+$$;
+
+CREATE TABLE IF NOT EXISTS publicacao (
+    id_publicacao UUID NOT NULL DEFAULT uuid_generate_v4(),
+    nome TEXT NOT NULL,
+    ano INTEGER NOT NULL, 
+    doi VARCHAR(100),
+    resumo TEXT,
+    resumo_sincronizado BOOLEAN NOT NULL DEFAULT FALSE,
+    id_periodico UUID NOT NULL,
+    chave TEXT GENERATED ALWAYS AS (f_chave_publicacao(doi, nome, ano, id_periodico)) STORED,
+    PRIMARY KEY (id_publicacao), 
+    CONSTRAINT uq_publicacao_chave UNIQUE (chave),
+    CONSTRAINT fk_publicacao_periodico
+        FOREIGN KEY (id_periodico)
+        REFERENCES periodico (id_periodico) 
+        ON UPDATE NO ACTION 
+        ON DELETE NO ACTION
+);
+
+CREATE TABLE IF NOT EXISTS autoria (
+    id_artigo UUID NOT NULL DEFAULT uuid_generate_v4(),
+    id_publicacao UUID NOT NULL,
+    id_pesquisador UUID NOT NULL,
+    PRIMARY KEY (id_artigo), 
+    CONSTRAINT uq_autoria UNIQUE (id_publicacao, id_pesquisador),
+    CONSTRAINT fk_autoria_publicacao 
+        FOREIGN KEY (id_publicacao)
+        REFERENCES publicacao (id_publicacao) 
+        ON UPDATE NO ACTION 
+        ON DELETE CASCADE,
+    CONSTRAINT fk_autoria_pesquisador
+        FOREIGN KEY (id_pesquisador)
+        REFERENCES pesquisador (id_pesquisador) 
+        ON UPDATE NO ACTION 
+        ON DELETE NO ACTION
+);
+
+CREATE INDEX IF NOT EXISTS idx_autoria_pesquisador ON autoria (id_pesquisador);
+
+-- A antiga tabela artigo (uma linha por artigo x pesquisador) vira publicações e autorias.
+-- Cada publicação fica com o menor id_artigo do grupo, o ID que a API já devolvia para ela;
+-- cada linha antiga vira uma autoria com o mesmo id_artigo (repetições do mesmo pesquisador somem).
+DO $$
+BEGIN
+    IF to_regclass('artigo') IS NOT NULL THEN
+        INSERT INTO publicacao (id_publicacao, nome, ano, doi, resumo, resumo_sincronizado, id_periodico)
+        SELECT DISTINCT ON (f_chave_publicacao(doi, nome, ano, id_periodico))
+            id_artigo, nome, ano, doi, resumo, resumo_sincronizado, id_periodico
+        FROM artigo
+        ORDER BY f_chave_publicacao(doi, nome, ano, id_periodico), id_artigo
+        ON CONFLICT (chave) DO NOTHING;
+
+        INSERT INTO autoria (id_artigo, id_publicacao, id_pesquisador)
+        SELECT a.id_artigo, pub.id_publicacao, a.id_pesquisador
+        FROM artigo a
+        JOIN publicacao pub ON pub.chave = f_chave_publicacao(a.doi, a.nome, a.ano, a.id_periodico)
+        ON CONFLICT DO NOTHING;
+
+        DROP TABLE artigo;
+    END IF;
+END
+$$;
+
+-- Busca textual (full-text) em artigos
+ALTER TABLE publicacao ADD COLUMN IF NOT EXISTS busca_tsv TSVECTOR
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', f_unaccent(coalesce(nome, ''))), 'A') ||
+        setweight(to_tsvector('english', f_unaccent(coalesce(nome, ''))), 'A') ||
+        setweight(to_tsvector('portuguese', f_unaccent(coalesce(resumo, ''))), 'B') ||
+        setweight(to_tsvector('english', f_unaccent(coalesce(resumo, ''))), 'B')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_publicacao_busca_tsv ON publicacao USING GIN (busca_tsv);
+
+-- Busca aproximada (trigramas) por nome de pesquisador e nomes de citação
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_pesquisador_nome_trgm
+    ON pesquisador USING GIN (f_unaccent(lower(nome)) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_pesquisador_citacoes_trgm
+    ON pesquisador USING GIN (f_unaccent(lower(citacoes)) gin_trgm_ops);
+
+-- Busca semântica (pgvector): um embedding por publicação ou pesquisador
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE TABLE IF NOT EXISTS embedding_documento (
+    tipo VARCHAR(20) NOT NULL,
+    id_documento UUID NOT NULL,
+    modelo VARCHAR(100) NOT NULL,
+    hash_conteudo CHAR(64) NOT NULL,
+    documento JSONB NOT NULL,
+    embedding VECTOR(1536) NOT NULL,
+    atualizado_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+    -- Chave da publicação (artigos), para localizar documentos de publicações alteradas
+    chave TEXT,
+    PRIMARY KEY (tipo, id_documento)
+);
+
+ALTER TABLE embedding_documento ADD COLUMN IF NOT EXISTS chave TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_embedding_chave
+    ON embedding_documento (tipo, chave);
+
+CREATE INDEX IF NOT EXISTS idx_embedding_artigo_hnsw
+    ON embedding_documento USING hnsw (embedding vector_cosine_ops)
+    WHERE tipo = 'artigo';
+
+CREATE INDEX IF NOT EXISTS idx_embedding_pesquisador_hnsw
+    ON embedding_documento USING hnsw (embedding vector_cosine_ops)
+    WHERE tipo = 'pesquisador';
+
+-- Cache de embeddings por (modelo, hash do texto), compartilhado pelos processos da API
+CREATE TABLE IF NOT EXISTS cache_embedding (
+    modelo VARCHAR(100) NOT NULL,
+    hash_texto CHAR(64) NOT NULL,
+    embedding REAL[] NOT NULL,
+    ultimo_acesso TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (modelo, hash_texto)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_embedding_acesso
+    ON cache_embedding (ultimo_acesso);
+
+-- Cache das respostas do LLM (resumos e tags), com validade e escopo para invalidação
+CREATE TABLE IF NOT EXISTS cache_llm (
+    chave CHAR(64) PRIMARY KEY,
+    template VARCHAR(50) NOT NULL,
+    escopo VARCHAR(100),
+    resposta TEXT NOT NULL,
+    criado_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+    expira_em TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_llm_escopo
+    ON cache_llm (escopo);
+
+CREATE INDEX IF NOT EXISTS idx_cache_llm_expira
+    ON cache_llm (expira_em);
+
+-- Resumos e tags dos pesquisadores gerados pelo LLM em segundo plano;
+-- cada linha é também a tarefa de geração (pendente, processando, pronto ou erro)
+CREATE TABLE IF NOT EXISTS resumo_pesquisador (
+    id_pesquisador UUID NOT NULL,
+    resumo_ia TEXT,
+    tags TEXT[],
+    status VARCHAR(12) NOT NULL DEFAULT 'pendente',
+    versao INTEGER NOT NULL DEFAULT 1,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    erro TEXT,
+    solicitado_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+    disponivel_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+    iniciado_em TIMESTAMPTZ,
+    gerado_em TIMESTAMPTZ,
+    PRIMARY KEY (id_pesquisador),
+    CONSTRAINT fk_resumo_pesquisador
+        FOREIGN KEY (id_pesquisador)
+        REFERENCES pesquisador (id_pesquisador)
+        ON UPDATE NO ACTION
+        ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_resumo_pesquisador_fila
+    ON resumo_pesquisador (disponivel_em)
+    WHERE status IN ('pendente', 'processando');
+"""
+
 # Script para inserir dados nas tabelas
 script_sql_insercao = """
 -- Instituições
@@ -118,12 +294,16 @@ INSERT INTO pesquisador (nome, grau_academico, resumo, citacoes, id_orcid, id_la
 ('Carlos Eduardo Santos', 'Mestre', 'Inteligência Artificial', '200', '0000-0002-3456-7890', 'L23456789012345')
 ON CONFLICT DO NOTHING;
 
--- Artigos
-INSERT INTO artigo (nome, ano, doi, id_pesquisador, id_periodico) VALUES
+-- Artigos (publicação e autoria)
+INSERT INTO publicacao (nome, ano, doi, id_periodico) VALUES
 ('Estudo sobre a Biodiversidade na Amazônia', 2022, '10.1234/bioamazonia.2022.001',
-(SELECT id_pesquisador FROM pesquisador WHERE nome='Ana Maria Silva'),
 (SELECT id_periodico FROM periodico WHERE issn='1234-5678'))
 ON CONFLICT DO NOTHING;
+
+INSERT INTO autoria (id_publicacao, id_pesquisador) VALUES
+((SELECT id_publicacao FROM publicacao WHERE chave='doi:10.1234/bioamazonia.2022.001'),
+(SELECT id_pesquisador FROM pesquisador WHERE nome='Ana Maria Silva'))
+ON CONFLICT DO NOTHING;
 """
 
 def main():
@@ -135,6 +315,11 @@ def main():
             conexao.commit()
             logger.info("Tabelas e extensões criadas com sucesso.")
 
+            logger.info("Aplicando migrações...")
+            cursor.execute(script_sql_migracao)
+            conexao.commit()
+            logger.info("Migrações aplicadas com sucesso.")
+
             logger.info("Inserindo dados de exemplo...")
             cursor.execute(script_sql_insercao)
             conexao.commit()
@@ -0,0 +1,151 @@
+"""
+Montagem dos artigos com autores em ArtigoDAO.listar_artigos / buscar_por_termo:
+agrupamento em Python de uma linha por artigo x autor (como era antes) contra
+uma linha por publicação com os autores já agregados no banco (jsonb_agg).
+
+As linhas são decodificadas como o driver faria (cada campo de cada linha vira um
+objeto novo; no caminho agregado, os autores chegam como texto JSON e passam pelo
+json.loads do psycopg), então o que se mede é o custo no processo da API: tempo de
+CPU e pico de memória (tracemalloc) de receber as linhas e montar os artigos.
+Nada é lido do banco.
+
+Uso (a partir da pasta FastAPI):
+
+    python -m benchmarks.bench_agrupamento_autores --artigos 100000 --autores 3
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+import uuid
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from dao.artigo_dao import ArtigoDAO
+
+
+def agrupar_autores_antes(linhas: Iterable[tuple]) -> Iterator[Dict]:
+    """Agrupamento de linhas consecutivas do mesmo artigo (listar_artigos antes)"""
+    artigo = None
+    for linha in linhas:
+        (id_artigo, title, journal, year, abstract, doi, qualis,
+         author_id, author_name) = linha
+
+        if artigo is None or artigo["id"] != str(id_artigo):
+            if artigo is not None:
+                yield artigo
+            artigo = {
+                "id": str(id_artigo), "title": title, "journal": journal, "year": year,
+                "abstract": abstract or "", "doi": doi, "qualis": qualis, "authors": []
+            }
+
+        if not any(author["id"] == str(author_id) for author in artigo["authors"]):
+            artigo["authors"].append({"id": str(author_id), "name": author_name})
+
+    if artigo is not None:
+        yield artigo
+
+
+def agrupar_por_chave_antes(linhas: Iterable[tuple]) -> List[Dict]:
+    """Agrupamento pela chave título|periódico|ano|doi montada em Python (buscar_por_termo antes)"""
+    artigos_dict = {}
+    for linha in linhas:
+        (id_artigo, title, journal, year, abstract, doi, qualis,
+         author_id, author_name) = linha
+
+        key = (f"{title.strip().lower()}|{journal.strip().lower() if journal else ''}|"
+               f"{str(year).strip() if year else ''}|{doi.strip().lower() if doi else ''}")
+
+        if key not in artigos_dict:
+            artigos_dict[key] = {
+                "id": str(id_artigo), "title": title, "journal": journal, "year": year,
+                "abstract": abstract or "", "doi": doi, "qualis": qualis, "authors": []
+            }
+
+        if not any(author["id"] == str(author_id) for author in artigos_dict[key]["authors"]):
+            artigos_dict[key]["authors"].append({"id": str(author_id), "name": author_name})
+
+    return list(artigos_dict.values())
+
+
+def gerar_artigos(quantidade: int, media_autores: float, semente: int) -> List[tuple]:
+    """
+    Artigos sintéticos como chegam do socket (bytes):
+    (id, título, periódico, ano, resumo, doi, qualis, [(id_autor, nome)])
+    """
+    aleatorio = random.Random(semente)
+    pesquisadores = [(str(uuid.UUID(int=aleatorio.getrandbits(128))).encode(), f"Pesquisador {i}".encode())
+                     for i in range(5000)]
+    resumo = ("Resumo do artigo sobre produção acadêmica. " * 20).encode()
+    artigos = []
+    for i in range(quantidade):
+        # A maioria com poucos autores; alguns grandes consórcios
+        total_autores = min(len(pesquisadores), max(1, int(aleatorio.expovariate(1 / media_autores)) + 1))
+        artigos.append((
+            str(uuid.UUID(int=aleatorio.getrandbits(128))).encode(), f"Artigo {i}".encode(),
+            f"Periódico {i % 800}".encode(), str(2000 + i % 25).encode(), resumo, f"10.1000/{i}".encode(), b"A1",
+            aleatorio.sample(pesquisadores, total_autores)
+        ))
+    artigos.sort(key=lambda artigo: artigo[0])
+    return artigos
+
+
+def linhas_por_autor(artigos: List[tuple]) -> List[tuple]:
+    """fetchall() da consulta antiga: uma linha por artigo x autor"""
+    return [
+        (id_artigo.decode(), titulo.decode(), periodico.decode(), int(ano), resumo.decode(),
+         doi.decode(), qualis.decode(), id_autor.decode(), nome.decode())
+        for id_artigo, titulo, periodico, ano, resumo, doi, qualis, autores in artigos
+        for id_autor, nome in autores
+    ]
+
+
+def linhas_agregadas(artigos: List[tuple]) -> List[tuple]:
+    """fetchall() da consulta agregada: uma linha por artigo, autores decodificados pelo driver"""
+    return [
+        (id_artigo.decode(), titulo.decode(), periodico.decode(), int(ano), resumo.decode(),
+         doi.decode(), qualis.decode(), json.loads(autores))
+        for id_artigo, titulo, periodico, ano, resumo, doi, qualis, autores in artigos
+    ]
+
+
+def medir(nome: str, receber: Callable[[], List[tuple]], montar: Callable[[List[tuple]], List[Dict]]) -> List[Dict]:
+    tracemalloc.start()
+    inicio = time.process_time()
+    linhas = receber()
+    artigos = montar(linhas)
+    cpu = time.process_time() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{nome:<32} {len(linhas):>10} {len(artigos):>9} {cpu:>9.2f} {pico / 2 ** 20:>10.1f}")
+    return artigos
+
+
+def main(argumentos: argparse.Namespace) -> None:
+    artigos = gerar_artigos(argumentos.artigos, argumentos.autores, argumentos.semente)
+    # Texto JSON como o PostgreSQL envia o jsonb_agg (ordenado pelo ID do autor)
+    agregados = [
+        artigo[:7] + (json.dumps([{"id": id_autor.decode(), "name": nome.decode()}
+                                  for id_autor, nome in sorted(artigo[7])]).encode(),)
+        for artigo in artigos
+    ]
+    total_autores = sum(len(artigo[7]) for artigo in artigos)
+
+    print(f"{len(artigos)} artigos, {total_autores} linhas artigo x autor "
+          f"(máximo de {max(len(artigo[7]) for artigo in artigos)} autores num artigo)")
+    print(f"{'cenário':<32} {'linhas':>10} {'artigos':>9} {'CPU (s)':>9} {'pico (MB)':>10}")
+
+    medir("listar: agrupar em Python", lambda: linhas_por_autor(artigos),
+          lambda linhas: list(agrupar_autores_antes(linhas)))
+    medir("buscar: chave em Python", lambda: linhas_por_autor(artigos), agrupar_por_chave_antes)
+    medir("agregado no banco", lambda: linhas_agregadas(agregados),
+          lambda linhas: [ArtigoDAO._montar_artigo(linha) for linha in linhas])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da montagem dos artigos com autores (Python x agregação no banco).")
+    parser.add_argument("--artigos", type=int, default=100_000, help="Artigos (publicações distintas)")
+    parser.add_argument("--autores", type=float, default=3.0, help="Média de autores por artigo")
+    parser.add_argument("--semente", type=int, default=42, help="Semente dos dados sintéticos")
+    main(parser.parse_args())
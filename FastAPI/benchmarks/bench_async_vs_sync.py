@@ -0,0 +1,103 @@
+"""
+Compara o caminho síncrono (psycopg2 no threadpool do Starlette) com o
+caminho assíncrono (psycopg 3 no event loop) nas consultas usadas por
+`GET /artigos/buscar` e `GET /pesquisadores/{id}/perfil`.
+
+Cada cenário dispara `--concorrencia` chamadas simultâneas, `--repeticoes`
+vezes, e mede vazão e latência (p50/p95).
+
+Uso (a partir da pasta FastAPI, com o banco configurado no .env):
+
+    python -m benchmarks.bench_async_vs_sync --termo dados --id-pesquisador <uuid>
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+import anyio.to_thread
+
+from banco.conexao_async import ConexaoAsync
+from banco.conexao_db import Conexao
+from dao.artigo_dao import ArtigoDAO
+from dao.artigo_dao_async import ArtigoDAOAsync
+from dao.pesquisador_dao import PesquisadorDAO
+from dao.pesquisador_dao_async import PesquisadorDAOAsync
+
+
+def percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+async def medir(nome: str, chamada: Callable[[], Awaitable], concorrencia: int, repeticoes: int) -> None:
+    latencias: List[float] = []
+
+    async def uma_chamada():
+        inicio = time.perf_counter()
+        await chamada()
+        latencias.append(time.perf_counter() - inicio)
+
+    # Aquecimento: abre conexões e preenche caches do banco
+    await chamada()
+
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        await asyncio.gather(*(uma_chamada() for _ in range(concorrencia)))
+    duracao = time.perf_counter() - inicio
+
+    print(
+        f"{nome:<32} {len(latencias) / duracao:>9.1f} req/s"
+        f"   p50 {1000 * statistics.median(latencias):>8.1f} ms"
+        f"   p95 {1000 * percentil(latencias, 95):>8.1f} ms"
+    )
+
+
+async def main(argumentos: argparse.Namespace) -> None:
+    Conexao.inicializar_pool()
+    await ConexaoAsync.inicializar_pool()
+
+    artigo_dao, artigo_dao_async = ArtigoDAO(), ArtigoDAOAsync()
+    pesquisador_dao, pesquisador_dao_async = PesquisadorDAO(), PesquisadorDAOAsync()
+
+    # Mesmo limite de threads usado pelo Starlette para rotas `def`
+    print(f"Threads do threadpool: {anyio.to_thread.current_default_thread_limiter().total_tokens}")
+    print(f"Concorrência: {argumentos.concorrencia} x {argumentos.repeticoes} rodadas\n")
+
+    try:
+        await medir(
+            "/artigos/buscar (sync)",
+            lambda: anyio.to_thread.run_sync(artigo_dao.buscar_por_termo, argumentos.termo),
+            argumentos.concorrencia, argumentos.repeticoes
+        )
+        await medir(
+            "/artigos/buscar (async)",
+            lambda: artigo_dao_async.buscar_por_termo(argumentos.termo),
+            argumentos.concorrencia, argumentos.repeticoes
+        )
+
+        if argumentos.id_pesquisador:
+            await medir(
+                "/pesquisadores/{id}/perfil (sync)",
+                lambda: anyio.to_thread.run_sync(pesquisador_dao.obter_perfil_pesquisador, argumentos.id_pesquisador),
+                argumentos.concorrencia, argumentos.repeticoes
+            )
+            await medir(
+                "/pesquisadores/{id}/perfil (async)",
+                lambda: pesquisador_dao_async.obter_perfil_pesquisador(argumentos.id_pesquisador),
+                argumentos.concorrencia, argumentos.repeticoes
+            )
+    finally:
+        await ConexaoAsync.fechar_pool()
+        Conexao.fechar_todas_conexoes()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos DAOs síncronos vs assíncronos.")
+    parser.add_argument("--termo", default="dados", help="Termo usado em /artigos/buscar")
+    parser.add_argument("--id-pesquisador", help="ID usado em /pesquisadores/{id}/perfil")
+    parser.add_argument("--concorrencia", type=int, default=200, help="Chamadas simultâneas por rodada")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Quantidade de rodadas")
+    asyncio.run(main(parser.parse_args()))
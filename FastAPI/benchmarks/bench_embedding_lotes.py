@@ -0,0 +1,101 @@
+"""
+Chamadas ao embedder no filtro de chunks dos resumos (SimilarityFilter):
+um `embed_query` por chunk (como era antes) contra o caminho em lotes do
+EmbeddingCache (service/embedding_cache.py), sequencial e concorrente,
+e com o cache já aquecido.
+
+Usa um embedder local falso, com latência configurável por chamada e por
+texto, que conta as chamadas recebidas; nada é enviado à OpenAI nem ao banco.
+
+Uso (a partir da pasta FastAPI):
+
+    python -m benchmarks.bench_embedding_lotes --artigos 50 --chunks 3 --latencia-ms 150
+"""
+import argparse
+import hashlib
+import threading
+import time
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from service.embedding_cache import CachedEmbeddings, EmbeddingCache
+
+
+class EmbedderFalso(Embeddings):
+    """Embedder determinístico que simula a latência de rede da API"""
+
+    model = "falso"
+
+    def __init__(self, latencia: float, latencia_por_texto: float, dim: int):
+        self.latencia = latencia
+        self.latencia_por_texto = latencia_por_texto
+        self.dim = dim
+        self.chamadas = 0
+        self._lock = threading.Lock()
+
+    def _vetor(self, texto: str) -> List[float]:
+        semente = hashlib.sha256(texto.encode("utf-8")).digest()
+        return [semente[i % len(semente)] / 255 for i in range(self.dim)]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.chamadas += 1
+        time.sleep(self.latencia + self.latencia_por_texto * len(texts))
+        return [self._vetor(texto) for texto in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def gerar_chunks(artigos: int, chunks_por_artigo: int) -> List[str]:
+    return [
+        f"Artigo {a}, trecho {c}: resultados sobre o tema {a % 7} com a metodologia {c}."
+        for a in range(artigos) for c in range(chunks_por_artigo)
+    ]
+
+
+def medir(nome: str, embedder: EmbedderFalso, chamada) -> None:
+    embedder.chamadas = 0
+    inicio = time.perf_counter()
+    chamada()
+    duracao = time.perf_counter() - inicio
+    print(f"{nome:<32} {embedder.chamadas:>10} {1000 * duracao:>12.1f}")
+
+
+def main(argumentos: argparse.Namespace) -> None:
+    textos = gerar_chunks(argumentos.artigos, argumentos.chunks)
+    embedder = EmbedderFalso(argumentos.latencia_ms / 1000, argumentos.latencia_texto_ms / 1000, argumentos.dim)
+
+    print(f"{len(textos)} chunks ({argumentos.artigos} artigos x {argumentos.chunks})")
+    print(f"{'cenário':<32} {'chamadas':>10} {'tempo (ms)':>12}")
+
+    medir("embed_query por chunk (antes)", embedder, lambda: [embedder.embed_query(texto) for texto in textos])
+
+    for nome, lote, concorrencia in (
+        ("lotes", argumentos.lote, 1),
+        (f"lotes de {argumentos.lote_pequeno}, sequencial", argumentos.lote_pequeno, 1),
+        (f"lotes de {argumentos.lote_pequeno}, {argumentos.concorrencia} simultâneos",
+         argumentos.lote_pequeno, argumentos.concorrencia),
+    ):
+        cache = EmbeddingCache(
+            memory_entries=10 * len(textos), max_entries=10 * len(textos),
+            batch_size=lote, concurrency=concorrencia, persistent=False
+        )
+        com_cache = CachedEmbeddings(embedder, cache)
+        medir(nome, embedder, lambda: com_cache.embed_documents(textos))
+
+    medir("cache aquecido", embedder, lambda: com_cache.embed_documents(textos))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de chamadas ao embedder com e sem lotes.")
+    parser.add_argument("--artigos", type=int, default=50, help="Artigos resumidos")
+    parser.add_argument("--chunks", type=int, default=3, help="Chunks por artigo")
+    parser.add_argument("--latencia-ms", type=float, default=150.0, help="Latência fixa por chamada (ms)")
+    parser.add_argument("--latencia-texto-ms", type=float, default=1.0, help="Latência adicional por texto (ms)")
+    parser.add_argument("--dim", type=int, default=1536, help="Dimensão dos vetores")
+    parser.add_argument("--lote", type=int, default=256, help="Textos por chamada (EMBEDDING_LOTE)")
+    parser.add_argument("--lote-pequeno", type=int, default=32, help="Lote do cenário concorrente")
+    parser.add_argument("--concorrencia", type=int, default=4, help="Lotes simultâneos (EMBEDDING_CONCORRENCIA)")
+    main(parser.parse_args())
@@ -0,0 +1,102 @@
+"""
+Recall x latência dos tipos de índice FAISS (service/faiss_indexes.py)
+comparados com a busca exata (flat), sobre vetores sintéticos agrupados
+com a mesma dimensão dos embeddings da OpenAI.
+
+Para cada índice, varia `nprobe` (IVF) ou `efSearch` (HNSW) e mede
+recall@k em relação ao flat, latência por consulta e memória do índice.
+
+Uso (a partir da pasta FastAPI):
+
+    python -m benchmarks.bench_faiss_recall --n 200000 --consultas 500 --k 10
+"""
+import argparse
+import statistics
+import time
+
+import faiss
+import numpy as np
+
+from service.faiss_indexes import create_index, set_search_params
+
+
+def gerar_vetores(n: int, dim: int, grupos: int, semente: int) -> np.ndarray:
+    """Vetores normalizados em torno de `grupos` centros, como embeddings de temas parecidos"""
+    rng = np.random.default_rng(semente)
+    centros = rng.standard_normal((grupos, dim)).astype("float32")
+    vetores = centros[rng.integers(0, grupos, n)] + 0.5 * rng.standard_normal((n, dim)).astype("float32")
+    vetores /= np.linalg.norm(vetores, axis=1, keepdims=True)
+    return np.ascontiguousarray(vetores)
+
+
+def buscar_uma_a_uma(index: faiss.Index, consultas: np.ndarray, k: int):
+    """Busca consulta por consulta (como na API) e devolve vizinhos e latências"""
+    vizinhos, latencias = [], []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        _, ids = index.search(consulta.reshape(1, -1), k)
+        latencias.append(time.perf_counter() - inicio)
+        vizinhos.append(ids[0])
+    return np.array(vizinhos), latencias
+
+
+def recall(exatos: np.ndarray, aproximados: np.ndarray) -> float:
+    acertos = sum(len(set(e) & set(a)) for e, a in zip(exatos, aproximados))
+    return acertos / exatos.size
+
+
+def main(argumentos: argparse.Namespace) -> None:
+    faiss.omp_set_num_threads(argumentos.threads)
+
+    print(f"Gerando {argumentos.n} vetores de dimensão {argumentos.dim}...")
+    base = gerar_vetores(argumentos.n, argumentos.dim, argumentos.grupos, semente=1)
+    consultas = gerar_vetores(argumentos.consultas, argumentos.dim, argumentos.grupos, semente=2)
+    treino = base[np.random.default_rng(3).choice(len(base), min(len(base), argumentos.amostra_treino), replace=False)]
+
+    print(f"{'índice':<12} {'parâmetro':<14} {'recall@' + str(argumentos.k):>10} "
+          f"{'p50 (ms)':>10} {'p95 (ms)':>10} {'memória (MB)':>13} {'construção (s)':>15}")
+
+    exatos = None
+    for index_type, parametro, valores in (
+        ("flat", None, [None]),
+        ("ivf_flat", "nprobe", [1, 4, 16, 64]),
+        ("ivf_pq", "nprobe", [1, 4, 16, 64]),
+        ("hnsw", "efSearch", [16, 32, 64, 128]),
+    ):
+        inicio = time.perf_counter()
+        index = create_index(index_type, argumentos.dim, treino, nlist=argumentos.nlist)
+        index.add(base)
+        construcao = time.perf_counter() - inicio
+        memoria = faiss.serialize_index(index).nbytes / 2 ** 20
+
+        for valor in valores:
+            if parametro == "nprobe":
+                set_search_params(index, nprobe=valor)
+            elif parametro == "efSearch":
+                set_search_params(index, ef_search=valor)
+
+            vizinhos, latencias = buscar_uma_a_uma(index, consultas, argumentos.k)
+            if exatos is None:
+                exatos = vizinhos
+
+            latencias_ordenadas = sorted(latencias)
+            print(
+                f"{index_type:<12} {(f'{parametro}={valor}' if parametro else '-'):<14} "
+                f"{recall(exatos, vizinhos):>10.3f} "
+                f"{1000 * statistics.median(latencias):>10.3f} "
+                f"{1000 * latencias_ordenadas[int(0.95 * (len(latencias_ordenadas) - 1))]:>10.3f} "
+                f"{memoria:>13.1f} {construcao:>15.1f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de recall x latência dos índices FAISS.")
+    parser.add_argument("--n", type=int, default=100_000, help="Vetores indexados")
+    parser.add_argument("--dim", type=int, default=1536, help="Dimensão dos vetores")
+    parser.add_argument("--grupos", type=int, default=200, help="Centros dos vetores sintéticos")
+    parser.add_argument("--consultas", type=int, default=200, help="Consultas medidas")
+    parser.add_argument("--k", type=int, default=10, help="Vizinhos por consulta")
+    parser.add_argument("--nlist", type=int, default=None, help="Listas do IVF (padrão: FAISS_NLIST)")
+    parser.add_argument("--amostra-treino", type=int, default=50_000, help="Vetores usados no treino do IVF")
+    parser.add_argument("--threads", type=int, default=1, help="Threads do FAISS")
+    main(parser.parse_args())
@@ -0,0 +1,335 @@
+"""
+Sincronização das fotos do Lattes (PesquisadorDAO.sincronizar_fotos): um pesquisador
+por vez (como era antes) contra o SincronizadorFotos com pesquisadores simultâneos,
+e a revalidação das fotos já baixadas (If-None-Match / hash do conteúdo).
+
+Sobe um servidor HTTP local que imita o redirecionamento do buscatextual (302 com o
+código K) e o download de fotos do servicosweb (JPEG de verdade, com ETag e 304), com
+latência configurável e uma parte dos pesquisadores sem código K; as fotos são gravadas
+numa pasta temporária e nada é gravado no banco.
+
+Antes das medições, confere o SincronizadorFotos contra o servidor: código K do 302,
+SEM_CODIGO, 304 com If-None-Match, o atalho pelo hash quando não há ETag e que as
+falhas (FALHA) não são entregues para gravação. Sai com erro se alguma conferência falhar.
+
+Uso (a partir da pasta FastAPI):
+
+    python -m benchmarks.bench_fotos_lattes --pesquisadores 200 --latencia-ms 150 --concorrencia 8
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import logging
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+from service.foto_lattes import (
+    BAIXADA, FALHA, HEADERS, INALTERADA, SEM_CODIGO, SincronizadorFotos
+)
+
+# JPEG 8x8 válido: o Pillow abre e gera as variantes como faria com uma foto do CNPq
+JPEG_BASE = base64.b64decode(
+    "/9j/4AAQSkZJRgABAQAAAQABAAD/2wBDABALDA4MChAODQ4SERATGCgaGBYWGDEjJR0oOjM9PDkzODdASFxOQERXRTc4UG1RV19iZ2hnPk1xeXBkeFxl"
+    "Z2P/2wBDARESEhgVGC8aGi9jQjhCY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2NjY2P/wAARCAAIAAgDASIAAhEB"
+    "AxEB/8QAHwAAAQUBAQEBAQEAAAAAAAAAAAECAwQFBgcICQoL/8QAtRAAAgEDAwIEAwUFBAQAAAF9AQIDAAQRBRIhMUEGE1FhByJxFDKBkaEII0KxwRVS"
+    "0fAkM2JyggkKFhcYGRolJicoKSo0NTY3ODk6Q0RFRkdISUpTVFVWV1hZWmNkZWZnaGlqc3R1dnd4eXqDhIWGh4iJipKTlJWWl5iZmqKjpKWmp6ipqrKz"
+    "tLW2t7i5usLDxMXGx8jJytLT1NXW19jZ2uHi4+Tl5ufo6erx8vP09fb3+Pn6/8QAHwEAAwEBAQEBAQEBAQAAAAAAAAECAwQFBgcICQoL/8QAtREAAgEC"
+    "BAQDBAcFBAQAAQJ3AAECAxEEBSExBhJBUQdhcRMiMoEIFEKRobHBCSMzUvAVYnLRChYkNOEl8RcYGRomJygpKjU2Nzg5OkNERUZHSElKU1RVVldYWVpj"
+    "ZGVmZ2hpanN0dXZ3eHl6goOEhYaHiImKkpOUlZaXmJmaoqOkpaanqKmqsrO0tba3uLm6wsPExcbHyMnK0tPU1dbX2Nna4uPk5ebn6Onq8vP09fb3+Pn6"
+    "/9oADAMBAAIRAxEAPwCGiiiuw5z/2Q=="
+)
+
+
+def foto(codigo_k: str) -> bytes:
+    """JPEG válido e diferente para cada código K (o código vai num segmento de comentário)"""
+    comentario = codigo_k.encode()
+    return JPEG_BASE[:2] + b"\xff\xfe" + struct.pack(">H", len(comentario) + 2) + comentario + JPEG_BASE[2:]
+
+
+def codigo_esperado(id_lattes: str) -> str:
+    return f"K{int(id_lattes) % 10 ** 9:09d}"
+
+
+class ServidorLattesFalso(ThreadingHTTPServer):
+    """Servidor local com as respostas do CNPq; conta as requisições e os bytes de foto enviados"""
+
+    daemon_threads = True
+
+    def __init__(self, latencia: float, taxa_sem_codigo: float):
+        super().__init__(("127.0.0.1", 0), RespostaLattes)
+        self.latencia = latencia
+        self.taxa_sem_codigo = taxa_sem_codigo
+        # Casos das conferências: ids sem código K, códigos cuja foto vem sem ETag e
+        # códigos cuja foto sempre responde 503
+        self.ids_sem_codigo = set()
+        self.codigos_sem_etag = set()
+        self.codigos_indisponiveis = set()
+        self.lock = threading.Lock()
+        self.zerar()
+
+    def zerar(self) -> None:
+        self.requisicoes = self.buscas = self.nao_modificadas = self.bytes_fotos = 0
+
+    def contar(self, **incrementos: int) -> None:
+        with self.lock:
+            for nome, valor in incrementos.items():
+                setattr(self, nome, getattr(self, nome) + valor)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class RespostaLattes(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        servidor = self.server
+        servidor.contar(requisicoes=1)
+        time.sleep(servidor.latencia)
+
+        url = urlsplit(self.path)
+        parametros = {nome: valores[0] for nome, valores in parse_qs(url.query).items()}
+
+        if url.path == "/buscatextual/cv":
+            servidor.contar(buscas=1)
+            id_lattes = parametros.get("id", "")
+            if (id_lattes in servidor.ids_sem_codigo
+                    or zlib.crc32(id_lattes.encode()) % 1000 < servidor.taxa_sem_codigo * 1000):
+                self._responder(200, "<html>Currículo não encontrado</html>".encode("utf-8"))
+            else:
+                location = f"{servidor.url}/buscatextual/visualizacv.do?id={codigo_esperado(id_lattes)}"
+                self._responder(302, b"", {"Location": location})
+        elif url.path == "/wspessoa/servletrecuperafoto":
+            codigo_k = parametros.get("id", "")
+            if codigo_k in servidor.codigos_indisponiveis:
+                self._responder(503, b"")
+                return
+            conteudo = foto(codigo_k)
+            etag = None if codigo_k in servidor.codigos_sem_etag else f'"{hashlib.md5(conteudo).hexdigest()}"'
+            if etag and self.headers.get("If-None-Match") == etag:
+                servidor.contar(nao_modificadas=1)
+                self._responder(304, b"", {"ETag": etag})
+            else:
+                servidor.contar(bytes_fotos=len(conteudo))
+                cabecalhos = {"Content-Type": "image/jpeg"}
+                if etag:
+                    cabecalhos["ETag"] = etag
+                self._responder(200, conteudo, cabecalhos)
+        else:
+            self._responder(404, b"")
+
+    def _responder(self, status: int, corpo: bytes, cabecalhos: dict = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def buscar_codigo_antes(url_busca: str, id_lattes: str) -> Optional[str]:
+    """buscar_codigo_lattes antes: um httpx.Client novo (sem keep-alive) por pesquisador"""
+    try:
+        with httpx.Client(follow_redirects=False, headers=HEADERS) as client:
+            resposta = client.get(f"{url_busca}/buscatextual/cv?id={id_lattes}", timeout=30.0)
+    except Exception:
+        return None
+    if resposta.status_code == HTTPStatus.FOUND:
+        return resposta.headers.get("Location", "")[-10:]
+    return None
+
+
+def baixar_foto_antes(url_foto: str, codigo_k: str, arquivo: Path) -> bool:
+    """
+    baixar_foto_pesquisador antes: até 2 tentativas, uma conexão nova por requisição
+    (requests.get; aqui httpx.get, que também não reaproveita conexões) e sem ETag nem hash
+    """
+    for _ in range(2):
+        try:
+            resposta = httpx.get(f"{url_foto}/wspessoa/servletrecuperafoto?tipo=1&id={codigo_k}", timeout=10)
+        except Exception:
+            continue
+        if resposta.status_code != HTTPStatus.OK:
+            continue
+        arquivo.write_bytes(resposta.content)
+        return True
+    return False
+
+
+def sincronizar_antes(servidor: ServidorLattesFalso, pesquisadores: List[Dict], diretorio: Path) -> Dict[str, int]:
+    """Laço de PesquisadorDAO.sincronizar_fotos antes: um pesquisador por vez (sem o UPDATE de cada um)"""
+    diretorio.mkdir(parents=True, exist_ok=True)
+    contagem = {BAIXADA: 0, INALTERADA: 0, SEM_CODIGO: 0}
+    for pesquisador in pesquisadores:
+        id_lattes = pesquisador["id_lattes"]
+        codigo_k = buscar_codigo_antes(servidor.url, id_lattes)
+        if not codigo_k:
+            contagem[SEM_CODIGO] += 1
+        elif baixar_foto_antes(servidor.url, codigo_k, diretorio / f"{id_lattes}.jpg"):
+            contagem[BAIXADA] += 1
+    return contagem
+
+
+def sincronizar(servidor: ServidorLattesFalso, pesquisadores: List[Dict], diretorio: Path,
+                concorrencia: int, por_segundo: float = 0, tentativas: Optional[int] = None):
+    """Roda o SincronizadorFotos; retorna a contagem e os resultados gravados por id_pesquisador"""
+    gravados = {}
+
+    def gravar(resultados):
+        for id_pesquisador, status, codigo_k, etag, foto_hash in resultados:
+            gravados[id_pesquisador] = {"status": status, "codigo_k": codigo_k, "etag": etag, "hash": foto_hash}
+
+    sincronizador = SincronizadorFotos(
+        concorrencia=concorrencia, requisicoes_por_segundo=por_segundo, tentativas=tentativas,
+        url_busca=servidor.url, url_foto=servidor.url, diretorio=diretorio
+    )
+    contagem = asyncio.run(sincronizador.sincronizar(pesquisadores, gravar, lote=50))
+    return contagem, gravados
+
+
+def guardados(pesquisadores: List[Dict], gravados: Dict) -> List[Dict]:
+    """Pesquisadores com o código K, o ETag e o hash gravados na passada anterior (como o DAO os lê)"""
+    return [
+        dict(pesquisador, **{campo: valor for campo, valor in gravados.get(pesquisador["id_pesquisador"], {}).items()
+                             if campo != "status"})
+        for pesquisador in pesquisadores
+    ]
+
+
+class RegistrosCapturados(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.registros = []
+
+    def emit(self, registro: logging.LogRecord) -> None:
+        self.registros.append(registro)
+
+
+def conferir(diretorio: Path) -> None:
+    """Confere o SincronizadorFotos contra o servidor local (sem latência)"""
+    servidor = ServidorLattesFalso(0.0, 0.0)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    com_etag, sem_codigo, sem_etag, indisponivel = (f"{2_000_000_000_000_000 + i:016d}" for i in range(4))
+    servidor.ids_sem_codigo.add(sem_codigo)
+    servidor.codigos_sem_etag.add(codigo_esperado(sem_etag))
+    servidor.codigos_indisponiveis.add(codigo_esperado(indisponivel))
+    pesquisadores = [{"id_pesquisador": id_lattes, "id_lattes": id_lattes}
+                     for id_lattes in (com_etag, sem_codigo, sem_etag, indisponivel)]
+
+    # Erros registrados pelo sincronizador (ex.: variantes que não puderam ser geradas)
+    captura = RegistrosCapturados()
+    logger_fotos = logging.getLogger("service.foto_lattes")
+    logger_fotos.addHandler(captura)
+    logger_fotos.propagate = False
+    try:
+        # Primeira passada: nada guardado
+        contagem, gravados = sincronizar(servidor, pesquisadores, diretorio, concorrencia=4, tentativas=1)
+        assert gravados[com_etag]["status"] == BAIXADA, gravados[com_etag]
+        assert gravados[com_etag]["codigo_k"] == codigo_esperado(com_etag), "código K do 302 não foi lido"
+        assert gravados[com_etag]["etag"], "ETag da foto não foi guardado"
+        assert (diretorio / f"{com_etag}.jpg").read_bytes() == foto(codigo_esperado(com_etag))
+        assert gravados[sem_codigo]["status"] == SEM_CODIGO, gravados[sem_codigo]
+        assert not (diretorio / f"{sem_codigo}.jpg").exists()
+        assert gravados[sem_etag]["status"] == BAIXADA and gravados[sem_etag]["etag"] is None, gravados[sem_etag]
+        assert gravados[sem_etag]["hash"] == hashlib.sha256(foto(codigo_esperado(sem_etag))).hexdigest()
+        assert contagem[FALHA] == 1, contagem
+        assert indisponivel not in gravados, "resultado FALHA foi entregue para gravação"
+        assert not (diretorio / f"{indisponivel}.jpg").exists()
+
+        # Segunda passada com código K, ETag e hash guardados
+        antes_sem_etag = (diretorio / f"{sem_etag}.jpg").stat().st_mtime_ns
+        servidor.zerar()
+        contagem, gravados = sincronizar(servidor, guardados(pesquisadores, gravados), diretorio,
+                                         concorrencia=4, tentativas=1)
+        assert gravados[com_etag]["status"] == INALTERADA, gravados[com_etag]
+        assert servidor.nao_modificadas == 1, "If-None-Match não foi enviado (ou o 304 não foi tratado)"
+        assert gravados[sem_etag]["status"] == INALTERADA, gravados[sem_etag]
+        assert (diretorio / f"{sem_etag}.jpg").stat().st_mtime_ns == antes_sem_etag, "foto igual foi regravada"
+        # Só voltam ao buscatextual o pesquisador sem código K e o que falhou (nada foi gravado para ele)
+        assert servidor.buscas == 2, servidor.buscas
+        assert contagem[FALHA] == 1 and indisponivel not in gravados, contagem
+
+        erros = [registro.getMessage() for registro in captura.registros if registro.exc_info]
+        assert not erros, erros
+    finally:
+        logger_fotos.removeHandler(captura)
+        logger_fotos.propagate = True
+        servidor.shutdown()
+
+    print("conferências do SincronizadorFotos: ok (302 → código K, sem código K, 304, hash sem ETag, FALHA não gravada)")
+
+
+def imprimir(nome: str, servidor: ServidorLattesFalso, contagem: Dict[str, int], duracao: float) -> None:
+    print(
+        f"{nome:<30} {servidor.requisicoes:>12} {servidor.bytes_fotos // 1024:>10} "
+        f"{contagem[BAIXADA]:>8} {contagem[INALTERADA]:>11} {contagem[SEM_CODIGO]:>10} {duracao:>10.2f}"
+    )
+
+
+def main(argumentos: argparse.Namespace) -> None:
+    # Avisos de pesquisadores sem código K são esperados aqui; só interessam as contagens
+    logging.getLogger("service.foto_lattes").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        conferir(Path(pasta) / "conferencia")
+
+        servidor = ServidorLattesFalso(argumentos.latencia_ms / 1000, argumentos.taxa_sem_codigo)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        pesquisadores = [
+            {"id_pesquisador": f"p{i}", "id_lattes": f"{1_000_000_000_000_000 + i:016d}"}
+            for i in range(argumentos.pesquisadores)
+        ]
+
+        print(f"\n{len(pesquisadores)} pesquisadores, {argumentos.latencia_ms:.0f} ms por resposta, "
+              f"{100 * argumentos.taxa_sem_codigo:.0f}% sem código K")
+        print(f"{'cenário':<30} {'requisições':>12} {'KB fotos':>10} {'baixadas':>8} "
+              f"{'inalteradas':>11} {'sem código':>10} {'tempo (s)':>10}")
+
+        try:
+            servidor.zerar()
+            inicio = time.perf_counter()
+            contagem = sincronizar_antes(servidor, pesquisadores, Path(pasta) / "sequencial")
+            imprimir("sequencial (antes)", servidor, contagem, time.perf_counter() - inicio)
+
+            diretorio = Path(pasta) / "simultaneo"
+            servidor.zerar()
+            inicio = time.perf_counter()
+            contagem, gravados = sincronizar(servidor, pesquisadores, diretorio,
+                                             argumentos.concorrencia, argumentos.por_segundo)
+            imprimir(f"{argumentos.concorrencia} simultâneos", servidor, contagem, time.perf_counter() - inicio)
+
+            # Segunda passada com código K e ETag guardados: nada é baixado de novo
+            servidor.zerar()
+            inicio = time.perf_counter()
+            contagem, _ = sincronizar(servidor, guardados(pesquisadores, gravados), diretorio,
+                                      argumentos.concorrencia, argumentos.por_segundo)
+            imprimir("revalidação (ETag)", servidor, contagem, time.perf_counter() - inicio)
+        finally:
+            servidor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da sincronização de fotos do Lattes contra um servidor local.")
+    parser.add_argument("--pesquisadores", type=int, default=200, help="Pesquisadores sincronizados")
+    parser.add_argument("--latencia-ms", type=float, default=150.0, help="Latência de cada resposta (ms)")
+    parser.add_argument("--taxa-sem-codigo", type=float, default=0.1, help="Fração de pesquisadores sem código K")
+    parser.add_argument("--concorrencia", type=int, default=8, help="Pesquisadores simultâneos (FOTO_CONCORRENCIA)")
+    parser.add_argument("--por-segundo", type=float, default=0,
+                        help="Limite por host (FOTO_REQUISICOES_POR_SEGUNDO; 0 = sem limite)")
+    main(parser.parse_args())
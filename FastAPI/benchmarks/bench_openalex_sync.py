@@ -0,0 +1,155 @@
+"""
+Busca de resumos no OpenAlex pela sincronização de resumos (ArtigoDAO.sincronizar_resumos):
+um DOI por requisição, uma por vez (como era antes) e simultâneas, contra o
+ClienteOpenAlex com lotes de DOIs (filter=doi:a|b|c), limite de taxa e novas tentativas.
+
+Sobe um servidor HTTP local que imita as rotas /works/https://doi.org/{doi} e
+/works?filter=doi:... do OpenAlex, com latência configurável (fixa e por registro),
+uma parte dos DOIs inexistente e respostas 429/503 ocasionais com Retry-After;
+nada é enviado ao OpenAlex nem gravado no banco.
+
+Uso (a partir da pasta FastAPI):
+
+    python -m benchmarks.bench_openalex_sync --dois 1000 --latencia-ms 120 --lote 50
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from service.openalex import ClienteOpenAlex
+
+
+class ServidorOpenAlexFalso(ThreadingHTTPServer):
+    """Servidor local com as respostas do OpenAlex; conta as requisições recebidas"""
+
+    daemon_threads = True
+
+    def __init__(self, latencia: float, latencia_registro: float, taxa_erro: float, taxa_404: float):
+        super().__init__(("127.0.0.1", 0), RespostaOpenAlex)
+        self.latencia = latencia
+        self.latencia_registro = latencia_registro
+        self.taxa_erro = taxa_erro
+        self.taxa_404 = taxa_404
+        self.requisicoes = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def existe(self, doi: str) -> bool:
+        return zlib.crc32(doi.encode()) % 1000 >= self.taxa_404 * 1000
+
+
+def registro(doi: str) -> dict:
+    palavras = f"resumo do artigo {doi} sobre o tema".split()
+    indice = {palavra: [posicao] for posicao, palavra in enumerate(palavras)}
+    return {"doi": f"https://doi.org/{doi}", "abstract_inverted_index": indice}
+
+
+class RespostaOpenAlex(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como a API real
+
+    def do_GET(self) -> None:
+        servidor = self.server
+        with servidor.lock:
+            servidor.requisicoes += 1
+
+        url = urlsplit(self.path)
+        filtro = parse_qs(url.query).get("filter", [""])[0]
+        if filtro.startswith("doi:"):
+            dois = filtro[len("doi:"):].split("|")
+        else:
+            dois = [url.path.split("https://doi.org/", 1)[-1]]
+        time.sleep(servidor.latencia + servidor.latencia_registro * len(dois))
+
+        if random.random() < servidor.taxa_erro:
+            self._responder(random.choice((429, 503)), {"error": "tente de novo"}, {"Retry-After": "0.2"})
+        elif filtro:
+            self._responder(200, {"results": [registro(doi) for doi in dois if servidor.existe(doi)]})
+        elif servidor.existe(dois[0]):
+            self._responder(200, registro(dois[0]))
+        else:
+            self._responder(404, {"error": "not found"})
+
+    def _responder(self, status: int, corpo: dict, cabecalhos: dict = None) -> None:
+        dados = json.dumps(corpo).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(dados)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def um_por_requisicao(cliente: ClienteOpenAlex, dois: list) -> list:
+    """Um DOI por requisição, com a mesma concorrência do cliente"""
+    with ThreadPoolExecutor(max_workers=cliente.concorrencia) as executor:
+        return list(zip(dois, executor.map(cliente.buscar_resumo, dois)))
+
+
+def medir(nome: str, servidor: ServidorOpenAlexFalso, dois: list, concorrencia: int, por_segundo: float,
+          lote: int = 0) -> None:
+    servidor.requisicoes = 0
+    inicio = time.perf_counter()
+    with ClienteOpenAlex(base_url=servidor.url, email="", concorrencia=concorrencia,
+                         requisicoes_por_segundo=por_segundo, dois_por_requisicao=lote or None) as cliente:
+        resultados = list(cliente.buscar_resumos(dois)) if lote else um_por_requisicao(cliente, dois)
+    duracao = time.perf_counter() - inicio
+
+    com_resumo = sum(1 for _, resumo in resultados if resumo)
+    print(
+        f"{nome:<36} {servidor.requisicoes:>12} {cliente.novas_tentativas:>10} "
+        f"{com_resumo:>8} {len(dois) - len(resultados):>7} {duracao:>10.2f}"
+    )
+
+
+def main(argumentos: argparse.Namespace) -> None:
+    random.seed(argumentos.semente)
+    # 404 e novas tentativas são esperados aqui; só interessam as contagens
+    logging.getLogger("service.openalex").setLevel(logging.ERROR)
+    dois = [f"10.1234/bench.{i}" for i in range(argumentos.dois)]
+    servidor = ServidorOpenAlexFalso(
+        argumentos.latencia_ms / 1000, argumentos.latencia_registro_ms / 1000,
+        argumentos.taxa_erro, argumentos.taxa_404
+    )
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    print(f"{len(dois)} DOIs, {argumentos.latencia_ms:.0f} ms por resposta, "
+          f"{100 * argumentos.taxa_erro:.0f}% de 429/503, {100 * argumentos.taxa_404:.0f}% de 404")
+    print(f"{'cenário':<36} {'requisições':>12} {'tentativas':>10} {'resumos':>8} {'falhas':>7} {'tempo (s)':>10}")
+
+    try:
+        medir("1 DOI/req, sequencial (antes)", servidor, dois, 1, 0)
+        medir(f"1 DOI/req, {argumentos.concorrencia} simultâneas", servidor, dois, argumentos.concorrencia, 0)
+        medir(f"1 DOI/req, {argumentos.concorrencia} simult., {argumentos.por_segundo:g} req/s",
+              servidor, dois, argumentos.concorrencia, argumentos.por_segundo)
+        medir(f"{argumentos.lote} DOIs/req, {argumentos.concorrencia} simult., {argumentos.por_segundo:g} req/s",
+              servidor, dois, argumentos.concorrencia, argumentos.por_segundo, argumentos.lote)
+    finally:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da busca de resumos no OpenAlex contra um servidor local.")
+    parser.add_argument("--dois", type=int, default=1000, help="DOIs buscados")
+    parser.add_argument("--latencia-ms", type=float, default=120.0, help="Latência de cada resposta (ms)")
+    parser.add_argument("--latencia-registro-ms", type=float, default=2.0, help="Latência por registro devolvido (ms)")
+    parser.add_argument("--taxa-erro", type=float, default=0.05, help="Fração de respostas 429/503")
+    parser.add_argument("--taxa-404", type=float, default=0.1, help="Fração de DOIs inexistentes")
+    parser.add_argument("--concorrencia", type=int, default=8, help="Requisições simultâneas (OPENALEX_CONCORRENCIA)")
+    parser.add_argument("--lote", type=int, default=50, help="DOIs por requisição (OPENALEX_DOIS_POR_REQUISICAO)")
+    parser.add_argument("--por-segundo", type=float, default=9.0, help="Limite de taxa (OPENALEX_REQUISICOES_POR_SEGUNDO)")
+    parser.add_argument("--semente", type=int, default=42, help="Semente dos erros sorteados")
+    main(parser.parse_args())
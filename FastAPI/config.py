@@ -9,9 +9,57 @@ class Configuracoes(BaseSettings):
     DB_PORT: int = 5445
     DB_MIN_CONEXOES: int = 1
     DB_MAX_CONEXOES: int = 10
+    DB_POOL_TIMEOUT: float = 10.0            # espera máxima (s) por uma conexão livre
+    DB_CONEXAO_IDADE_MAXIMA: float = 1800.0  # recicla conexões mais velhas que isso (s)
+    DB_CONEXAO_OCIOSA_MAXIMA: float = 300.0  # fecha conexões ociosas há mais que isso (s)
+    DB_CONEXAO_VALIDAR_APOS: float = 5.0     # testa com SELECT 1 se ociosa há mais que isso (s)
 
     # OpenAI / LangChain
     OPENAI_API_KEY: str
+
+    # Busca semântica
+    SEMANTIC_BACKEND: str = "pgvector"       # "pgvector" (tabela no PostgreSQL) ou "faiss" (arquivos locais)
+    FAISS_INDEX_TYPE: str = "flat"           # flat (exato), ivf_flat, ivf_pq ou hnsw
+    FAISS_NLIST: int = 0                     # listas do IVF (0 = 4 * raiz do nº de vetores)
+    FAISS_NPROBE: int = 16                   # listas visitadas por busca no IVF (mais = mais recall)
+    FAISS_PQ_M: int = 64                     # subvetores do PQ (deve dividir a dimensão, 1536)
+    FAISS_HNSW_M: int = 32                   # vizinhos por nó no grafo HNSW
+    FAISS_EF_CONSTRUCTION: int = 200         # candidatos ao construir o HNSW
+    FAISS_EF_SEARCH: int = 64                # candidatos por busca no HNSW (mais = mais recall)
+
+    # Cache de embeddings (tabela cache_embedding + LRU em memória por processo)
+    EMBEDDING_CACHE_MAXIMO: int = 200_000    # entradas mantidas no banco (remove as usadas há mais tempo)
+    EMBEDDING_CACHE_MEMORIA: int = 5_000     # entradas mantidas em memória em cada processo
+    EMBEDDING_LOTE: int = 256                # textos por chamada ao embedder
+    EMBEDDING_CONCORRENCIA: int = 1          # lotes enviados ao embedder ao mesmo tempo
+
+    # Cache das respostas do LLM (tabela cache_llm)
+    LLM_CACHE_VALIDADE_HORAS: int = 168      # validade de cada resposta (7 dias)
+
+    # Fila de resumos e tags dos pesquisadores (tabela resumo_pesquisador)
+    RESUMO_WORKERS: int = 2                  # tarefas geradas ao mesmo tempo por processo
+    
+    # OpenAlex (sincronização dos resumos dos artigos)
+    OPENALEX_URL: str = "https://api.openalex.org"
+    OPENALEX_EMAIL: str = ""                 # e-mail do "polite pool" (parâmetro mailto), recomendado
+    OPENALEX_CONCORRENCIA: int = 8           # requisições simultâneas
+    OPENALEX_REQUISICOES_POR_SEGUNDO: float = 9.0  # limite do polite pool: 10 por segundo
+    OPENALEX_TENTATIVAS: int = 4             # tentativas por requisição (429, 5xx e falhas de rede)
+    OPENALEX_DOIS_POR_REQUISICAO: int = 50   # DOIs por consulta com filter=doi:a|b (máximo da API: 50)
+    OPENALEX_LOTE_ESCRITA: int = 200         # resumos gravados por UPDATE
+
+    # Lattes (sincronização das fotos dos pesquisadores)
+    LATTES_BUSCA_URL: str = "https://buscatextual.cnpq.br"   # redirecionamento com o código K
+    LATTES_FOTO_URL: str = "http://servicosweb.cnpq.br"      # download das fotos
+    FOTO_CONCORRENCIA: int = 8               # pesquisadores processados ao mesmo tempo
+    FOTO_REQUISICOES_POR_SEGUNDO: float = 5.0  # limite por host do CNPq
+    FOTO_TENTATIVAS: int = 3                 # tentativas por requisição (429, 5xx e falhas de rede)
+    FOTO_LOTE_ESCRITA: int = 100             # resultados gravados por UPDATE
+    FOTO_REVALIDAR_DIAS: int = 30            # confere de novo fotos sincronizadas há mais tempo (0 = nunca)
+    FOTO_LARGURA_LISTAGEM: int = 384         # largura (px) da foto nas URLs devolvidas pela API
+
+    # Sincronização dos dados externos (resumos, fotos e busca semântica; service/startup_sync.py)
+    SINCRONIZAR_NA_INICIALIZACAO: bool = True  # False: rodar à parte com python -m service.startup_sync
     
     # Servidor
     BASE_URL: str = "http://localhost:8000"
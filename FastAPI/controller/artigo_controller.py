@@ -1,10 +1,18 @@
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+import asyncio
 import logging
 
+from controller.paginacao import LIMITE_PADRAO, LIMITE_MAXIMO, definir_proximo_cursor, resposta_ndjson
+from controller.sse import resposta_sse
+from banco.pool_conexoes import PoolEsgotadoError
 from dao.artigo_dao import ArtigoDAO
+from dao.artigo_dao_async import ArtigoDAOAsync
 from model.artigo import Artigo
 from service.langchain import LangchainService
-from service.semantic_search import SemanticSearchService
+from service.resumo_busca import result_set_hash, search_summary_service
+from service.semantic_search import semantic_search_service
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +24,10 @@ class ArtigoController:
     """
     def __init__(self):
         self.dao = ArtigoDAO()
-        self.summarizer = LangchainService()
-        self.semantic = SemanticSearchService()
+        self.dao_async = ArtigoDAOAsync()
+        self.summarizer = LangchainService(vector_lookup=semantic_search_service.document_vectors)
+        self.search_summaries = search_summary_service
+        self.semantic = semantic_search_service
         self.router = APIRouter(prefix="/artigos", tags=["artigos"])
         self._register_routes()
 
@@ -29,7 +39,12 @@ class ArtigoController:
             response_model=None,
             methods=["GET"],
             summary="Listar artigos",
-            description="Retorna todos os artigos cadastrados no sistema."
+            description=(
+                "Retorna os artigos cadastrados no sistema em páginas ordenadas por ID, uma publicação "
+                "por item com todos os seus autores. "
+                "Use `limit` e, para a próxima página, `after` com o valor do cabeçalho `X-Next-Cursor`. "
+                "Com `stream=true`, exporta todos os registros em NDJSON, sem paginação."
+            )
         )
 
         self.router.add_api_route(
@@ -39,8 +54,37 @@ class ArtigoController:
             methods=["GET"],
             summary="Buscar artigos por termo",
             description=(
-                "Retorna os artigos cujo nome ou resumo contém o termo passado. "
-                "Pode também incluir um resumo geral dos resultados e tags separadas se `incluir_resumo=true`."
+                "Retorna os artigos cujo título ou resumo contém as palavras do termo (também como prefixo, "
+                "sem diferenciar acentos), ordenados por relevância. "
+                "Com `incluir_resumo=true`, responde logo com os resultados e um `token_resumo`; "
+                "o resumo geral e as tags são obtidos em `/artigos/buscar/resumo/{token}`."
+            )
+        )
+
+        self.router.add_api_route(
+            "/buscar/resumo/{token}",
+            self.obter_resumo_busca,
+            response_model=None,
+            methods=["GET"],
+            summary="Obter resumo e tags de uma busca de artigos",
+            description=(
+                "Resolve o `token_resumo` devolvido por `/artigos/buscar?incluir_resumo=true`: "
+                "retorna o resumo gerado por IA e as tags dos resultados. Buscas com o mesmo termo e "
+                "os mesmos resultados compartilham o resumo (em cache ou ainda sendo gerado)."
+            )
+        )
+
+        self.router.add_api_route(
+            "/buscar/stream",
+            self.buscar_por_termo_stream,
+            response_model=None,
+            methods=["GET"],
+            summary="Buscar artigos por termo com resumo em streaming (SSE)",
+            description=(
+                "Mesma busca de `/artigos/buscar?incluir_resumo=true`, como Server-Sent Events: "
+                "o evento `resultados` chega logo após a consulta, o resumo chega em partes nos eventos `resumo` "
+                "(texto em JSON, para concatenar), depois vêm as `tags` e, por último, `fim`. "
+                "Falhas na geração chegam no evento `erro`."
             )
         )
 
@@ -52,7 +96,10 @@ class ArtigoController:
             summary="Busca semântica em artigos",
             description=(
                 "Realiza busca semântica usando embeddings para retornar artigos "
-                "ordenados por relevância no contexto da consulta."
+                "ordenados por relevância no contexto da consulta. "
+                "Aceita filtros por ano (`ano_inicio`, `ano_fim`), Qualis (`qualis`, pode repetir) "
+                "e instituição de algum dos autores (`id_instituicao`). "
+                "`nprobe` (índices IVF) e `ef_search` (HNSW) ajustam recall x latência só desta busca."
             )
         )
 
@@ -64,8 +111,10 @@ class ArtigoController:
             methods=["POST"],
             summary="Criar artigo",
             description=(
-                "Cria um novo artigo e retorna o recurso criado com ID gerado. "
-                "Retorna 409 em caso de conflito de chave ou 400 em erro genérico."
+                "Cria um novo artigo para o pesquisador e retorna o recurso criado com ID gerado. "
+                "Se a publicação (mesmo DOI ou, sem DOI, mesmo título, ano e periódico) já estiver "
+                "cadastrada, o pesquisador é incluído entre os autores dela. "
+                "Retorna 409 se ele já for autor ou em conflito de chave, ou 400 em erro genérico."
             )
         )
 
@@ -76,8 +125,11 @@ class ArtigoController:
             methods=["PUT"],
             summary="Atualizar artigo",
             description=(
-                "Atualiza um artigo existente por ID e retorna o recurso atualizado. "
-                "Retorna 404 se não encontrado ou 400 em erro."
+                "Atualiza o artigo (ID da publicação, o mesmo da listagem) do pesquisador `id_pesquisador` "
+                "e retorna o recurso atualizado. Os dados de uma publicação com outros autores não são "
+                "sobrescritos: se eles mudarem, o pesquisador passa para a publicação correspondente. "
+                "Retorna 404 se não encontrado, 409 se o pesquisador já for autor da "
+                "publicação com os novos dados ou 400 em erro."
             )
         )
 
@@ -87,42 +139,139 @@ class ArtigoController:
             status_code=status.HTTP_204_NO_CONTENT,
             methods=["DELETE"],
             summary="Deletar artigo",
-            description="Remove um artigo existente por ID. Retorna 404 se não encontrado."
+            description=(
+                "Remove o pesquisador `id_pesquisador` dos autores do artigo (ID da publicação, o mesmo da listagem); "
+                "a publicação é apagada se ficar sem autores. Retorna 404 se não encontrado."
+            )
         )
 
-    def listar(self):
-        return self.dao.listar_artigos()
+    def listar(
+        self,
+        response: Response,
+        after: Optional[UUID] = Query(None),
+        limit: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+        stream: bool = Query(False)
+    ):
+        apos = str(after) if after else None
+        if stream:
+            return resposta_ndjson(self.dao.exportar_artigos(apos))
+
+        resultados = self.dao.listar_artigos(apos, limit)
+        definir_proximo_cursor(response, resultados, "id", limit)
+        return resultados
 
-    def buscar_por_termo(
+    async def buscar_por_termo(
         self, 
         termo: str = Query(..., min_length=1), 
         incluir_resumo: bool = Query(False)
     ):
         try:
-            resultados = self.dao.buscar_por_termo(termo)
+            resultados = await self.dao_async.buscar_por_termo(termo)
 
             if incluir_resumo and resultados:
-                resumo = self.summarizer.summarize(resultados, tipo="artigo")
-                tags = self.summarizer.gerar_tags_artigo(resultados)
+                # O resumo não atrasa os resultados: é resolvido à parte, pelo token
                 return {
-                    "resultados": resultados, 
-                    "resumo_ia": resumo,
-                    "tags": tags
+                    "resultados": resultados,
+                    "token_resumo": self.search_summaries.make_token(termo, resultados)
                 }
 
             return resultados
         
+        except PoolEsgotadoError:
+            raise
         except Exception as e:
             logger.exception("Erro ao buscar artigo pelo termo: {termo}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    async def obter_resumo_busca(self, token: str):
+        try:
+            termo, chave = self.search_summaries.parse_token(token)
+
+            # Já pronto ou sendo gerado para o mesmo conjunto: nem refaz a consulta
+            resumo = self.search_summaries.cached(chave)
+            if resumo is not None:
+                return resumo
+            if self.search_summaries.in_flight(chave) is None:
+                resultados = await self.dao_async.buscar_por_termo(termo)
+                if not resultados:
+                    raise LookupError("A busca não tem mais resultados para resumir.")
+                # Se os artigos mudaram desde a busca, resume os resultados atuais
+                chave = result_set_hash(termo, resultados)
+            else:
+                resultados = []
+
+            return await self.search_summaries.resolve(chave, resultados)
+        
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except LookupError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except PoolEsgotadoError:
+            raise
+        except RuntimeError as e:
+            logger.error("Erro ao buscar artigos para o resumo: %s", e)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as e:
+            logger.warning(f"Erro ao gerar resumo da busca de artigos: {e!r}")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Não foi possível gerar o resumo.")
+
+    async def buscar_por_termo_stream(self, termo: str = Query(..., min_length=1)):
+        try:
+            resultados = await self.dao_async.buscar_por_termo(termo)
+        
+        except PoolEsgotadoError:
+            raise
+        except Exception as e:
+            logger.exception(f"Erro ao buscar artigo pelo termo: {termo}")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        return resposta_sse(self._eventos_busca(resultados))
+
+    async def _eventos_busca(self, resultados: List[Dict]) -> AsyncIterator[Tuple[str, object]]:
+        """Resultados primeiro; depois o resumo em partes e as tags, geradas ao mesmo tempo"""
+        yield "resultados", resultados
+        if not resultados:
+            return
+
+        tags = asyncio.create_task(self.summarizer.agerar_tags_artigo(resultados))
+        try:
+            try:
+                async for parte in self.summarizer.astream_summary(resultados, tipo="artigo"):
+                    yield "resumo", parte
+            except Exception as e:
+                logger.warning(f"Erro ao gerar resumo dos artigos em streaming: {e!r}")
+                yield "erro", {"detail": "Não foi possível gerar o resumo."}
+
+            try:
+                yield "tags", await tags
+            except Exception as e:
+                logger.warning(f"Erro ao gerar tags dos artigos: {e!r}")
+                yield "tags", ["Pesquisa Científica", "Artigo Acadêmico", "Ciência"]
+        finally:
+            # Cliente desconectado no meio do stream: não deixa a geração das tags órfã
+            tags.cancel()
+
     def busca_semantica_artigos(
         self,
         termo: str = Query(..., min_length=1),
-        k: int = Query(10, ge=1, le=50)
+        k: int = Query(10, ge=1, le=50),
+        ano_inicio: Optional[int] = Query(None),
+        ano_fim: Optional[int] = Query(None),
+        qualis: Optional[List[str]] = Query(None),
+        id_instituicao: Optional[UUID] = Query(None),
+        nprobe: Optional[int] = Query(None, ge=1, le=4096),
+        ef_search: Optional[int] = Query(None, ge=1, le=1000)
     ):        
         try:
-            resultados = self.semantic.semantic_search(termo, k, tipo="artigo")
+            resultados = self.semantic.semantic_search(
+                termo, k, tipo="artigo",
+                ano_inicio=ano_inicio,
+                ano_fim=ano_fim,
+                qualis=qualis,
+                id_instituicao=str(id_instituicao) if id_instituicao else None,
+                nprobe=nprobe,
+                ef_search=ef_search
+            )
             
             return {
                 "query": termo,
@@ -131,6 +280,8 @@ class ArtigoController:
                 ]
             }
         
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except Exception as e:
             logger.error(f"Erro na busca semântica de artigos: {e}")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -154,13 +305,16 @@ class ArtigoController:
         except LookupError as e:
             logger.info("Artigo não encontrado para atualização: %s", e)
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except ValueError as e:
+            logger.warning("Conflito ao atualizar artigo: %s", e)
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
         except RuntimeError as e:
             logger.error("Erro ao atualizar artigo: %s", e)
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    def apagar(self, id_artigo: str):
+    def apagar(self, id_artigo: str, id_pesquisador: str = Query(..., min_length=36, max_length=36)):
         try:
-            self.dao.apagar_artigo(id_artigo)
+            self.dao.apagar_artigo(id_artigo, id_pesquisador)
 
         except LookupError as e:
             logger.info("Artigo não encontrado para exclusão: %s", e)
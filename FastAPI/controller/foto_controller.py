@@ -0,0 +1,89 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from pathlib import Path
+from typing import Optional
+import logging
+
+from service.registro_fotos import DIRETORIO_FOTOS, registro_fotos
+from service.variantes_fotos import etag_arquivo, obter_variante
+
+logger = logging.getLogger(__name__)
+
+# URL com a versão atual da foto (?v=): o conteúdo nunca muda, o navegador não precisa revalidar
+CACHE_IMUTAVEL = "public, max-age=31536000, immutable"
+# Sem versão (ou com versão antiga): guarda, mas confere o ETag antes de usar
+CACHE_REVALIDAR = "public, no-cache"
+
+TIPOS = {".jpg": "image/jpeg", ".webp": "image/webp"}
+
+
+async def resposta_foto(request: Request, original: Path, largura: Optional[int],
+                        versao: Optional[str], versao_atual: Optional[str]) -> Response:
+    """
+    Serve a foto na largura pedida (miniatura mais próxima) e em WebP quando o navegador
+    aceita, com ETag forte; responde 304 se o If-None-Match do navegador já for o atual.
+    """
+    if not original.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Foto não encontrada")
+
+    webp = "image/webp" in request.headers.get("accept", "")
+    caminho = await run_in_threadpool(obter_variante, original, largura, webp)
+    etag = await run_in_threadpool(etag_arquivo, caminho)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_IMUTAVEL if versao and versao == versao_atual else CACHE_REVALIDAR,
+        # A mesma URL devolve WebP ou JPEG conforme o Accept
+        "Vary": "Accept",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (valor.strip() for valor in if_none_match.split(","))):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return FileResponse(caminho, media_type=TIPOS.get(caminho.suffix, "image/jpeg"), headers=headers)
+
+
+class FotoController:
+    """
+    Controller das fotos dos pesquisadores em /imagens/pesquisadores.
+    Registrado antes da montagem estática de /imagens, atende às mesmas URLs
+    acrescentando miniaturas (?w=), WebP e cabeçalhos de cache.
+    """
+    def __init__(self):
+        self.router = APIRouter(prefix="/imagens/pesquisadores", tags=["fotos"])
+        self._register_routes()
+
+    def _register_routes(self):
+        self.router.add_api_route(
+            "/{arquivo}",
+            self.obter_foto,
+            response_class=FileResponse,
+            methods=["GET"],
+            summary="Obter foto por ID Lattes",
+            description=(
+                "Retorna a foto `{id_lattes}.jpg`. Com `w`, devolve a menor miniatura com pelo "
+                "menos essa largura; em WebP se o cabeçalho Accept permitir. Com `v` igual à versão "
+                "atual (como nas URLs devolvidas pela API), a resposta pode ficar em cache para sempre. "
+                "Responde 304 quando o If-None-Match coincide com o ETag."
+            )
+        )
+
+    async def obter_foto(
+        self,
+        arquivo: str,
+        request: Request,
+        w: Optional[int] = Query(None, ge=16, le=2048, description="Largura desejada (px)"),
+        v: Optional[str] = Query(None, description="Versão da foto")
+    ) -> Response:
+        id_lattes, _, extensao = arquivo.rpartition(".")
+        # Só nomes simples: nada de caminhos relativos para fora da pasta
+        if extensao != "jpg" or not id_lattes.isalnum():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Foto não encontrada")
+
+        return await resposta_foto(request, DIRETORIO_FOTOS / arquivo, w, v, registro_fotos.versao(id_lattes))
+
+# Instância do controller e router exportável
+foto_controller = FotoController()
+foto_router = foto_controller.router
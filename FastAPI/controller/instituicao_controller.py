@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from typing import List, Optional
+from uuid import UUID
 import logging
 
 from model.instituicao import Instituicao
+from controller.paginacao import LIMITE_PADRAO, LIMITE_MAXIMO, definir_proximo_cursor, resposta_ndjson
 from dao.instituicao_dao import InstituicaoDAO
 
 logger = logging.getLogger(__name__)
@@ -24,7 +26,11 @@ class InstituicaoController:
             response_model=List[Instituicao],
             methods=["GET"],
             summary="Listar instituições",
-            description="Retorna todas as instituições cadastradas no sistema."
+            description=(
+                "Retorna as instituições cadastradas no sistema em páginas ordenadas por ID. "
+                "Use `limit` e, para a próxima página, `after` com o valor do cabeçalho `X-Next-Cursor`. "
+                "Com `stream=true`, exporta todos os registros em NDJSON, sem paginação."
+            )
         )
 
         self.router.add_api_route(
@@ -61,8 +67,20 @@ class InstituicaoController:
             description="Remove uma instituição existente por ID. Retorna 404 se não encontrado."
         )
 
-    def listar(self):
-        return self.dao.listar_instituicoes()
+    def listar(
+        self,
+        response: Response,
+        after: Optional[UUID] = Query(None),
+        limit: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+        stream: bool = Query(False)
+    ):
+        apos = str(after) if after else None
+        if stream:
+            return resposta_ndjson(self.dao.exportar_instituicoes(apos))
+
+        resultados = self.dao.listar_instituicoes(apos, limit)
+        definir_proximo_cursor(response, resultados, "id_instituicao", limit)
+        return resultados
 
     def adicionar(self, instituicao: Instituicao):
         try:
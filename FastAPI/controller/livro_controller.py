@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from typing import List, Optional
+from uuid import UUID
 import logging
 
 from model.livro import Livro
+from controller.paginacao import LIMITE_PADRAO, LIMITE_MAXIMO, definir_proximo_cursor, resposta_ndjson
 from dao.livro_dao import LivroDAO
 
 logger = logging.getLogger(__name__)
@@ -24,7 +26,11 @@ class LivroController:
             response_model=List[Livro],
             methods=["GET"],
             summary="Listar livros",
-            description="Retorna todos os livros cadastrados no sistema."
+            description=(
+                "Retorna os livros cadastrados no sistema em páginas ordenadas por ID. "
+                "Use `limit` e, para a próxima página, `after` com o valor do cabeçalho `X-Next-Cursor`. "
+                "Com `stream=true`, exporta todos os registros em NDJSON, sem paginação."
+            )
         )
 
         self.router.add_api_route(
@@ -55,8 +61,20 @@ class LivroController:
             description="Remove um livro existente por ID. Retorna 404 se não encontrado."
         )
 
-    def listar(self):
-        return self.dao.listar_livros()
+    def listar(
+        self,
+        response: Response,
+        after: Optional[UUID] = Query(None),
+        limit: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+        stream: bool = Query(False)
+    ):
+        apos = str(after) if after else None
+        if stream:
+            return resposta_ndjson(self.dao.exportar_livros(apos))
+
+        resultados = self.dao.listar_livros(apos, limit)
+        definir_proximo_cursor(response, resultados, "id_livro", limit)
+        return resultados
 
     def adicionar(self, livro: Livro):
         try:
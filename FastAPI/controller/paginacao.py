@@ -0,0 +1,33 @@
+import json
+from typing import Dict, Iterable, Iterator, List
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+# Limites da paginação por cursor (keyset) nas listagens
+LIMITE_PADRAO = 100
+LIMITE_MAXIMO = 1000
+
+# Cabeçalho com o cursor da próxima página (ID do último registro retornado)
+CABECALHO_PROXIMO_CURSOR = "X-Next-Cursor"
+
+
+def definir_proximo_cursor(response: Response, itens: List[Dict], campo_id: str, limite: int) -> None:
+    """
+    Informa no cabeçalho o cursor da próxima página quando a página veio cheia.
+    O cliente repete a chamada com `after=<cursor>` até o cabeçalho não vir mais.
+    """
+    if itens and len(itens) >= limite:
+        response.headers[CABECALHO_PROXIMO_CURSOR] = str(itens[-1][campo_id])
+
+
+def resposta_ndjson(linhas: Iterable[Dict]) -> StreamingResponse:
+    """
+    Transmite as linhas como NDJSON (um objeto JSON por linha), à medida que são lidas do banco.
+    """
+    def gerar() -> Iterator[bytes]:
+        for linha in linhas:
+            yield (json.dumps(jsonable_encoder(linha), ensure_ascii=False) + "\n").encode("utf-8")
+
+    return StreamingResponse(gerar(), media_type="application/x-ndjson")
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from typing import List, Optional
+from uuid import UUID
 import logging
 
 from model.patente import Patente
+from controller.paginacao import LIMITE_PADRAO, LIMITE_MAXIMO, definir_proximo_cursor, resposta_ndjson
 from dao.patente_dao import PatenteDAO
 
 logger = logging.getLogger(__name__)
@@ -24,7 +26,11 @@ class PatenteController:
             response_model=List[Patente],
             methods=["GET"],
             summary="Listar patentes",
-            description="Retorna todas as patentes cadastradas no sistema."
+            description=(
+                "Retorna as patentes cadastradas no sistema em páginas ordenadas por ID. "
+                "Use `limit` e, para a próxima página, `after` com o valor do cabeçalho `X-Next-Cursor`. "
+                "Com `stream=true`, exporta todos os registros em NDJSON, sem paginação."
+            )
         )
 
         self.router.add_api_route(
@@ -55,8 +61,20 @@ class PatenteController:
             description="Remove uma patente existente por ID. Retorna 404 se não encontrada."
         )
 
-    def listar(self):
-        return self.dao.listar_patentes()
+    def listar(
+        self,
+        response: Response,
+        after: Optional[UUID] = Query(None),
+        limit: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+        stream: bool = Query(False)
+    ):
+        apos = str(after) if after else None
+        if stream:
+            return resposta_ndjson(self.dao.exportar_patentes(apos))
+
+        resultados = self.dao.listar_patentes(apos, limit)
+        definir_proximo_cursor(response, resultados, "id_patente", limit)
+        return resultados
 
     def adicionar(self, patente: Patente):
         try:
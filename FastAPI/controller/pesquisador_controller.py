@@ -1,15 +1,31 @@
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+import asyncio
 import logging
 
+from controller.paginacao import LIMITE_PADRAO, LIMITE_MAXIMO, definir_proximo_cursor, resposta_ndjson
+from controller.foto_controller import resposta_foto
+from controller.sse import resposta_sse
+from banco.pool_conexoes import PoolEsgotadoError
 from dao.pesquisador_dao import PesquisadorDAO
+from dao.pesquisador_dao_async import PesquisadorDAOAsync
+from dao.resumo_pesquisador_dao_async import ResumoPesquisadorDAOAsync
 from model.pesquisador import Pesquisador
 from service.langchain import LangchainService
-from service.semantic_search import SemanticSearchService
+from service.registro_fotos import DIRETORIO_FOTOS, registro_fotos
+from service.resumo_pesquisador import FALLBACK_TAGS
+from service.resumo_queue import STALE_AFTER_SECONDS, resumo_queue
+from service.semantic_search import semantic_search_service
 
 logger = logging.getLogger(__name__)
 
+# Resumo em streaming sendo gerado por um worker: intervalo entre as consultas e espera máxima
+ESPERA_RESUMO_INTERVALO = 1.0
+ESPERA_RESUMO_MAXIMA = 120.0
+
 
 class PesquisadorController:
     """
@@ -18,8 +34,10 @@ class PesquisadorController:
     """
     def __init__(self):
         self.dao = PesquisadorDAO()
-        self.summarizer = LangchainService()
-        self.semantic = SemanticSearchService()
+        self.dao_async = PesquisadorDAOAsync()
+        self.resumos = ResumoPesquisadorDAOAsync()
+        self.summarizer = LangchainService(vector_lookup=semantic_search_service.document_vectors)
+        self.semantic = semantic_search_service
         self.router = APIRouter(prefix="/pesquisadores", tags=["pesquisadores"])
         self._register_routes()
 
@@ -31,7 +49,11 @@ class PesquisadorController:
             response_model=None,
             methods=["GET"],
             summary="Listar pesquisadores",
-            description="Retorna todos os pesquisadores cadastrados no sistema."
+            description=(
+                "Retorna os pesquisadores cadastrados no sistema em páginas ordenadas por ID. "
+                "Use `limit` e, para a próxima página, `after` com o valor do cabeçalho `X-Next-Cursor`. "
+                "Com `stream=true`, exporta todos os registros em NDJSON, sem paginação."
+            )
         )
 
         self.router.add_api_route(
@@ -41,7 +63,9 @@ class PesquisadorController:
             methods=["GET"],
             summary="Buscar pesquisadores por termo",
             description=(
-                "Retorna os pesquisadores cujo nome contém o termo passado. "
+                "Retorna os pesquisadores cujo nome contém o termo passado, sem diferenciar acentos. "
+                "Com `aproximada=true`, tolera erros de digitação e ordena por similaridade (ideal para autocompletar); "
+                "com `citacoes=true`, também compara os nomes usados em citações bibliográficas. "
                 "Pode também incluir um resumo geral dos resultados se `incluir_resumo=true`."
             )
         )
@@ -54,7 +78,9 @@ class PesquisadorController:
             summary="Busca semântica em pesquisadores",
             description=(
                 "Realiza busca semântica usando embeddings para retornar pesquisadores "
-                "ordenados por relevância no contexto da consulta."
+                "ordenados por relevância no contexto da consulta. "
+                "Aceita filtro por instituição (`id_instituicao`). "
+                "`nprobe` (índices IVF) e `ef_search` (HNSW) ajustam recall x latência só desta busca."
             )
         )
 
@@ -98,7 +124,10 @@ class PesquisadorController:
             response_class=FileResponse,
             methods=["GET"],
             summary="Obter foto do pesquisador",
-            description="Retorna a foto JPEG do pesquisador, se existir."
+            description=(
+                "Retorna a foto do pesquisador, se existir. Aceita `w` (miniatura) e `v` (versão) "
+                "como /imagens/pesquisadores/{id_lattes}.jpg; WebP quando o cabeçalho Accept permitir."
+            )
         )
 
         self.router.add_api_route(
@@ -120,29 +149,62 @@ class PesquisadorController:
             methods=["GET"],
             summary="Obter resumo e tags do pesquisador",
             description=(
-                "Retorna um resumo gerado por IA e tags baseadas no perfil e produções do pesquisador. "
-                "Formato compatível com ResumeData do frontend."
+                "Retorna um resumo gerado por IA e tags baseadas no perfil e produções do pesquisador, "
+                "pré-calculados em segundo plano. Enquanto a geração estiver pendente, responde 202 "
+                "com `status=pendente`. Formato compatível com ResumeData do frontend."
+            )
+        )
+
+        self.router.add_api_route(
+            "/{id_pesquisador}/resumo/stream",
+            self.obter_resumo_stream,
+            response_model=None,
+            methods=["GET"],
+            summary="Obter resumo e tags do pesquisador em streaming (SSE)",
+            description=(
+                "Server-Sent Events com o resumo do pesquisador nos eventos `resumo` (texto em JSON, para concatenar), "
+                "seguidos das `tags` e de `fim`. Um resumo já pré-calculado chega num evento só; "
+                "se ainda estiver pendente, é gerado na hora (no lugar da fila de resumos, e gravado para as próximas consultas) "
+                "e transmitido à medida que o LLM o produz. Se a fila já estiver gerando o resumo, ele chega quando ficar pronto."
             )
         )
         
 
-    def listar(self):
-        return self.dao.listar_pesquisadores()
+    def listar(
+        self,
+        response: Response,
+        after: Optional[UUID] = Query(None),
+        limit: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO),
+        stream: bool = Query(False)
+    ):
+        apos = str(after) if after else None
+        if stream:
+            return resposta_ndjson(self.dao.exportar_pesquisadores(apos))
+
+        resultados = self.dao.listar_pesquisadores(apos, limit)
+        definir_proximo_cursor(response, resultados, "id", limit)
+        return resultados
     
-    def buscar_por_termo(
+    async def buscar_por_termo(
         self, 
         termo: str = Query(..., min_length=1), 
-        incluir_resumo: bool = Query(False)
+        incluir_resumo: bool = Query(False),
+        aproximada: bool = Query(False),
+        citacoes: bool = Query(False),
+        limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO)
     ):
         try:
-            resultados = self.dao.buscar_por_termo(termo)
+            resultados = await self.dao_async.buscar_por_termo(termo, aproximada, citacoes, limit)
 
             if incluir_resumo and resultados:
-                resumo = self.summarizer.summarize(resultados, tipo="pesquisador")
+                # A chamada ao LLM ainda é síncrona: roda no threadpool
+                resumo = await run_in_threadpool(self.summarizer.summarize, resultados, tipo="pesquisador")
                 return {"resultados": resultados, "resumo_ia": resumo}
 
             return resultados
         
+        except PoolEsgotadoError:
+            raise
         except Exception as e:
             logger.exception("Erro ao buscar pesquisador pelo termo: {termo}")
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -150,10 +212,18 @@ class PesquisadorController:
     def busca_semantica_pesquisadores(
         self,
         termo: str = Query(..., min_length=1),
-        k: int = Query(10, ge=1, le=50)
+        k: int = Query(10, ge=1, le=50),
+        id_instituicao: Optional[UUID] = Query(None),
+        nprobe: Optional[int] = Query(None, ge=1, le=4096),
+        ef_search: Optional[int] = Query(None, ge=1, le=1000)
     ):        
         try:
-            resultados = self.semantic.semantic_search(termo, k, tipo="pesquisador")
+            resultados = self.semantic.semantic_search(
+                termo, k, tipo="pesquisador",
+                id_instituicao=str(id_instituicao) if id_instituicao else None,
+                nprobe=nprobe,
+                ef_search=ef_search
+            )
 
             return {
                 "query": termo,
@@ -162,6 +232,8 @@ class PesquisadorController:
                 ]
             }
         
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
         except Exception as e:
             logger.error(f"Erro na busca semântica de pesquisadores: {e}")
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -200,13 +272,13 @@ class PesquisadorController:
             logger.error("Erro ao apagar pesquisador: %s", e)
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    def obter_perfil(self, id_pesquisador: str):
+    async def obter_perfil(self, id_pesquisador: str):
         """
         Retorna o perfil completo do pesquisador (dados básicos + artigos).
         Compatível com o tipo ResearcherProfileData do frontend.
         """
         try:
-            return self.dao.obter_perfil_pesquisador(id_pesquisador)
+            return await self.dao_async.obter_perfil_pesquisador(id_pesquisador)
         
         except LookupError as e:
             logger.info("Pesquisador não encontrado para perfil: %s", e)
@@ -215,52 +287,92 @@ class PesquisadorController:
             logger.error("Erro ao obter perfil do pesquisador: %s", e)
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    def retornar_foto(self, id_pesquisador: str) -> FileResponse:
-        caminho = Path("imagens") / "pesquisadores" / f"{id_pesquisador}.jpg"
-        if not caminho.exists():
-            logger.warning("Foto não encontrada para pesquisador %s", id_pesquisador)
+    async def retornar_foto(
+        self,
+        id_pesquisador: str,
+        request: Request,
+        w: Optional[int] = Query(None, ge=16, le=2048, description="Largura desejada (px)"),
+        v: Optional[str] = Query(None, description="Versão da foto")
+    ) -> Response:
+        """
+        Retorna a foto do pesquisador (salva pelo id_lattes), com miniaturas e cache
+        como em /imagens/pesquisadores.
+        """
+        try:
+            pesquisador = await self.dao_async.obter_pesquisador_por_id(id_pesquisador)
+        except LookupError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except RuntimeError as e:
+            logger.error("Erro ao obter pesquisador para a foto: %s", e)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        id_lattes = pesquisador.id_lattes
+        if not id_lattes or not id_lattes.isalnum():
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Foto não encontrada")
-        return FileResponse(caminho, media_type="image/jpeg")
+        return await resposta_foto(
+            request, DIRETORIO_FOTOS / f"{id_lattes}.jpg", w, v, registro_fotos.versao(id_lattes)
+        )
 
-    def obter_resumo(self, id_pesquisador: str):
+    async def obter_resumo(self, id_pesquisador: str, response: Response):
         """
-        Retorna resumo gerado por IA e tags baseadas no perfil e produções do pesquisador.
+        Retorna o resumo gerado por IA e as tags do pesquisador, pré-calculados pela fila de resumos.
+        Enquanto a geração estiver pendente, responde 202 com status "pendente" (e o resumo
+        anterior, se houver); a latência não depende da OpenAI.
         Compatível com o tipo ResumeData do frontend.
         """
         try:
-            # Obter perfil completo do pesquisador
-            perfil = self.dao.obter_perfil_pesquisador(id_pesquisador)
-            
-            # Extrair dados básicos do pesquisador
-            researcher_data = perfil["researcher"]
-            productions = perfil["productions"]
-            
-            # Buscar dados completos do pesquisador para o resumo pessoal
-            pesquisador_completo = self.dao.obter_pesquisador_por_id(id_pesquisador)
-            
-            # Gerar resumo usando IA com tratamento de erro
+            resumo = await self.resumos.obter(id_pesquisador)
+
+            if resumo is None:
+                # Pesquisador ainda sem resumo (ex.: inserido direto no banco): pede a geração agora
+                if not await resumo_queue.aenqueue(id_pesquisador):
+                    raise LookupError(f"Pesquisador com ID {id_pesquisador} não encontrado")
+                resumo = {"resumo_ia": None, "tags": None, "status": "pendente", "gerado_em": None}
+
+            status_resumo = "pendente" if resumo["status"] == "processando" else resumo["status"]
+            if status_resumo == "pendente":
+                response.status_code = status.HTTP_202_ACCEPTED
+                response.headers["Retry-After"] = "5"
+
+            return {
+                "status": status_resumo,
+                "resumo_ia": resumo["resumo_ia"],
+                "tags": resumo["tags"] or [],
+                "gerado_em": resumo["gerado_em"]
+            }
+        
+        except LookupError as e:
+            logger.info("Pesquisador não encontrado para resumo: %s", e)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except RuntimeError as e:
+            logger.error("Erro ao obter resumo do pesquisador: %s", e)
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def obter_resumo_stream(self, id_pesquisador: str):
+        try:
+            resumo = await self.resumos.obter(id_pesquisador)
+            if resumo is not None and resumo["status"] == "pronto":
+                return resposta_sse(self._eventos_resumo_pronto(resumo))
+
+            if resumo is None or resumo["status"] == "erro":
+                if not await resumo_queue.aenqueue(id_pesquisador):
+                    raise LookupError(f"Pesquisador com ID {id_pesquisador} não encontrado")
+
+            # Reserva a tarefa da fila: o resumo gerado aqui é o que fica gravado, sem o worker
+            # gerar outro. Se um worker já a reservou, o stream acompanha a geração dele.
+            tarefa = await self.resumos.reservar_pesquisador(id_pesquisador, STALE_AFTER_SECONDS)
+            if tarefa is None:
+                return resposta_sse(self._eventos_resumo_aguardado(id_pesquisador))
+            versao, _ = tarefa
+
             try:
-                resumo_ia = self.summarizer.gerar_resumo_perfil_pesquisador(
-                    nome=researcher_data["name"],
-                    titulo=researcher_data["title"],
-                    resumo_pessoal=pesquisador_completo.resumo if pesquisador_completo else "",
-                    producoes=productions
+                pesquisador, productions = await asyncio.gather(
+                    self.dao_async.obter_pesquisador_por_id(id_pesquisador),
+                    self.dao_async.buscar_artigos_por_pesquisador(id_pesquisador)
                 )
             except Exception as e:
-                logger.warning(f"Erro ao gerar resumo com IA: {e}")
-                resumo_ia = f"Pesquisador especializado em {researcher_data['title']} com {len(productions)} publicações acadêmicas."
-            
-            # Gerar tags usando IA com fallback
-            try:
-                tags = self.summarizer.gerar_tags_pesquisador(productions)
-            except Exception as e:
-                logger.warning(f"Erro ao gerar tags com IA: {e}")
-                tags = ["Pesquisa Acadêmica", "Ciência", "Produção Científica"]
-            
-            return {
-                "resumo_ia": resumo_ia,
-                "tags": tags
-            }
+                await self._devolver_tarefa(id_pesquisador, versao, e)
+                raise
         
         except LookupError as e:
             logger.info("Pesquisador não encontrado para resumo: %s", e)
@@ -269,6 +381,94 @@ class PesquisadorController:
             logger.error("Erro ao obter resumo do pesquisador: %s", e)
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+        return resposta_sse(self._eventos_resumo_gerado(id_pesquisador, versao, pesquisador, productions))
+
+    async def _eventos_resumo_pronto(self, resumo: Dict) -> AsyncIterator[Tuple[str, object]]:
+        yield "resumo", resumo["resumo_ia"]
+        yield "tags", resumo["tags"] or []
+
+    async def _eventos_resumo_aguardado(self, id_pesquisador: str) -> AsyncIterator[Tuple[str, object]]:
+        """Resumo gerado por um worker da fila, enviado quando ficar pronto"""
+        loop = asyncio.get_running_loop()
+        limite = loop.time() + ESPERA_RESUMO_MAXIMA
+        while loop.time() < limite:
+            await asyncio.sleep(ESPERA_RESUMO_INTERVALO)
+            resumo = await self.resumos.obter(id_pesquisador)
+            if resumo is None:
+                # Pesquisador apagado durante a geração (ON DELETE CASCADE)
+                break
+            if resumo["status"] == "pronto":
+                async for evento in self._eventos_resumo_pronto(resumo):
+                    yield evento
+                return
+            if resumo["status"] == "erro":
+                break
+
+        yield "erro", {"detail": "Não foi possível gerar o resumo."}
+
+    async def _eventos_resumo_gerado(self, id_pesquisador: str, versao: int, pesquisador: Pesquisador,
+                                     productions: List[Dict]) -> AsyncIterator[Tuple[str, object]]:
+        """
+        Resumo em partes, à medida que o LLM o gera, e tags geradas ao mesmo tempo.
+        O resultado conclui a tarefa reservada na fila; se o resumo falhar (ou o cliente
+        desconectar), a tarefa volta para a fila e um worker o gera.
+        """
+        tags = asyncio.create_task(
+            self.summarizer.agerar_tags_pesquisador(productions, id_pesquisador=id_pesquisador)
+        )
+        partes = []
+        erro = None
+        try:
+            try:
+                async for parte in self.summarizer.astream_resumo_perfil_pesquisador(
+                    nome=pesquisador.nome,
+                    titulo=pesquisador.grau_academico,
+                    resumo_pessoal=pesquisador.resumo or "",
+                    producoes=productions,
+                    id_pesquisador=id_pesquisador
+                ):
+                    partes.append(parte)
+                    yield "resumo", parte
+            except Exception as e:
+                logger.warning(f"Erro ao gerar resumo com IA em streaming: {e!r}")
+                erro = e
+                yield "erro", {"detail": "Não foi possível gerar o resumo."}
+
+            try:
+                tags_geradas = await tags
+            except Exception as e:
+                logger.warning(f"Erro ao gerar tags com IA: {e!r}")
+                # Concluído com fallback (erro registrado), as tags são refeitas depois pela fila
+                tags_geradas = FALLBACK_TAGS
+                erro_tags = repr(e)
+            else:
+                erro_tags = None
+            yield "tags", tags_geradas
+
+            if erro is None:
+                try:
+                    await self.resumos.concluir(id_pesquisador, versao, "".join(partes), tags_geradas, erro_tags)
+                except RuntimeError as e:
+                    erro = e
+        except BaseException as e:
+            # Cliente desconectado no meio do stream
+            erro = e
+            raise
+        finally:
+            # Não deixa a geração das tags órfã
+            tags.cancel()
+            if erro is not None:
+                await self._devolver_tarefa(id_pesquisador, versao, erro)
+
+    async def _devolver_tarefa(self, id_pesquisador: str, versao: int, erro: BaseException) -> None:
+        """Devolve para a fila de resumos uma tarefa reservada pelo stream, sem esperar STALE_AFTER_SECONDS"""
+        try:
+            # Protegida do cancelamento do stream, para a tarefa não ficar presa em "processando"
+            await asyncio.shield(self.resumos.adiar(id_pesquisador, versao, repr(erro), 0))
+        except Exception:
+            logger.warning(f"Não foi possível devolver o resumo do pesquisador {id_pesquisador} para a fila.")
+        resumo_queue.wake()
+
 # Instância do controller e router exportável
 pesquisador_controller = PesquisadorController()
 pesquisador_router = pesquisador_controller.router
\ No newline at end of file
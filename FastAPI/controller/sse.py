@@ -0,0 +1,38 @@
+import json
+import logging
+from typing import Any, AsyncIterable, AsyncIterator, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+
+def evento_sse(evento: str, dados: Any) -> str:
+    """
+    Formata um evento Server-Sent Events. Os dados vão em JSON numa linha só,
+    então quebras de linha do texto (ex.: tokens do LLM) não quebram o evento.
+    """
+    return f"event: {evento}\ndata: {json.dumps(jsonable_encoder(dados), ensure_ascii=False)}\n\n"
+
+
+def resposta_sse(eventos: AsyncIterable[Tuple[str, Any]]) -> StreamingResponse:
+    """
+    Transmite os pares (evento, dados) como text/event-stream, à medida que são produzidos.
+    Uma falha no meio vira um evento `erro`; o stream sempre termina com o evento `fim`.
+    """
+    async def gerar() -> AsyncIterator[str]:
+        try:
+            async for evento, dados in eventos:
+                yield evento_sse(evento, dados)
+        except Exception as e:
+            logger.exception("Erro ao transmitir eventos SSE")
+            yield evento_sse("erro", {"detail": str(e) or repr(e)})
+        yield evento_sse("fim", {})
+
+    return StreamingResponse(
+        gerar(),
+        media_type="text/event-stream",
+        # Sem cache nem buffer em proxies, para cada evento chegar assim que é gerado
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,283 +1,469 @@
 import logging
-from typing import List, Dict
+import re
+import time
+from typing import Callable, List, Dict, Iterator, Optional
 from psycopg2 import IntegrityError
+from psycopg2.errors import UniqueViolation
+from psycopg2.extras import execute_values
 
 from banco.conexao_db import Conexao
+from banco.cursor_servidor import iterar_consulta
 from model.artigo import Artigo
-from service.openalex import buscar_resumo_openalex
+from service.index_queue import index_queue
+from service.llm_cache import llm_cache
+from service.resumo_queue import resumo_queue
+from service.openalex import ClienteOpenAlex
+from config import configuracoes
 
 logger = logging.getLogger(__name__)
 
+# Autores de cada publicação (alias `pub`), como lista JSON ordenada pelo ID do pesquisador
+SQL_AUTORES_PUBLICACAO = (
+    "(SELECT coalesce(jsonb_agg("
+    "jsonb_build_object('id', p.id_pesquisador::text, 'name', p.nome) ORDER BY p.id_pesquisador"
+    "), '[]'::jsonb) "
+    "FROM autoria au "
+    "JOIN pesquisador p ON au.id_pesquisador = p.id_pesquisador "
+    "WHERE au.id_publicacao = pub.id_publicacao)"
+)
+
+# Uma linha por publicação, já com a lista de autores
+SQL_SELECT_ARTIGO = (
+    "SELECT "
+    "pub.id_publicacao as id, "
+    "pub.nome as title, "
+    "per.nome as journal, "
+    "pub.ano as year, "
+    "pub.resumo as abstract, "
+    "pub.doi, "
+    "per.qualis, "
+    f"{SQL_AUTORES_PUBLICACAO} as authors "
+    "FROM publicacao pub "
+    "JOIN periodico per ON pub.id_periodico = per.id_periodico "
+)
+
+# Página de artigos: até N publicações com ID maior que o cursor
+SQL_LISTAR_ARTIGOS = (
+    f"{SQL_SELECT_ARTIGO}"
+    "WHERE %s::uuid IS NULL OR pub.id_publicacao > %s::uuid "
+    "ORDER BY pub.id_publicacao "
+    "LIMIT %s"
+)
+
+# Artigos das publicações com as chaves informadas (todas, se NULL),
+# precedidos da chave de cada publicação. Usado para manter o índice semântico.
+SQL_ARTIGOS_POR_CHAVE = (
+    "SELECT pub.chave, "
+    f"{SQL_SELECT_ARTIGO[len('SELECT '):]}"
+    "WHERE %(chaves)s::text[] IS NULL OR pub.chave = ANY(%(chaves)s::text[]) "
+    "ORDER BY pub.id_publicacao"
+)
+
+# Busca textual (full-text) nos títulos e resumos, ordenada por relevância.
+# A coluna gerada `busca_tsv` (índice GIN) guarda os léxicos em português e inglês;
+# a consulta é aplicada nas duas configurações.
+SQL_BUSCAR_POR_TERMO = (
+    "WITH consulta AS ("
+    "SELECT to_tsquery('portuguese', f_unaccent(%s)) || to_tsquery('english', f_unaccent(%s)) AS q"
+    ") "
+    f"{SQL_SELECT_ARTIGO}"
+    "CROSS JOIN consulta c "
+    "WHERE pub.busca_tsv @@ c.q "
+    "ORDER BY ts_rank(pub.busca_tsv, c.q) DESC, pub.id_publicacao"
+)
+
+# Grava a publicação ou, se a chave (DOI ou título) já existir, usa a existente sem alterar
+# seus dados, compartilhados pelos autores (o SET sem efeito só faz o RETURNING devolvê-la).
+# Retorna também os autores que ela já tinha.
+SQL_GRAVAR_PUBLICACAO = (
+    "INSERT INTO publicacao AS pub (nome, ano, doi, id_periodico) "
+    "VALUES (%s, %s, %s, %s) "
+    "ON CONFLICT (chave) DO UPDATE SET nome = pub.nome "
+    "RETURNING pub.id_publicacao, pub.chave, "
+    "ARRAY(SELECT au.id_pesquisador::text FROM autoria au WHERE au.id_publicacao = pub.id_publicacao)"
+)
+
+# Altera no lugar a publicação do seu único autor (mantém o ID, o resumo e o embedding).
+# Com outro DOI, o resumo volta a ser sincronizado. A chave recalculada pode colidir com
+# a de outra publicação (violação de uq_publicacao_chave).
+SQL_CORRIGIR_PUBLICACAO = (
+    "UPDATE publicacao SET "
+    "nome = %(nome)s, ano = %(ano)s, doi = %(doi)s, id_periodico = %(id_periodico)s, "
+    "resumo_sincronizado = resumo_sincronizado AND doi IS NOT DISTINCT FROM %(doi)s "
+    "WHERE id_publicacao = %(id)s "
+    "RETURNING chave"
+)
+
+# Artigo (autoria) no formato devolvido pelas rotas de escrita, a partir do CTE `au`.
+# O ID do artigo é o da publicação, o mesmo da listagem e da busca.
+SQL_SELECT_AUTORIA = (
+    "SELECT au.id_publicacao as id_artigo, pub.nome, pub.ano, pub.doi, au.id_pesquisador, pub.id_periodico "
+    "FROM au "
+    "JOIN publicacao pub ON pub.id_publicacao = au.id_publicacao"
+)
+
+# Apaga a publicação que ficou sem autores. O bloqueio vem antes, em outro comando:
+# duas exclusões simultâneas dos últimos autores não deixam a publicação para trás.
+SQL_REMOVER_PUBLICACAO_ORFA = (
+    "SELECT 1 FROM publicacao WHERE id_publicacao = %(id)s FOR UPDATE; "
+    "DELETE FROM publicacao pub "
+    "WHERE pub.id_publicacao = %(id)s "
+    "AND NOT EXISTS (SELECT 1 FROM autoria au WHERE au.id_publicacao = pub.id_publicacao)"
+)
+
 class ArtigoDAO:
     """
     DAO para operações de CRUD em artigos.
-    Mantém uma conexão ao instanciar e devolve ao destruir.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
     """
-    def __init__(self):
-        self.conexao = Conexao.obter_conexao()
-
-    def __del__(self):
-        Conexao.devolver_conexao(self.conexao)
 
-    
-    def listar_artigos(self) -> List[Dict]: 
-        sql = (
-            "SELECT "
-            "a.id_artigo as id, "
-            "a.nome as title, "
-            "per.nome as journal, "
-            "a.ano as year, "
-            "a.resumo as abstract, "
-            "a.doi, "
-            "per.qualis, "
-            "p.id_pesquisador as author_id, "
-            "p.nome as author_name "
-            "FROM artigo a "
-            "JOIN periodico per ON a.id_periodico = per.id_periodico "
-            "JOIN pesquisador p ON a.id_pesquisador = p.id_pesquisador "
-            "ORDER BY a.id_artigo"
-        )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql)
-                linhas = cursor.fetchall()
-            
-            # Agrupar resultados por artigo para lidar com múltiplos autores
-            artigos_dict = {}
-            for linha in linhas:
-                (id_artigo, title, journal, year, abstract, doi, qualis, 
-                 author_id, author_name) = linha
-                
-                normalized_title = title.strip().lower()
-                normalized_journal = journal.strip().lower() if journal else ""
-                normalized_year = str(year).strip() if year else ""
-                normalized_doi = (doi.strip().lower() if doi else "")
-
-                key = f"{normalized_title}|{normalized_journal}|{normalized_year}|{normalized_doi}"
-
-                if key  not in artigos_dict:
-                    artigos_dict[key] = {
-                        "id": str(id_artigo),
-                        "title": title,
-                        "journal": journal,
-                        "year": year,
-                        "abstract": abstract or "",
-                        "doi": doi,
-                        "qualis": qualis,
-                        "authors": []
-                    }
-                
-                # Adicionar autor se não existir
-                author_exists = any(
-                    author["id"] == str(author_id) 
-                    for author in artigos_dict[key]["authors"]
-                )
-                if not author_exists:
-                    artigos_dict[key ]["authors"].append({
-                        "id": str(author_id),
-                        "name": author_name
-                    })
+    def listar_artigos(self, apos: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        """
+        Lista artigos (uma publicação por item, com todos os autores) paginando por
+        cursor (keyset): retorna até `limite` artigos com ID maior que `apos`.
+        O ID de cada artigo é o da publicação, o que mantém a ordem estável entre as páginas.
+        Sem parâmetros, retorna todos os artigos.
+        """
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_LISTAR_ARTIGOS, (apos, apos, limite))
+                    linhas = cursor.fetchall()
             
-            return list(artigos_dict.values())
+                return [self._montar_artigo(linha) for linha in linhas]
 
-        except Exception as e:
-            logger.exception("Erro ao listar artigos")
-            raise RuntimeError(f"Erro ao listar artigos: {e}")
+            except Exception as e:
+                logger.exception("Erro ao listar artigos")
+                raise RuntimeError(f"Erro ao listar artigos: {e}")
 
 
-    def buscar_por_termo(self, termo: str) -> List[Dict]:
+    def exportar_artigos(self, apos: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Percorre todos os artigos (uma publicação por linha, com todos os autores) por
+        um cursor nomeado no servidor. Cada artigo é emitido assim que sua linha chega,
+        sem carregar o resultado em memória.
+        """
         sql = (
-            "SELECT "
-            "a.id_artigo as id, "
-            "a.nome as title, "
-            "per.nome as journal, "
-            "a.ano as year, "
-            "a.resumo as abstract, "
-            "a.doi, "
-            "per.qualis, "
-            "p.id_pesquisador as author_id, "
-            "p.nome as author_name "
-            "FROM artigo a "
-            "JOIN periodico per ON a.id_periodico = per.id_periodico "
-            "JOIN pesquisador p ON a.id_pesquisador = p.id_pesquisador "
-            "WHERE unaccent(lower(a.nome)) ILIKE unaccent(lower(%s)) "
-            "OR unaccent(lower(a.resumo)) ILIKE unaccent(lower(%s)) "
-            "ORDER BY a.id_artigo"
+            f"{SQL_SELECT_ARTIGO}"
+            "WHERE %s::uuid IS NULL OR pub.id_publicacao > %s::uuid "
+            "ORDER BY pub.id_publicacao"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                termo_formatado = f"%{termo.strip()}%"
-                
-                cursor.execute(sql, (termo_formatado, termo_formatado))
-                linhas = cursor.fetchall()
-            
-            # Agrupar resultados por artigo para lidar com múltiplos autores
-            artigos_dict = {}
-            for linha in linhas:
-                (id_artigo, title, journal, year, abstract, doi, qualis, 
-                 author_id, author_name) = linha
-                
-                normalized_title = title.strip().lower()
-                normalized_journal = journal.strip().lower() if journal else ""
-                normalized_year = str(year).strip() if year else ""
-                normalized_doi = (doi.strip().lower() if doi else "")
-
-                key = f"{normalized_title}|{normalized_journal}|{normalized_year}|{normalized_doi}"
-
-                if key  not in artigos_dict:
-                    artigos_dict[key] = {
-                        "id": str(id_artigo),
-                        "title": title,
-                        "journal": journal,
-                        "year": year,
-                        "abstract": abstract or "",
-                        "doi": doi,
-                        "qualis": qualis,
-                        "authors": []
-                    }
-                
-                # Adicionar autor se não existir
-                author_exists = any(
-                    author["id"] == str(author_id) 
-                    for author in artigos_dict[key]["authors"]
-                )
-                if not author_exists:
-                    artigos_dict[key ]["authors"].append({
-                        "id": str(author_id),
-                        "name": author_name
-                    })
+        linhas = iterar_consulta(sql, (apos, apos), como_dict=False)
+        return map(self._montar_artigo, linhas)
+
+
+    def buscar_por_termo(self, termo: str) -> List[Dict]:
+        parametros = self._parametros_busca(termo)
+        if parametros is None:
+            return []
+
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_BUSCAR_POR_TERMO, parametros)
+                    linhas = cursor.fetchall()
             
-            return list(artigos_dict.values())
+                return [self._montar_artigo(linha) for linha in linhas]
             
-        except Exception as e:
-            logger.exception(f"Erro ao buscar artigo pelo termo: '{termo}'")
-            raise RuntimeError(f"Erro ao buscar artigo por termo: {e}")
+            except Exception as e:
+                logger.exception(f"Erro ao buscar artigo pelo termo: '{termo}'")
+                raise RuntimeError(f"Erro ao buscar artigo por termo: {e}")
+
+
+    def listar_artigos_por_chave(self, chaves: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Retorna {chave da publicação: artigo} das chaves informadas,
+        ou de todas as publicações se `chaves` for None.
+        Chaves sem nenhum artigo (publicações apagadas) não aparecem no resultado.
+        """
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_ARTIGOS_POR_CHAVE, {"chaves": list(chaves) if chaves is not None else None})
+                    linhas = cursor.fetchall()
+
+                return {linha[0]: self._montar_artigo(linha[1:]) for linha in linhas}
+
+            except Exception as e:
+                logger.exception("Erro ao listar artigos por chave")
+                raise RuntimeError(f"Erro ao listar artigos por chave: {e}")
 
 
     def salvar_artigo(self, artigo: Artigo) -> Dict:
+        """
+        Cadastra o artigo para o pesquisador: grava a publicação (ou usa a que já existe
+        com o mesmo DOI ou título) e a autoria. ValueError se o pesquisador já for autor
+        da publicação.
+        """
         sql = (
-            "INSERT INTO artigo (nome, ano, doi, id_pesquisador, id_periodico) "
-            "VALUES (%s, %s, %s, %s, %s) "
-            "RETURNING id_artigo, nome, ano, doi, id_pesquisador, id_periodico "
+            "WITH au AS ("
+            "INSERT INTO autoria (id_publicacao, id_pesquisador) VALUES (%s, %s) RETURNING *"
+            ") "
+            f"{SQL_SELECT_AUTORIA}"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    artigo.nome, 
-                    artigo.ano, 
-                    artigo.doi, 
-                    artigo.id_pesquisador, 
-                    artigo.id_periodico
-                ))  
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    id_publicacao, chave, autores = self._gravar_publicacao(cursor, artigo)
+                    cursor.execute(sql, (id_publicacao, artigo.id_pesquisador))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+
+                resultado = dict(zip(colunas, linha))
+                index_queue.enqueue_artigos(chave)
+                llm_cache.invalidate_pesquisadores(resultado["id_pesquisador"], *autores)
+                resumo_queue.enqueue(resultado["id_pesquisador"], *autores)
+                return resultado
         
-        except IntegrityError as e:
-            self.conexao.rollback()
-            raise ValueError(f"Conflito ao salvar artigo: {e.diag.message_detail or e}")
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao salvar artigo")
-            raise RuntimeError(f"Erro ao salvar artigo: {e}")
+            except IntegrityError as e:
+                conexao.rollback()
+                raise ValueError(f"Conflito ao salvar artigo: {e.diag.message_detail or e}")
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao salvar artigo")
+                raise RuntimeError(f"Erro ao salvar artigo: {e}")
         
         
     def atualizar_artigo(self, artigo:Artigo) -> Dict:
+        """
+        Altera o artigo `artigo.id_artigo` (ID da publicação) do pesquisador `artigo.id_pesquisador`.
+        Se ele for o único autor, a publicação é alterada no lugar; se tiver coautores (ou se
+        os novos dados coincidirem com outra publicação), a autoria passa para a publicação
+        com os novos dados, criada se preciso, e os dados compartilhados não são sobrescritos.
+        A publicação antiga é apagada se ficar sem autores.
+        """
+        sql_antigo = (
+            "SELECT au.id_artigo, pub.chave, "
+            "EXISTS (SELECT 1 FROM autoria o WHERE o.id_publicacao = au.id_publicacao "
+            "AND o.id_pesquisador <> au.id_pesquisador) "
+            "FROM autoria au JOIN publicacao pub ON pub.id_publicacao = au.id_publicacao "
+            "WHERE au.id_publicacao = %s AND au.id_pesquisador = %s "
+            "FOR UPDATE"
+        )
         sql = (
-            "UPDATE artigo "
-            "SET nome=%s, ano=%s, doi=%s, id_pesquisador=%s, id_periodico=%s "
-            "WHERE id_artigo=%s "
-            "RETURNING id_artigo, nome, ano, doi, id_pesquisador, id_periodico "
+            "WITH au AS ("
+            "UPDATE autoria SET id_publicacao=%s "
+            "WHERE id_artigo=%s RETURNING *"
+            ") "
+            f"{SQL_SELECT_AUTORIA}"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    artigo.nome, 
-                    artigo.ano, 
-                    artigo.doi, 
-                    artigo.id_pesquisador, 
-                    artigo.id_periodico,
-                    artigo.id_artigo
-                ))     
-                if cursor.rowcount == 0:
-                    raise LookupError("Artigo não encontrado para atualização.")
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()  
-            self.conexao.commit() 
-            return dict(zip(colunas, linha))   
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql_antigo, (artigo.id_artigo, artigo.id_pesquisador))
+                    antigo = cursor.fetchone()
+                    if antigo is None:
+                        raise LookupError("Artigo não encontrado para atualização.")
+                    id_autoria, chave_antiga, tem_coautores = antigo
+
+                    chave = None
+                    if not tem_coautores:
+                        chave = self._corrigir_publicacao(cursor, artigo)
+                    if chave is not None:
+                        id_publicacao, autores = artigo.id_artigo, []
+                    else:
+                        id_publicacao, chave, autores = self._gravar_publicacao(cursor, artigo)
+
+                    cursor.execute(sql, (id_publicacao, id_autoria))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                    cursor.execute(SQL_REMOVER_PUBLICACAO_ORFA, {"id": artigo.id_artigo})
+                conexao.commit() 
+
+                resultado = dict(zip(colunas, linha))
+                index_queue.enqueue_artigos(chave_antiga, chave)
+                llm_cache.invalidate_pesquisadores(resultado["id_pesquisador"], *autores)
+                resumo_queue.enqueue(resultado["id_pesquisador"], *autores)
+                return resultado
         
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao atualizar artigo")
-            raise RuntimeError(f"Erro ao atualizar artigo: {e}")
+            except LookupError:
+                conexao.rollback()
+                raise
+            except IntegrityError as e:
+                conexao.rollback()
+                raise ValueError(f"Conflito ao atualizar artigo: {e.diag.message_detail or e}")
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao atualizar artigo")
+                raise RuntimeError(f"Erro ao atualizar artigo: {e}")
         
 
-    def apagar_artigo(self, id_artigo: str) -> None:
+    @staticmethod
+    def _corrigir_publicacao(cursor, artigo: Artigo) -> Optional[str]:
+        """
+        Altera no lugar a publicação `artigo.id_artigo` e retorna a nova chave, ou None
+        (sem alterar nada) se os novos dados coincidirem com outra publicação.
+        """
+        cursor.execute("SAVEPOINT corrigir_publicacao")
+        try:
+            cursor.execute(SQL_CORRIGIR_PUBLICACAO, {
+                "nome": artigo.nome, "ano": artigo.ano, "doi": artigo.doi,
+                "id_periodico": artigo.id_periodico, "id": artigo.id_artigo
+            })
+        except UniqueViolation:
+            cursor.execute("ROLLBACK TO SAVEPOINT corrigir_publicacao")
+            return None
+        chave, = cursor.fetchone()
+        cursor.execute("RELEASE SAVEPOINT corrigir_publicacao")
+        return chave
+
+
+    def apagar_artigo(self, id_artigo: str, id_pesquisador: str) -> None:
+        """
+        Apaga o artigo `id_artigo` (ID da publicação) do pesquisador: remove a autoria e a
+        publicação, se ela ficar sem autores
+        """
         sql = (
-            "DELETE FROM artigo "
-            "WHERE id_artigo=%s "
+            "WITH au AS ("
+            "DELETE FROM autoria WHERE id_publicacao=%s AND id_pesquisador=%s RETURNING id_publicacao"
+            ") "
+            "SELECT pub.chave "
+            "FROM au JOIN publicacao pub ON pub.id_publicacao = au.id_publicacao"
         )
-        try:        
-            with self.conexao.cursor() as cursor:            
-                cursor.execute(sql, (id_artigo,))            
-                if cursor.rowcount == 0:
-                    raise LookupError("Artigo não encontrado para exclusão.")
-            self.conexao.commit()
+        with Conexao.conexao() as conexao:
+            try:        
+                with conexao.cursor() as cursor:            
+                    cursor.execute(sql, (id_artigo, id_pesquisador))            
+                    if cursor.rowcount == 0:
+                        raise LookupError("Artigo não encontrado para exclusão.")
+                    chave, = cursor.fetchone()
+                    cursor.execute(SQL_REMOVER_PUBLICACAO_ORFA, {"id": id_artigo})
+                conexao.commit()
+                index_queue.enqueue_artigos(chave)
+                llm_cache.invalidate_pesquisadores(id_pesquisador)
+                resumo_queue.enqueue(id_pesquisador)
             
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:        
-            self.conexao.rollback()
-            logger.exception("Erro ao apagar artigo")
-            raise RuntimeError(f"Erro ao apagar artigo: {e}")
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:        
+                conexao.rollback()
+                logger.exception("Erro ao apagar artigo")
+                raise RuntimeError(f"Erro ao apagar artigo: {e}")
+    
+
+    @staticmethod
+    def _gravar_publicacao(cursor, artigo: Artigo) -> tuple:
+        """Grava a publicação do artigo e retorna (id_publicacao, chave, IDs dos autores que ela já tinha)"""
+        cursor.execute(SQL_GRAVAR_PUBLICACAO, (artigo.nome, artigo.ano, artigo.doi, artigo.id_periodico))
+        return cursor.fetchone()
     
 
-    def sincronizar_resumos(self) -> None:
+    def sincronizar_resumos(self, progresso: Optional[Callable[[Dict], None]] = None) -> Dict[str, int]:
         """
-        Atualiza os campos de resumo dos artigos com DOI nulo, 
-        consultando a API do OpenAlex.
+        Preenche o resumo das publicações com DOI ainda não sincronizadas, consultando
+        a API do OpenAlex em lotes de DOIs e com requisições simultâneas (ver ClienteOpenAlex).
+        Cada DOI é buscado uma vez e os resultados são gravados em lotes de OPENALEX_LOTE_ESCRITA.
+        DOIs que falharem em todas as tentativas continuam pendentes para a próxima execução.
+        Retorna as contagens de artigos atualizados, sem resumo e pendentes, que também
+        são passadas a `progresso` depois de cada lote gravado.
         """
         sql_consulta = """
-            SELECT id_artigo, doi 
-            FROM artigo 
+            SELECT id_publicacao::text, doi 
+            FROM publicacao 
             WHERE doi IS NOT NULL AND resumo_sincronizado = FALSE
         """
-        sql_atualizacao = """
-            UPDATE artigo 
-            SET resumo = %s, resumo_sincronizado = TRUE
-            WHERE id_artigo = %s
-        """
         try:
-            with self.conexao.cursor() as cursor:
+            with Conexao.conexao() as conexao, conexao.cursor() as cursor:
                 cursor.execute(sql_consulta)
                 artigos = cursor.fetchall()
+                conexao.rollback()
 
-            logger.info(f"{len(artigos)} artigos sem resumo sincronizado encontrados.")
-
-            for id_artigo, doi in artigos:
-                try:
-                    resumo = buscar_resumo_openalex(doi)
-                except Exception as e:
-                    resumo = None
-                    logger.exception(f"Erro ao buscar resumo do DOI {doi}")
-
-                try:
-                    with self.conexao.cursor() as cursor:
-                        cursor.execute(sql_atualizacao, (resumo, id_artigo))
-                        self.conexao.commit()
-                    if resumo:
-                        logger.info(f"Resumo atualizado com sucesso para o artigo {id_artigo}")
-                    else:
-                        logger.info(f"Marcação de `resumo_sincronizado` para o artigo {id_artigo} (sem resumo)")
+            artigos_por_doi: Dict[str, List[str]] = {}
+            for id_publicacao, doi in artigos:
+                artigos_por_doi.setdefault(doi, []).append(id_publicacao)
+
+            logger.info(
+                f"{len(artigos)} publicações sem resumo sincronizado encontradas ({len(artigos_por_doi)} DOIs distintos)."
+            )
+            contagem = {"atualizados": 0, "sem_resumo": 0, "pendentes": len(artigos)}
+            if not artigos:
+                return contagem
+
+            inicio = time.monotonic()
+            lote = []
+            # A conexão é emprestada só para cada escrita em lote, nunca durante as chamadas HTTP
+            with ClienteOpenAlex() as cliente:
+                for doi, resumo in cliente.buscar_resumos(artigos_por_doi):
+                    lote.extend((id_publicacao, resumo) for id_publicacao in artigos_por_doi[doi])
+                    if len(lote) >= configuracoes.OPENALEX_LOTE_ESCRITA:
+                        self._gravar_resumos(lote, contagem)
+                        lote = []
+                        if progresso:
+                            progresso(dict(contagem, total=len(artigos)))
+                self._gravar_resumos(lote, contagem)
+
+            logger.info(
+                f"Resumos sincronizados em {time.monotonic() - inicio:.1f}s: {contagem['atualizados']} atualizados, "
+                f"{contagem['sem_resumo']} sem resumo, {contagem['pendentes']} pendentes "
+                f"({cliente.requisicoes} requisições, {cliente.novas_tentativas} novas tentativas)."
+            )
+            return contagem
 
-                except Exception as e:
-                    self.conexao.rollback()
-                    logger.exception(f"Erro ao atualizar resumo do artigo {id_artigo}")
         except Exception as e:
             logger.exception("Erro ao sincronizar resumos dos artigos")
-            raise RuntimeError(f"Erro ao sincronizar resumos: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Erro ao sincronizar resumos: {e}")
+
+
+    def _gravar_resumos(self, lote: List[tuple], contagem: Dict[str, int]) -> None:
+        """Grava (id_publicacao, resumo) num único UPDATE e enfileira para reindexação os que ganharam resumo"""
+        if not lote:
+            return
+
+        sql = (
+            "UPDATE publicacao AS pub "
+            "SET resumo = v.resumo, resumo_sincronizado = TRUE "
+            "FROM (VALUES %s) AS v (id_publicacao, resumo) "
+            "WHERE pub.id_publicacao = v.id_publicacao::uuid "
+            "RETURNING v.resumo IS NOT NULL, pub.chave"
+        )
+        try:
+            with Conexao.conexao() as conexao:
+                with conexao.cursor() as cursor:
+                    linhas = execute_values(cursor, sql, lote, template="(%s, %s::text)", fetch=True)
+                conexao.commit()
+        except Exception:
+            # O lote continua pendente e é tentado de novo na próxima sincronização
+            logger.exception(f"Erro ao gravar lote de {len(lote)} resumos")
+            return
+
+        atualizados = [chave for com_resumo, chave in linhas if com_resumo]
+        index_queue.enqueue_artigos(*atualizados)
+        contagem["atualizados"] += len(atualizados)
+        contagem["sem_resumo"] += len(linhas) - len(atualizados)
+        contagem["pendentes"] -= len(linhas)
+
+
+    @staticmethod
+    def _parametros_busca(termo: str) -> Optional[tuple]:
+        """
+        Parâmetros de SQL_BUSCAR_POR_TERMO para o termo informado.
+        Cada palavra vira um prefixo (`palavra:*`) e todas precisam aparecer,
+        então "biodiv amaz" encontra "Biodiversidade na Amazônia".
+        Retorna None se o termo não tiver nenhuma palavra pesquisável.
+        """
+        palavras = re.findall(r"[^\W_]+", termo)
+        if not palavras:
+            return None
+        consulta = " & ".join(f"{palavra}:*" for palavra in palavras)
+        return (consulta, consulta)
+
+
+    @staticmethod
+    def _montar_artigo(linha: tuple) -> Dict:
+        """
+        Converte uma linha de SQL_SELECT_ARTIGO (ou de SQL_ARTIGOS_POR_CHAVE, sem a chave) no formato da API.
+        Os autores já chegam agregados pelo banco (SQL_AUTORES_PUBLICACAO).
+        """
+        (id_artigo, title, journal, year, abstract, doi, qualis, authors) = linha
+        return {
+            "id": str(id_artigo),
+            "title": title,
+            "journal": journal,
+            "year": year,
+            "abstract": abstract or "",
+            "doi": doi,
+            "qualis": qualis,
+            "authors": authors
+        }
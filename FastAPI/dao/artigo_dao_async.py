@@ -0,0 +1,46 @@
+import logging
+from typing import List, Dict, Optional
+
+from banco.conexao_async import ConexaoAsync
+from dao.artigo_dao import ArtigoDAO, SQL_LISTAR_ARTIGOS, SQL_BUSCAR_POR_TERMO
+
+logger = logging.getLogger(__name__)
+
+class ArtigoDAOAsync:
+    """
+    DAO assíncrono (psycopg 3) com as consultas de ArtigoDAO.
+    Usa o mesmo SQL e a mesma conversão de linhas do DAO síncrono,
+    mas aguarda o banco no event loop em vez de ocupar uma thread.
+    As escritas continuam no ArtigoDAO.
+    """
+
+    async def listar_artigos(self, apos: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_LISTAR_ARTIGOS, (apos, apos, limite))
+                    linhas = await cursor.fetchall()
+
+                return [ArtigoDAO._montar_artigo(linha) for linha in linhas]
+
+            except Exception as e:
+                logger.exception("Erro ao listar artigos")
+                raise RuntimeError(f"Erro ao listar artigos: {e}")
+
+
+    async def buscar_por_termo(self, termo: str) -> List[Dict]:
+        parametros = ArtigoDAO._parametros_busca(termo)
+        if parametros is None:
+            return []
+
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_BUSCAR_POR_TERMO, parametros)
+                    linhas = await cursor.fetchall()
+
+                return [ArtigoDAO._montar_artigo(linha) for linha in linhas]
+
+            except Exception as e:
+                logger.exception(f"Erro ao buscar artigo pelo termo: '{termo}'")
+                raise RuntimeError(f"Erro ao buscar artigo por termo: {e}")
@@ -0,0 +1,105 @@
+import logging
+from typing import List, Dict, Iterable, Tuple
+from psycopg2.extras import execute_values
+
+from banco.conexao_db import Conexao
+
+logger = logging.getLogger(__name__)
+
+# Embeddings em cache pelo hash do texto. O último acesso só é regravado se tiver
+# mais de uma hora, para que leituras frequentes não virem uma escrita por consulta.
+SQL_BUSCAR_EMBEDDINGS = (
+    "WITH encontrados AS ("
+    "SELECT hash_texto, embedding, ultimo_acesso "
+    "FROM cache_embedding "
+    "WHERE modelo = %(modelo)s AND hash_texto = ANY(%(hashes)s)"
+    "), "
+    "tocados AS ("
+    "UPDATE cache_embedding c SET ultimo_acesso = now() "
+    "FROM encontrados e "
+    "WHERE c.modelo = %(modelo)s AND c.hash_texto = e.hash_texto "
+    "AND e.ultimo_acesso < now() - interval '1 hour'"
+    ") "
+    "SELECT hash_texto, embedding FROM encontrados"
+)
+
+SQL_SALVAR_EMBEDDINGS = (
+    "INSERT INTO cache_embedding (modelo, hash_texto, embedding) "
+    "VALUES %s "
+    "ON CONFLICT (modelo, hash_texto) DO UPDATE SET ultimo_acesso = now()"
+)
+
+# Remove as entradas menos usadas recentemente além do limite
+SQL_REMOVER_EXCEDENTES = (
+    "DELETE FROM cache_embedding "
+    "WHERE ctid IN ("
+    "SELECT ctid FROM cache_embedding "
+    "ORDER BY ultimo_acesso DESC "
+    "OFFSET %s"
+    ")"
+)
+
+
+class CacheEmbeddingDAO:
+    """
+    DAO da tabela cache_embedding: embeddings já calculados, por (modelo, hash do texto),
+    compartilhados por todos os processos da API e preservados entre reinícios.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
+    """
+
+    def buscar(self, modelo: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """
+        Retorna {hash_texto: embedding} dos hashes encontrados no cache.
+        """
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_BUSCAR_EMBEDDINGS, {"modelo": modelo, "hashes": hashes})
+                    encontrados = {hash_texto: embedding for hash_texto, embedding in cursor}
+                conexao.commit()
+                return encontrados
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao buscar embeddings em cache")
+                raise RuntimeError(f"Erro ao buscar embeddings em cache: {e}")
+
+
+    def salvar(self, modelo: str, itens: Iterable[Tuple[str, List[float]]]) -> int:
+        """
+        Grava (hash_texto, embedding) no cache. Retorna a quantidade de linhas enviadas.
+        """
+        valores = [(modelo, hash_texto, embedding) for hash_texto, embedding in itens]
+        if not valores:
+            return 0
+
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    execute_values(cursor, SQL_SALVAR_EMBEDDINGS, valores, template="(%s, %s, %s::real[])")
+                conexao.commit()
+                return len(valores)
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao salvar embeddings em cache")
+                raise RuntimeError(f"Erro ao salvar embeddings em cache: {e}")
+
+
+    def remover_excedentes(self, maximo: int) -> int:
+        """
+        Mantém no cache apenas as `maximo` entradas usadas mais recentemente.
+        Retorna a quantidade de linhas removidas.
+        """
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_REMOVER_EXCEDENTES, (maximo,))
+                    removidos = cursor.rowcount
+                conexao.commit()
+                return removidos
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao remover excedentes do cache de embeddings")
+                raise RuntimeError(f"Erro ao remover excedentes do cache de embeddings: {e}")
@@ -0,0 +1,105 @@
+import logging
+from typing import List, Optional
+
+from banco.conexao_db import Conexao
+
+logger = logging.getLogger(__name__)
+
+# Resposta em cache ainda dentro da validade
+SQL_BUSCAR_RESPOSTA = (
+    "SELECT resposta FROM cache_llm "
+    "WHERE chave = %s AND expira_em > now()"
+)
+
+SQL_SALVAR_RESPOSTA = (
+    "INSERT INTO cache_llm (chave, template, escopo, resposta, expira_em) "
+    "VALUES (%s, %s, %s, %s, now() + %s * interval '1 second') "
+    "ON CONFLICT (chave) DO UPDATE SET "
+    "escopo = EXCLUDED.escopo, "
+    "resposta = EXCLUDED.resposta, "
+    "criado_em = now(), "
+    "expira_em = EXCLUDED.expira_em"
+)
+
+
+class CacheLlmDAO:
+    """
+    DAO da tabela cache_llm: respostas do LLM por chave (template, entradas e parâmetros do modelo),
+    com validade (expira_em) e um escopo opcional (ex.: "pesquisador:<id>") para invalidação.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
+    """
+
+    def buscar(self, chave: str) -> Optional[str]:
+        """
+        Retorna a resposta em cache para a chave, ou None se não houver ou tiver expirado.
+        """
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_BUSCAR_RESPOSTA, (chave,))
+                    linha = cursor.fetchone()
+                conexao.rollback()
+                return linha[0] if linha else None
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao buscar resposta do LLM em cache")
+                raise RuntimeError(f"Erro ao buscar resposta do LLM em cache: {e}")
+
+
+    def salvar(self, chave: str, template: str, escopo: Optional[str], resposta: str, validade_segundos: int) -> None:
+        """
+        Grava a resposta em cache, válida por `validade_segundos`.
+        """
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_SALVAR_RESPOSTA, (chave, template, escopo, resposta, validade_segundos))
+                conexao.commit()
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao salvar resposta do LLM em cache")
+                raise RuntimeError(f"Erro ao salvar resposta do LLM em cache: {e}")
+
+
+    def invalidar(self, escopos: List[str]) -> int:
+        """
+        Remove as respostas em cache dos escopos informados.
+        Retorna a quantidade de linhas removidas.
+        """
+        if not escopos:
+            return 0
+
+        sql = "DELETE FROM cache_llm WHERE escopo = ANY(%s)"
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (list(escopos),))
+                    removidos = cursor.rowcount
+                conexao.commit()
+                return removidos
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao invalidar respostas do LLM em cache")
+                raise RuntimeError(f"Erro ao invalidar respostas do LLM em cache: {e}")
+
+
+    def remover_expiradas(self) -> int:
+        """
+        Remove as respostas vencidas. Retorna a quantidade de linhas removidas.
+        """
+        sql = "DELETE FROM cache_llm WHERE expira_em <= now()"
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql)
+                    removidos = cursor.rowcount
+                conexao.commit()
+                return removidos
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao remover respostas do LLM expiradas")
+                raise RuntimeError(f"Erro ao remover respostas do LLM expiradas: {e}")
@@ -0,0 +1,39 @@
+import logging
+from typing import Optional
+
+from banco.conexao_async import ConexaoAsync
+from dao.cache_llm_dao import SQL_BUSCAR_RESPOSTA, SQL_SALVAR_RESPOSTA
+
+logger = logging.getLogger(__name__)
+
+class CacheLlmDAOAsync:
+    """
+    DAO assíncrono (psycopg 3) com as leituras e gravações de CacheLlmDAO,
+    usado pela geração assíncrona de resumos e tags.
+    A invalidação e a limpeza continuam no CacheLlmDAO.
+    """
+
+    async def buscar(self, chave: str) -> Optional[str]:
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_BUSCAR_RESPOSTA, (chave,))
+                    linha = await cursor.fetchone()
+
+                return linha[0] if linha else None
+
+            except Exception as e:
+                logger.exception("Erro ao buscar resposta do LLM em cache")
+                raise RuntimeError(f"Erro ao buscar resposta do LLM em cache: {e}")
+
+
+    async def salvar(self, chave: str, template: str, escopo: Optional[str], resposta: str,
+                     validade_segundos: int) -> None:
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_SALVAR_RESPOSTA, (chave, template, escopo, resposta, validade_segundos))
+
+            except Exception as e:
+                logger.exception("Erro ao salvar resposta do LLM em cache")
+                raise RuntimeError(f"Erro ao salvar resposta do LLM em cache: {e}")
@@ -0,0 +1,316 @@
+import json
+import logging
+from typing import List, Dict, Iterable, Optional, Set, Tuple
+from psycopg2.extras import execute_values
+
+from banco.conexao_db import Conexao
+
+logger = logging.getLogger(__name__)
+
+# Busca KNN por distância de cosseno (índice HNSW parcial por tipo).
+# Os filtros opcionais entram no mesmo SQL, então a busca filtrada é uma única ida ao banco.
+SQL_BUSCAR_SIMILARES = (
+    "SELECT e.documento, 1 - (e.embedding <=> %(vetor)s::vector) AS score "
+    "FROM embedding_documento e "
+    "{juncoes}"
+    "WHERE e.tipo = %(tipo)s "
+    "{filtros}"
+    "ORDER BY e.embedding <=> %(vetor)s::vector "
+    "LIMIT %(k)s"
+)
+
+SQL_SALVAR_EMBEDDINGS = (
+    "INSERT INTO embedding_documento "
+    "(tipo, id_documento, modelo, hash_conteudo, documento, embedding, chave) "
+    "VALUES %s "
+    "ON CONFLICT (tipo, id_documento) DO UPDATE SET "
+    "modelo = EXCLUDED.modelo, "
+    "hash_conteudo = EXCLUDED.hash_conteudo, "
+    "documento = EXCLUDED.documento, "
+    "embedding = EXCLUDED.embedding, "
+    "chave = EXCLUDED.chave, "
+    "atualizado_em = now()"
+)
+
+# Atualiza só os metadados (documento e chave) de embeddings cujo texto não mudou
+SQL_ATUALIZAR_DOCUMENTOS = (
+    "UPDATE embedding_documento e "
+    "SET documento = v.documento, chave = v.chave, atualizado_em = now() "
+    "FROM (VALUES %s) AS v (tipo, id_documento, documento, chave) "
+    "WHERE e.tipo = v.tipo AND e.id_documento = v.id_documento"
+)
+
+
+class EmbeddingDAO:
+    """
+    DAO da tabela embedding_documento (pgvector): um vetor por documento indexado
+    para a busca semântica, compartilhado por todos os processos da API.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
+    """
+
+    def listar_hashes(self, tipo: str, ids: Optional[List[str]] = None) -> Dict[str, Tuple[str, str, Optional[str]]]:
+        """
+        Retorna {id_documento: (modelo, hash_conteudo, chave)} dos documentos já indexados
+        do tipo, restritos aos `ids` informados (todos, se None).
+        """
+        sql = (
+            "SELECT id_documento::text, modelo, hash_conteudo, chave "
+            "FROM embedding_documento "
+            "WHERE tipo = %s AND (%s::uuid[] IS NULL OR id_documento = ANY(%s::uuid[]))"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (tipo, ids, ids))
+                    return {
+                        id_documento: (modelo, hash_conteudo, chave)
+                        for id_documento, modelo, hash_conteudo, chave in cursor
+                    }
+
+            except Exception as e:
+                logger.exception(f"Erro ao listar embeddings do tipo '{tipo}'")
+                raise RuntimeError(f"Erro ao listar embeddings: {e}")
+
+
+    def salvar_embeddings(
+        self, tipo: str, modelo: str, itens: Iterable[Tuple[Dict, str, List[float], Optional[str]]]
+    ) -> int:
+        """
+        Insere ou atualiza os embeddings de (documento, hash_conteudo, vetor, chave).
+        Retorna a quantidade de linhas gravadas.
+        """
+        valores = [
+            (tipo, documento["id"], modelo, hash_conteudo,
+             json.dumps(documento, default=str), self._vetor_sql(vetor), chave)
+            for documento, hash_conteudo, vetor, chave in itens
+        ]
+        if not valores:
+            return 0
+
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    execute_values(
+                        cursor, SQL_SALVAR_EMBEDDINGS, valores,
+                        template="(%s, %s::uuid, %s, %s, %s::jsonb, %s::vector, %s)"
+                    )
+                conexao.commit()
+                return len(valores)
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception(f"Erro ao salvar embeddings do tipo '{tipo}'")
+                raise RuntimeError(f"Erro ao salvar embeddings: {e}")
+
+
+    def atualizar_documentos(self, tipo: str, itens: Iterable[Tuple[Dict, Optional[str]]]) -> int:
+        """
+        Atualiza o documento e a chave de (documento, chave) já indexados, sem tocar no vetor.
+        Retorna a quantidade de linhas atualizadas.
+        """
+        valores = [(tipo, documento["id"], json.dumps(documento, default=str), chave) for documento, chave in itens]
+        if not valores:
+            return 0
+
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    execute_values(
+                        cursor, SQL_ATUALIZAR_DOCUMENTOS, valores,
+                        template="(%s, %s::uuid, %s::jsonb, %s)"
+                    )
+                conexao.commit()
+                return len(valores)
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception(f"Erro ao atualizar documentos do tipo '{tipo}'")
+                raise RuntimeError(f"Erro ao atualizar documentos: {e}")
+
+
+    def remover(self, tipo: str, ids: List[str]) -> int:
+        """
+        Remove os embeddings dos documentos informados.
+        Retorna a quantidade de linhas removidas.
+        """
+        if not ids:
+            return 0
+
+        sql = (
+            "DELETE FROM embedding_documento "
+            "WHERE tipo = %s AND id_documento = ANY(%s::uuid[])"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (tipo, list(ids)))
+                    removidos = cursor.rowcount
+                conexao.commit()
+                return removidos
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception(f"Erro ao remover embeddings do tipo '{tipo}'")
+                raise RuntimeError(f"Erro ao remover embeddings: {e}")
+
+
+    def buscar_vetores(self, tipo: str, modelo: str, ids: List[str]) -> Dict[str, List[float]]:
+        """
+        Retorna {id_documento: vetor} dos documentos informados já indexados com o modelo.
+        """
+        sql = (
+            "SELECT id_documento::text, embedding::text "
+            "FROM embedding_documento "
+            "WHERE tipo = %s AND modelo = %s AND id_documento = ANY(%s::uuid[])"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (tipo, modelo, list(ids)))
+                    # O texto do tipo vector ("[0.1,0.2,...]") é um array JSON válido
+                    return {id_documento: json.loads(vetor) for id_documento, vetor in cursor}
+
+            except Exception as e:
+                logger.exception(f"Erro ao buscar vetores do tipo '{tipo}'")
+                raise RuntimeError(f"Erro ao buscar vetores: {e}")
+
+
+    def ids_por_chaves(self, tipo: str, chaves: List[str]) -> Set[str]:
+        """
+        Retorna os IDs dos documentos indexados com alguma das chaves informadas.
+        """
+        sql = (
+            "SELECT id_documento::text "
+            "FROM embedding_documento "
+            "WHERE tipo = %s AND chave = ANY(%s)"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (tipo, list(chaves)))
+                    return {id_documento for (id_documento,) in cursor}
+
+            except Exception as e:
+                logger.exception(f"Erro ao buscar embeddings por chave do tipo '{tipo}'")
+                raise RuntimeError(f"Erro ao buscar embeddings por chave: {e}")
+
+
+    def remover_ausentes(self, tipo: str, ids_atuais: List[str]) -> int:
+        """
+        Remove os embeddings de documentos do tipo que não existem mais.
+        Retorna a quantidade de linhas removidas.
+        """
+        sql = (
+            "DELETE FROM embedding_documento "
+            "WHERE tipo = %s AND NOT (id_documento = ANY(%s::uuid[]))"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (tipo, ids_atuais))
+                    removidos = cursor.rowcount
+                conexao.commit()
+                return removidos
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception(f"Erro ao remover embeddings do tipo '{tipo}'")
+                raise RuntimeError(f"Erro ao remover embeddings: {e}")
+
+
+    def buscar_similares(
+        self,
+        tipo: str,
+        vetor: List[float],
+        k: int,
+        ano_inicio: Optional[int] = None,
+        ano_fim: Optional[int] = None,
+        qualis: Optional[List[str]] = None,
+        id_instituicao: Optional[str] = None,
+        ef_search: Optional[int] = None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        Retorna os `k` documentos do tipo mais próximos do vetor, como (documento, score),
+        com score = similaridade de cosseno. Ano e Qualis filtram apenas artigos;
+        a instituição filtra pesquisadores ou artigos com algum autor da instituição.
+        """
+        juncoes, filtros = self._montar_filtros(tipo, ano_inicio, ano_fim, qualis, id_instituicao)
+        sql = SQL_BUSCAR_SIMILARES.format(juncoes=juncoes, filtros=filtros)
+        parametros = {
+            "vetor": self._vetor_sql(vetor),
+            "tipo": tipo,
+            "k": k,
+            "ano_inicio": ano_inicio,
+            "ano_fim": ano_fim,
+            "qualis": [q.upper() for q in qualis] if qualis else None,
+            "id_instituicao": id_instituicao,
+            # Candidatos do HNSW: os pedidos (ao menos k) ou, sem eles, o padrão (40) ampliado quando k passa dele
+            "ef_search": str(max(ef_search, k) if ef_search else max(40, 2 * k))
+        }
+
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute("SELECT set_config('hnsw.ef_search', %(ef_search)s, true)", parametros)
+                    if filtros:
+                        # Com filtros, o HNSW continua varrendo o grafo até achar k linhas que passem
+                        cursor.execute("SELECT set_config('hnsw.iterative_scan', 'strict_order', true)")
+                    cursor.execute(sql, parametros)
+                    linhas = cursor.fetchall()
+                conexao.rollback()
+                return [(documento, float(score)) for documento, score in linhas]
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception(f"Erro na busca vetorial de '{tipo}'")
+                raise RuntimeError(f"Erro na busca vetorial: {e}")
+
+
+    @staticmethod
+    def _montar_filtros(
+        tipo: str,
+        ano_inicio: Optional[int],
+        ano_fim: Optional[int],
+        qualis: Optional[List[str]],
+        id_instituicao: Optional[str]
+    ) -> Tuple[str, str]:
+        """
+        Monta as junções e condições de SQL_BUSCAR_SIMILARES para os filtros informados.
+        """
+        juncoes, filtros = "", ""
+
+        if tipo == "artigo":
+            if ano_inicio is not None or ano_fim is not None or qualis:
+                juncoes = (
+                    "JOIN publicacao pub ON pub.id_publicacao = e.id_documento "
+                    "JOIN periodico per ON per.id_periodico = pub.id_periodico "
+                )
+            if ano_inicio is not None:
+                filtros += "AND pub.ano >= %(ano_inicio)s "
+            if ano_fim is not None:
+                filtros += "AND pub.ano <= %(ano_fim)s "
+            if qualis:
+                filtros += "AND per.qualis = ANY(%(qualis)s) "
+            if id_instituicao:
+                # Basta um dos autores da publicação pertencer à instituição
+                filtros += (
+                    "AND EXISTS ("
+                    "SELECT 1 FROM autoria au "
+                    "JOIN pesquisador p ON p.id_pesquisador = au.id_pesquisador "
+                    "WHERE au.id_publicacao = e.id_documento "
+                    "AND p.id_instituicao = %(id_instituicao)s::uuid) "
+                )
+
+        elif tipo == "pesquisador" and id_instituicao:
+            juncoes = "JOIN pesquisador p ON p.id_pesquisador = e.id_documento "
+            filtros = "AND p.id_instituicao = %(id_instituicao)s::uuid "
+
+        return juncoes, filtros
+
+
+    @staticmethod
+    def _vetor_sql(vetor: List[float]) -> str:
+        """
+        Representação textual do vetor aceita pelo tipo `vector` do pgvector.
+        """
+        return "[" + ",".join(str(float(valor)) for valor in vetor) + "]"
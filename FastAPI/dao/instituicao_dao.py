@@ -1,8 +1,9 @@
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from psycopg2 import IntegrityError
 
 from banco.conexao_db import Conexao
+from banco.cursor_servidor import iterar_consulta
 from model.instituicao import Instituicao
 
 logger = logging.getLogger(__name__)
@@ -10,27 +11,47 @@ logger = logging.getLogger(__name__)
 class InstituicaoDAO:
     """
     DAO para operações de CRUD em instituições.
-    Mantém uma conexão ao instanciar e devolve ao destruir.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
     """
-    def __init__(self):
-        self.conexao = Conexao.obter_conexao()
 
-    def __del__(self):
-        Conexao.devolver_conexao(self.conexao)
-
-
-    def listar_instituicoes(self) -> List[Dict]: 
-        sql = "SELECT id_instituicao, nome FROM instituicao"
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql)
-                colunas = [desc[0] for desc in cursor.description]
-                linhas = cursor.fetchall()
-            return [dict(zip(colunas, linha)) for linha in linhas]
-
-        except Exception as e:
-            logger.exception("Erro ao listar instituições")
-            raise RuntimeError(f"Erro ao listar instituições: {e}")
+    def listar_instituicoes(self, apos: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        """
+        Lista instituições em ordem de ID, paginando por cursor (keyset):
+        retorna até `limite` registros com ID maior que `apos`.
+        Sem parâmetros, retorna todos os registros.
+        """
+        sql = (
+            "SELECT id_instituicao, nome "
+            "FROM instituicao "
+            "WHERE %s::uuid IS NULL OR id_instituicao > %s::uuid "
+            "ORDER BY id_instituicao "
+            "LIMIT %s"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (apos, apos, limite))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = cursor.fetchall()
+                return [dict(zip(colunas, linha)) for linha in linhas]
+
+            except Exception as e:
+                logger.exception("Erro ao listar instituições")
+                raise RuntimeError(f"Erro ao listar instituições: {e}")
+
+
+    def exportar_instituicoes(self, apos: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Percorre instituições em ordem de ID por um cursor nomeado no servidor,
+        sem carregar o resultado inteiro em memória.
+        """
+        sql = (
+            "SELECT id_instituicao, nome "
+            "FROM instituicao "
+            "WHERE %s::uuid IS NULL OR id_instituicao > %s::uuid "
+            "ORDER BY id_instituicao"
+        )
+        return iterar_consulta(sql, (apos, apos))
 
 
     def salvar_instituicao(self, instituicao: Instituicao) -> Dict:
@@ -38,21 +59,22 @@ class InstituicaoDAO:
             "INSERT INTO instituicao (nome) VALUES (%s) "
             "RETURNING id_instituicao, nome"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (instituicao.nome,))
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
-
-        except IntegrityError as e:
-            self.conexao.rollback()
-            raise ValueError(f"Conflito ao salvar instituição: {e.diag.message_detail or e}")
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao salvar instituição")
-            raise RuntimeError(f"Erro ao salvar instituição: {e}")
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (instituicao.nome,))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
+
+            except IntegrityError as e:
+                conexao.rollback()
+                raise ValueError(f"Conflito ao salvar instituição: {e.diag.message_detail or e}")
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao salvar instituição")
+                raise RuntimeError(f"Erro ao salvar instituição: {e}")
 
 
     def atualizar_instituicao(self, instituicao: Instituicao) -> Dict:
@@ -61,23 +83,24 @@ class InstituicaoDAO:
             "WHERE id_instituicao=%s "
             "RETURNING id_instituicao, nome"
         )        
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (instituicao.nome, instituicao.id_instituicao))
-                if cursor.rowcount == 0:
-                    raise LookupError("Instituição não encontrada para atualização.")
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
-
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao atualizar instituição")
-            raise RuntimeError(f"Erro ao atualizar instituição: {e}")
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (instituicao.nome, instituicao.id_instituicao))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Instituição não encontrada para atualização.")
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
+
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao atualizar instituição")
+                raise RuntimeError(f"Erro ao atualizar instituição: {e}")
 
 
     def apagar_instituicao(self, id_instituicao: str) -> None:
@@ -85,17 +108,18 @@ class InstituicaoDAO:
             "DELETE FROM instituicao "
             "WHERE id_instituicao=%s "
         )        
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (id_instituicao,))
-                if cursor.rowcount == 0:                    
-                    raise LookupError("Instituição não encontrada para exclusão.")
-            self.conexao.commit()
-
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao apagar instituição")
-            raise RuntimeError(f"Erro ao apagar instituição: {e}")
\ No newline at end of file
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (id_instituicao,))
+                    if cursor.rowcount == 0:                    
+                        raise LookupError("Instituição não encontrada para exclusão.")
+                conexao.commit()
+
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao apagar instituição")
+                raise RuntimeError(f"Erro ao apagar instituição: {e}")
\ No newline at end of file
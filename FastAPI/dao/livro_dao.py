@@ -1,8 +1,9 @@
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from psycopg2 import IntegrityError
 
 from banco.conexao_db import Conexao
+from banco.cursor_servidor import iterar_consulta
 from model.livro import Livro
 
 logger = logging.getLogger(__name__)
@@ -10,26 +11,47 @@ logger = logging.getLogger(__name__)
 class LivroDAO:
     """
     DAO para operações de CRUD em livros.
-    Mantém uma conexão ao instanciar e devolve ao destruir.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
     """
-    def __init__(self):
-        self.conexao = Conexao.obter_conexao()
 
-    def __del__(self):
-        Conexao.devolver_conexao(self.conexao)
+    def listar_livros(self, apos: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        """
+        Lista livros em ordem de ID, paginando por cursor (keyset):
+        retorna até `limite` registros com ID maior que `apos`.
+        Sem parâmetros, retorna todos os registros.
+        """
+        sql = (
+            "SELECT id_livro, nome_livro, ano, nome_editora, isbn, id_pesquisador "
+            "FROM livro "
+            "WHERE %s::uuid IS NULL OR id_livro > %s::uuid "
+            "ORDER BY id_livro "
+            "LIMIT %s"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (apos, apos, limite))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = cursor.fetchall()
+                return [dict(zip(colunas, linha)) for linha in linhas]
 
-    def listar_livros(self) -> List[Dict]:
-        sql = "SELECT id_livro, nome_livro, ano, nome_editora, isbn, id_pesquisador FROM livro"
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql)
-                colunas = [desc[0] for desc in cursor.description]
-                linhas = cursor.fetchall()
-            return [dict(zip(colunas, linha)) for linha in linhas]
-        
-        except Exception as e:
-            logger.exception("Erro ao listar livros")
-            raise RuntimeError(f"Erro ao listar livros: {e}")
+            except Exception as e:
+                logger.exception("Erro ao listar livros")
+                raise RuntimeError(f"Erro ao listar livros: {e}")
+
+
+    def exportar_livros(self, apos: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Percorre livros em ordem de ID por um cursor nomeado no servidor,
+        sem carregar o resultado inteiro em memória.
+        """
+        sql = (
+            "SELECT id_livro, nome_livro, ano, nome_editora, isbn, id_pesquisador "
+            "FROM livro "
+            "WHERE %s::uuid IS NULL OR id_livro > %s::uuid "
+            "ORDER BY id_livro"
+        )
+        return iterar_consulta(sql, (apos, apos))
 
 
     def salvar_livro(self, livro: Livro) -> Dict:
@@ -38,27 +60,28 @@ class LivroDAO:
             "VALUES (%s, %s, %s, %s, %s) "
             "RETURNING id_livro, nome_livro, ano, nome_editora, isbn, id_pesquisador"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    livro.nome_livro,
-                    livro.ano,
-                    livro.nome_editora,
-                    livro.isbn,
-                    livro.id_pesquisador
-                ))
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        livro.nome_livro,
+                        livro.ano,
+                        livro.nome_editora,
+                        livro.isbn,
+                        livro.id_pesquisador
+                    ))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
         
-        except IntegrityError as e:
-            self.conexao.rollback()
-            raise ValueError(f"Conflito ao salvar livro: {e.diag.message_detail or e}")
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao salvar livro")
-            raise RuntimeError(f"Erro ao salvar livro: {e}")
+            except IntegrityError as e:
+                conexao.rollback()
+                raise ValueError(f"Conflito ao salvar livro: {e.diag.message_detail or e}")
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao salvar livro")
+                raise RuntimeError(f"Erro ao salvar livro: {e}")
 
 
     def atualizar_livro(self, livro: Livro) -> Dict:
@@ -68,30 +91,31 @@ class LivroDAO:
             "WHERE id_livro=%s "
             "RETURNING id_livro, nome_livro, ano, nome_editora, isbn, id_pesquisador"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    livro.nome_livro,
-                    livro.ano,
-                    livro.nome_editora,
-                    livro.isbn,
-                    livro.id_pesquisador,
-                    livro.id_livro
-                ))
-                if cursor.rowcount == 0:
-                    raise LookupError("Livro não encontrado para atualização.")
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        livro.nome_livro,
+                        livro.ano,
+                        livro.nome_editora,
+                        livro.isbn,
+                        livro.id_pesquisador,
+                        livro.id_livro
+                    ))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Livro não encontrado para atualização.")
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
         
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao atualizar livro")
-            raise RuntimeError(f"Erro ao atualizar livro: {e}")
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao atualizar livro")
+                raise RuntimeError(f"Erro ao atualizar livro: {e}")
 
 
     def apagar_livro(self, id_livro: str) -> None:
@@ -99,17 +123,18 @@ class LivroDAO:
             "DELETE FROM livro "
             "WHERE id_livro=%s "
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (id_livro,))
-                if cursor.rowcount == 0:
-                    raise LookupError("Livro não encontrado para exclusão.")
-            self.conexao.commit()
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (id_livro,))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Livro não encontrado para exclusão.")
+                conexao.commit()
 
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao apagar livro")
-            raise RuntimeError(f"Erro ao apagar livro: {e}")
\ No newline at end of file
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao apagar livro")
+                raise RuntimeError(f"Erro ao apagar livro: {e}")
\ No newline at end of file
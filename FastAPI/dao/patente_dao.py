@@ -1,8 +1,9 @@
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from psycopg2 import IntegrityError
 
 from banco.conexao_db import Conexao
+from banco.cursor_servidor import iterar_consulta
 from model.patente import Patente
 
 logger = logging.getLogger(__name__)
@@ -10,30 +11,47 @@ logger = logging.getLogger(__name__)
 class PatenteDAO:
     """
     DAO para operações de CRUD em patentes.
-    Mantém uma conexão ao instanciar e devolve ao destruir.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
     """
-    def __init__(self):
-        self.conexao = Conexao.obter_conexao()
 
-    def __del__(self):
-        Conexao.devolver_conexao(self.conexao)
+    def listar_patentes(self, apos: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        """
+        Lista patentes em ordem de ID, paginando por cursor (keyset):
+        retorna até `limite` registros com ID maior que `apos`.
+        Sem parâmetros, retorna todos os registros.
+        """
+        sql = (
+            "SELECT id_patente, nome, ano, data_concessao, id_pesquisador "
+            "FROM patente "
+            "WHERE %s::uuid IS NULL OR id_patente > %s::uuid "
+            "ORDER BY id_patente "
+            "LIMIT %s"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (apos, apos, limite))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = cursor.fetchall()
+                return [dict(zip(colunas, linha)) for linha in linhas]
 
+            except Exception as e:
+                logger.exception("Erro ao listar patentes")
+                raise RuntimeError(f"Erro ao listar patentes: {e}")
 
-    def listar_patentes(self) -> List[Dict]:
+
+    def exportar_patentes(self, apos: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Percorre patentes em ordem de ID por um cursor nomeado no servidor,
+        sem carregar o resultado inteiro em memória.
+        """
         sql = (
             "SELECT id_patente, nome, ano, data_concessao, id_pesquisador "
-            "FROM patente"
+            "FROM patente "
+            "WHERE %s::uuid IS NULL OR id_patente > %s::uuid "
+            "ORDER BY id_patente"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql)
-                colunas = [desc[0] for desc in cursor.description]
-                linhas = cursor.fetchall()
-            return [dict(zip(colunas, linha)) for linha in linhas]
-        
-        except Exception as e:
-            logger.exception("Erro ao listar patentes")
-            raise RuntimeError(f"Erro ao listar patentes: {e}")
+        return iterar_consulta(sql, (apos, apos))
 
 
     def salvar_patente(self, patente: Patente) -> Dict:
@@ -42,26 +60,27 @@ class PatenteDAO:
             "VALUES (%s, %s, %s, %s) "
             "RETURNING id_patente, nome, ano, data_concessao, id_pesquisador"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    patente.nome,
-                    patente.ano,
-                    patente.data_concessao,
-                    patente.id_pesquisador
-                ))
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        patente.nome,
+                        patente.ano,
+                        patente.data_concessao,
+                        patente.id_pesquisador
+                    ))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
         
-        except IntegrityError as e:
-            self.conexao.rollback()
-            raise ValueError(f"Conflito ao salvar patente: {e.diag.message_detail or e}")
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao salvar patente")
-            raise RuntimeError(f"Erro ao salvar patente: {e}")
+            except IntegrityError as e:
+                conexao.rollback()
+                raise ValueError(f"Conflito ao salvar patente: {e.diag.message_detail or e}")
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao salvar patente")
+                raise RuntimeError(f"Erro ao salvar patente: {e}")
 
 
     def atualizar_patente(self, patente: Patente) -> Dict:
@@ -71,29 +90,30 @@ class PatenteDAO:
             "WHERE id_patente=%s "
             "RETURNING id_patente, nome, ano, data_concessao, id_pesquisador"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    patente.nome,
-                    patente.ano,
-                    patente.data_concessao,
-                    patente.id_pesquisador,
-                    patente.id_patente
-                ))
-                if cursor.rowcount == 0:
-                    raise LookupError("Patente não encontrada para atualização.")
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        patente.nome,
+                        patente.ano,
+                        patente.data_concessao,
+                        patente.id_pesquisador,
+                        patente.id_patente
+                    ))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Patente não encontrada para atualização.")
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
         
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao atualizar patente")
-            raise RuntimeError(f"Erro ao atualizar patente: {e}")
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao atualizar patente")
+                raise RuntimeError(f"Erro ao atualizar patente: {e}")
 
 
     def apagar_patente(self, id_patente: str) -> None:
@@ -101,16 +121,17 @@ class PatenteDAO:
             "DELETE FROM patente "
             "WHERE id_patente=%s "
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (id_patente,))
-                if cursor.rowcount == 0:
-                    raise LookupError("Patente não encontrada para exclusão.")
-            self.conexao.commit()
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao apagar patente")
-            raise RuntimeError(f"Erro ao apagar patente: {e}")
\ No newline at end of file
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (id_patente,))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Patente não encontrada para exclusão.")
+                conexao.commit()
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao apagar patente")
+                raise RuntimeError(f"Erro ao apagar patente: {e}")
\ No newline at end of file
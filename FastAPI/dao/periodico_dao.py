@@ -1,8 +1,9 @@
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from psycopg2 import IntegrityError
 
 from banco.conexao_db import Conexao
+from banco.cursor_servidor import iterar_consulta
 from model.periodico import Periodico
 
 logger = logging.getLogger(__name__)
@@ -10,27 +11,47 @@ logger = logging.getLogger(__name__)
 class PeriodicoDAO:
     """
     DAO para operações de CRUD em periódicos.
-    Mantém uma conexão ao instanciar e devolve ao destruir.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
     """
-    def __init__(self):
-        self.conexao = Conexao.obter_conexao()
 
-    def __del__(self):
-        Conexao.devolver_conexao(self.conexao)
+    def listar_periodicos(self, apos: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        """
+        Lista periódicos em ordem de ID, paginando por cursor (keyset):
+        retorna até `limite` registros com ID maior que `apos`.
+        Sem parâmetros, retorna todos os registros.
+        """
+        sql = (
+            "SELECT id_periodico, nome, qualis, issn "
+            "FROM periodico "
+            "WHERE %s::uuid IS NULL OR id_periodico > %s::uuid "
+            "ORDER BY id_periodico "
+            "LIMIT %s"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (apos, apos, limite))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = cursor.fetchall()
+                return [dict(zip(colunas, linha)) for linha in linhas]
 
+            except Exception as e:
+                logger.exception("Erro ao listar periódicos")
+                raise RuntimeError(f"Erro ao listar periódicos: {e}")
 
-    def listar_periodicos(self) -> List[Dict]:
-        sql = "SELECT id_periodico, nome, qualis, issn FROM periodico"
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql)
-                colunas = [desc[0] for desc in cursor.description]
-                linhas = cursor.fetchall()
-            return [dict(zip(colunas, linha)) for linha in linhas]
 
-        except Exception as e:
-            logger.exception("Erro ao listar periódicos")
-            raise RuntimeError(f"Erro ao listar periódicos: {e}")
+    def exportar_periodicos(self, apos: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Percorre periódicos em ordem de ID por um cursor nomeado no servidor,
+        sem carregar o resultado inteiro em memória.
+        """
+        sql = (
+            "SELECT id_periodico, nome, qualis, issn "
+            "FROM periodico "
+            "WHERE %s::uuid IS NULL OR id_periodico > %s::uuid "
+            "ORDER BY id_periodico"
+        )
+        return iterar_consulta(sql, (apos, apos))
 
 
     def salvar_periodico(self, periodico: Periodico) -> Dict:
@@ -39,25 +60,26 @@ class PeriodicoDAO:
             "VALUES (%s, %s, %s) "
             "RETURNING id_periodico, nome, qualis, issn "
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    periodico.nome,
-                    periodico.qualis,
-                    periodico.issn
-                ))
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        periodico.nome,
+                        periodico.qualis,
+                        periodico.issn
+                    ))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
 
-        except IntegrityError as e:
-            self.conexao.rollback()
-            raise ValueError(f"Conflito ao salvar periódico: {e.diag.message_detail or e}")
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao salvar periódico")
-            raise RuntimeError(f"Erro ao salvar periódico: {e}")
+            except IntegrityError as e:
+                conexao.rollback()
+                raise ValueError(f"Conflito ao salvar periódico: {e.diag.message_detail or e}")
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao salvar periódico")
+                raise RuntimeError(f"Erro ao salvar periódico: {e}")
 
 
     def atualizar_periodico(self, periodico: Periodico) -> Dict:
@@ -66,42 +88,44 @@ class PeriodicoDAO:
             "WHERE id_periodico=%s "
             "RETURNING id_periodico, nome, qualis, issn "
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    periodico.nome,
-                    periodico.qualis,
-                    periodico.issn,
-                    periodico.id_periodico
-                ))
-                if cursor.rowcount == 0:
-                    raise LookupError("Periódico não encontrado para atualização.")
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        periodico.nome,
+                        periodico.qualis,
+                        periodico.issn,
+                        periodico.id_periodico
+                    ))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Periódico não encontrado para atualização.")
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
 
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao atualizar periódico")
-            raise RuntimeError(f"Erro ao atualizar periódico: {e}")
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao atualizar periódico")
+                raise RuntimeError(f"Erro ao atualizar periódico: {e}")
 
 
     def apagar_periodico(self, id_periodico: str) -> None:
         sql = "DELETE FROM periodico WHERE id_periodico=%s"
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (id_periodico,))
-                if cursor.rowcount == 0:
-                    raise LookupError("Periódico não encontrado para exclusão.")
-            self.conexao.commit()
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao apagar periódico")
-            raise RuntimeError(f"Erro ao apagar periódico: {e}")
\ No newline at end of file
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (id_periodico,))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Periódico não encontrado para exclusão.")
+                conexao.commit()
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao apagar periódico")
+                raise RuntimeError(f"Erro ao apagar periódico: {e}")
\ No newline at end of file
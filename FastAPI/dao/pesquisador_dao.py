@@ -1,87 +1,180 @@
+import asyncio
 import logging
-from typing import List, Dict
-from pathlib import Path
+from typing import Callable, List, Dict, Iterator, Optional, Tuple
 from psycopg2 import IntegrityError
+from psycopg2.extras import execute_values
 
 from banco.conexao_db import Conexao
+from banco.cursor_servidor import iterar_consulta
 from model.pesquisador import Pesquisador
-from service.foto_lattes import buscar_codigo_lattes, baixar_foto_pesquisador
+from service.index_queue import index_queue
+from service.llm_cache import llm_cache
+from service.resumo_queue import resumo_queue
+from service.foto_lattes import SincronizadorFotos
+from service.registro_fotos import registro_fotos
 from config import configuracoes
 
 logger = logging.getLogger(__name__)
 
+# Colunas básicas do pesquisador, na ordem esperada pelos conversores
+SQL_SELECT_PESQUISADOR = (
+    "SELECT id_pesquisador, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes "
+    "FROM pesquisador "
+)
+
+# Página de pesquisadores com ID maior que o cursor
+SQL_LISTAR_PESQUISADORES = (
+    f"{SQL_SELECT_PESQUISADOR}"
+    "WHERE %s::uuid IS NULL OR id_pesquisador > %s::uuid "
+    "ORDER BY id_pesquisador "
+    "LIMIT %s"
+)
+
+# Pesquisadores com os IDs informados
+SQL_PESQUISADORES_POR_IDS = (
+    f"{SQL_SELECT_PESQUISADOR}"
+    "WHERE id_pesquisador = ANY(%s::uuid[])"
+)
+
+# Nome e apelidos de citação (NOME-EM-CITACOES-BIBLIOGRAFICAS do Lattes) normalizados.
+# As expressões são as mesmas dos índices GIN (pg_trgm), para que os índices sejam usados.
+SQL_NOME_NORMALIZADO = "f_unaccent(lower(nome))"
+SQL_CITACOES_NORMALIZADAS = "f_unaccent(lower(citacoes))"
+
+# Pesquisadores cujo nome (e, opcionalmente, algum nome de citação) contém o termo
+SQL_BUSCAR_POR_TERMO = (
+    f"{SQL_SELECT_PESQUISADOR}"
+    f"WHERE {SQL_NOME_NORMALIZADO} LIKE f_unaccent(lower(%(padrao)s)) "
+    "{condicao_citacoes}"
+    "ORDER BY nome "
+    "LIMIT %(limite)s"
+)
+
+# Busca aproximada: pesquisadores com nome (ou nome de citação) parecido com o termo,
+# do mais para o menos parecido. `<%` filtra pelo limiar de word_similarity
+SQL_BUSCAR_SIMILARES = (
+    f"{SQL_SELECT_PESQUISADOR}"
+    f"WHERE f_unaccent(lower(%(termo)s)) <%% {SQL_NOME_NORMALIZADO} "
+    "{condicao_citacoes}"
+    "ORDER BY greatest("
+    f"word_similarity(f_unaccent(lower(%(termo)s)), {SQL_NOME_NORMALIZADO})"
+    "{similaridade_citacoes}"
+    ") DESC, nome "
+    "LIMIT %(limite)s"
+)
+
+# Pesquisador pelo ID
+SQL_OBTER_PESQUISADOR = (
+    f"{SQL_SELECT_PESQUISADOR}"
+    "WHERE id_pesquisador = %s"
+)
+
+# Artigos de um pesquisador, dos mais recentes para os mais antigos.
+# O ID de cada artigo é o da publicação, como na listagem, na busca e no índice semântico.
+SQL_ARTIGOS_DO_PESQUISADOR = (
+    "SELECT "
+    "pub.id_publicacao as id, "
+    "pub.nome as title, "
+    "per.nome as journal, "
+    "pub.ano as year, "
+    "pub.resumo as abstract, "
+    "pub.doi, "
+    "per.qualis, "
+    "p.id_pesquisador as author_id, "
+    "p.nome as author_name "
+    "FROM autoria au "
+    "JOIN publicacao pub ON au.id_publicacao = pub.id_publicacao "
+    "JOIN periodico per ON pub.id_periodico = per.id_periodico "
+    "JOIN pesquisador p ON au.id_pesquisador = p.id_pesquisador "
+    "WHERE au.id_pesquisador = %s "
+    "ORDER BY pub.ano DESC, pub.nome"
+)
+
 class PesquisadorDAO:
     """
     DAO para operações CRUD em pesquisadores.
-    Mantém uma conexão ao instanciar e devolve ao destruir.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
     """
-    def __init__(self):
-        self.conexao = Conexao.obter_conexao()
-
-    def __del__(self):
-        Conexao.devolver_conexao(self.conexao)
 
-
-    def listar_pesquisadores(self) -> List[Dict]:
-        sql = (
-            "SELECT id_pesquisador, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes "
-            "FROM pesquisador "
-        )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql)
-                colunas = [desc[0] for desc in cursor.description]
-                linhas = cursor.fetchall()
+    def listar_pesquisadores(self, apos: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        """
+        Lista pesquisadores em ordem de ID, paginando por cursor (keyset):
+        retorna até `limite` registros com ID maior que `apos`.
+        Sem parâmetros, retorna todos os registros.
+        """
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_LISTAR_PESQUISADORES, (apos, apos, limite))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = cursor.fetchall()
                 
-                # Converte para formato compatível com ResearcherData
-                resultado = []
-                for linha in linhas:
-                    pesquisador = dict(zip(colunas, linha))
-                    researcher_data = {
-                        "id": str(pesquisador["id_pesquisador"]),
-                        "name": pesquisador["nome"],
-                        "title": pesquisador["grau_academico"],
-                        "photo": self._gerar_url_foto(pesquisador["id_lattes"])
-                    }
-                    resultado.append(researcher_data)
+                    # Converte para formato compatível com ResearcherData
+                    resultado = [self._converter_pesquisador(dict(zip(colunas, linha))) for linha in linhas]
                 
-            return resultado
+                return resultado
         
-        except Exception as e:
-            logger.exception("Erro ao listar pesquisadores")
-            raise RuntimeError(f"Erro ao listar pesquisadores: {e}")
+            except Exception as e:
+                logger.exception("Erro ao listar pesquisadores")
+                raise RuntimeError(f"Erro ao listar pesquisadores: {e}")
+
 
+    def listar_pesquisadores_por_ids(self, ids: List[str]) -> List[Dict]:
+        """Retorna os pesquisadores com os IDs informados; IDs inexistentes são ignorados"""
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_PESQUISADORES_POR_IDS, (list(ids),))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = cursor.fetchall()
+                return [self._converter_pesquisador(dict(zip(colunas, linha))) for linha in linhas]
 
-    def buscar_por_termo(self, termo: str) -> List[Dict]:
+            except Exception as e:
+                logger.exception("Erro ao listar pesquisadores por IDs")
+                raise RuntimeError(f"Erro ao listar pesquisadores por IDs: {e}")
+
+
+    def exportar_pesquisadores(self, apos: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Percorre os pesquisadores em ordem de ID por um cursor nomeado no servidor,
+        já no formato ResearcherData, sem carregar o resultado inteiro em memória.
+        """
         sql = (
-            "SELECT id_pesquisador, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes "
-            "FROM pesquisador "
-            "WHERE unaccent(lower(nome)) ILIKE unaccent(lower(%s)) "
+            f"{SQL_SELECT_PESQUISADOR}"
+            "WHERE %s::uuid IS NULL OR id_pesquisador > %s::uuid "
+            "ORDER BY id_pesquisador"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                termo_formatado = f"%{termo.strip()}%"
+        for pesquisador in iterar_consulta(sql, (apos, apos)):
+            yield self._converter_pesquisador(pesquisador)
 
-                cursor.execute(sql, (termo_formatado,))
-                colunas = [desc[0] for desc in cursor.description]
-                linhas = cursor.fetchall()
+
+    def buscar_por_termo(
+        self,
+        termo: str,
+        aproximada: bool = False,
+        incluir_citacoes: bool = False,
+        limite: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Busca pesquisadores pelo nome, sem diferenciar acentos.
+        Com `aproximada=True`, tolera erros de digitação e ordena por similaridade;
+        com `incluir_citacoes=True`, também compara os nomes usados em citações.
+        """
+        sql, parametros = self._consulta_busca(termo, aproximada, incluir_citacoes, limite)
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, parametros)
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = cursor.fetchall()
                 
-                # Converte para formato compatível com ResearcherData
-                resultado = []
-                for linha in linhas:
-                    pesquisador = dict(zip(colunas, linha))
-                    researcher_data = {
-                        "id": str(pesquisador["id_pesquisador"]),
-                        "name": pesquisador["nome"],
-                        "title": pesquisador["grau_academico"],
-                        "photo": self._gerar_url_foto(pesquisador["id_lattes"])
-                    }
-                    resultado.append(researcher_data)
+                    # Converte para formato compatível com ResearcherData
+                    resultado = [self._converter_pesquisador(dict(zip(colunas, linha))) for linha in linhas]
                 
-            return resultado
-        except Exception as e:
-            logger.exception(f"Erro ao buscar pesquisador pelo termo: '{termo}'")
-            raise RuntimeError(f"Erro ao buscar pesquisador por termo: {e}")
+                return resultado
+            except Exception as e:
+                logger.exception(f"Erro ao buscar pesquisador pelo termo: '{termo}'")
+                raise RuntimeError(f"Erro ao buscar pesquisador por termo: {e}")
 
 
     def obter_pesquisador_por_id(self, id_pesquisador: str) -> Pesquisador:
@@ -89,36 +182,22 @@ class PesquisadorDAO:
         Obtém um pesquisador específico pelo ID.
         Retorna o objeto Pesquisador completo.
         """
-        sql = (
-            "SELECT id_pesquisador, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes "
-            "FROM pesquisador "
-            "WHERE id_pesquisador = %s"
-        )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (id_pesquisador,))
-                linha = cursor.fetchone()
-                
-                if not linha:
-                    raise LookupError(f"Pesquisador com ID {id_pesquisador} não encontrado")
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_OBTER_PESQUISADOR, (id_pesquisador,))
+                    linha = cursor.fetchone()
                 
-                (id_pesq, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes) = linha
+                    if not linha:
+                        raise LookupError(f"Pesquisador com ID {id_pesquisador} não encontrado")
                 
-                return Pesquisador(
-                    id_pesquisador=str(id_pesq),
-                    nome=nome,
-                    grau_academico=grau_academico,
-                    resumo=resumo,
-                    citacoes=citacoes,
-                    id_orcid=id_orcid,
-                    id_lattes=id_lattes
-                )
+                    return self._montar_pesquisador(linha)
                 
-        except LookupError:
-            raise
-        except Exception as e:
-            logger.exception(f"Erro ao obter pesquisador por ID: {id_pesquisador}")
-            raise RuntimeError(f"Erro ao obter pesquisador por ID: {e}")
+            except LookupError:
+                raise
+            except Exception as e:
+                logger.exception(f"Erro ao obter pesquisador por ID: {id_pesquisador}")
+                raise RuntimeError(f"Erro ao obter pesquisador por ID: {e}")
 
 
     def salvar_pesquisador(self, pesquisador:Pesquisador) -> Dict:
@@ -127,28 +206,33 @@ class PesquisadorDAO:
             "VALUES (%s, %s, %s, %s, %s, %s) "
             "RETURNING id_pesquisador, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes "
         )
-        try:        
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    pesquisador.nome, 
-                    pesquisador.grau_academico, 
-                    pesquisador.resumo, 
-                    pesquisador.citacoes, 
-                    pesquisador.id_orcid, 
-                    pesquisador.id_lattes
-                ))
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()            
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:        
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        pesquisador.nome, 
+                        pesquisador.grau_academico, 
+                        pesquisador.resumo, 
+                        pesquisador.citacoes, 
+                        pesquisador.id_orcid, 
+                        pesquisador.id_lattes
+                    ))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()            
 
-        except IntegrityError as e:
-            self.conexao.rollback()
-            raise ValueError(f"Conflito ao salvar pesquisador: {e.diag.message_detail or e}")          
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao salvar pesquisador")
-            raise RuntimeError(f"Erro ao salvar pesquisador: {e}")
+                resultado = dict(zip(colunas, linha))
+                index_queue.enqueue_pesquisador(resultado["id_pesquisador"])
+                resumo_queue.enqueue(resultado["id_pesquisador"])
+                return resultado
+
+            except IntegrityError as e:
+                conexao.rollback()
+                raise ValueError(f"Conflito ao salvar pesquisador: {e.diag.message_detail or e}")          
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao salvar pesquisador")
+                raise RuntimeError(f"Erro ao salvar pesquisador: {e}")
         
 
     def atualizar_pesquisador(self, pesquisador:Pesquisador) -> Dict:
@@ -158,31 +242,37 @@ class PesquisadorDAO:
             "WHERE id_pesquisador=%s "
             "RETURNING id_pesquisador, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes "
         )
-        try:        
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    pesquisador.nome, 
-                    pesquisador.grau_academico, 
-                    pesquisador.resumo, 
-                    pesquisador.citacoes, 
-                    pesquisador.id_orcid, 
-                    pesquisador.id_lattes,
-                    pesquisador.id_pesquisador
-                ))
-                if cursor.rowcount == 0:
-                    raise LookupError("Pesquisador não encontrado para atualização.")
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()  
-            self.conexao.commit()            
-            return dict(zip(colunas, linha))   
+        with Conexao.conexao() as conexao:
+            try:        
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        pesquisador.nome, 
+                        pesquisador.grau_academico, 
+                        pesquisador.resumo, 
+                        pesquisador.citacoes, 
+                        pesquisador.id_orcid, 
+                        pesquisador.id_lattes,
+                        pesquisador.id_pesquisador
+                    ))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Pesquisador não encontrado para atualização.")
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()  
+                conexao.commit()            
 
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao atualizar pesquisador")
-            raise RuntimeError(f"Erro ao atualizar pesquisador: {e}")
+                resultado = dict(zip(colunas, linha))
+                index_queue.enqueue_pesquisador(resultado["id_pesquisador"])
+                llm_cache.invalidate_pesquisadores(resultado["id_pesquisador"])
+                resumo_queue.enqueue(resultado["id_pesquisador"])
+                return resultado
+
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao atualizar pesquisador")
+                raise RuntimeError(f"Erro ao atualizar pesquisador: {e}")
 
 
     def apagar_pesquisador(self, id_pesquisador: str) -> None:
@@ -190,20 +280,23 @@ class PesquisadorDAO:
             "DELETE FROM pesquisador "
             "WHERE id_pesquisador=%s "
         )
-        try:        
-            with self.conexao.cursor() as cursor:            
-                cursor.execute(sql, (id_pesquisador,))            
-                if cursor.rowcount == 0:
-                    raise LookupError("Pesquisador não encontrado para exclusão.") 
-            self.conexao.commit()            
+        with Conexao.conexao() as conexao:
+            try:        
+                with conexao.cursor() as cursor:            
+                    cursor.execute(sql, (id_pesquisador,))            
+                    if cursor.rowcount == 0:
+                        raise LookupError("Pesquisador não encontrado para exclusão.") 
+                conexao.commit()            
+                index_queue.enqueue_pesquisador(id_pesquisador, delete=True)
+                llm_cache.invalidate_pesquisadores(id_pesquisador)
 
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:        
-            self.conexao.rollback()
-            logger.exception("Erro ao apagar pesquisador")
-            raise RuntimeError(f"Erro ao apagar pesquisador: {e}")
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:        
+                conexao.rollback()
+                logger.exception("Erro ao apagar pesquisador")
+                raise RuntimeError(f"Erro ao apagar pesquisador: {e}")
         
 
     def buscar_artigos_por_pesquisador(self, id_pesquisador: str) -> List[Dict]:
@@ -211,54 +304,18 @@ class PesquisadorDAO:
         Busca todos os artigos de um pesquisador específico.
         Retorna no formato compatível com ArticleData.
         """
-        sql = (
-            "SELECT "
-            "a.id_artigo as id, "
-            "a.nome as title, "
-            "per.nome as journal, "
-            "a.ano as year, "
-            "a.resumo as abstract, "
-            "a.doi, "
-            "per.qualis, "
-            "p.id_pesquisador as author_id, "
-            "p.nome as author_name "
-            "FROM artigo a "
-            "JOIN periodico per ON a.id_periodico = per.id_periodico "
-            "JOIN pesquisador p ON a.id_pesquisador = p.id_pesquisador "
-            "WHERE a.id_pesquisador = %s "
-            "ORDER BY a.ano DESC, a.nome"
-        )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (id_pesquisador,))
-                linhas = cursor.fetchall()
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_ARTIGOS_DO_PESQUISADOR, (id_pesquisador,))
+                    linhas = cursor.fetchall()
             
-            # Converter para formato ArticleData
-            artigos = []
-            for linha in linhas:
-                (id_artigo, title, journal, year, abstract, doi, qualis,
-                 author_id, author_name) = linha
-                
-                artigo = {
-                    "id": str(id_artigo),
-                    "title": title,
-                    "journal": journal,
-                    "year": year,
-                    "abstract": abstract or "",
-                    "doi": doi,
-                    "qualis": qualis,
-                    "authors": [{
-                        "id": str(author_id),
-                        "name": author_name
-                    }]
-                }
-                artigos.append(artigo)
-            
-            return artigos
+                # Converter para formato ArticleData
+                return self._converter_artigos(linhas)
             
-        except Exception as e:
-            logger.exception(f"Erro ao buscar artigos do pesquisador {id_pesquisador}")
-            raise RuntimeError(f"Erro ao buscar artigos do pesquisador: {e}")
+            except Exception as e:
+                logger.exception(f"Erro ao buscar artigos do pesquisador {id_pesquisador}")
+                raise RuntimeError(f"Erro ao buscar artigos do pesquisador: {e}")
 
 
     def obter_perfil_pesquisador(self, id_pesquisador: str) -> Dict:
@@ -266,39 +323,27 @@ class PesquisadorDAO:
         Obtém dados completos do perfil do pesquisador (dados básicos + artigos).
         Retorna no formato compatível com ResearcherProfileData.
         """
-        # Buscar dados básicos do pesquisador
-        sql_pesquisador = (
-            "SELECT id_pesquisador, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes "
-            "FROM pesquisador "
-            "WHERE id_pesquisador = %s"
-        )
-        
         try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql_pesquisador, (id_pesquisador,))
+            # Buscar dados básicos do pesquisador
+            with Conexao.conexao() as conexao, conexao.cursor() as cursor:
+                cursor.execute(SQL_OBTER_PESQUISADOR, (id_pesquisador,))
+                colunas = [desc[0] for desc in cursor.description]
                 linha = cursor.fetchone()
                 
-                if not linha:
-                    raise LookupError(f"Pesquisador com ID {id_pesquisador} não encontrado")
-                
-                # Converter dados do pesquisador para formato ResearcherData
-                (id_pesq, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes) = linha
-                
-                researcher_data = {
-                    "id": str(id_pesq),
-                    "name": nome,
-                    "title": grau_academico,
-                    "photo": self._gerar_url_foto(id_lattes)
-                }
-                
-                # Buscar artigos do pesquisador
-                artigos = self.buscar_artigos_por_pesquisador(id_pesquisador)
-                
-                # Retornar no formato ResearcherProfileData
-                return {
-                    "researcher": researcher_data,
-                    "productions": artigos
-                }
+            if not linha:
+                raise LookupError(f"Pesquisador com ID {id_pesquisador} não encontrado")
+            
+            # Converter dados do pesquisador para formato ResearcherData
+            researcher_data = self._converter_pesquisador(dict(zip(colunas, linha)))
+            
+            # Buscar artigos do pesquisador (em outro empréstimo de conexão)
+            artigos = self.buscar_artigos_por_pesquisador(id_pesquisador)
+            
+            # Retornar no formato ResearcherProfileData
+            return {
+                "researcher": researcher_data,
+                "productions": artigos
+            }
                 
         except LookupError:
             raise  # Repassar erro de não encontrado
@@ -307,72 +352,168 @@ class PesquisadorDAO:
             raise RuntimeError(f"Erro ao obter perfil do pesquisador: {e}")
 
 
-    def sincronizar_fotos(self) -> None:
+    def sincronizar_fotos(self, progresso: Optional[Callable[[Dict], None]] = None) -> Dict[str, int]:
         """
-        Para cada pesquisador com id_lattes e sem foto sincronizada,
-        tenta obter o código K, baixar a foto e, em qualquer caso,
-        marca foto_sincronizado = TRUE para não tentar de novo.
+        Sincroniza as fotos dos pesquisadores com id_lattes ainda não sincronizados ou
+        sincronizados há mais de FOTO_REVALIDAR_DIAS, com requisições simultâneas
+        (ver SincronizadorFotos). Código K, ETag e hash da foto são guardados para a
+        próxima revalidação pedir a foto condicionalmente. Pesquisadores sem código K
+        ou sem foto também são marcados como sincronizados; os que falharam por erro
+        de rede continuam pendentes. Informa o andamento a `progresso` e retorna a
+        contagem por resultado. Roda o próprio event loop: não chamar de dentro de um.
         """
         sql_consulta = """
-            SELECT id_pesquisador, id_lattes
+            SELECT id_pesquisador::text, id_lattes, foto_codigo_k, foto_etag, foto_hash
             FROM pesquisador
-            WHERE id_lattes IS NOT NULL AND foto_sincronizada = FALSE
-        """
-        sql_atualizacao = """
-            UPDATE pesquisador
-            SET foto_sincronizada = TRUE
-            WHERE id_pesquisador = %s
+            WHERE id_lattes IS NOT NULL
+              AND (foto_sincronizada = FALSE
+                   OR (%(dias)s > 0 AND foto_sincronizada_em < NOW() - make_interval(days => %(dias)s)))
         """
         try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql_consulta)
-                pesquisadores = cursor.fetchall()
-
-            logger.info(f"{len(pesquisadores)} pesquisadores sem foto sincronizada encontrados.")
-
-            for id_pesq, id_lattes in pesquisadores:
-                try:
-                    codigo_k = buscar_codigo_lattes(id_lattes)
-                except Exception:
-                    codigo_k = None
-                    logger.exception(f"Erro ao buscar código K para Lattes {id_lattes}")
-
-                if codigo_k:
-                    try:
-                        sucesso = baixar_foto_pesquisador(codigo_k, id_lattes)
-                        if not sucesso:
-                            logger.warning(f"Falha ao baixar foto para pesquisador {id_pesq}")
-                    except Exception:
-                        logger.exception(f"Erro ao baixar foto para pesquisador {id_pesq}")
-                else:
-                    logger.warning(f"Código K não encontrado para pesquisador {id_pesq}")
-
-                try:
-                    with self.conexao.cursor() as cursor:
-                        cursor.execute(sql_atualizacao, (id_pesq,))
-                    self.conexao.commit()
-                except Exception:
-                    self.conexao.rollback()
-                    logger.exception(f"Erro ao atualizar flag de sincronização para {id_pesq}")
+            with Conexao.conexao() as conexao, conexao.cursor() as cursor:
+                cursor.execute(sql_consulta, {"dias": configuracoes.FOTO_REVALIDAR_DIAS})
+                pesquisadores = [
+                    {"id_pesquisador": id_pesq, "id_lattes": id_lattes, "codigo_k": codigo_k,
+                     "etag": etag, "hash": foto_hash}
+                    for id_pesq, id_lattes, codigo_k, etag, foto_hash in cursor.fetchall()
+                ]
+                conexao.rollback()
+
+            logger.info(f"{len(pesquisadores)} pesquisadores com foto a sincronizar encontrados.")
+            if not pesquisadores:
+                return {}
+
+            sincronizador = SincronizadorFotos()
+            contagem = asyncio.run(sincronizador.sincronizar(pesquisadores, self._gravar_fotos, progresso=progresso))
+            logger.info(
+                f"Fotos sincronizadas: {contagem} "
+                f"({sincronizador.requisicoes} requisições, {sincronizador.novas_tentativas} novas tentativas)."
+            )
+            return contagem
 
         except Exception:
             logger.exception("Erro inesperado na sincronização de fotos")
             raise RuntimeError("Erro ao sincronizar fotos de pesquisadores")
-    
 
-    def _gerar_url_foto(self, id_lattes: str) -> str:
+
+    def _gravar_fotos(self, resultados: List[tuple]) -> None:
+        """Marca um lote de pesquisadores como sincronizados, com código K, ETag e hash da foto, num único UPDATE"""
+        sql = (
+            "UPDATE pesquisador AS p "
+            "SET foto_sincronizada = TRUE, foto_sincronizada_em = NOW(), "
+            "foto_codigo_k = v.codigo_k, foto_etag = v.etag, foto_hash = v.hash "
+            "FROM (VALUES %s) AS v (id_pesquisador, codigo_k, etag, hash) "
+            "WHERE p.id_pesquisador = v.id_pesquisador::uuid"
+        )
+        valores = [(id_pesq, codigo_k, etag, foto_hash) for id_pesq, _, codigo_k, etag, foto_hash in resultados]
+        try:
+            with Conexao.conexao() as conexao:
+                with conexao.cursor() as cursor:
+                    execute_values(cursor, sql, valores, template="(%s, %s::text, %s::text, %s::text)")
+                conexao.commit()
+        except Exception:
+            # O lote continua pendente e é sincronizado de novo na próxima execução
+            logger.exception(f"Erro ao gravar sincronização de {len(resultados)} fotos")
+
+
+    @staticmethod
+    def _consulta_busca(
+        termo: str,
+        aproximada: bool = False,
+        incluir_citacoes: bool = False,
+        limite: Optional[int] = None
+    ) -> Tuple[str, Dict]:
         """
-        Gera a URL completa da foto do pesquisador.
-        Verifica se o arquivo existe fisicamente, caso contrário retorna URL de imagem padrão.
+        Monta o SQL e os parâmetros da busca de pesquisadores por nome.
         """
-        if not id_lattes:
-            logger.warning("ID Lattes não fornecido. Usando imagem padrão.")
-            return f"{configuracoes.BASE_URL}/imagens/pesquisadores/default.jpg"
+        termo = termo.strip()
+        parametros = {"termo": termo, "padrao": f"%{termo}%", "limite": limite}
+
+        if aproximada:
+            sql = SQL_BUSCAR_SIMILARES.format(
+                condicao_citacoes=(
+                    f"OR f_unaccent(lower(%(termo)s)) <%% {SQL_CITACOES_NORMALIZADAS} "
+                    if incluir_citacoes else ""
+                ),
+                similaridade_citacoes=(
+                    f", word_similarity(f_unaccent(lower(%(termo)s)), {SQL_CITACOES_NORMALIZADAS})"
+                    if incluir_citacoes else ""
+                )
+            )
+        else:
+            sql = SQL_BUSCAR_POR_TERMO.format(
+                condicao_citacoes=(
+                    f"OR {SQL_CITACOES_NORMALIZADAS} LIKE f_unaccent(lower(%(padrao)s)) "
+                    if incluir_citacoes else ""
+                )
+            )
+
+        return sql, parametros
+
+
+    @staticmethod
+    def _montar_pesquisador(linha: tuple) -> Pesquisador:
+        """
+        Monta o objeto Pesquisador a partir de uma linha de SQL_SELECT_PESQUISADOR.
+        """
+        (id_pesq, nome, grau_academico, resumo, citacoes, id_orcid, id_lattes) = linha
         
-        caminho_foto = Path(__file__).parent.parent / "imagens" / "pesquisadores" / f"{id_lattes}.jpg"
+        return Pesquisador(
+            id_pesquisador=str(id_pesq),
+            nome=nome,
+            grau_academico=grau_academico,
+            resumo=resumo,
+            citacoes=citacoes,
+            id_orcid=id_orcid,
+            id_lattes=id_lattes
+        )
+
+
+    @staticmethod
+    def _converter_pesquisador(pesquisador: Dict) -> Dict:
+        """
+        Converte uma linha da tabela pesquisador para o formato ResearcherData.
+        """
+        return {
+            "id": str(pesquisador["id_pesquisador"]),
+            "name": pesquisador["nome"],
+            "title": pesquisador["grau_academico"],
+            "photo": PesquisadorDAO._gerar_url_foto(pesquisador["id_lattes"])
+        }
+
+
+    @staticmethod
+    def _converter_artigos(linhas: List[tuple]) -> List[Dict]:
+        """
+        Converte as linhas de SQL_ARTIGOS_DO_PESQUISADOR para o formato ArticleData.
+        """
+        artigos = []
+        for linha in linhas:
+            (id_publicacao, title, journal, year, abstract, doi, qualis,
+             author_id, author_name) = linha
         
-        if caminho_foto.exists():
-            return f"{configuracoes.BASE_URL}/imagens/pesquisadores/{id_lattes}.jpg"
-        else:
-            logger.warning(f"Foto não encontrada para id_lattes: {id_lattes}. Usando imagem padrão.")
-            return f"{configuracoes.BASE_URL}/imagens/pesquisadores/default.jpg"
\ No newline at end of file
+            artigo = {
+                "id": str(id_publicacao),
+                "title": title,
+                "journal": journal,
+                "year": year,
+                "abstract": abstract or "",
+                "doi": doi,
+                "qualis": qualis,
+                "authors": [{
+                    "id": str(author_id),
+                    "name": author_name
+                }]
+            }
+            artigos.append(artigo)
+        
+        return artigos
+
+
+    @staticmethod
+    def _gerar_url_foto(id_lattes: str) -> str:
+        """
+        Gera a URL completa da foto do pesquisador, ou da imagem padrão se ele não tiver foto.
+        Consulta o registro de fotos em memória, sem acessar o disco.
+        """
+        return registro_fotos.url(id_lattes)
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from typing import List, Dict, Optional
+
+from banco.conexao_async import ConexaoAsync
+from dao.pesquisador_dao import (
+    PesquisadorDAO,
+    SQL_LISTAR_PESQUISADORES,
+    SQL_OBTER_PESQUISADOR,
+    SQL_ARTIGOS_DO_PESQUISADOR
+)
+from model.pesquisador import Pesquisador
+
+logger = logging.getLogger(__name__)
+
+class PesquisadorDAOAsync:
+    """
+    DAO assíncrono (psycopg 3) com as consultas de PesquisadorDAO.
+    Usa o mesmo SQL e a mesma conversão de linhas do DAO síncrono,
+    mas aguarda o banco no event loop em vez de ocupar uma thread.
+    As escritas e a sincronização de fotos continuam no PesquisadorDAO.
+    """
+
+    async def listar_pesquisadores(self, apos: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_LISTAR_PESQUISADORES, (apos, apos, limite))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = await cursor.fetchall()
+
+                return [PesquisadorDAO._converter_pesquisador(dict(zip(colunas, linha))) for linha in linhas]
+
+            except Exception as e:
+                logger.exception("Erro ao listar pesquisadores")
+                raise RuntimeError(f"Erro ao listar pesquisadores: {e}")
+
+
+    async def buscar_por_termo(
+        self,
+        termo: str,
+        aproximada: bool = False,
+        incluir_citacoes: bool = False,
+        limite: Optional[int] = None
+    ) -> List[Dict]:
+        sql, parametros = PesquisadorDAO._consulta_busca(termo, aproximada, incluir_citacoes, limite)
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(sql, parametros)
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = await cursor.fetchall()
+
+                # Converte para formato compatível com ResearcherData
+                return [PesquisadorDAO._converter_pesquisador(dict(zip(colunas, linha))) for linha in linhas]
+
+            except Exception as e:
+                logger.exception(f"Erro ao buscar pesquisador pelo termo: '{termo}'")
+                raise RuntimeError(f"Erro ao buscar pesquisador por termo: {e}")
+
+
+    async def obter_pesquisador_por_id(self, id_pesquisador: str) -> Pesquisador:
+        """
+        Obtém um pesquisador específico pelo ID.
+        Retorna o objeto Pesquisador completo.
+        """
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_OBTER_PESQUISADOR, (id_pesquisador,))
+                    linha = await cursor.fetchone()
+
+                if not linha:
+                    raise LookupError(f"Pesquisador com ID {id_pesquisador} não encontrado")
+
+                return PesquisadorDAO._montar_pesquisador(linha)
+
+            except LookupError:
+                raise
+            except Exception as e:
+                logger.exception(f"Erro ao obter pesquisador por ID: {id_pesquisador}")
+                raise RuntimeError(f"Erro ao obter pesquisador por ID: {e}")
+
+
+    async def buscar_artigos_por_pesquisador(self, id_pesquisador: str) -> List[Dict]:
+        """
+        Busca todos os artigos de um pesquisador específico.
+        Retorna no formato compatível com ArticleData.
+        """
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_ARTIGOS_DO_PESQUISADOR, (id_pesquisador,))
+                    linhas = await cursor.fetchall()
+
+                return PesquisadorDAO._converter_artigos(linhas)
+
+            except Exception as e:
+                logger.exception(f"Erro ao buscar artigos do pesquisador {id_pesquisador}")
+                raise RuntimeError(f"Erro ao buscar artigos do pesquisador: {e}")
+
+
+    async def obter_perfil_pesquisador(self, id_pesquisador: str) -> Dict:
+        """
+        Obtém dados completos do perfil do pesquisador (dados básicos + artigos).
+        As duas consultas rodam em paralelo, cada uma em sua conexão.
+        Retorna no formato compatível com ResearcherProfileData.
+        """
+        pesquisador, artigos = await asyncio.gather(
+            self.obter_pesquisador_por_id(id_pesquisador),
+            self.buscar_artigos_por_pesquisador(id_pesquisador)
+        )
+
+        # Retornar no formato ResearcherProfileData
+        return {
+            "researcher": {
+                "id": pesquisador.id_pesquisador,
+                "name": pesquisador.nome,
+                "title": pesquisador.grau_academico,
+                "photo": PesquisadorDAO._gerar_url_foto(pesquisador.id_lattes)
+            },
+            "productions": artigos
+        }
@@ -0,0 +1,157 @@
+import logging
+from typing import Dict, List
+
+from banco.conexao_db import Conexao
+
+logger = logging.getLogger(__name__)
+
+# Marca os pesquisadores para (re)geração. A versão muda a cada pedido, para que
+# um resultado gerado com dados antigos não sobrescreva um pedido mais recente.
+# Pesquisadores inexistentes são ignorados (o INSERT parte da tabela pesquisador).
+SQL_SOLICITAR_RESUMOS = (
+    "INSERT INTO resumo_pesquisador (id_pesquisador) "
+    "SELECT id_pesquisador FROM pesquisador WHERE id_pesquisador = ANY(%s::uuid[]) "
+    "ON CONFLICT (id_pesquisador) DO UPDATE SET "
+    "status = 'pendente', "
+    "versao = resumo_pesquisador.versao + 1, "
+    "tentativas = 0, "
+    "solicitado_em = now(), "
+    "disponivel_em = now()"
+)
+
+# Pesquisadores ainda sem resumo e resumos que terminaram em erro ou com fallback
+SQL_SOLICITAR_FALTANTES = (
+    "WITH novos AS ("
+    "INSERT INTO resumo_pesquisador (id_pesquisador) "
+    "SELECT id_pesquisador FROM pesquisador "
+    "ON CONFLICT (id_pesquisador) DO NOTHING "
+    "RETURNING 1"
+    "), "
+    "refeitos AS ("
+    "UPDATE resumo_pesquisador SET "
+    "status = 'pendente', versao = versao + 1, tentativas = 0, "
+    "solicitado_em = now(), disponivel_em = now() "
+    "WHERE status = 'erro' OR (status = 'pronto' AND erro IS NOT NULL) "
+    "RETURNING 1"
+    ") "
+    "SELECT (SELECT count(*) FROM novos), (SELECT count(*) FROM refeitos)"
+)
+
+SQL_OBTER_RESUMO = (
+    "SELECT resumo_ia, tags, status, gerado_em "
+    "FROM resumo_pesquisador "
+    "WHERE id_pesquisador = %s"
+)
+
+# Reserva a próxima tarefa disponível. SKIP LOCKED deixa vários workers (e processos)
+# reservarem tarefas diferentes ao mesmo tempo; tarefas em processamento há mais de
+# %s segundos (worker que caiu) voltam a ser reservadas.
+SQL_RESERVAR_TAREFA = (
+    "UPDATE resumo_pesquisador r SET "
+    "status = 'processando', tentativas = r.tentativas + 1, iniciado_em = now() "
+    "WHERE r.id_pesquisador = ("
+    "SELECT id_pesquisador FROM resumo_pesquisador "
+    "WHERE (status = 'pendente' AND disponivel_em <= now()) "
+    "OR (status = 'processando' AND iniciado_em < now() - %s * interval '1 second') "
+    "ORDER BY disponivel_em "
+    "LIMIT 1 "
+    "FOR UPDATE SKIP LOCKED"
+    ") "
+    "RETURNING r.id_pesquisador::text, r.versao, r.tentativas"
+)
+
+# Reserva a tarefa de um pesquisador específico (endpoint de resumo em streaming, que
+# gera o resumo na hora). Não espera disponivel_em: quem pediu está aguardando. Se um
+# worker já a reservou, nada é retornado.
+SQL_RESERVAR_TAREFA_PESQUISADOR = (
+    "UPDATE resumo_pesquisador SET "
+    "status = 'processando', tentativas = tentativas + 1, iniciado_em = now() "
+    "WHERE id_pesquisador = %s "
+    "AND (status = 'pendente' "
+    "OR (status = 'processando' AND iniciado_em < now() - %s * interval '1 second')) "
+    "RETURNING versao, tentativas"
+)
+
+# Só grava se nenhum pedido novo chegou durante a geração (mesma versão)
+SQL_CONCLUIR_TAREFA = (
+    "UPDATE resumo_pesquisador SET "
+    "resumo_ia = %s, tags = %s, erro = %s, status = 'pronto', gerado_em = now() "
+    "WHERE id_pesquisador = %s AND versao = %s"
+)
+
+# Devolve a tarefa para a fila depois de `espera` segundos, ou a encerra com erro
+SQL_ADIAR_TAREFA = (
+    "UPDATE resumo_pesquisador SET "
+    "erro = %s, "
+    "status = CASE WHEN %s THEN 'erro' ELSE 'pendente' END, "
+    "disponivel_em = now() + %s * interval '1 second' "
+    "WHERE id_pesquisador = %s AND versao = %s"
+)
+
+
+class ResumoPesquisadorDAO:
+    """
+    DAO da tabela resumo_pesquisador: resumos e tags dos pesquisadores gerados
+    pelo LLM em segundo plano. Cada linha é também a tarefa de geração
+    (status pendente, processando, pronto ou erro).
+    A reserva e a conclusão das tarefas ficam no ResumoPesquisadorDAOAsync.
+    """
+
+    def solicitar(self, ids_pesquisador: List[str]) -> int:
+        """
+        Marca os pesquisadores para (re)geração do resumo e das tags.
+        Retorna a quantidade de pesquisadores marcados.
+        """
+        if not ids_pesquisador:
+            return 0
+
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_SOLICITAR_RESUMOS, ([str(id_pesquisador) for id_pesquisador in ids_pesquisador],))
+                    marcados = cursor.rowcount
+                conexao.commit()
+                return marcados
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao solicitar resumos de pesquisadores")
+                raise RuntimeError(f"Erro ao solicitar resumos de pesquisadores: {e}")
+
+
+    def solicitar_faltantes(self) -> Dict[str, int]:
+        """
+        Marca para geração os pesquisadores sem resumo (ex.: carregados pelo Apache Hop)
+        e os resumos que terminaram em erro ou com fallback.
+        """
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(SQL_SOLICITAR_FALTANTES)
+                    novos, refeitos = cursor.fetchone()
+                conexao.commit()
+                return {"novos": novos, "refeitos": refeitos}
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao solicitar resumos faltantes")
+                raise RuntimeError(f"Erro ao solicitar resumos faltantes: {e}")
+
+
+    def contar_por_status(self) -> Dict[str, int]:
+        """
+        Retorna {status: quantidade} dos resumos de pesquisadores.
+        """
+        sql = "SELECT status, count(*) FROM resumo_pesquisador GROUP BY status"
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql)
+                    contagem = dict(cursor.fetchall())
+                conexao.rollback()
+                return contagem
+
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao contar resumos de pesquisadores")
+                raise RuntimeError(f"Erro ao contar resumos de pesquisadores: {e}")
@@ -0,0 +1,116 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from banco.conexao_async import ConexaoAsync
+from dao.resumo_pesquisador_dao import (
+    SQL_SOLICITAR_RESUMOS,
+    SQL_OBTER_RESUMO,
+    SQL_RESERVAR_TAREFA,
+    SQL_RESERVAR_TAREFA_PESQUISADOR,
+    SQL_CONCLUIR_TAREFA,
+    SQL_ADIAR_TAREFA
+)
+
+logger = logging.getLogger(__name__)
+
+class ResumoPesquisadorDAOAsync:
+    """
+    DAO assíncrono (psycopg 3) da tabela resumo_pesquisador, usado pelo endpoint
+    de resumo e pelos workers da fila de resumos (reserva e conclusão das tarefas).
+    """
+
+    async def obter(self, id_pesquisador: str) -> Optional[Dict]:
+        """
+        Retorna {resumo_ia, tags, status, gerado_em} do pesquisador,
+        ou None se o resumo ainda não foi solicitado.
+        """
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_OBTER_RESUMO, (id_pesquisador,))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = await cursor.fetchone()
+
+                return dict(zip(colunas, linha)) if linha else None
+
+            except Exception as e:
+                logger.exception(f"Erro ao obter resumo do pesquisador: {id_pesquisador}")
+                raise RuntimeError(f"Erro ao obter resumo do pesquisador: {e}")
+
+
+    async def solicitar(self, ids_pesquisador: List[str]) -> int:
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_SOLICITAR_RESUMOS, ([str(id_pesquisador) for id_pesquisador in ids_pesquisador],))
+                    return cursor.rowcount
+
+            except Exception as e:
+                logger.exception("Erro ao solicitar resumos de pesquisadores")
+                raise RuntimeError(f"Erro ao solicitar resumos de pesquisadores: {e}")
+
+
+    async def reservar(self, tempo_maximo_segundos: float) -> Optional[Tuple[str, int, int]]:
+        """
+        Reserva a próxima tarefa disponível.
+        Retorna (id_pesquisador, versao, tentativas) ou None se a fila estiver vazia.
+        """
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_RESERVAR_TAREFA, (tempo_maximo_segundos,))
+                    return await cursor.fetchone()
+
+            except Exception as e:
+                logger.exception("Erro ao reservar tarefa de resumo")
+                raise RuntimeError(f"Erro ao reservar tarefa de resumo: {e}")
+
+
+    async def reservar_pesquisador(self, id_pesquisador: str,
+                                   tempo_maximo_segundos: float) -> Optional[Tuple[int, int]]:
+        """
+        Reserva a tarefa pendente do pesquisador para gerá-la fora dos workers.
+        Retorna (versao, tentativas) ou None se não houver tarefa pendente (ex.: já reservada por um worker).
+        """
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_RESERVAR_TAREFA_PESQUISADOR, (id_pesquisador, tempo_maximo_segundos))
+                    return await cursor.fetchone()
+
+            except Exception as e:
+                logger.exception(f"Erro ao reservar tarefa de resumo do pesquisador: {id_pesquisador}")
+                raise RuntimeError(f"Erro ao reservar tarefa de resumo do pesquisador: {e}")
+
+
+    async def concluir(self, id_pesquisador: str, versao: int, resumo_ia: str, tags: List[str],
+                       erro: Optional[str] = None) -> bool:
+        """
+        Grava o resultado da tarefa. Retorna False se o pesquisador foi alterado
+        durante a geração (a tarefa continua pendente, com a nova versão).
+        """
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_CONCLUIR_TAREFA, (resumo_ia, tags, erro, id_pesquisador, versao))
+                    return cursor.rowcount > 0
+
+            except Exception as e:
+                logger.exception(f"Erro ao concluir resumo do pesquisador: {id_pesquisador}")
+                raise RuntimeError(f"Erro ao concluir resumo do pesquisador: {e}")
+
+
+    async def adiar(self, id_pesquisador: str, versao: int, erro: str, espera_segundos: float,
+                    final: bool = False) -> None:
+        """
+        Registra a falha da tarefa: volta para a fila depois de `espera_segundos`
+        ou, com `final`, termina com status erro.
+        """
+        async with ConexaoAsync.conexao() as conexao:
+            try:
+                async with conexao.cursor() as cursor:
+                    await cursor.execute(SQL_ADIAR_TAREFA, (erro, final, espera_segundos, id_pesquisador, versao))
+
+            except Exception as e:
+                logger.exception(f"Erro ao registrar falha do resumo do pesquisador: {id_pesquisador}")
+                raise RuntimeError(f"Erro ao registrar falha do resumo do pesquisador: {e}")
@@ -1,8 +1,9 @@
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterator, Optional
 from psycopg2 import IntegrityError
 
 from banco.conexao_db import Conexao
+from banco.cursor_servidor import iterar_consulta
 from model.software import Software
 
 logger = logging.getLogger(__name__)
@@ -10,30 +11,47 @@ logger = logging.getLogger(__name__)
 class SoftwareDAO:
     """
     DAO para operações de CRUD em softwares.
-    Mantém uma conexão ao instanciar e devolve ao destruir.
+    Cada operação empresta uma conexão do pool e a devolve ao terminar.
     """
-    def __init__(self):
-        self.conexao = Conexao.obter_conexao()
 
-    def __del__(self):
-        Conexao.devolver_conexao(self.conexao)
+    def listar_softwares(self, apos: Optional[str] = None, limite: Optional[int] = None) -> List[Dict]:
+        """
+        Lista softwares em ordem de ID, paginando por cursor (keyset):
+        retorna até `limite` registros com ID maior que `apos`.
+        Sem parâmetros, retorna todos os registros.
+        """
+        sql = (
+            "SELECT id_software, nome, ano, plataforma, finalidade, id_pesquisador "
+            "FROM software "
+            "WHERE %s::uuid IS NULL OR id_software > %s::uuid "
+            "ORDER BY id_software "
+            "LIMIT %s"
+        )
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (apos, apos, limite))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linhas = cursor.fetchall()
+                return [dict(zip(colunas, linha)) for linha in linhas]
 
+            except Exception as e:
+                logger.exception("Erro ao listar softwares")
+                raise RuntimeError(f"Erro ao listar softwares: {e}")
 
-    def listar_softwares(self) -> List[Dict]:
+
+    def exportar_softwares(self, apos: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Percorre softwares em ordem de ID por um cursor nomeado no servidor,
+        sem carregar o resultado inteiro em memória.
+        """
         sql = (
             "SELECT id_software, nome, ano, plataforma, finalidade, id_pesquisador "
-            "FROM software"
+            "FROM software "
+            "WHERE %s::uuid IS NULL OR id_software > %s::uuid "
+            "ORDER BY id_software"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql)
-                colunas = [desc[0] for desc in cursor.description]
-                linhas = cursor.fetchall()
-            return [dict(zip(colunas, linha)) for linha in linhas]
-        
-        except Exception as e:
-            logger.exception("Erro ao listar softwares")
-            raise RuntimeError(f"Erro ao listar softwares: {e}")
+        return iterar_consulta(sql, (apos, apos))
 
 
     def salvar_software(self, software: Software) -> Dict:
@@ -42,27 +60,28 @@ class SoftwareDAO:
             "VALUES (%s, %s, %s, %s, %s) "
             "RETURNING id_software, nome, ano, plataforma, finalidade, id_pesquisador"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    software.nome,
-                    software.ano,
-                    software.plataforma,
-                    software.finalidade,
-                    software.id_pesquisador
-                ))
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        software.nome,
+                        software.ano,
+                        software.plataforma,
+                        software.finalidade,
+                        software.id_pesquisador
+                    ))
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
         
-        except IntegrityError as e:
-            self.conexao.rollback()
-            raise ValueError(f"Conflito ao salvar software: {e.diag.message_detail or e}")
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao salvar software")
-            raise RuntimeError(f"Erro ao salvar software: {e}")
+            except IntegrityError as e:
+                conexao.rollback()
+                raise ValueError(f"Conflito ao salvar software: {e.diag.message_detail or e}")
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao salvar software")
+                raise RuntimeError(f"Erro ao salvar software: {e}")
 
 
     def atualizar_software(self, software: Software) -> Dict:
@@ -72,30 +91,31 @@ class SoftwareDAO:
             "WHERE id_software=%s "
             "RETURNING id_software, nome, ano, plataforma, finalidade, id_pesquisador"
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (
-                    software.nome,
-                    software.ano,
-                    software.plataforma,
-                    software.finalidade,
-                    software.id_pesquisador,
-                    software.id_software
-                ))
-                if cursor.rowcount == 0:
-                    raise LookupError("Software não encontrado para atualização.")
-                colunas = [desc[0] for desc in cursor.description]
-                linha = cursor.fetchone()
-            self.conexao.commit()
-            return dict(zip(colunas, linha))
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (
+                        software.nome,
+                        software.ano,
+                        software.plataforma,
+                        software.finalidade,
+                        software.id_pesquisador,
+                        software.id_software
+                    ))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Software não encontrado para atualização.")
+                    colunas = [desc[0] for desc in cursor.description]
+                    linha = cursor.fetchone()
+                conexao.commit()
+                return dict(zip(colunas, linha))
         
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao atualizar software")
-            raise RuntimeError(f"Erro ao atualizar software: {e}")
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao atualizar software")
+                raise RuntimeError(f"Erro ao atualizar software: {e}")
 
 
     def apagar_software(self, id_software: str) -> None:
@@ -103,16 +123,17 @@ class SoftwareDAO:
             "DELETE FROM software "
             "WHERE id_software=%s "
         )
-        try:
-            with self.conexao.cursor() as cursor:
-                cursor.execute(sql, (id_software,))
-                if cursor.rowcount == 0:
-                    raise LookupError("Software não encontrado para exclusão.")
-            self.conexao.commit()
-        except LookupError:
-            self.conexao.rollback()
-            raise
-        except Exception as e:
-            self.conexao.rollback()
-            logger.exception("Erro ao apagar software")
-            raise RuntimeError(f"Erro ao apagar software: {e}")
\ No newline at end of file
+        with Conexao.conexao() as conexao:
+            try:
+                with conexao.cursor() as cursor:
+                    cursor.execute(sql, (id_software,))
+                    if cursor.rowcount == 0:
+                        raise LookupError("Software não encontrado para exclusão.")
+                conexao.commit()
+            except LookupError:
+                conexao.rollback()
+                raise
+            except Exception as e:
+                conexao.rollback()
+                logger.exception("Erro ao apagar software")
+                raise RuntimeError(f"Erro ao apagar software: {e}")
\ No newline at end of file
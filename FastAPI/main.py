@@ -1,13 +1,15 @@
+import asyncio
 import logging
 from pathlib import Path
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from controller.artigo_controller import artigo_router
+from controller.foto_controller import foto_router
 from controller.instituicao_controller import instituicao_router
 from controller.livro_controller import livro_router
 from controller.patente_controller import patente_router
@@ -15,27 +17,48 @@ from controller.periodico_controller import periodico_router
 from controller.pesquisador_controller import pesquisador_router
 from controller.software_controller import software_router
 
-from dao.artigo_dao import ArtigoDAO
-from dao.pesquisador_dao import PesquisadorDAO
+from config import configuracoes
 from banco.conexao_db import Conexao
-from service.semantic_search import SemanticSearchService
+from banco.conexao_async import ConexaoAsync
+from banco.pool_conexoes import PoolEsgotadoError
+from service.embedding_cache import embedding_cache
+from service.index_queue import index_queue
+from service.llm_cache import llm_cache
+from service.registro_fotos import registro_fotos
+from service.resumo_pesquisador import resumo_pesquisador_service
+from service.resumo_busca import search_summary_service
+from service.resumo_queue import resumo_queue
+from service.semantic_search import semantic_search_service
+from service.startup_sync import startup_sync
 
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO, 
     format="%(asctime)s %(levelname)s %(message)s"
 )
+logger = logging.getLogger(__name__)
 
 # Definição do ciclo de vida da aplicação
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     Conexao.inicializar_pool()
+    await ConexaoAsync.inicializar_pool()
 
-    ArtigoDAO().sincronizar_resumos()
-    PesquisadorDAO().sincronizar_fotos()
-    SemanticSearchService().index_all()
+    # Alterações feitas a partir daqui chegam à busca semântica pela fila de indexação
+    index_queue.start(semantic_search_service.apply_changes)
+    # Resumos e tags dos pesquisadores são gerados em segundo plano, após a carga dos dados
+    resumo_queue.start(resumo_pesquisador_service.gerar)
+    resumo_queue.enqueue_missing()
+    # OpenAlex, Lattes e indexação semântica rodam em segundo plano: a API já atende enquanto isso
+    if configuracoes.SINCRONIZAR_NA_INICIALIZACAO:
+        startup_sync.start()
 
     yield
+    startup_sync.stop()
+    await resumo_queue.stop()
+    index_queue.stop()
+    semantic_search_service.persist(force=True)
+    await ConexaoAsync.fechar_pool()
     Conexao.fechar_todas_conexoes()
 
 # Criação da aplicação FastAPI
@@ -53,8 +76,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Pool de conexões esgotado: responde 503 para o cliente tentar de novo, em vez de 500
+@app.exception_handler(PoolEsgotadoError)
+async def pool_esgotado(request: Request, erro: PoolEsgotadoError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Servidor ocupado, tente novamente em instantes."},
+        headers={"Retry-After": "1"}
+    )
+
 # Registro dos routers
 app.include_router(artigo_router)
 app.include_router(instituicao_router)
@@ -63,6 +96,8 @@ app.include_router(patente_router)
 app.include_router(periodico_router)
 app.include_router(pesquisador_router)
 app.include_router(software_router)
+# Antes da montagem de /imagens: as fotos dos pesquisadores ganham miniaturas e cache
+app.include_router(foto_router)
 
 # Montagem de arquivos estáticos (HTML, CSS, JS, etc.)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -78,7 +113,48 @@ async def index() -> str:
         raise HTTPException(status_code=500, detail="Página inicial não encontrada")
     return path.read_text(encoding="utf-8")
 
-# Endpoint de health-check
+# Espera máxima (s) pela consulta ao banco na verificação de prontidão
+PRONTIDAO_TIMEOUT = 2.0
+
+# Endpoint de health-check (liveness): o processo está de pé; não consulta o banco
 @app.get("/health")
 def health() -> dict:
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+# Endpoint de prontidão (readiness): o banco responde; a sincronização em segundo plano
+# não impede o atendimento e só tem o andamento informado
+@app.get("/health/ready")
+async def health_ready(response: Response) -> dict:
+    async def consultar_banco():
+        async with ConexaoAsync.conexao() as conexao:
+            await conexao.execute("SELECT 1")
+
+    try:
+        await asyncio.wait_for(consultar_banco(), PRONTIDAO_TIMEOUT)
+        banco = True
+    except Exception as e:
+        logger.warning(f"Verificação de prontidão falhou: {e!r}")
+        banco = False
+
+    if not banco:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "pronto" if banco else "indisponivel",
+        "banco": banco,
+        "sincronizacao": startup_sync.metricas()
+    }
+
+# Endpoint de métricas operacionais
+@app.get("/metricas")
+def metricas() -> dict:
+    return {
+        "pool_conexoes": Conexao.metricas(),
+        "pool_conexoes_async": ConexaoAsync.metricas(),
+        "indexacao_semantica": index_queue.metricas(),
+        "cache_embeddings": embedding_cache.metricas(),
+        "cache_llm": llm_cache.metricas(),
+        "fila_resumos": resumo_queue.metricas(),
+        "resumos_busca": search_summary_service.metricas(),
+        "registro_fotos": registro_fotos.metricas(),
+        "sincronizacao": startup_sync.metricas()
+    }
@@ -0,0 +1,210 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+import hashlib
+import logging
+import threading
+
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+from banco.pool_conexoes import PoolEsgotadoError
+from config import configuracoes
+from dao.cache_embedding_dao import CacheEmbeddingDAO
+
+
+logger = logging.getLogger(__name__)
+
+# A limpeza das entradas excedentes no banco roda a cada tantas gravações
+EVICTION_EVERY_WRITES = 1000
+
+
+def text_hash(text: str) -> str:
+    """Hash SHA-256 do texto, chave do cache junto com o modelo"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Cache de embeddings por (modelo, hash do texto) em dois níveis:
+    um LRU em memória por processo e a tabela cache_embedding no PostgreSQL,
+    compartilhada entre os processos e preservada entre reinícios.
+    Ambos os níveis são limitados: o LRU por EMBEDDING_CACHE_MEMORIA e a tabela
+    por EMBEDDING_CACHE_MAXIMO (removendo as entradas usadas há mais tempo).
+
+    Os textos fora do cache são enviados ao embedder em lotes de até
+    EMBEDDING_LOTE textos, com até EMBEDDING_CONCORRENCIA lotes simultâneos.
+
+    Falhas no banco não impedem a geração dos embeddings: o cache apenas deixa de ser usado.
+    Com `persistent=False`, só o nível em memória é usado (benchmarks e scripts sem banco).
+    """
+
+    def __init__(self, memory_entries: Optional[int] = None, max_entries: Optional[int] = None,
+                 batch_size: Optional[int] = None, concurrency: Optional[int] = None,
+                 persistent: bool = True):
+        self.memory_entries = memory_entries or configuracoes.EMBEDDING_CACHE_MEMORIA
+        self.max_entries = max_entries or configuracoes.EMBEDDING_CACHE_MAXIMO
+        self.batch_size = batch_size or configuracoes.EMBEDDING_LOTE
+        self.concurrency = concurrency or configuracoes.EMBEDDING_CONCORRENCIA
+        self.dao = CacheEmbeddingDAO() if persistent else None
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[tuple, List[float]]" = OrderedDict()
+        self._writes_since_eviction = 0
+
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+        self.database_errors = 0
+        self.embedding_calls = 0
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        """Retorna {hash: embedding} dos hashes em cache (memória, depois banco)"""
+        found = {}
+        with self._lock:
+            for h in hashes:
+                vector = self._memory.get((model, h))
+                if vector is not None:
+                    self._memory.move_to_end((model, h))
+                    found[h] = vector
+            self.memory_hits += len(found)
+
+        remaining = [h for h in dict.fromkeys(hashes) if h not in found]
+        if remaining and self.dao is None:
+            with self._lock:
+                self.misses += len(remaining)
+        elif remaining:
+            try:
+                from_database = self.dao.buscar(model, remaining)
+            except (RuntimeError, PoolEsgotadoError):
+                self._database_error()
+                from_database = {}
+
+            self._remember(model, from_database)
+            found.update(from_database)
+            with self._lock:
+                self.database_hits += len(from_database)
+                self.misses += len(remaining) - len(from_database)
+
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        """Grava embeddings recém-gerados nos dois níveis"""
+        if not vectors:
+            return
+        self._remember(model, vectors)
+        if self.dao is None:
+            return
+
+        try:
+            self.dao.salvar(model, vectors.items())
+        except (RuntimeError, PoolEsgotadoError):
+            self._database_error()
+            return
+
+        with self._lock:
+            self._writes_since_eviction += len(vectors)
+            evict = self._writes_since_eviction >= EVICTION_EVERY_WRITES
+            if evict:
+                self._writes_since_eviction = 0
+
+        if evict:
+            try:
+                removed = self.dao.remover_excedentes(self.max_entries)
+                if removed:
+                    logger.info(f"Cache de embeddings: {removed} entradas antigas removidas.")
+            except (RuntimeError, PoolEsgotadoError):
+                self._database_error()
+
+    def _database_error(self) -> None:
+        with self._lock:
+            self.database_errors += 1
+
+    def _remember(self, model: str, vectors: Dict[str, List[float]]) -> None:
+        with self._lock:
+            for h, vector in vectors.items():
+                self._memory[(model, h)] = vector
+                self._memory.move_to_end((model, h))
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def embed_documents(self, embedder: Embeddings, model: str, texts: List[str]) -> List[List[float]]:
+        """Embeddings dos textos, gerando pelo `embedder` apenas os que não estão em cache"""
+        hashes = [text_hash(text) for text in texts]
+        vectors = self.get_many(model, hashes)
+
+        missing = {h: text for h, text in zip(hashes, texts) if h not in vectors}
+        if missing:
+            generated = dict(zip(missing, self._generate(embedder, list(missing.values()))))
+            self.put_many(model, generated)
+            vectors.update(generated)
+
+        return [vectors[h] for h in hashes]
+
+    def _generate(self, embedder: Embeddings, texts: List[str]) -> List[List[float]]:
+        """Gera os embeddings em lotes de até `batch_size` textos, com até `concurrency` lotes simultâneos"""
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        with self._lock:
+            self.embedding_calls += len(batches)
+
+        if self.concurrency > 1 and len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as executor:
+                results = list(executor.map(embedder.embed_documents, batches))
+        else:
+            results = [embedder.embed_documents(batch) for batch in batches]
+
+        return [vector for result in results for vector in result]
+
+    def embed_query(self, embedder: Embeddings, model: str, text: str) -> List[float]:
+        """Embedding de uma consulta, gerado pelo `embedder` apenas se não estiver em cache"""
+        h = text_hash(text)
+        vector = self.get_many(model, [h]).get(h)
+        if vector is None:
+            with self._lock:
+                self.embedding_calls += 1
+            vector = embedder.embed_query(text)
+            self.put_many(model, {h: vector})
+        return vector
+
+    def metricas(self) -> Dict:
+        with self._lock:
+            total = self.memory_hits + self.database_hits + self.misses
+            return {
+                "acertos_memoria": self.memory_hits,
+                "acertos_banco": self.database_hits,
+                "falhas": self.misses,
+                "taxa_acerto": round((self.memory_hits + self.database_hits) / total, 4) if total else None,
+                "chamadas_embedder": self.embedding_calls,
+                "entradas_memoria": len(self._memory),
+                "erros_banco": self.database_errors,
+            }
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embedder do LangChain que consulta o EmbeddingCache antes de chamar o embedder real.
+    Pode substituir o OpenAIEmbeddings em qualquer ponto do código.
+    """
+
+    def __init__(self, embedder: Embeddings, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.cache = cache
+
+    @property
+    def model(self) -> str:
+        return self.embedder.model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.cache.embed_documents(self.embedder, self.model, texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.cache.embed_query(self.embedder, self.model, text)
+
+
+# Instância única do cache, compartilhada por todos os embedders do processo
+embedding_cache = EmbeddingCache()
+
+
+def create_embedder() -> CachedEmbeddings:
+    """Embedder da OpenAI com cache; use-o em vez de instanciar OpenAIEmbeddings diretamente"""
+    return CachedEmbeddings(OpenAIEmbeddings(api_key=configuracoes.OPENAI_API_KEY), embedding_cache)
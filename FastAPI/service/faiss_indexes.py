@@ -0,0 +1,578 @@
+"""
+Tipos de índice FAISS para a busca semântica (backend SEMANTIC_BACKEND=faiss).
+
+- flat:     busca exata (IndexFlatL2), sem treino; referência de recall.
+- ivf_flat: particiona os vetores em `nlist` listas (k-means); cada busca visita `nprobe` listas.
+- ivf_pq:   como o IVF, mas guarda os vetores comprimidos por product quantization
+            (`m` subvetores de 8 bits), usando uma fração da memória.
+- hnsw:     grafo navegável (HNSW); cada busca mantém `efSearch` candidatos. Sem treino.
+
+Os tipos IVF precisam de treino sobre uma amostra dos vetores antes de receberem dados.
+Na indexação incremental, o índice fica exato (flat) até haver vetores suficientes para o
+nlist desejado e é treinado de novo quando o nlist adequado ao tamanho passa do dobro do atual.
+O treino offline reconstrói o índice salvo a partir de todos os documentos:
+
+    python -m service.faiss_indexes --tipo artigo --index-type ivf_pq
+"""
+from typing import Iterable, List, Dict, Optional, Set, Tuple
+import argparse
+import json
+import logging
+import math
+import os
+import threading
+import time
+
+import faiss
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from config import configuracoes
+from service.vector_stores import content_hash, document_text, matches_filters
+
+
+logger = logging.getLogger(__name__)
+
+FAISS_INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+# Tipos que precisam de treino (k-means) antes de receber vetores
+TRAINED_INDEX_TYPES = ("ivf_flat", "ivf_pq")
+
+# O k-means do FAISS pede ao menos ~39 pontos de treino por centróide
+MIN_TRAINING_POINTS_PER_LIST = 39
+# O PQ de 8 bits treina 256 centróides por subvetor
+MIN_TRAINING_POINTS_PQ = 256
+
+# Intervalo mínimo entre gravações do índice em disco durante a manutenção incremental
+PERSIST_INTERVAL_SECONDS = 60.0
+# Fração de lápides (vetores removidos do HNSW) a partir da qual o grafo é recriado
+MAX_TOMBSTONE_FRACTION = 0.2
+
+
+def target_nlist(n_vectors: int, nlist: int = None) -> int:
+    """Quantidade de listas desejada para o IVF: a informada, a configurada ou 4 * raiz do nº de vetores"""
+    return nlist or configuracoes.FAISS_NLIST or int(4 * math.sqrt(max(n_vectors, 1)))
+
+
+def choose_nlist(n_vectors: int, nlist: int = None) -> int:
+    """Quantidade de listas do IVF: a desejada, limitada pelo tamanho da amostra de treino"""
+    return max(1, min(target_nlist(n_vectors, nlist), n_vectors // MIN_TRAINING_POINTS_PER_LIST))
+
+
+def factory_string(index_type: str, n_vectors: int, nlist: int = None) -> str:
+    """Descrição do índice no formato do faiss.index_factory"""
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "ivf_flat":
+        return f"IVF{choose_nlist(n_vectors, nlist)},Flat"
+    if index_type == "ivf_pq":
+        return f"IVF{choose_nlist(n_vectors, nlist)},PQ{configuracoes.FAISS_PQ_M}"
+    if index_type == "hnsw":
+        return f"HNSW{configuracoes.FAISS_HNSW_M},Flat"
+    raise ValueError(f"Tipo de índice FAISS desconhecido: '{index_type}'. Use um de {FAISS_INDEX_TYPES}.")
+
+
+def create_index(index_type: str, dim: int, training_vectors: np.ndarray = None, nlist: int = None) -> faiss.Index:
+    """
+    Cria um índice vazio do tipo pedido. Tipos que exigem treino são treinados
+    com `training_vectors`; sem amostra suficiente, cai para o índice exato.
+    """
+    n_vectors = 0 if training_vectors is None else len(training_vectors)
+    min_points = {"ivf_flat": MIN_TRAINING_POINTS_PER_LIST, "ivf_pq": MIN_TRAINING_POINTS_PQ}.get(index_type, 0)
+
+    if n_vectors < min_points:
+        logger.warning(
+            f"Apenas {n_vectors} vetores para treinar o índice '{index_type}'; usando índice exato (flat)."
+        )
+        index_type = "flat"
+
+    description = factory_string(index_type, n_vectors, nlist)
+    index = faiss.index_factory(dim, description, faiss.METRIC_L2)
+
+    if index_type == "hnsw":
+        index.hnsw.efConstruction = configuracoes.FAISS_EF_CONSTRUCTION
+
+    if not index.is_trained:
+        logger.info(f"Treinando índice FAISS '{description}' com {n_vectors} vetores...")
+        index.train(np.ascontiguousarray(training_vectors, dtype="float32"))
+
+    set_search_params(index)
+    return index
+
+
+def unwrap_index(index: faiss.Index) -> faiss.Index:
+    """Índice de busca propriamente dito, sem o mapeamento de IDs (IndexIDMap2)"""
+    base = faiss.downcast_index(index)
+    if isinstance(base, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        base = faiss.downcast_index(base.index)
+    return base
+
+
+def with_ids(index: faiss.Index) -> faiss.Index:
+    """
+    Prepara o índice para receber vetores com IDs próprios (add_with_ids / remove_ids).
+    IVF já guarda os IDs nas listas (com mapa direto para reconstruir por ID);
+    os demais tipos são envolvidos em IndexIDMap2.
+    """
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except RuntimeError:
+        return faiss.IndexIDMap2(index)
+    ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+    return index
+
+
+def supports_removal(index: faiss.Index) -> bool:
+    """O grafo HNSW não permite remover vetores; os demais tipos permitem"""
+    return getattr(unwrap_index(index), "hnsw", None) is None
+
+
+def set_search_params(index: faiss.Index, nprobe: int = None, ef_search: int = None) -> None:
+    """
+    Ajusta os parâmetros de busca (recall x latência) do índice, se ele os tiver:
+    `nprobe` para IVF e `efSearch` para HNSW.
+    """
+    nprobe = nprobe or configuracoes.FAISS_NPROBE
+    ef_search = ef_search or configuracoes.FAISS_EF_SEARCH
+
+    try:
+        ivf = faiss.extract_index_ivf(index)
+        ivf.nprobe = min(nprobe, ivf.nlist)
+    except RuntimeError:
+        pass
+
+    hnsw = getattr(unwrap_index(index), "hnsw", None)
+    if hnsw is not None:
+        hnsw.efSearch = ef_search
+
+
+def built_index_type(index: faiss.Index) -> str:
+    """Tipo (de FAISS_INDEX_TYPES) do índice efetivamente construído, que pode ter caído para flat"""
+    base = unwrap_index(index)
+    if isinstance(base, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(base, faiss.IndexIVFFlat):
+        return "ivf_flat"
+    if isinstance(base, faiss.IndexHNSW):
+        return "hnsw"
+    return "flat"
+
+
+def training_due(index: faiss.Index, index_type: str, n_vectors: int) -> bool:
+    """
+    Se o índice mantido de forma incremental deve ser (re)treinado como `index_type`:
+    há vetores para treinar o nlist desejado sem reduzi-lo, e o índice ainda é exato
+    ou tem no máximo metade dessas listas (ex.: treinado com poucos vetores).
+    """
+    if index_type not in TRAINED_INDEX_TYPES:
+        return False
+    nlist = target_nlist(n_vectors)
+    min_points = MIN_TRAINING_POINTS_PQ if index_type == "ivf_pq" else 0
+    if n_vectors < max(min_points, nlist * MIN_TRAINING_POINTS_PER_LIST):
+        return False
+    if built_index_type(index) != index_type:
+        return True
+    return 2 * faiss.extract_index_ivf(index).nlist <= nlist
+
+
+def describe_index(index: faiss.Index) -> str:
+    """Resumo legível do índice para logs e métricas"""
+    base = unwrap_index(index)
+    return f"{type(base).__name__} ({index.ntotal} vetores, dim {index.d})"
+
+
+def stack_vectors(vectors: Iterable) -> np.ndarray:
+    """Empilha vetores em uma matriz float32 contígua, como o FAISS espera"""
+    return np.ascontiguousarray(np.asarray(list(vectors), dtype="float32"))
+
+
+class FaissVectorStore:
+    """
+    Índice FAISS em memória, salvo em disco em `index_dir`.
+    Cada processo da API carrega sua própria cópia; útil sem pgvector disponível.
+    O tipo do índice (flat, ivf_flat, ivf_pq ou hnsw) vem de FAISS_INDEX_TYPE; os tipos
+    IVF ficam exatos (flat) até haver vetores suficientes para o treino (ver training_due).
+
+    Os vetores são guardados com IDs internos (int64) e os metadados de cada
+    documento (documento, hash do texto, modelo e chave da publicação) ficam em
+    um arquivo JSON ao lado do índice. Atualizar um documento troca seu vetor
+    (remove o ID antigo e adiciona um novo); no HNSW, que não remove vetores,
+    o ID antigo vira uma lápide ignorada na busca até o índice ser compactado.
+    """
+
+    def __init__(self, tipo: str, embedder: Embeddings, index_dir: str, index_type: Optional[str] = None):
+        self.tipo = tipo
+        self.embedder = embedder
+        self.index_type = index_type or configuracoes.FAISS_INDEX_TYPE
+        os.makedirs(index_dir, exist_ok=True)
+        self.index_path = os.path.join(index_dir, f"faiss_{tipo}.index")
+        self.metadata_path = os.path.join(index_dir, f"faiss_{tipo}.json")
+
+        # Protege índice e metadados entre a busca e a manutenção incremental
+        self._lock = threading.RLock()
+        # Serializa as escritas (indexação inicial, fila de indexação e retreino)
+        self._write_lock = threading.Lock()
+
+        self.index: Optional[faiss.Index] = None
+        # ID interno -> {"doc", "hash", "model", "key"} dos documentos no índice
+        self.entries: Dict[int, Dict] = {}
+        # ID do documento -> ID interno
+        self.internal_ids: Dict[str, int] = {}
+        # Chave da publicação -> IDs dos documentos
+        self.ids_by_key: Dict[str, Set[str]] = {}
+        # IDs internos removidos que continuam no grafo HNSW
+        self.tombstones: Set[int] = set()
+        self.next_id = 0
+        self._dirty = False
+        self._last_persist = time.monotonic()
+
+        self._load()
+
+    def _load(self) -> None:
+        if not (os.path.exists(self.index_path) and os.path.exists(self.metadata_path)):
+            # Sem índice salvo: será criado (e treinado, se preciso) na primeira indexação
+            return
+
+        self.index = faiss.read_index(self.index_path)
+        with open(self.metadata_path, encoding="utf-8") as arquivo:
+            metadata = json.load(arquivo)
+
+        self.index_type = metadata["index_type"]
+        self.next_id = metadata["next_id"]
+        self.tombstones = set(metadata["tombstones"])
+        for internal_id, entry in metadata["entries"].items():
+            self._register(int(internal_id), entry)
+
+        set_search_params(self.index)
+        logger.info(
+            f"Índice FAISS de '{self.tipo}' carregado: {describe_index(self.index)}, "
+            f"tipo '{built_index_type(self.index)}' (configurado: '{self.index_type}')"
+        )
+
+    def _register(self, internal_id: int, entry: Dict) -> None:
+        doc_id = entry["doc"]["id"]
+        self.entries[internal_id] = entry
+        self.internal_ids[doc_id] = internal_id
+        if entry["key"]:
+            self.ids_by_key.setdefault(entry["key"], set()).add(doc_id)
+
+    def _unregister(self, internal_id: int) -> None:
+        entry = self.entries.pop(internal_id)
+        doc_id = entry["doc"]["id"]
+        self.internal_ids.pop(doc_id, None)
+        if entry["key"]:
+            ids = self.ids_by_key.get(entry["key"], set())
+            ids.discard(doc_id)
+            if not ids:
+                self.ids_by_key.pop(entry["key"], None)
+
+    def _add(self, items: List[Tuple[Dict, str, List[float], Optional[str]]], model: str) -> None:
+        """Adiciona (documento, hash, vetor, chave), substituindo versões anteriores dos documentos"""
+        matrix = stack_vectors(vector for _, _, vector, _ in items)
+        if self.index is None:
+            # Tipos com treino não são treinados com o primeiro lote (poucos vetores, nlist pequeno
+            # para sempre): o índice começa exato e é treinado quando houver vetores suficientes
+            index_type = "flat" if self.index_type in TRAINED_INDEX_TYPES else self.index_type
+            self.index = with_ids(create_index(index_type, matrix.shape[1]))
+
+        self._remove([self.internal_ids[doc["id"]] for doc, _, _, _ in items if doc["id"] in self.internal_ids])
+
+        ids = np.arange(self.next_id, self.next_id + len(items), dtype="int64")
+        self.next_id += len(items)
+        self.index.add_with_ids(matrix, ids)
+        for internal_id, (doc, text_hash, _, key) in zip(ids.tolist(), items):
+            self._register(internal_id, {"doc": doc, "hash": text_hash, "model": model, "key": key})
+        self._dirty = True
+
+    def _remove(self, internal_ids: List[int]) -> None:
+        if not internal_ids:
+            return
+        for internal_id in internal_ids:
+            self._unregister(internal_id)
+
+        if supports_removal(self.index):
+            self.index.remove_ids(np.asarray(internal_ids, dtype="int64"))
+        else:
+            self.tombstones.update(internal_ids)
+            if len(self.tombstones) > MAX_TOMBSTONE_FRACTION * self.index.ntotal:
+                self._compact()
+        self._dirty = True
+
+    def _compact(self) -> None:
+        """Recria o grafo HNSW só com os vetores ativos, descartando as lápides"""
+        ids = np.asarray(sorted(self.entries), dtype="int64")
+        vectors = stack_vectors(self.index.reconstruct(int(internal_id)) for internal_id in ids)
+        index = with_ids(create_index("hnsw", self.index.d))
+        if len(ids):
+            index.add_with_ids(vectors, ids)
+
+        logger.info(f"Índice FAISS de '{self.tipo}' compactado: {len(self.tombstones)} vetores removidos descartados.")
+        self.index = index
+        self.tombstones.clear()
+
+    def _clear(self) -> None:
+        """Esquece todos os documentos do índice (metadados, IDs e lápides)"""
+        self.entries, self.internal_ids, self.ids_by_key = {}, {}, {}
+        self.tombstones.clear()
+        self.next_id = 0
+        self._dirty = False
+
+    def _stored_vectors(self) -> Dict[str, List[float]]:
+        """
+        Vetores já guardados no índice, por ID do documento, para reaproveitar no retreino.
+        Índices comprimidos (PQ) só devolvem aproximações e não são reaproveitados.
+        """
+        if self.index is None or "PQ" in type(unwrap_index(self.index)).__name__:
+            return {}
+
+        return {
+            entry["doc"]["id"]: self.index.reconstruct(internal_id).tolist()
+            for internal_id, entry in self.entries.items()
+        }
+
+    def index_documents(self, docs: List[Dict], keys: Optional[Dict[str, str]] = None,
+                        refresh: bool = False) -> int:
+        """
+        Gera embeddings apenas de documentos novos ou com texto alterado e troca seus vetores.
+        Documentos com o mesmo texto só têm os metadados atualizados (sempre, com `refresh`).
+        Retorna a quantidade de documentos (re)embedados.
+        """
+        keys = keys or {}
+        model = self.embedder.model
+
+        with self._write_lock:
+            pending = []
+            with self._lock:
+                for doc in docs:
+                    text = document_text(doc, self.tipo)
+                    text_hash = content_hash(text)
+                    internal_id = self.internal_ids.get(doc["id"])
+                    entry = self.entries.get(internal_id) if internal_id is not None else None
+
+                    if entry is None or (entry["model"], entry["hash"]) != (model, text_hash):
+                        pending.append((doc, text, text_hash))
+                    elif refresh or entry["key"] != keys.get(doc["id"]):
+                        self._unregister(internal_id)
+                        self._register(internal_id, {**entry, "doc": doc, "key": keys.get(doc["id"])})
+                        self._dirty = True
+
+            # Os embeddings são gerados fora do lock, sem bloquear as buscas
+            batch_size = configuracoes.EMBEDDING_LOTE
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                vectors = self.embedder.embed_documents([text for _, text, _ in batch])
+                with self._lock:
+                    self._add(
+                        [(doc, text_hash, vector, keys.get(doc["id"]))
+                         for (doc, _, text_hash), vector in zip(batch, vectors)],
+                        model
+                    )
+
+            self._train_if_due()
+
+        return len(pending)
+
+    def _train_if_due(self) -> None:
+        """Retreina o índice com os próprios documentos quando training_due; exige o _write_lock"""
+        with self._lock:
+            if self.index is None or not training_due(self.index, self.index_type, len(self.entries)):
+                return
+            entries = list(self.entries.values())
+
+        logger.info(
+            f"Índice FAISS de '{self.tipo}' com {len(entries)} vetores: treinando como '{self.index_type}'."
+        )
+        self._rebuild(
+            [entry["doc"] for entry in entries], self.index_type,
+            keys={entry["doc"]["id"]: entry["key"] for entry in entries}
+        )
+
+    def delete_documents(self, ids: Iterable[str]) -> int:
+        """Remove do índice os documentos informados"""
+        with self._write_lock, self._lock:
+            internal_ids = [self.internal_ids[doc_id] for doc_id in ids if doc_id in self.internal_ids]
+            self._remove(internal_ids)
+            return len(internal_ids)
+
+    def get_vectors(self, ids: Iterable[str]) -> Dict[str, List[float]]:
+        """
+        Vetores já indexados (com o modelo atual) dos documentos informados, por ID.
+        Índices comprimidos (PQ) só devolvem aproximações e não são usados.
+        """
+        model = self.embedder.model
+        with self._lock:
+            if self.index is None or "PQ" in type(unwrap_index(self.index)).__name__:
+                return {}
+
+            vectors = {}
+            for doc_id in ids:
+                internal_id = self.internal_ids.get(doc_id)
+                if internal_id is not None and self.entries[internal_id]["model"] == model:
+                    vectors[doc_id] = self.index.reconstruct(internal_id).tolist()
+            return vectors
+
+    def ids_for_keys(self, keys: Iterable[str]) -> Set[str]:
+        """IDs dos documentos indexados com alguma das chaves de publicação"""
+        with self._lock:
+            return set().union(*(self.ids_by_key.get(key, set()) for key in keys))
+
+    def remove_missing(self, current_ids: List[str]) -> int:
+        """Remove do índice os documentos que não existem mais"""
+        with self._lock:
+            missing = set(self.internal_ids) - set(current_ids)
+        return self.delete_documents(missing)
+
+    def persist(self, force: bool = False) -> None:
+        """
+        Salva índice e metadados se houver alterações, no máximo a cada
+        PERSIST_INTERVAL_SECONDS (ou já, com `force`).
+        """
+        with self._lock:
+            if not self._dirty or self.index is None:
+                return
+            if not force and time.monotonic() - self._last_persist < PERSIST_INTERVAL_SECONDS:
+                return
+
+            data = faiss.serialize_index(self.index)
+            metadata = json.dumps({
+                "index_type": self.index_type,
+                "built_type": built_index_type(self.index),
+                "next_id": self.next_id,
+                "tombstones": sorted(self.tombstones),
+                "entries": {str(internal_id): entry for internal_id, entry in self.entries.items()},
+            }, default=str)
+            self._dirty = False
+            self._last_persist = time.monotonic()
+
+        # Grava em arquivos temporários e troca, para nunca deixar um par índice/metadados pela metade
+        with open(f"{self.index_path}.tmp", "wb") as arquivo:
+            arquivo.write(data.tobytes())
+        with open(f"{self.metadata_path}.tmp", "w", encoding="utf-8") as arquivo:
+            arquivo.write(metadata)
+        os.replace(f"{self.index_path}.tmp", self.index_path)
+        os.replace(f"{self.metadata_path}.tmp", self.metadata_path)
+
+    def rebuild(self, docs: List[Dict], index_type: Optional[str] = None, nlist: Optional[int] = None,
+                keys: Optional[Dict[str, str]] = None) -> None:
+        """
+        Treino offline: recria o índice do zero com todos os documentos, no tipo pedido.
+        Vetores já presentes no índice atual são reaproveitados; os demais são gerados.
+        """
+        with self._write_lock:
+            if not docs:
+                # Sem documentos não há o que treinar: o índice é descartado e criado na próxima indexação
+                with self._lock:
+                    self._clear()
+                    self.index = None
+                    self.index_type = index_type or self.index_type
+                for path in (self.index_path, self.metadata_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                logger.info(f"Nenhum documento de '{self.tipo}' para indexar; índice FAISS removido.")
+                return
+
+            self._rebuild(docs, index_type or self.index_type, nlist, keys)
+
+        self.persist(force=True)
+        logger.info(f"Índice salvo em {self.index_path}: {describe_index(self.index)}")
+
+    def _rebuild(self, docs: List[Dict], index_type: str, nlist: Optional[int] = None,
+                 keys: Optional[Dict[str, str]] = None) -> None:
+        """Recria o índice com os documentos, reaproveitando os vetores guardados; exige o _write_lock"""
+        keys = keys or {}
+        model = self.embedder.model
+
+        with self._lock:
+            stored = self._stored_vectors()
+
+        texts = [document_text(doc, self.tipo) for doc in docs]
+        missing = [i for i, doc in enumerate(docs) if doc["id"] not in stored]
+        embedded = self.embedder.embed_documents([texts[i] for i in missing]) if missing else []
+
+        vectors = [stored.get(doc["id"]) for doc in docs]
+        for i, vector in zip(missing, embedded):
+            vectors[i] = vector
+
+        logger.info(
+            f"Reconstruindo índice FAISS de '{self.tipo}' como '{index_type}': "
+            f"{len(docs)} documentos ({len(docs) - len(missing)} vetores reaproveitados, {len(missing)} gerados)."
+        )
+        matrix = stack_vectors(vectors)
+        index = with_ids(create_index(index_type, matrix.shape[1], matrix, nlist=nlist))
+
+        with self._lock:
+            self._clear()
+            self.index = index
+            self.index_type = index_type
+            self._add(
+                [(doc, content_hash(text), vector, keys.get(doc["id"]))
+                 for doc, text, vector in zip(docs, texts, vectors)],
+                model
+            )
+
+    def search(self, query: str, k: int, id_instituicao: Optional[str] = None,
+               nprobe: Optional[int] = None, ef_search: Optional[int] = None,
+               **filtros) -> List[Tuple[Dict, float]]:
+        """
+        Retorna (documento, 1 / (1 + distância L2)) dos k documentos mais próximos.
+        `nprobe` (IVF) e `efSearch` (HNSW) valem só para esta busca; sem eles, os da configuração.
+        """
+        if id_instituicao:
+            raise ValueError("O filtro por instituição exige o backend pgvector.")
+
+        query_vector = stack_vectors([self.embedder.embed_query(query)])
+        has_filters = any(value for value in filtros.values())
+
+        with self._lock:
+            if self.index is None or not self.entries:
+                return []
+
+            # Com filtros, busca mais candidatos e filtra depois; lápides também ocupam vagas
+            fetch_k = (k * 5 if has_filters else k) + len(self.tombstones)
+            if nprobe or ef_search:
+                set_search_params(self.index, nprobe, ef_search)
+            try:
+                distances, ids = self.index.search(query_vector, min(fetch_k, self.index.ntotal))
+            finally:
+                if nprobe or ef_search:
+                    set_search_params(self.index)
+
+            documentos = []
+            for distance, internal_id in zip(distances[0], ids[0]):
+                entry = self.entries.get(int(internal_id))
+                if entry is None:
+                    continue
+                if has_filters and not matches_filters(entry["doc"], **filtros):
+                    continue
+                documentos.append((entry["doc"], 1 / (1 + float(distance))))
+
+        return documentos[:k]
+
+
+def main():
+    from dao.artigo_dao import ArtigoDAO
+    from dao.pesquisador_dao import PesquisadorDAO
+    from service.embedding_cache import create_embedder
+    from service.semantic_search import EMBEDDING_INDEX_DIR
+
+    parser = argparse.ArgumentParser(description="Treina e reconstrói um índice FAISS da busca semântica.")
+    parser.add_argument("--tipo", choices=("artigo", "pesquisador"), required=True)
+    parser.add_argument("--index-type", choices=FAISS_INDEX_TYPES, default=configuracoes.FAISS_INDEX_TYPE)
+    parser.add_argument("--nlist", type=int, default=None, help="Listas do IVF (padrão: FAISS_NLIST)")
+    argumentos = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if argumentos.tipo == "artigo":
+        artigos = ArtigoDAO().listar_artigos_por_chave()
+        docs = list(artigos.values())
+        keys = {doc["id"]: chave for chave, doc in artigos.items()}
+    else:
+        docs, keys = PesquisadorDAO().listar_pesquisadores(), None
+
+    embedder = create_embedder()
+    store = FaissVectorStore(argumentos.tipo, embedder, EMBEDDING_INDEX_DIR)
+    store.rebuild(docs, argumentos.index_type, nlist=argumentos.nlist, keys=keys)
+
+
+if __name__ == "__main__":
+    main()
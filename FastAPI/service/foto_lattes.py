@@ -1,103 +1,215 @@
 from http import HTTPStatus
 from pathlib import Path
-from typing import Optional 
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
+import asyncio
+import hashlib
 import httpx
 import logging
-import requests
+import random
+import time
+
+from config import configuracoes
+from service.registro_fotos import DIRETORIO_FOTOS, registro_fotos
+from service.variantes_fotos import gerar_variantes
 
 logger = logging.getLogger(__name__)
 
+HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+        'AppleWebKit/537.36 (KHTML, like Gecko) '
+        'Chrome/125.0.0.0 Safari/537.36'
+    )
+}
 
-def buscar_codigo_lattes(id_lattes: str) -> Optional[str]:
-    """
-    Busca o “código K” no serviço buscatextual.cnpq.br, a partir do id_lattes.
+# Respostas que valem nova tentativa (limite de taxa e falhas do servidor)
+STATUS_TRANSITORIOS = {429, 500, 502, 503, 504}
 
-    Retorna o código de 10 caracteres (K...) ou None se não encontrar.
-    """
-    url = f'https://buscatextual.cnpq.br/buscatextual/cv?id={id_lattes}'
-    headers = {
-        'User-Agent': (
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-            'AppleWebKit/537.36 (KHTML, like Gecko) '
-            'Chrome/125.0.0.0 Safari/537.36'
-        )
-    }
-
-    try:
-        with httpx.Client(follow_redirects=False, headers=headers) as client:
-            resposta = client.get(url, timeout=30.0)
-    except Exception as e:
-        logger.error(f"Falha na requisição para buscar código K com o id_lattes {id_lattes}: {e}")
-        return None
+# Resultado de cada pesquisador: a foto foi salva, já estava atualizada, o CNPq não tem
+# foto ou código K para ele (definitivos) ou houve falha de rede (tenta de novo depois)
+BAIXADA, INALTERADA, SEM_FOTO, SEM_CODIGO, FALHA = "baixada", "inalterada", "sem_foto", "sem_codigo", "falha"
 
-    if resposta.status_code == HTTPStatus.FOUND:
-        codigo = resposta.headers.get("Location", "")[-10:]
-        logger.info(f"Código K encontrado para {id_lattes}: {codigo}")
-        return codigo
-        
-    logger.warning(f"Código K não encontrado para {id_lattes} (status {resposta.status_code})")
-    return None
+# (id_pesquisador, status, codigo_k, etag, hash) gravado pelo DAO
+ResultadoFoto = Tuple[str, str, Optional[str], Optional[str], Optional[str]]
 
 
-def baixar_foto_pesquisador(codigo_k: str, id_lattes: str) -> bool:
-    """
-    Baixa a foto do pesquisador a partir do código K e
-    salva em imagens/pesquisadores/{id_lattes}.jpg.
+class FalhaTransitoriaError(RuntimeError):
+    """O CNPq não respondeu depois de todas as tentativas"""
+
+
+class LimitadorHosts:
+    """Espaça as requisições de cada host para no máximo `por_segundo` por segundo"""
 
-    Retorna True se conseguiu salvar (status 200), False caso contrário.
-    Em caso de falha, tenta novamente uma vez antes de desistir.
+    def __init__(self, por_segundo: float):
+        self.intervalo = 1.0 / por_segundo if por_segundo > 0 else 0.0
+        self._proximo: Dict[str, float] = {}
+
+    async def aguardar(self, host: str) -> None:
+        # Sem await entre ler e reservar o horário: no event loop isso já é atômico
+        agora = time.monotonic()
+        inicio = max(agora, self._proximo.get(host, 0.0))
+        self._proximo[host] = inicio + self.intervalo
+        if inicio > agora:
+            await asyncio.sleep(inicio - agora)
+
+
+class SincronizadorFotos:
+    """
+    Sincroniza as fotos dos pesquisadores com o Lattes.
+
+    Para cada pesquisador, obtém o código K (pelo redirecionamento do buscatextual, só se
+    ainda não estiver guardado) e baixa a foto do servicosweb. Usa um único httpx.AsyncClient
+    com keep-alive, até FOTO_CONCORRENCIA pesquisadores ao mesmo tempo e no máximo
+    FOTO_REQUISICOES_POR_SEGUNDO por host. Fotos já baixadas são pedidas com If-None-Match
+    (ETag) e só são regravadas se o conteúdo (SHA-256) mudou. Os resultados são entregues
+    em lotes para o DAO gravar.
     """
-    
-    url = f"http://servicosweb.cnpq.br/wspessoa/servletrecuperafoto?tipo=1&id={codigo_k}"
-    max_tentativas = 2
 
-    for tentativa in range(1, max_tentativas + 1):
-        try:
-            resposta = requests.get(url, timeout=10)
-        except Exception as e:           
-            logger.error(f"Erro na tentativa {tentativa} ao baixar foto K={codigo_k}: {e}")
-            if tentativa == max_tentativas:
-                return False
-            continue
-
-        if resposta.status_code != HTTPStatus.OK:
-            logger.warning(
-                f"Falha na tentativa {tentativa} ao baixar foto (K={codigo_k}): "
-                f"status {resposta.status_code}"
-            )
-            if tentativa == max_tentativas:
-                return False
-            continue
-
-        destino = Path(__file__).parents[1] / "imagens" / "pesquisadores"
-        destino.mkdir(parents=True, exist_ok=True)
-        arquivo = destino / f"{id_lattes}.jpg"
+    def __init__(self, concorrencia: Optional[int] = None, requisicoes_por_segundo: Optional[float] = None,
+                 tentativas: Optional[int] = None, url_busca: Optional[str] = None,
+                 url_foto: Optional[str] = None, diretorio: Path = DIRETORIO_FOTOS, timeout: float = 30.0):
+        self.concorrencia = concorrencia or configuracoes.FOTO_CONCORRENCIA
+        self.tentativas = tentativas or configuracoes.FOTO_TENTATIVAS
+        if requisicoes_por_segundo is None:
+            requisicoes_por_segundo = configuracoes.FOTO_REQUISICOES_POR_SEGUNDO
+        self.limitador = LimitadorHosts(requisicoes_por_segundo)
+        self.url_busca = (url_busca or configuracoes.LATTES_BUSCA_URL).rstrip("/")
+        self.url_foto = (url_foto or configuracoes.LATTES_FOTO_URL).rstrip("/")
+        self.diretorio = diretorio
+        self.timeout = timeout
+
+        self.requisicoes = 0
+        self.novas_tentativas = 0
+
+    async def sincronizar(self, pesquisadores: List[Dict], gravar: Callable[[List[ResultadoFoto]], None],
+                          lote: Optional[int] = None, progresso: Optional[Callable[[Dict], None]] = None) -> Dict[str, int]:
+        """
+        Processa os pesquisadores ({"id_pesquisador", "id_lattes", "codigo_k", "etag", "hash"})
+        e chama `gravar(resultados)` (numa thread, fora do event loop) a cada `lote` resultados.
+        Retorna a contagem por status.
+        """
+        lote = lote or configuracoes.FOTO_LOTE_ESCRITA
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        contagem = {status: 0 for status in (BAIXADA, INALTERADA, SEM_FOTO, SEM_CODIGO, FALHA)}
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        pendentes: List[ResultadoFoto] = []
+
+        async def processar(client: httpx.AsyncClient, pesquisador: Dict) -> ResultadoFoto:
+            async with semaforo:
+                try:
+                    return await self._processar(client, pesquisador)
+                except FalhaTransitoriaError as erro:
+                    logger.error(str(erro))
+                except Exception:
+                    logger.exception(f"Erro inesperado ao sincronizar foto do Lattes {pesquisador['id_lattes']}")
+                return (pesquisador["id_pesquisador"], FALHA, None, None, None)
+
+        limites = httpx.Limits(max_connections=self.concorrencia, max_keepalive_connections=self.concorrencia)
+        async with httpx.AsyncClient(headers=HEADERS, timeout=self.timeout, limits=limites,
+                                     follow_redirects=False) as client:
+            tarefas = [asyncio.create_task(processar(client, pesquisador)) for pesquisador in pesquisadores]
+            for processado, tarefa in enumerate(asyncio.as_completed(tarefas), start=1):
+                resultado = await tarefa
+                contagem[resultado[1]] += 1
+                # Falhas de rede não são gravadas: o pesquisador continua pendente
+                if resultado[1] != FALHA:
+                    pendentes.append(resultado)
+                if len(pendentes) >= lote:
+                    await asyncio.to_thread(gravar, pendentes)
+                    pendentes = []
+                if progresso:
+                    progresso(dict(contagem, processados=processado, total=len(pesquisadores)))
+
+            if pendentes:
+                await asyncio.to_thread(gravar, pendentes)
+
+        return contagem
+
+    async def _processar(self, client: httpx.AsyncClient, pesquisador: Dict) -> ResultadoFoto:
+        id_pesquisador, id_lattes = pesquisador["id_pesquisador"], pesquisador["id_lattes"]
+
+        codigo_k = pesquisador.get("codigo_k") or await self._buscar_codigo(client, id_lattes)
+        if not codigo_k:
+            return (id_pesquisador, SEM_CODIGO, None, None, None)
+
+        arquivo = self.diretorio / f"{id_lattes}.jpg"
+        etag_anterior = pesquisador.get("etag") if arquivo.exists() else None
+        headers = {"If-None-Match": etag_anterior} if etag_anterior else None
+
+        resposta = await self._get(client, f"{self.url_foto}/wspessoa/servletrecuperafoto",
+                                   {"tipo": 1, "id": codigo_k}, headers)
+        if resposta.status_code == HTTPStatus.NOT_MODIFIED:
+            return (id_pesquisador, INALTERADA, codigo_k, etag_anterior, pesquisador.get("hash"))
+        if resposta.status_code != HTTPStatus.OK or not resposta.content:
+            logger.warning(f"Foto não encontrada para Lattes {id_lattes} (status {resposta.status_code})")
+            return (id_pesquisador, SEM_FOTO, codigo_k, None, None)
+
+        etag = resposta.headers.get("ETag")
+        conteudo_hash = hashlib.sha256(resposta.content).hexdigest()
+        # Sem ETag (ou com ETag novo), o hash evita regravar uma foto igual
+        if conteudo_hash == pesquisador.get("hash") and arquivo.exists():
+            return (id_pesquisador, INALTERADA, codigo_k, etag, conteudo_hash)
+
+        await asyncio.to_thread(self._salvar, arquivo, resposta.content)
+        if self.diretorio == registro_fotos.diretorio:
+            registro_fotos.adicionar(id_lattes, arquivo)
+        logger.info(f"Imagem salva em {arquivo}")
+        return (id_pesquisador, BAIXADA, codigo_k, etag, conteudo_hash)
+
+    async def _buscar_codigo(self, client: httpx.AsyncClient, id_lattes: str) -> Optional[str]:
+        """Código K (10 caracteres, K...) do redirecionamento do buscatextual, ou None se não houver"""
+        resposta = await self._get(client, f"{self.url_busca}/buscatextual/cv", {"id": id_lattes})
+        if resposta.status_code == HTTPStatus.FOUND:
+            codigo = resposta.headers.get("Location", "")[-10:]
+            logger.info(f"Código K encontrado para {id_lattes}: {codigo}")
+            return codigo or None
+
+        logger.warning(f"Código K não encontrado para {id_lattes} (status {resposta.status_code})")
+        return None
 
+    async def _get(self, client: httpx.AsyncClient, url: str, parametros: Dict,
+                   headers: Optional[Dict] = None) -> httpx.Response:
+        """GET com limite de taxa por host e novas tentativas em falhas de rede, 429 e 5xx"""
+        host = urlsplit(url).netloc
+        for tentativa in range(1, self.tentativas + 1):
+            await self.limitador.aguardar(host)
+            self.requisicoes += 1
+            try:
+                resposta = await client.get(url, params=parametros, headers=headers)
+            except httpx.TransportError as erro:
+                motivo = repr(erro)
+            else:
+                if resposta.status_code not in STATUS_TRANSITORIOS:
+                    return resposta
+                motivo = f"HTTP {resposta.status_code}"
+
+            if tentativa < self.tentativas:
+                self.novas_tentativas += 1
+                await asyncio.sleep(min(30.0, 2 ** (tentativa - 1)) * (0.5 + random.random()))
+
+        raise FalhaTransitoriaError(f"CNPq indisponível para {url} após {self.tentativas} tentativas: {motivo}")
+
+    @staticmethod
+    def _salvar(arquivo: Path, conteudo: bytes) -> None:
+        # Grava num arquivo temporário e troca: quem estiver servindo a foto nunca lê uma foto pela metade
+        temporario = arquivo.with_suffix(".tmp")
+        temporario.write_bytes(conteudo)
+        temporario.replace(arquivo)
+        # Miniaturas e WebP já saem prontos para as listagens
         try:
-            arquivo.write_bytes(resposta.content)
-            logger.info(f"Imagem salva em {arquivo}")
-            return True
-        except Exception as e:
-            logger.error(
-                f"Erro ao salvar foto na tentativa {tentativa} para {id_lattes}: {e}"
-            )
-            if tentativa == max_tentativas:
-                return False
-        
-    return False
+            gerar_variantes(arquivo)
+        except Exception:
+            logger.exception(f"Erro ao gerar variantes da foto {arquivo.name}")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     teste_lattes = "7401907691814937"
-    logger.info(f"Iniciando busca de código K para Lattes {teste_lattes}")
-    codigo = buscar_codigo_lattes(teste_lattes)
-
-    if not codigo:
-        print(f"Código K não encontrado para {teste_lattes}")
-    else:
-        sucesso = baixar_foto_pesquisador(codigo, teste_lattes)
-        if sucesso:
-            print(f"Foto do pesquisador {teste_lattes} baixada com sucesso.")
-        else:
-            print(f"Falha ao baixar foto para {teste_lattes}.")
\ No newline at end of file
+    logger.info(f"Iniciando sincronização da foto do Lattes {teste_lattes}")
+    contagem = asyncio.run(SincronizadorFotos().sincronizar(
+        [{"id_pesquisador": teste_lattes, "id_lattes": teste_lattes}],
+        gravar=lambda resultados: print(resultados)
+    ))
+    print(contagem)
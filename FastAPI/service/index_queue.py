@@ -0,0 +1,143 @@
+from typing import Callable, Dict, Optional, Set
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# Espera após a primeira alteração antes de aplicar, para juntar escritas próximas num só lote
+DEBOUNCE_SECONDS = 1.0
+# Espera antes de tentar de novo um lote que falhou
+RETRY_SECONDS = 30.0
+
+
+class IndexQueue:
+    """
+    Fila de alterações pendentes para o índice semântico.
+
+    Os DAOs enfileiram o que mudaram (chaves de publicações de artigos e IDs de
+    pesquisadores) logo após o commit; uma thread aplica as alterações em lote,
+    fora da requisição. Alterações repetidas do mesmo documento se fundem na fila.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._artigo_keys: Set[str] = set()
+        # id_pesquisador -> True (inserir/atualizar) ou False (remover)
+        self._pesquisadores: Dict[str, bool] = {}
+        self._apply: Optional[Callable[[Set[str], Set[str], Set[str]], None]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.applied_batches = 0
+        self.failed_batches = 0
+
+    def enqueue_artigos(self, *keys: Optional[str]) -> None:
+        """Marca publicações (pela chave normalizada do artigo) para reindexação"""
+        keys = {key for key in keys if key}
+        if not keys:
+            return
+        with self._condition:
+            self._artigo_keys.update(keys)
+            self._condition.notify()
+
+    def enqueue_pesquisador(self, id_pesquisador: str, delete: bool = False) -> None:
+        """Marca um pesquisador para reindexação (ou remoção, com delete=True)"""
+        with self._condition:
+            self._pesquisadores[str(id_pesquisador)] = not delete
+            self._condition.notify()
+
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._artigo_keys) + len(self._pesquisadores)
+
+    def start(self, apply: Callable[[Set[str], Set[str], Set[str]], None]) -> None:
+        """
+        Inicia a thread que aplica os lotes chamando
+        `apply(chaves_artigos, pesquisadores_atualizados, pesquisadores_removidos)`.
+        """
+        with self._condition:
+            if self._running:
+                return
+            self._apply = apply
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="index-queue", daemon=True)
+        self._thread.start()
+        logger.info("Fila de indexação semântica iniciada.")
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Aplica o que ainda estiver pendente e encerra a thread"""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout)
+        logger.info("Fila de indexação semântica encerrada.")
+
+    def flush(self) -> bool:
+        """
+        Aplica imediatamente as alterações pendentes na thread atual.
+        Retorna False se o lote falhou (e voltou para a fila).
+        """
+        if self._apply is None:
+            return True
+
+        with self._condition:
+            keys, self._artigo_keys = self._artigo_keys, set()
+            pesquisadores, self._pesquisadores = self._pesquisadores, {}
+
+        if not keys and not pesquisadores:
+            return True
+
+        upserts = {id_pesquisador for id_pesquisador, upsert in pesquisadores.items() if upsert}
+        deletes = set(pesquisadores) - upserts
+        try:
+            self._apply(keys, upserts, deletes)
+            self.applied_batches += 1
+            return True
+        except Exception:
+            self.failed_batches += 1
+            logger.exception("Erro ao aplicar lote da fila de indexação; as alterações voltam para a fila.")
+            with self._condition:
+                self._artigo_keys.update(keys)
+                for id_pesquisador, upsert in pesquisadores.items():
+                    self._pesquisadores.setdefault(id_pesquisador, upsert)
+            return False
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._artigo_keys and not self._pesquisadores:
+                    self._condition.wait()
+                running = self._running
+
+            if running:
+                # Junta as escritas que chegarem logo em seguida
+                self._wait(DEBOUNCE_SECONDS)
+
+            applied = self.flush()
+
+            if not running:
+                return
+            if not applied:
+                self._wait(RETRY_SECONDS)
+
+    def _wait(self, seconds: float) -> None:
+        """Espera `seconds`, ou menos se a fila for encerrada"""
+        deadline = time.monotonic() + seconds
+        with self._condition:
+            while self._running and time.monotonic() < deadline:
+                self._condition.wait(deadline - time.monotonic())
+
+    def metricas(self) -> Dict:
+        return {
+            "pendentes": self.pending(),
+            "lotes_aplicados": self.applied_batches,
+            "lotes_com_erro": self.failed_batches,
+        }
+
+
+# Instância única compartilhada pelos DAOs e pelo serviço de busca semântica
+index_queue = IndexQueue()
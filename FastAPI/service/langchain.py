@@ -1,29 +1,35 @@
-from typing import List, Dict
-from langchain_openai import OpenAI, OpenAIEmbeddings
+from typing import AsyncIterator, Callable, List, Dict, Optional
+import asyncio
+from langchain_openai import OpenAI
 from langchain.text_splitter import CharacterTextSplitter
 import logging
 from config import configuracoes
 
 # Importar módulos refatorados
 from .langchain_config import LangchainConfig, TemplateManager
-from .langchain_formatters import EmbeddingCache, DocumentFormatter
+from .embedding_cache import CachedEmbeddings, create_embedder
+from .langchain_formatters import DocumentFormatter
 from .langchain_processors import ChunkProcessor
 from .langchain_filters import SimilarityFilter
 from .langchain_generators import ContentGenerator
+from .llm_cache import llm_cache, pesquisador_scope
 
 logger = logging.getLogger(__name__)
 
 
 class LangchainService:
-    """Serviço principal refatorado com responsabilidades bem definidas"""
+    """
+    Serviço principal refatorado com responsabilidades bem definidas.
+    `vector_lookup(tipo, ids)` dá acesso aos vetores já indexados na busca semântica
+    (ver SimilarityFilter), para não embedar de novo os documentos a cada requisição.
+    """
     
-    def __init__(self):
+    def __init__(self, vector_lookup: Optional[Callable[[str, List[str]], Dict[str, List[float]]]] = None):
         self.config = LangchainConfig()
         self._validate_api_key()
         
         # Inicializar componentes
         self.template_manager = TemplateManager()
-        self.embedding_cache = EmbeddingCache()
         self.formatter = DocumentFormatter(self.config)
         self.chunk_processor = ChunkProcessor(self.config)
         
@@ -33,8 +39,10 @@ class LangchainService:
         self.splitter = CharacterTextSplitter(chunk_size=3000, chunk_overlap=50)
         
         # Inicializar filtro e gerador
-        self.similarity_filter = SimilarityFilter(self.config, self.embedding_cache)
-        self.content_generator = ContentGenerator(self.llm, self.template_manager)
+        self.similarity_filter = SimilarityFilter(self.config, vector_lookup)
+        self.content_generator = ContentGenerator(
+            self.llm, self.template_manager, timeout=self.config.LLM_TIMEOUT_SECONDS, cache=llm_cache
+        )
     
     def _validate_api_key(self):
         """Valida se a API key está configurada"""
@@ -52,9 +60,9 @@ class LangchainService:
             max_tokens=500
         )
     
-    def _create_embedder(self) -> OpenAIEmbeddings:
-        """Cria instância do embedder"""
-        return OpenAIEmbeddings(api_key=self.api_key)
+    def _create_embedder(self) -> CachedEmbeddings:
+        """Cria instância do embedder (com o cache de embeddings compartilhado)"""
+        return create_embedder()
     
     def _should_use_chunking(self, user_query: str) -> bool:
         """Determina se deve usar chunking baseado na query"""
@@ -62,11 +70,39 @@ class LangchainService:
     
     def summarize(self, documentos: List[Dict], tipo: str, user_query: str = "") -> str:
         """Método principal de resumo"""
+        content, template_type, entradas = self._build_summary_inputs(documentos, tipo, user_query)
+        return self.content_generator.generate_summary(content, template_type, **entradas)
+    
+    async def asummarize(self, documentos: List[Dict], tipo: str, user_query: str = "") -> str:
+        """
+        Versão assíncrona de summarize. Erros e o tempo limite
+        (asyncio.TimeoutError) são propagados, para quem chama aplicar o próprio fallback.
+        """
+        content, template_type, entradas = await self._abuild_summary_inputs(documentos, tipo, user_query)
+        return await self.content_generator.agenerate_summary(content, template_type, **entradas)
+    
+    async def astream_summary(self, documentos: List[Dict], tipo: str, user_query: str = "") -> AsyncIterator[str]:
+        """
+        Versão de summarize que entrega o resumo em partes, à medida que o LLM as gera.
+        Erros e o tempo limite (asyncio.TimeoutError) são propagados.
+        """
+        content, template_type, entradas = await self._abuild_summary_inputs(documentos, tipo, user_query)
+        async for parte in self.content_generator.astream_summary(content, template_type, **entradas):
+            yield parte
+    
+    async def _abuild_summary_inputs(self, documentos: List[Dict], tipo: str, user_query: str) -> tuple:
+        """_build_summary_inputs fora do event loop quando há consulta (o filtro por similaridade chama o embedder)"""
+        if user_query:
+            return await asyncio.to_thread(self._build_summary_inputs, documentos, tipo, user_query)
+        return self._build_summary_inputs(documentos, tipo, user_query)
+    
+    def _build_summary_inputs(self, documentos: List[Dict], tipo: str, user_query: str) -> tuple:
+        """Conteúdo, template e variáveis extras do resumo dos documentos"""
         if self._should_use_chunking(user_query):
-            return self._summarize_with_chunks(documentos, tipo, user_query)
-        return self._summarize_traditional(documentos, tipo, user_query)
+            return self._chunk_summary_inputs(documentos, tipo, user_query)
+        return self._traditional_summary_inputs(documentos, tipo, user_query)
     
-    def _summarize_with_chunks(self, documentos: List[Dict], tipo: str, user_query: str) -> str:
+    def _chunk_summary_inputs(self, documentos: List[Dict], tipo: str, user_query: str) -> tuple:
         """Resumo otimizado usando chunks semânticos"""
         relevant_chunks = self.similarity_filter.filter_relevant_chunks(
             user_query, documentos, tipo, self.embedder, 
@@ -77,11 +113,9 @@ class LangchainService:
         
         logger.info(f"Gerando resumo com chunking para tipo '{tipo}' usando {len(relevant_chunks)} chunks")
         
-        return self.content_generator.generate_summary(
-            content, "resumo_otimizado", tipo=tipo
-        )
+        return content, "resumo_otimizado", {"tipo": tipo}
     
-    def _summarize_traditional(self, documentos: List[Dict], tipo: str, user_query: str) -> str:
+    def _traditional_summary_inputs(self, documentos: List[Dict], tipo: str, user_query: str) -> tuple:
         """Resumo tradicional sem chunking"""
         if user_query:
             documentos_relevantes = self.similarity_filter.filter_relevant_documents(
@@ -95,7 +129,7 @@ class LangchainService:
         
         logger.info(f"Gerando resumo tradicional do tipo '{tipo}' para {len(documentos_relevantes)} documentos")
         
-        return self.content_generator.generate_summary(content, tipo)
+        return content, tipo, {}
     
     def _build_chunk_content(self, chunks: List[Dict], tipo: str) -> str:
         """Constrói conteúdo a partir dos chunks"""
@@ -127,65 +161,151 @@ class LangchainService:
         return "\n\n".join(chunks)
     
     def gerar_resumo_perfil_pesquisador(self, nome: str, titulo: str, 
-                                      resumo_pessoal: str, producoes: List[Dict]) -> str:
-        """Gera resumo do perfil de pesquisador"""
+                                      resumo_pessoal: str, producoes: List[Dict],
+                                      id_pesquisador: Optional[str] = None) -> str:
+        """Gera resumo do perfil de pesquisador (em cache, invalidado pelo `id_pesquisador`)"""
         try:
-            producoes_formatadas = self.formatter.format_producoes_for_profile(producoes)
-            resumo_limitado = self.formatter._truncate_text(resumo_pessoal, self.config.MAX_RESUMO_CHARS)
-            
-            if resumo_limitado and len(resumo_pessoal) > self.config.MAX_RESUMO_CHARS:
-                resumo_limitado += "..."
-            
-            resumo_limitado = resumo_limitado or "Não informado"
+            producoes_formatadas, entradas = self._build_profile_inputs(nome, titulo, resumo_pessoal, producoes)
             
             logger.info(f"Gerando resumo de perfil para pesquisador: {nome}")
             
             return self.content_generator.generate_summary(
                 producoes_formatadas, "perfil_pesquisador",
-                nome=self.formatter._truncate_text(nome, self.config.MAX_TITULO_CHARS),
-                titulo=self.formatter._truncate_text(titulo, self.config.MAX_TITULO_CHARS),
-                resumo_pessoal=resumo_limitado,
-                producoes=producoes_formatadas
+                cache_scope=pesquisador_scope(id_pesquisador) if id_pesquisador else None, **entradas
             )
             
         except Exception as e:
             logger.exception("Erro ao gerar resumo do perfil do pesquisador")
             return f"Erro ao gerar resumo do perfil: {str(e)}"
     
-    def gerar_tags_pesquisador(self, producoes: List[Dict], user_query: str = "") -> List[str]:
-        """Gera tags para pesquisador"""
+    async def agerar_resumo_perfil_pesquisador(self, nome: str, titulo: str,
+                                             resumo_pessoal: str, producoes: List[Dict],
+                                             id_pesquisador: Optional[str] = None) -> str:
+        """
+        Versão assíncrona de gerar_resumo_perfil_pesquisador. Erros e o tempo limite
+        (asyncio.TimeoutError) são propagados, para quem chama aplicar o próprio fallback.
+        """
+        producoes_formatadas, entradas = self._build_profile_inputs(nome, titulo, resumo_pessoal, producoes)
+        
+        logger.info(f"Gerando resumo de perfil (assíncrono) para pesquisador: {nome}")
+        
+        return await self.content_generator.agenerate_summary(
+            producoes_formatadas, "perfil_pesquisador",
+            cache_scope=pesquisador_scope(id_pesquisador) if id_pesquisador else None, **entradas
+        )
+    
+    async def astream_resumo_perfil_pesquisador(self, nome: str, titulo: str,
+                                                resumo_pessoal: str, producoes: List[Dict],
+                                                id_pesquisador: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Versão de agerar_resumo_perfil_pesquisador que entrega o resumo em partes.
+        O resumo completo vai para o cache, onde a fila de resumos o reaproveita.
+        """
+        producoes_formatadas, entradas = self._build_profile_inputs(nome, titulo, resumo_pessoal, producoes)
+        
+        logger.info(f"Gerando resumo de perfil (streaming) para pesquisador: {nome}")
+        
+        async for parte in self.content_generator.astream_summary(
+            producoes_formatadas, "perfil_pesquisador",
+            cache_scope=pesquisador_scope(id_pesquisador) if id_pesquisador else None, **entradas
+        ):
+            yield parte
+    
+    def _build_profile_inputs(self, nome: str, titulo: str, resumo_pessoal: str,
+                              producoes: List[Dict]) -> tuple:
+        """Monta o conteúdo e as variáveis do template perfil_pesquisador"""
+        producoes_formatadas = self.formatter.format_producoes_for_profile(producoes)
+        resumo_limitado = self.formatter._truncate_text(resumo_pessoal, self.config.MAX_RESUMO_CHARS)
+        
+        if resumo_limitado and len(resumo_pessoal) > self.config.MAX_RESUMO_CHARS:
+            resumo_limitado += "..."
+        
+        entradas = {
+            "nome": self.formatter._truncate_text(nome, self.config.MAX_TITULO_CHARS),
+            "titulo": self.formatter._truncate_text(titulo, self.config.MAX_TITULO_CHARS),
+            "resumo_pessoal": resumo_limitado or "Não informado",
+            "producoes": producoes_formatadas
+        }
+        return producoes_formatadas, entradas
+    
+    def gerar_tags_pesquisador(self, producoes: List[Dict], user_query: str = "",
+                               id_pesquisador: Optional[str] = None) -> List[str]:
+        """Gera tags para pesquisador (em cache, invalidadas pelo `id_pesquisador`)"""
         try:
             if not producoes:
                 return ["Pesquisa Acadêmica", "Ciência", "Produção Científica"]
             
-            if self._should_use_chunking(user_query):
-                content = self._build_tags_content_with_chunks(producoes, user_query, "artigo")
-            else:
-                content = self._build_tags_content_traditional(producoes, user_query, "artigo")
-            
-            return self.content_generator.generate_tags(content, "tags_pesquisador", max_tags=8)
+            content = self._build_researcher_tags_content(producoes, user_query)
+            return self.content_generator.generate_tags(
+                content, "tags_pesquisador", max_tags=8,
+                cache_scope=pesquisador_scope(id_pesquisador) if id_pesquisador else None
+            )
             
         except Exception:
             logger.exception("Erro ao gerar tags do pesquisador")
             return ["Pesquisa Acadêmica", "Ciência", "Produção Científica"]
     
+    async def agerar_tags_pesquisador(self, producoes: List[Dict], user_query: str = "",
+                                      id_pesquisador: Optional[str] = None) -> List[str]:
+        """
+        Versão assíncrona de gerar_tags_pesquisador. Erros e o tempo limite
+        (asyncio.TimeoutError) são propagados, para quem chama aplicar o próprio fallback.
+        """
+        if not producoes:
+            return ["Pesquisa Acadêmica", "Ciência", "Produção Científica"]
+        
+        if user_query:
+            # O filtro por similaridade chama o embedder de forma síncrona
+            content = await asyncio.to_thread(self._build_researcher_tags_content, producoes, user_query)
+        else:
+            content = self._build_researcher_tags_content(producoes, user_query)
+        
+        return await self.content_generator.agenerate_tags(
+            content, "tags_pesquisador", max_tags=8,
+            cache_scope=pesquisador_scope(id_pesquisador) if id_pesquisador else None
+        )
+    
+    def _build_researcher_tags_content(self, producoes: List[Dict], user_query: str) -> str:
+        """Conteúdo do template tags_pesquisador a partir das produções"""
+        if self._should_use_chunking(user_query):
+            return self._build_tags_content_with_chunks(producoes, user_query, "artigo")
+        return self._build_tags_content_traditional(producoes, user_query, "artigo")
+    
     def gerar_tags_artigo(self, documentos: List[Dict], user_query: str = "") -> List[str]:
         """Gera tags para artigos"""
         try:
             if not documentos:
                 return ["Pesquisa Científica", "Artigo Acadêmico"]
             
-            if self._should_use_chunking(user_query):
-                content = self._build_tags_content_with_chunks(documentos, user_query, "artigo")
-            else:
-                content = self._build_tags_content_traditional(documentos, user_query, "artigo")
-            
+            content = self._build_article_tags_content(documentos, user_query)
             return self.content_generator.generate_tags(content, "tags_artigo", max_tags=5)
             
         except Exception:
             logger.exception("Erro ao gerar tags dos artigos")
             return ["Pesquisa Científica", "Artigo Acadêmico", "Ciência"]
     
+    async def agerar_tags_artigo(self, documentos: List[Dict], user_query: str = "") -> List[str]:
+        """
+        Versão assíncrona de gerar_tags_artigo. Erros e o tempo limite
+        (asyncio.TimeoutError) são propagados, para quem chama aplicar o próprio fallback.
+        """
+        if not documentos:
+            return ["Pesquisa Científica", "Artigo Acadêmico"]
+        
+        if user_query:
+            # O filtro por similaridade chama o embedder de forma síncrona
+            content = await asyncio.to_thread(self._build_article_tags_content, documentos, user_query)
+        else:
+            content = self._build_article_tags_content(documentos, user_query)
+        
+        return await self.content_generator.agenerate_tags(content, "tags_artigo", max_tags=5)
+    
+    def _build_article_tags_content(self, documentos: List[Dict], user_query: str) -> str:
+        """Conteúdo do template tags_artigo a partir dos artigos"""
+        if self._should_use_chunking(user_query):
+            return self._build_tags_content_with_chunks(documentos, user_query, "artigo")
+        return self._build_tags_content_traditional(documentos, user_query, "artigo")
+    
     def _build_tags_content_with_chunks(self, documentos: List[Dict], 
                                        user_query: str, doc_type: str) -> str:
         """Constrói conteúdo para tags usando chunks"""
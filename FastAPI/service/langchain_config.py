@@ -27,6 +27,9 @@ class LangchainConfig:
     
     # Query mínima para chunking
     MIN_QUERY_LENGTH: int = 10
+    
+    # Tempo limite (s) de cada chamada assíncrona ao LLM
+    LLM_TIMEOUT_SECONDS: float = 20.0
 
 
 class TemplateManager:
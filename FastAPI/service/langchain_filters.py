@@ -1,24 +1,32 @@
-from typing import List, Dict, Optional
-from langchain_openai import OpenAIEmbeddings
+from typing import Callable, List, Dict, Optional
+from langchain_core.embeddings import Embeddings
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
 import logging
 from .langchain_config import LangchainConfig
-from .langchain_formatters import EmbeddingCache, DocumentFormatter
+from .langchain_formatters import DocumentFormatter
 from .langchain_processors import ChunkProcessor
+from .vector_stores import document_text
 
 logger = logging.getLogger(__name__)
 
 
 class SimilarityFilter:
-    """Responsável por filtrar conteúdo baseado em similaridade"""
+    """
+    Responsável por filtrar conteúdo baseado em similaridade.
+    Os embeddings passam pelo cache compartilhado (service/embedding_cache.py) do embedder recebido.
+
+    `vector_lookup(tipo, ids)`, se informado, devolve os vetores já indexados na busca
+    semântica por ID do documento; só os documentos fora do índice são embedados.
+    """
     
-    def __init__(self, config: LangchainConfig, embedding_cache: EmbeddingCache):
+    def __init__(self, config: LangchainConfig,
+                 vector_lookup: Optional[Callable[[str, List[str]], Dict[str, List[float]]]] = None):
         self.config = config
-        self.embedding_cache = embedding_cache
+        self.vector_lookup = vector_lookup
     
     def filter_relevant_chunks(self, user_query: str, documentos: List[Dict], 
-                             doc_type: str, embedder: OpenAIEmbeddings,
+                             doc_type: str, embedder: Embeddings,
                              formatter: DocumentFormatter, 
                              chunk_processor: ChunkProcessor,
                              max_chunks: Optional[int] = None) -> List[Dict]:
@@ -29,7 +37,7 @@ class SimilarityFilter:
             return documentos
         
         try:
-            query_embedding = self.embedding_cache.get_or_create_embedding(user_query, embedder)
+            query_embedding = embedder.embed_query(user_query)
             all_chunks = self._create_all_chunks(documentos, doc_type, formatter, chunk_processor)
             
             if not all_chunks:
@@ -45,7 +53,7 @@ class SimilarityFilter:
             return documentos
     
     def filter_relevant_documents(self, user_query: str, documentos: List[Dict], 
-                                doc_type: str, embedder: OpenAIEmbeddings,
+                                doc_type: str, embedder: Embeddings,
                                 formatter: DocumentFormatter,
                                 max_docs: Optional[int] = None) -> List[Dict]:
         """Filtra documentos mais relevantes usando embeddings"""
@@ -56,8 +64,7 @@ class SimilarityFilter:
         
         try:
             query_embedding = embedder.embed_query(user_query)
-            doc_texts = [formatter.format_for_display(doc, doc_type) for doc in documentos]
-            doc_embeddings = embedder.embed_documents(doc_texts)
+            doc_embeddings = self._document_embeddings(documentos, doc_type, embedder, formatter)
             
             similarities = self._calculate_similarities(query_embedding, doc_embeddings)
             relevant_docs = self._get_top_documents(documentos, similarities, max_docs)
@@ -69,6 +76,36 @@ class SimilarityFilter:
             logger.warning(f"Erro ao filtrar documentos: {e}")
             return documentos[:max_docs]
     
+    def _document_embeddings(self, documentos: List[Dict], doc_type: str,
+                             embedder: Embeddings, formatter: DocumentFormatter) -> List[List[float]]:
+        """Vetores dos documentos: os do índice semântico, quando houver, e os demais gerados"""
+        stored = self._stored_vectors(documentos, doc_type)
+        
+        missing = [i for i, doc in enumerate(documentos) if str(doc.get('id')) not in stored]
+        # Mesmo texto do índice, para que os vetores gerados e os armazenados sejam comparáveis
+        embedded = embedder.embed_documents(
+            [document_text(documentos[i], doc_type) for i in missing]
+        ) if missing else []
+        
+        embeddings = [stored.get(str(doc.get('id'))) for doc in documentos]
+        for i, embedding in zip(missing, embedded):
+            embeddings[i] = embedding
+        
+        logger.debug(f"{len(documentos) - len(missing)} vetores do índice semântico, {len(missing)} gerados")
+        return embeddings
+    
+    def _stored_vectors(self, documentos: List[Dict], doc_type: str) -> Dict[str, List[float]]:
+        """Vetores já indexados na busca semântica, por ID (vazio sem vector_lookup ou em caso de erro)"""
+        ids = [str(doc['id']) for doc in documentos if doc.get('id')]
+        if self.vector_lookup is None or not ids:
+            return {}
+        
+        try:
+            return self.vector_lookup(doc_type, ids)
+        except Exception as e:
+            logger.warning(f"Erro ao buscar vetores do índice semântico: {e}")
+            return {}
+    
     def _create_all_chunks(self, documentos: List[Dict], doc_type: str, 
                           formatter: DocumentFormatter, 
                           chunk_processor: ChunkProcessor) -> List[Dict]:
@@ -88,13 +125,11 @@ class SimilarityFilter:
     
     def _find_most_similar_chunks(self, query_embedding: List[float], 
                                  all_chunks: List[Dict], 
-                                 embedder: OpenAIEmbeddings,
+                                 embedder: Embeddings,
                                  max_chunks: int) -> List[Dict]:
         """Encontra os chunks mais similares à query"""
-        chunk_embeddings = [
-            self.embedding_cache.get_or_create_embedding(chunk['text'], embedder)
-            for chunk in all_chunks
-        ]
+        # Uma única chamada: o cache separa os chunks já conhecidos e envia o restante em lotes
+        chunk_embeddings = embedder.embed_documents([chunk['text'] for chunk in all_chunks])
         
         similarities = self._calculate_similarities(query_embedding, chunk_embeddings)
         
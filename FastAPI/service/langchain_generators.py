@@ -1,37 +1,130 @@
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
 from langchain_core.runnables import Runnable
 from langchain_openai import OpenAI
 from langchain.prompts import PromptTemplate
 from .langchain_config import TemplateManager
+from .llm_cache import LlmResponseCache
 
 
 class ContentGenerator:
-    """Responsável por gerar conteúdo usando LLM"""
+    """
+    Responsável por gerar conteúdo usando LLM.
+    Os métodos `agenerate_*` são as versões assíncronas (ainvoke), com tempo limite por chamada,
+    e `astream_summary` entrega o resumo em partes, à medida que o LLM as gera.
     
-    def __init__(self, llm: OpenAI, template_manager: TemplateManager):
+    Com `cache`, as respostas ficam guardadas (ver LlmResponseCache) e um prompt repetido
+    não chama o LLM. `cache_scope` marca as respostas para invalidação (ex.: por pesquisador).
+    """
+    
+    def __init__(self, llm: OpenAI, template_manager: TemplateManager, timeout: Optional[float] = None,
+                 cache: Optional[LlmResponseCache] = None):
         self.llm = llm
         self.template_manager = template_manager
+        self.timeout = timeout
+        self.cache = cache
     
-    def generate_summary(self, content: str, template_type: str, **kwargs) -> str:
-        """Gera resumo baseado no template"""
+    def _build_runnable(self, template_type: str, input_variables: List[str]) -> Runnable:
+        """Monta a cadeia prompt | LLM do template"""
         template = self.template_manager.get_template(template_type)
-        prompt = PromptTemplate(
-            input_variables=list(kwargs.keys()) + ["content"], 
-            template=template
-        )
-        
-        runnable: Runnable = prompt | self.llm
-        return runnable.invoke({"content": content, **kwargs})
+        prompt = PromptTemplate(input_variables=input_variables, template=template)
+        return prompt | self.llm
     
-    def generate_tags(self, content: str, template_type: str, max_tags: int = 5) -> List[str]:
-        """Gera tags baseadas no conteúdo"""
+    def _cache_key(self, template_type: str, inputs: Dict) -> str:
+        """Chave do cache: template (nome e texto), entradas do prompt e parâmetros do modelo"""
+        llm_params = {
+            "model": getattr(self.llm, "model_name", None),
+            "temperature": getattr(self.llm, "temperature", None),
+            "max_tokens": getattr(self.llm, "max_tokens", None)
+        }
         template = self.template_manager.get_template(template_type)
-        prompt = PromptTemplate(input_variables=["content"], template=template)
+        return self.cache.make_key(template_type, template, inputs, llm_params)
+    
+    def _invoke(self, template_type: str, inputs: Dict, cache_scope: Optional[str] = None) -> str:
+        """Executa o template com as entradas, consultando o cache antes do LLM"""
+        key = self._cache_key(template_type, inputs) if self.cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        resultado = self._build_runnable(template_type, list(inputs.keys())).invoke(inputs)
+        
+        if key:
+            self.cache.put(key, template_type, cache_scope, resultado)
+        return resultado
+    
+    async def _ainvoke(self, template_type: str, inputs: Dict, cache_scope: Optional[str] = None) -> str:
+        """Versão assíncrona de _invoke; o tempo limite vale só para a chamada ao LLM"""
+        key = self._cache_key(template_type, inputs) if self.cache else None
+        if key:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return cached
+        
+        runnable = self._build_runnable(template_type, list(inputs.keys()))
+        resultado = await asyncio.wait_for(runnable.ainvoke(inputs), self.timeout)
         
-        runnable: Runnable = prompt | self.llm
-        resultado = runnable.invoke({"content": content})
+        if key:
+            await self.cache.aput(key, template_type, cache_scope, resultado)
+        return resultado
+    
+    async def _astream(self, template_type: str, inputs: Dict,
+                       cache_scope: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Versão de _ainvoke que entrega a resposta em partes. Em um acerto do cache, a resposta
+        vem inteira em uma parte só; o tempo limite vale para a espera de cada parte.
+        """
+        key = self._cache_key(template_type, inputs) if self.cache else None
+        if key:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        stream = self._build_runnable(template_type, list(inputs.keys())).astream(inputs).__aiter__()
+        partes = []
+        while True:
+            try:
+                parte = await asyncio.wait_for(stream.__anext__(), self.timeout)
+            except StopAsyncIteration:
+                break
+            partes.append(parte)
+            yield parte
         
-        # Processar resultado
+        # Só grava a resposta completa: um stream interrompido não entra no cache
+        if key:
+            await self.cache.aput(key, template_type, cache_scope, "".join(partes))
+    
+    def generate_summary(self, content: str, template_type: str, cache_scope: Optional[str] = None,
+                         **kwargs) -> str:
+        """Gera resumo baseado no template"""
+        return self._invoke(template_type, {"content": content, **kwargs}, cache_scope)
+    
+    def generate_tags(self, content: str, template_type: str, max_tags: int = 5,
+                      cache_scope: Optional[str] = None) -> List[str]:
+        """Gera tags baseadas no conteúdo"""
+        resultado = self._invoke(template_type, {"content": content}, cache_scope)
+        return self._parse_tags(resultado, template_type, max_tags)
+    
+    async def agenerate_summary(self, content: str, template_type: str, cache_scope: Optional[str] = None,
+                                **kwargs) -> str:
+        """Versão assíncrona de generate_summary; levanta asyncio.TimeoutError após `timeout` segundos"""
+        return await self._ainvoke(template_type, {"content": content, **kwargs}, cache_scope)
+    
+    def astream_summary(self, content: str, template_type: str, cache_scope: Optional[str] = None,
+                        **kwargs) -> AsyncIterator[str]:
+        """Versão de agenerate_summary que entrega o resumo em partes (tokens)"""
+        return self._astream(template_type, {"content": content, **kwargs}, cache_scope)
+    
+    async def agenerate_tags(self, content: str, template_type: str, max_tags: int = 5,
+                             cache_scope: Optional[str] = None) -> List[str]:
+        """Versão assíncrona de generate_tags; levanta asyncio.TimeoutError após `timeout` segundos"""
+        resultado = await self._ainvoke(template_type, {"content": content}, cache_scope)
+        return self._parse_tags(resultado, template_type, max_tags)
+    
+    def _parse_tags(self, resultado: str, template_type: str, max_tags: int) -> List[str]:
+        """Separa as tags da resposta do LLM (lista separada por vírgulas)"""
         tags = [tag.strip() for tag in resultado.split(",")]
         tags = [tag for tag in tags if tag][:max_tags]
         
@@ -0,0 +1,139 @@
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+
+from banco.pool_conexoes import PoolEsgotadoError
+from config import configuracoes
+from dao.cache_llm_dao import CacheLlmDAO
+from dao.cache_llm_dao_async import CacheLlmDAOAsync
+
+
+logger = logging.getLogger(__name__)
+
+# A limpeza das respostas vencidas roda a cada tantas gravações
+CLEANUP_EVERY_WRITES = 500
+
+
+def pesquisador_scope(id_pesquisador: str) -> str:
+    """Escopo das respostas geradas a partir dos dados de um pesquisador"""
+    return f"pesquisador:{id_pesquisador}"
+
+
+class LlmResponseCache:
+    """
+    Cache persistente (tabela cache_llm) das respostas do LLM.
+
+    A chave é o hash do nome e do texto do template, das variáveis do prompt e dos
+    parâmetros do modelo: mudar qualquer um deles gera outra chave. As respostas valem
+    por LLM_CACHE_VALIDADE_HORAS e as de um pesquisador são invalidadas (pelo escopo)
+    quando ele ou seus artigos mudam.
+
+    Falhas no banco não impedem a geração: o cache apenas deixa de ser usado.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds or configuracoes.LLM_CACHE_VALIDADE_HORAS * 3600
+        self.dao = CacheLlmDAO()
+        self.dao_async = CacheLlmDAOAsync()
+
+        self._lock = threading.Lock()
+        self._writes_since_cleanup = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(template_type: str, template: str, inputs: Dict, llm_params: Dict) -> str:
+        payload = json.dumps(
+            {"template_type": template_type, "template": template, "inputs": inputs, "llm": llm_params},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            response = self.dao.buscar(key)
+        except (RuntimeError, PoolEsgotadoError):
+            self._error()
+            response = None
+        return self._count(response)
+
+    async def aget(self, key: str) -> Optional[str]:
+        try:
+            response = await self.dao_async.buscar(key)
+        except (RuntimeError, PoolEsgotadoError):
+            self._error()
+            response = None
+        return self._count(response)
+
+    def put(self, key: str, template_type: str, scope: Optional[str], response: str) -> None:
+        try:
+            self.dao.salvar(key, template_type, scope, response, self.ttl_seconds)
+        except (RuntimeError, PoolEsgotadoError):
+            self._error()
+            return
+        if self._cleanup_due():
+            self._cleanup()
+
+    async def aput(self, key: str, template_type: str, scope: Optional[str], response: str) -> None:
+        try:
+            await self.dao_async.salvar(key, template_type, scope, response, self.ttl_seconds)
+        except (RuntimeError, PoolEsgotadoError):
+            self._error()
+            return
+        if self._cleanup_due():
+            await asyncio.to_thread(self._cleanup)
+
+    def invalidate_pesquisadores(self, *ids_pesquisador: Optional[str]) -> None:
+        """Descarta as respostas geradas para os pesquisadores (perfil e tags)"""
+        scopes = {pesquisador_scope(id_pesquisador) for id_pesquisador in ids_pesquisador if id_pesquisador}
+        try:
+            self.dao.invalidar(sorted(scopes))
+        except (RuntimeError, PoolEsgotadoError):
+            # A chave já muda com as entradas do prompt; a invalidação só libera espaço antes
+            self._error()
+
+    def _error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def _count(self, response: Optional[str]) -> Optional[str]:
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def _cleanup_due(self) -> bool:
+        with self._lock:
+            self._writes_since_cleanup += 1
+            if self._writes_since_cleanup < CLEANUP_EVERY_WRITES:
+                return False
+            self._writes_since_cleanup = 0
+            return True
+
+    def _cleanup(self) -> None:
+        try:
+            removed = self.dao.remover_expiradas()
+            if removed:
+                logger.info(f"Cache do LLM: {removed} respostas vencidas removidas.")
+        except (RuntimeError, PoolEsgotadoError):
+            self._error()
+
+    def metricas(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "acertos": self.hits,
+                "falhas": self.misses,
+                "taxa_acerto": round(self.hits / total, 4) if total else None,
+                "erros_banco": self.errors,
+            }
+
+
+# Instância única compartilhada pela geração de conteúdo e pelos DAOs (invalidação)
+llm_cache = LlmResponseCache()
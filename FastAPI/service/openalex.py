@@ -1,37 +1,253 @@
 import logging
-import requests
-from typing import Optional
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import httpx
+
+from config import configuracoes
 
 logger = logging.getLogger(__name__)
 
-def buscar_resumo_openalex(doi: str) -> Optional[str]:
-    url = f"https://api.openalex.org/works/https://doi.org/{doi}"
+# Respostas que valem nova tentativa (limite de taxa e falhas do servidor)
+STATUS_TRANSITORIOS = {429, 500, 502, 503, 504}
+# Espera máxima entre tentativas (s)
+ESPERA_MAXIMA = 30.0
+# Máximo de DOIs por consulta aceito pelo filtro do OpenAlex
+MAXIMO_DOIS_POR_REQUISICAO = 50
+# Campos pedidos ao OpenAlex (select=): o resto do registro não é usado
+CAMPOS = "doi,abstract_inverted_index"
+# Prefixos com que o DOI pode estar gravado ou vir do OpenAlex
+PREFIXOS_DOI = ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "http://dx.doi.org/", "doi:")
 
-    try:
-        resposta = requests.get(url, timeout=10)
-        resposta.raise_for_status()
-        dados = resposta.json()
-        indice_invertido = dados.get("abstract_inverted_index")
 
-        if indice_invertido is None:
-            logger.warning(f"Resumo do artigo não encontrado no OpenAlex: {doi}")
+class OpenAlexIndisponivelError(RuntimeError):
+    """O OpenAlex não respondeu depois de todas as tentativas; o DOI deve ser tentado de novo depois"""
+
+
+def reconstruir_resumo(indice_invertido: Optional[Dict[str, list]]) -> Optional[str]:
+    """Reconstrói o texto do resumo a partir do índice invertido do OpenAlex"""
+    if not indice_invertido:
+        return None
+
+    tamanho_resumo = max(posicao for posicoes in indice_invertido.values() for posicao in posicoes)
+    palavras = [''] * (tamanho_resumo + 1)
+
+    for palavra, posicoes in indice_invertido.items():
+        for posicao in posicoes:
+            palavras[posicao] = palavra
+
+    return ' '.join(palavras)
+
+
+def normalizar_doi(doi: str) -> str:
+    """DOI sem prefixo e em minúsculas, como o OpenAlex compara (ex.: 10.1234/abc)"""
+    doi = doi.strip().lower()
+    for prefixo in PREFIXOS_DOI:
+        if doi.startswith(prefixo):
+            return doi[len(prefixo):]
+    return doi
+
+
+class LimitadorTaxa:
+    """
+    Espaça o início das requisições para no máximo `por_segundo` por segundo,
+    somando todas as threads. `pausar` adia todas elas (ex.: Retry-After de um 429).
+    """
+
+    def __init__(self, por_segundo: float):
+        self.intervalo = 1.0 / por_segundo if por_segundo > 0 else 0.0
+        self._proximo = 0.0
+        self._lock = threading.Lock()
+
+    def aguardar(self) -> None:
+        with self._lock:
+            agora = time.monotonic()
+            inicio = max(agora, self._proximo)
+            self._proximo = inicio + self.intervalo
+        if inicio > agora:
+            time.sleep(inicio - agora)
+
+    def pausar(self, segundos: float) -> None:
+        with self._lock:
+            self._proximo = max(self._proximo, time.monotonic() + segundos)
+
+
+class ClienteOpenAlex:
+    """
+    Cliente da API do OpenAlex para a sincronização de resumos.
+
+    Os DOIs são buscados em lotes de OPENALEX_DOIS_POR_REQUISICAO (filter=doi:a|b|c),
+    pedindo só o DOI e o resumo. Usa uma única conexão HTTP com keep-alive (httpx.Client,
+    seguro entre threads), até OPENALEX_CONCORRENCIA requisições simultâneas e no máximo
+    OPENALEX_REQUISICOES_POR_SEGUNDO por segundo. Com OPENALEX_EMAIL, as requisições
+    entram no "polite pool" do OpenAlex (parâmetro mailto). Limite de taxa (429),
+    erros 5xx e falhas de rede são tentados de novo, com espera exponencial.
+
+        with ClienteOpenAlex() as cliente:
+            for doi, resumo in cliente.buscar_resumos(dois):
+                ...
+    """
+
+    def __init__(self, base_url: Optional[str] = None, email: Optional[str] = None,
+                 concorrencia: Optional[int] = None, requisicoes_por_segundo: Optional[float] = None,
+                 tentativas: Optional[int] = None, dois_por_requisicao: Optional[int] = None,
+                 timeout: float = 10.0):
+        self.concorrencia = concorrencia or configuracoes.OPENALEX_CONCORRENCIA
+        self.dois_por_requisicao = min(MAXIMO_DOIS_POR_REQUISICAO, dois_por_requisicao or configuracoes.OPENALEX_DOIS_POR_REQUISICAO)
+        self.tentativas = tentativas or configuracoes.OPENALEX_TENTATIVAS
+        if requisicoes_por_segundo is None:
+            requisicoes_por_segundo = configuracoes.OPENALEX_REQUISICOES_POR_SEGUNDO
+        # 0 desliga o limite de taxa
+        self.limitador = LimitadorTaxa(requisicoes_por_segundo)
+
+        email = email if email is not None else configuracoes.OPENALEX_EMAIL
+        self.client = httpx.Client(
+            base_url=base_url or configuracoes.OPENALEX_URL,
+            timeout=timeout,
+            params={"mailto": email} if email else None,
+            limits=httpx.Limits(max_connections=self.concorrencia, max_keepalive_connections=self.concorrencia)
+        )
+
+        self._lock = threading.Lock()
+        self.requisicoes = 0
+        self.novas_tentativas = 0
+
+    def __enter__(self) -> "ClienteOpenAlex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.client.close()
+
+    def buscar_resumo(self, doi: str) -> Optional[str]:
+        """
+        Resumo do artigo com o DOI, ou None se o DOI não existir no OpenAlex ou não tiver resumo.
+        Levanta OpenAlexIndisponivelError se todas as tentativas falharem.
+        """
+        resposta = self._get(f"/works/https://doi.org/{doi}", f"DOI {doi}", {"select": CAMPOS})
+        if resposta is None:
             return None
 
-        # Reconstrução do resumo a partir do índice invertido
-        tamanho_resumo = max(posicao for posicoes in indice_invertido.values() for posicao in posicoes)
-        palavras = [''] * (tamanho_resumo + 1)
+        resumo = reconstruir_resumo(resposta.json().get("abstract_inverted_index"))
+        if resumo is None:
+            logger.warning(f"Resumo do artigo não encontrado no OpenAlex: {doi}")
+        return resumo
+
+    def buscar_lote(self, dois: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resumos de até OPENALEX_DOIS_POR_REQUISICAO DOIs (normalizados) numa requisição só,
+        com filter=doi:a|b|c. DOIs ausentes da resposta ficam com None. Se o OpenAlex
+        recusar o filtro (4xx), os DOIs do lote são buscados um a um.
+        """
+        parametros = {"filter": "doi:" + "|".join(dois), "select": CAMPOS, "per-page": len(dois)}
+        resposta = self._get("/works", f"lote de {len(dois)} DOIs", parametros)
+        if resposta is None:
+            logger.warning(f"Filtro por DOI recusado pelo OpenAlex; buscando {len(dois)} DOIs um a um.")
+            return {doi: self.buscar_resumo(doi) for doi in dois}
+
+        encontrados: Dict[str, Optional[str]] = {}
+        for trabalho in resposta.json().get("results", []):
+            if not trabalho.get("doi"):
+                continue
+            doi = normalizar_doi(trabalho["doi"])
+            resumo = reconstruir_resumo(trabalho.get("abstract_inverted_index"))
+            # O mesmo DOI pode estar em mais de um registro; fica o que tiver resumo
+            if resumo or doi not in encontrados:
+                encontrados[doi] = resumo
+
+        for doi in dois:
+            if doi not in encontrados:
+                logger.warning(f"DOI não encontrado no OpenAlex: {doi}")
+            elif encontrados[doi] is None:
+                logger.warning(f"Resumo do artigo não encontrado no OpenAlex: {doi}")
+        return {doi: encontrados.get(doi) for doi in dois}
 
-        for palavra, posicoes in indice_invertido.items():
-            for posicao in posicoes:
-                palavras[posicao] = palavra
+    def buscar_resumos(self, dois: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Busca os resumos dos DOIs em lotes de `dois_por_requisicao`, com até `concorrencia`
+        requisições simultâneas, e retorna (doi, resumo) à medida que cada lote fica pronto,
+        com o DOI como foi recebido. DOIs de lotes cujas tentativas falharam todas são
+        registrados no log e omitidos, para tentar de novo depois.
+        """
+        # Variações do mesmo DOI (maiúsculas, prefixo https://doi.org/) são buscadas uma vez só
+        originais: Dict[str, List[str]] = {}
+        for doi in dois:
+            originais.setdefault(normalizar_doi(doi), []).append(doi)
 
-        return ' '.join(palavras)
+        # "," e "|" são separadores do filtro; esses DOIs vão na rota individual
+        avulsos = [doi for doi in originais if "," in doi or "|" in doi]
+        agrupaveis = [doi for doi in originais if "," not in doi and "|" not in doi]
+        lotes = [
+            agrupaveis[i:i + self.dois_por_requisicao]
+            for i in range(0, len(agrupaveis), self.dois_por_requisicao)
+        ]
 
-    except requests.exceptions.HTTPError as erro_http:
-        if erro_http.response.status_code == 404:
-            logger.warning(f"DOI não encontrado no OpenAlex: {doi}")
-        else:
-            logger.error(f"Erro HTTP ao buscar DOI {doi}: {erro_http}")
-    except Exception as erro:
-        logger.error(f"Erro inesperado ao buscar DOI {doi}: {erro}")
-    return None
\ No newline at end of file
+        with ThreadPoolExecutor(max_workers=self.concorrencia, thread_name_prefix="openalex") as executor:
+            futuros = {executor.submit(self.buscar_lote, lote): lote for lote in lotes}
+            futuros.update({executor.submit(self._buscar_avulso, doi): [doi] for doi in avulsos})
+            for futuro in as_completed(futuros):
+                try:
+                    resumos = futuro.result()
+                except OpenAlexIndisponivelError as erro:
+                    logger.error(str(erro))
+                    continue
+                except Exception:
+                    logger.exception(f"Erro inesperado ao buscar {len(futuros[futuro])} DOIs")
+                    continue
+
+                for doi, resumo in resumos.items():
+                    for original in originais[doi]:
+                        yield original, resumo
+
+    def _buscar_avulso(self, doi: str) -> Dict[str, Optional[str]]:
+        return {doi: self.buscar_resumo(doi)}
+
+    def _get(self, caminho: str, descricao: str, parametros: Optional[dict] = None) -> Optional[httpx.Response]:
+        """GET com limite de taxa e novas tentativas; None em 404 e em erros definitivos (4xx)"""
+        for tentativa in range(1, self.tentativas + 1):
+            self.limitador.aguardar()
+            with self._lock:
+                self.requisicoes += 1
+
+            try:
+                resposta = self.client.get(caminho, params=parametros)
+            except httpx.TransportError as erro:
+                motivo, espera = repr(erro), None
+            else:
+                if resposta.status_code == 404:
+                    logger.warning(f"Não encontrado no OpenAlex: {descricao}")
+                    return None
+                if resposta.status_code not in STATUS_TRANSITORIOS:
+                    if resposta.is_error:
+                        logger.error(f"Erro HTTP {resposta.status_code} ao buscar {descricao}")
+                        return None
+                    return resposta
+                motivo, espera = f"HTTP {resposta.status_code}", self._retry_after(resposta)
+
+            if tentativa == self.tentativas:
+                break
+
+            if espera is None:
+                # Espera exponencial com jitter, para as threads não voltarem juntas
+                espera = min(ESPERA_MAXIMA, 2 ** (tentativa - 1)) * (0.5 + random.random())
+            else:
+                # Retry-After vale para todas as requisições, não só para esta
+                self.limitador.pausar(espera)
+            with self._lock:
+                self.novas_tentativas += 1
+            logger.info(f"OpenAlex: {motivo} ao buscar {descricao}; nova tentativa em {espera:.1f}s.")
+            time.sleep(espera)
+
+        raise OpenAlexIndisponivelError(f"OpenAlex indisponível para {descricao} após {self.tentativas} tentativas: {motivo}")
+
+    @staticmethod
+    def _retry_after(resposta: httpx.Response) -> Optional[float]:
+        try:
+            return min(ESPERA_MAXIMA, float(resposta.headers["Retry-After"]))
+        except (KeyError, ValueError):
+            return None
@@ -0,0 +1,105 @@
+from pathlib import Path
+from typing import Dict, Optional
+
+import logging
+import os
+import threading
+import time
+
+from config import configuracoes
+
+logger = logging.getLogger(__name__)
+
+# Fotos salvas como imagens/pesquisadores/{id_lattes}.jpg
+DIRETORIO_FOTOS = Path(__file__).parents[1] / "imagens" / "pesquisadores"
+# Intervalo mínimo entre conferências da pasta (um stat do diretório, não das fotos)
+INTERVALO_CONFERENCIA = 5.0
+
+
+class RegistroFotos:
+    """
+    Quais pesquisadores (por id_lattes) têm foto em imagens/pesquisadores, e a versão
+    de cada foto (mtime do arquivo), em memória.
+
+    A pasta é listada uma vez; depois, no máximo a cada INTERVALO_CONFERENCIA segundos,
+    um único stat do diretório indica se algum arquivo entrou ou saiu (o mtime muda) e
+    só então ela é listada de novo. A sincronização de fotos registra as fotos que baixa
+    na hora. Gerar a URL da foto de uma listagem não toca mais o disco por pesquisador.
+
+    A URL leva a versão (?v=), então pode ser guardada em cache como imutável: quando
+    a foto muda, a URL muda junto.
+    """
+
+    def __init__(self, diretorio: Path = DIRETORIO_FOTOS):
+        self.diretorio = diretorio
+        # id_lattes -> versão da foto
+        self._fotos: Dict[str, str] = {}
+        self._mtime: Optional[int] = None
+        self._conferido_em: Optional[float] = None
+        self._lock = threading.Lock()
+        self.recargas = 0
+
+    def tem_foto(self, id_lattes: str) -> bool:
+        return self.versao(id_lattes) is not None
+
+    def versao(self, id_lattes: str) -> Optional[str]:
+        self._conferir()
+        return self._fotos.get(id_lattes)
+
+    def url(self, id_lattes: Optional[str], largura: Optional[int] = None) -> str:
+        """
+        URL da foto do pesquisador na largura pedida (padrão FOTO_LARGURA_LISTAGEM),
+        ou da imagem padrão se ele não tiver foto
+        """
+        versao = self.versao(id_lattes) if id_lattes else None
+        if versao is None:
+            return f"{configuracoes.BASE_URL}/imagens/pesquisadores/default.jpg"
+        largura = largura or configuracoes.FOTO_LARGURA_LISTAGEM
+        return f"{configuracoes.BASE_URL}/imagens/pesquisadores/{id_lattes}.jpg?w={largura}&v={versao}"
+
+    def adicionar(self, id_lattes: str, arquivo: Path) -> None:
+        """Registra uma foto recém-gravada, sem esperar a próxima conferência da pasta"""
+        versao = self._versao_arquivo(arquivo.stat())
+        with self._lock:
+            self._fotos[id_lattes] = versao
+
+    def _conferir(self) -> None:
+        agora = time.monotonic()
+        if self._conferido_em is not None and agora - self._conferido_em < INTERVALO_CONFERENCIA:
+            return
+
+        with self._lock:
+            if self._conferido_em is not None and agora - self._conferido_em < INTERVALO_CONFERENCIA:
+                return
+            self._conferido_em = agora
+
+            try:
+                mtime = self.diretorio.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            if mtime == self._mtime and self.recargas:
+                return
+
+            self._fotos = self._listar() if mtime is not None else {}
+            self._mtime = mtime
+            self.recargas += 1
+            logger.info(f"Registro de fotos carregado: {len(self._fotos)} fotos em {self.diretorio}.")
+
+    def _listar(self) -> Dict[str, str]:
+        with os.scandir(self.diretorio) as entradas:
+            return {
+                entrada.name[:-len(".jpg")]: self._versao_arquivo(entrada.stat()) for entrada in entradas
+                if entrada.name.endswith(".jpg") and entrada.name != "default.jpg" and entrada.is_file()
+            }
+
+    @staticmethod
+    def _versao_arquivo(estado: os.stat_result) -> str:
+        return f"{estado.st_mtime_ns:x}"
+
+    def metricas(self) -> Dict:
+        self._conferir()
+        return {"fotos": len(self._fotos), "recargas": self.recargas}
+
+
+# Instância única: DAOs e sincronização de fotos compartilham o mesmo registro
+registro_fotos = RegistroFotos()
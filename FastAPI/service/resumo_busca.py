@@ -0,0 +1,148 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from service.langchain import LangchainService
+from service.semantic_search import semantic_search_service
+
+
+logger = logging.getLogger(__name__)
+
+# Resumos de busca prontos guardados em memória (o cache do LLM guarda as respostas por mais tempo)
+CACHE_TTL_SECONDS = 600
+CACHE_MAX_ENTRIES = 256
+
+FALLBACK_TAGS = ["Pesquisa Científica", "Artigo Acadêmico", "Ciência"]
+
+
+def result_set_hash(termo: str, resultados: List[Dict]) -> str:
+    """Hash do termo normalizado e do conjunto de resultados (ids e conteúdo, na ordem)"""
+    payload = json.dumps(
+        {"termo": " ".join(termo.lower().split()), "resultados": jsonable_encoder(resultados)},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchSummaryService:
+    """
+    Segunda fase da busca de artigos com resumo: a busca devolve os resultados e um token,
+    e o resumo e as tags são resolvidos à parte pelo token.
+
+    O token leva o termo (base64url) e o hash do conjunto de resultados, então qualquer
+    processo da API consegue resolvê-lo. Buscas com o mesmo termo e os mesmos resultados
+    compartilham o resumo: o pronto fica em cache por CACHE_TTL_SECONDS e, enquanto está
+    sendo gerado, as requisições idênticas aguardam a mesma geração (coalescência).
+    """
+
+    def __init__(self, summarizer: LangchainService):
+        self.summarizer = summarizer
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.coalesced = 0
+        self.generated = 0
+
+    @staticmethod
+    def make_token(termo: str, resultados: List[Dict]) -> str:
+        termo_codificado = base64.urlsafe_b64encode(termo.encode("utf-8")).decode("ascii").rstrip("=")
+        return f"{termo_codificado}.{result_set_hash(termo, resultados)}"
+
+    @staticmethod
+    def parse_token(token: str) -> Tuple[str, str]:
+        """Retorna (termo, hash) do token; levanta ValueError se for inválido"""
+        termo_codificado, _, hash_resultados = token.partition(".")
+        if not termo_codificado or len(hash_resultados) != 64:
+            raise ValueError("Token de resumo inválido.")
+        try:
+            termo = base64.urlsafe_b64decode(termo_codificado + "=" * (-len(termo_codificado) % 4)).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError):
+            raise ValueError("Token de resumo inválido.")
+        return termo, hash_resultados
+
+    def cached(self, key: str) -> Optional[Dict]:
+        """Resumo pronto do conjunto de resultados, se ainda estiver no cache"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        created, result = entry
+        if time.monotonic() - created > CACHE_TTL_SECONDS:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def in_flight(self, key: str) -> Optional[asyncio.Task]:
+        return self._in_flight.get(key)
+
+    async def resolve(self, key: str, resultados: List[Dict]) -> Dict:
+        """
+        Retorna {"resumo_ia", "tags"} dos resultados: do cache, da geração já em andamento
+        para o mesmo conjunto ou de uma geração nova.
+        """
+        result = self.cached(key)
+        if result is not None:
+            return result
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.create_task(self._generate(resultados))
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self._in_flight[key] = task
+            self.generated += 1
+
+        # shield: uma requisição cancelada (cliente desconectado) não cancela a geração das outras
+        return await asyncio.shield(task)
+
+    async def _generate(self, resultados: List[Dict]) -> Dict:
+        resumo_ia, tags = await asyncio.gather(
+            self.summarizer.asummarize(resultados, tipo="artigo"),
+            self.summarizer.agerar_tags_artigo(resultados),
+            return_exceptions=True
+        )
+
+        if isinstance(resumo_ia, Exception):
+            # Sem resumo não há o que guardar: a próxima requisição tenta de novo
+            raise resumo_ia
+
+        if isinstance(tags, Exception):
+            logger.warning(f"Erro ao gerar tags dos artigos: {tags!r}")
+            tags = FALLBACK_TAGS
+
+        return {"resumo_ia": resumo_ia, "tags": tags}
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._cache[key] = (time.monotonic(), task.result())
+        self._cache.move_to_end(key)
+        while len(self._cache) > CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
+    def metricas(self) -> Dict:
+        return {
+            "acertos_cache": self.hits,
+            "coalescidas": self.coalesced,
+            "geradas": self.generated,
+            "em_andamento": len(self._in_flight),
+            "entradas_cache": len(self._cache),
+        }
+
+
+# Instância única: a coalescência e o cache valem para todas as requisições do processo
+search_summary_service = SearchSummaryService(
+    LangchainService(vector_lookup=semantic_search_service.document_vectors)
+)
@@ -0,0 +1,70 @@
+from typing import Dict
+import asyncio
+import logging
+
+from dao.pesquisador_dao_async import PesquisadorDAOAsync
+from service.langchain import LangchainService
+from service.semantic_search import semantic_search_service
+
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_TAGS = ["Pesquisa Acadêmica", "Ciência", "Produção Científica"]
+
+
+class ResumoPesquisadorService:
+    """
+    Gera o resumo e as tags de um pesquisador para a fila de resumos (service/resumo_queue.py).
+    Resumo e tags são gerados ao mesmo tempo, com o cache de respostas do LLM: ao tentar
+    de novo, a parte que já tinha dado certo não é gerada outra vez.
+    """
+
+    def __init__(self):
+        self.dao = PesquisadorDAOAsync()
+        self.summarizer = LangchainService(vector_lookup=semantic_search_service.document_vectors)
+
+    async def gerar(self, id_pesquisador: str, ultima_tentativa: bool = False) -> Dict:
+        """
+        Retorna {"resumo_ia", "tags", "erro"}. Falhas do LLM são propagadas para a fila
+        tentar de novo; na última tentativa, a parte que falhou recebe o fallback e o
+        erro é registrado em "erro".
+        """
+        pesquisador, productions = await asyncio.gather(
+            self.dao.obter_pesquisador_por_id(id_pesquisador),
+            self.dao.buscar_artigos_por_pesquisador(id_pesquisador)
+        )
+
+        resumo_ia, tags = await asyncio.gather(
+            self.summarizer.agerar_resumo_perfil_pesquisador(
+                nome=pesquisador.nome,
+                titulo=pesquisador.grau_academico,
+                resumo_pessoal=pesquisador.resumo or "",
+                producoes=productions,
+                id_pesquisador=id_pesquisador
+            ),
+            self.summarizer.agerar_tags_pesquisador(productions, id_pesquisador=id_pesquisador),
+            return_exceptions=True
+        )
+
+        erros = [resultado for resultado in (resumo_ia, tags) if isinstance(resultado, Exception)]
+        if erros and not ultima_tentativa:
+            raise erros[0]
+
+        # Fallbacks quando a IA falha ou estoura o tempo limite em todas as tentativas
+        if isinstance(resumo_ia, Exception):
+            logger.warning(f"Erro ao gerar resumo com IA: {resumo_ia!r}")
+            resumo_ia = f"Pesquisador especializado em {pesquisador.grau_academico} com {len(productions)} publicações acadêmicas."
+
+        if isinstance(tags, Exception):
+            logger.warning(f"Erro ao gerar tags com IA: {tags!r}")
+            tags = FALLBACK_TAGS
+
+        return {
+            "resumo_ia": resumo_ia,
+            "tags": tags,
+            "erro": "; ".join(repr(erro) for erro in erros) or None
+        }
+
+
+# Instância única usada pelos workers da fila de resumos
+resumo_pesquisador_service = ResumoPesquisadorService()
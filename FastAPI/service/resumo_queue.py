@@ -0,0 +1,195 @@
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import logging
+import threading
+
+from banco.pool_conexoes import PoolEsgotadoError
+from config import configuracoes
+from dao.resumo_pesquisador_dao import ResumoPesquisadorDAO
+from dao.resumo_pesquisador_dao_async import ResumoPesquisadorDAOAsync
+
+
+logger = logging.getLogger(__name__)
+
+# Intervalo entre consultas à tabela quando não há aviso de tarefa nova
+# (pega tarefas pedidas por outros processos e as adiadas)
+POLL_SECONDS = 30.0
+# Espera antes de tentar de novo, multiplicada pelo número da tentativa
+RETRY_SECONDS = 60.0
+# Na última tentativa, as partes que falharem recebem o fallback
+MAX_ATTEMPTS = 3
+# Tarefas "processando" há mais tempo que isso são de um worker que caiu
+STALE_AFTER_SECONDS = 600.0
+# Tempo para os workers terminarem a tarefa atual ao encerrar a API
+STOP_TIMEOUT_SECONDS = 30.0
+
+
+class ResumoQueue:
+    """
+    Fila de geração dos resumos e tags dos pesquisadores, guardada na tabela resumo_pesquisador.
+
+    Os DAOs pedem a geração logo após o commit (novo pesquisador, pesquisador ou
+    artigos alterados); workers assíncronos no event loop da API reservam as tarefas
+    com SKIP LOCKED, geram o conteúdo com o LLM e gravam o resultado, que o endpoint
+    de resumo apenas lê. Por estar no banco, a fila sobrevive a reinícios e pode ser
+    consumida por vários processos.
+    """
+
+    def __init__(self):
+        self.dao = ResumoPesquisadorDAO()
+        self.dao_async = ResumoPesquisadorDAOAsync()
+        self._generate: Optional[Callable[[str, bool], Awaitable[Dict]]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._running = False
+
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.superseded = 0
+        self.failed = 0
+        self.request_errors = 0
+
+    def enqueue(self, *ids_pesquisador: Optional[str]) -> None:
+        """Pede a (re)geração do resumo dos pesquisadores; chamado pelos DAOs após o commit"""
+        ids = sorted({str(id_pesquisador) for id_pesquisador in ids_pesquisador if id_pesquisador})
+        if not ids:
+            return
+        try:
+            self.dao.solicitar(ids)
+        except (RuntimeError, PoolEsgotadoError):
+            # O resumo antigo continua sendo servido; a próxima alteração (ou reinício) pede de novo
+            self._count("request_errors")
+            logger.warning(f"Não foi possível pedir a geração do resumo dos pesquisadores {ids}.")
+            return
+        self.wake()
+
+    async def aenqueue(self, id_pesquisador: str) -> bool:
+        """Versão assíncrona de enqueue para um pesquisador; retorna False se ele não existir"""
+        marked = await self.dao_async.solicitar([id_pesquisador])
+        self.wake()
+        return marked > 0
+
+    def enqueue_missing(self) -> None:
+        """Pede a geração para pesquisadores sem resumo e refaz os que terminaram com erro ou fallback"""
+        try:
+            requested = self.dao.solicitar_faltantes()
+        except (RuntimeError, PoolEsgotadoError):
+            self._count("request_errors")
+            return
+        if requested["novos"] or requested["refeitos"]:
+            logger.info(
+                f"Resumos de pesquisadores solicitados: {requested['novos']} novos, "
+                f"{requested['refeitos']} refeitos."
+            )
+        self.wake()
+
+    def wake(self) -> None:
+        """Acorda os workers ociosos; pode ser chamado de qualquer thread"""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def start(self, generate: Callable[[str, bool], Awaitable[Dict]], workers: Optional[int] = None) -> None:
+        """
+        Inicia os workers no event loop atual. `generate(id_pesquisador, ultima_tentativa)`
+        retorna {"resumo_ia", "tags", "erro"}; na última tentativa deve aplicar o fallback
+        em vez de propagar falhas do LLM.
+        """
+        if self._running:
+            return
+        self._generate = generate
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._running = True
+
+        workers = workers or configuracoes.RESUMO_WORKERS
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"resumo-worker-{i}") for i in range(workers)
+        ]
+        logger.info(f"Fila de resumos de pesquisadores iniciada com {workers} workers.")
+
+    async def stop(self) -> None:
+        """Espera os workers terminarem a tarefa atual (até STOP_TIMEOUT_SECONDS) e os encerra"""
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup.set()
+
+        _, pending = await asyncio.wait(self._workers, timeout=STOP_TIMEOUT_SECONDS)
+        for task in pending:
+            # A tarefa interrompida fica "processando" e é retomada depois de STALE_AFTER_SECONDS
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        self._workers = []
+        self._loop = self._wakeup = None
+        logger.info("Fila de resumos de pesquisadores encerrada.")
+
+    async def _worker(self) -> None:
+        while self._running:
+            # Limpa o aviso antes de consultar: um pedido que chegar durante a consulta não se perde
+            self._wakeup.clear()
+            try:
+                task = await self.dao_async.reservar(STALE_AFTER_SECONDS)
+            except Exception:
+                logger.warning("Erro ao reservar tarefa de resumo; nova tentativa em instantes.")
+                task = None
+
+            if task is None:
+                await self._sleep(POLL_SECONDS)
+                continue
+
+            await self._process(*task)
+
+    async def _process(self, id_pesquisador: str, versao: int, tentativas: int) -> None:
+        last_attempt = tentativas >= MAX_ATTEMPTS
+        try:
+            result = await self._generate(id_pesquisador, last_attempt)
+            stored = await self.dao_async.concluir(
+                id_pesquisador, versao, result["resumo_ia"], result["tags"], result.get("erro")
+            )
+        except LookupError:
+            # Pesquisador apagado durante a geração: a tarefa sai junto (ON DELETE CASCADE)
+            return
+        except Exception as e:
+            self._count("failed")
+            logger.warning(f"Erro ao gerar resumo do pesquisador {id_pesquisador} (tentativa {tentativas}): {e!r}")
+            try:
+                await self.dao_async.adiar(id_pesquisador, versao, repr(e), RETRY_SECONDS * tentativas, last_attempt)
+            except Exception:
+                # Sem conseguir registrar a falha, a tarefa é retomada depois de STALE_AFTER_SECONDS
+                pass
+            return
+
+        # Sem gravar, o pesquisador mudou durante a geração e a tarefa continua pendente
+        self._count("completed" if stored else "superseded")
+
+    async def _sleep(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def metricas(self) -> Dict:
+        try:
+            by_status = self.dao.contar_por_status()
+        except (RuntimeError, PoolEsgotadoError):
+            by_status = None
+        with self._lock:
+            return {
+                "por_status": by_status,
+                "workers": len(self._workers),
+                "concluidas": self.completed,
+                "descartadas": self.superseded,
+                "falhas": self.failed,
+                "erros_solicitacao": self.request_errors,
+            }
+
+
+# Instância única compartilhada pelos DAOs, pelo endpoint de resumo e pelo ciclo de vida da API
+resumo_queue = ResumoQueue()
@@ -1,106 +1,159 @@
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional, Set
 import logging
 import os
 
-import faiss
-from langchain_community.docstore.in_memory import InMemoryDocstore
-from langchain_community.vectorstores import FAISS
-from langchain_openai import OpenAIEmbeddings
-from langchain.schema import Document
-
 from config import configuracoes
 from dao.artigo_dao import ArtigoDAO
 from dao.pesquisador_dao import PesquisadorDAO
+from service.embedding_cache import create_embedder
+from service.vector_stores import PgVectorStore
 
 
 logger = logging.getLogger(__name__)
 
-# Diretório comum para todos os índices semânticos
+# Diretório comum para todos os índices semânticos (backend FAISS)
 EMBEDDING_INDEX_DIR = os.getenv("SEMANTIC_INDEX_DIR", "semantic_indexes")
-os.makedirs(EMBEDDING_INDEX_DIR, exist_ok=True)
 
 
 class SemanticSearchService:
-    def __init__(self):        
-        self.embedder = OpenAIEmbeddings(api_key=configuracoes.OPENAI_API_KEY)
+    def __init__(self):
+        self.embedder = create_embedder()
 
-        # Carrega ou cria dois índices distintos em disco: pesquisadores e artigos
+        # Um índice por tipo de documento: pesquisadores e artigos
         self.indices = {
-            "artigo": self._load_or_create_index("faiss_artigo_index"),
-            "pesquisador": self._load_or_create_index("faiss_pesquisador_index"),
+            "artigo": self._create_store("artigo"),
+            "pesquisador": self._create_store("pesquisador"),
         }
 
 
-    def _get_path(self, name: str) -> str:
-        return os.path.join(EMBEDDING_INDEX_DIR, name)
-
-
-    def _load_or_create_index(self, name: str) -> FAISS:
-        path = self._get_path(name)
+    def _create_store(self, tipo: str):
+        if configuracoes.SEMANTIC_BACKEND == "faiss":
+            # FAISS é opcional: só é importado quando escolhido
+            from service.faiss_indexes import FaissVectorStore
+            return FaissVectorStore(tipo, self.embedder, EMBEDDING_INDEX_DIR)
+        return PgVectorStore(tipo, self.embedder)
 
-        try:
-            return FAISS.load_local(
-                path,
-                embeddings=self.embedder,
-                allow_dangerous_deserialization=True
-            )
-        except Exception:
-            faiss_index = faiss.IndexFlatL2(len(self.embedder.embed_query("hello world")))
-
-            return FAISS(
-                embedding_function=self.embedder,
-                index=faiss_index,
-                docstore=InMemoryDocstore(),
-                index_to_docstore_id={}
-            )
 
+    def index_documents(self, docs: List[Dict], tipo: str, keys: Optional[Dict[str, str]] = None) -> int:
+        return self.indices[tipo].index_documents(docs, keys=keys)
 
-    def index_documents(self, docs: List[Dict], tipo: str):
-        index = self.indices[tipo]
-        name = f"faiss_{tipo}_index"
-        
-        existing_docs = {d.metadata["doc"]["id"] for d in index.docstore._dict.values()}
 
-        faiss_docs = []
-        for doc in docs:
-            if doc['id'] not in existing_docs:
-                text = (
-                    f"{doc['name']}: {doc.get('title','')}"
-                    if tipo == "pesquisador"
-                    else f"{doc['title']} - {doc.get('abstract','')}"
-                )
-                faiss_docs.append(Document(page_content=text, metadata={"doc": doc}))
+    def index_all(self, progresso: Optional[Callable[[Dict], None]] = None) -> Dict[str, int]:
+        # Indexa artigos e pesquisadores novos ou alterados e remove os que não existem mais
+        artigos_por_chave = ArtigoDAO().listar_artigos_por_chave()
+        artigos = list(artigos_por_chave.values())
+        chaves = {doc["id"]: chave for chave, doc in artigos_por_chave.items()}
+        pesquisadores = PesquisadorDAO().listar_pesquisadores()
 
-        if faiss_docs:
-            index.add_documents(faiss_docs)
-            index.save_local(self._get_path(name))
+        if progresso:
+            progresso({"fase": "artigos", "artigos": len(artigos), "pesquisadores": len(pesquisadores)})
+        novos_artigos = self.index_documents(artigos, tipo="artigo", keys=chaves)
+        if progresso:
+            progresso({"fase": "pesquisadores", "artigos": len(artigos), "pesquisadores": len(pesquisadores)})
+        novos_pesquisadores = self.index_documents(pesquisadores, tipo="pesquisador")
+
+        removidos = (
+            self.indices["artigo"].remove_missing([doc["id"] for doc in artigos])
+            + self.indices["pesquisador"].remove_missing([doc["id"] for doc in pesquisadores])
+        )
+        self.persist(force=True)
+
+        logger.info(
+            f"{len(artigos)} artigos e {len(pesquisadores)} pesquisadores na busca semântica "
+            f"({novos_artigos + novos_pesquisadores} (re)indexados, {removidos} removidos)."
+        )
+        return {
+            "artigos": len(artigos),
+            "pesquisadores": len(pesquisadores),
+            "reindexados": novos_artigos + novos_pesquisadores,
+            "removidos": removidos,
+        }
 
 
-    def index_all(self):
-        # Recria e indexa todos os artigos e pesquisadores
-        artigos = ArtigoDAO().listar_artigos()
-        pesquisadores = PesquisadorDAO().listar_pesquisadores()
+    def apply_changes(self, chaves_artigos: Set[str], pesquisadores_atualizados: Set[str],
+                      pesquisadores_removidos: Set[str]):
+        """
+        Aplica um lote da fila de indexação (service/index_queue.py): relê do banco só
+        as publicações e pesquisadores alterados, reindexa os que mudaram e remove
+        os que não existem mais.
+        """
+        indexados, removidos = 0, 0
+
+        if chaves_artigos:
+            index = self.indices["artigo"]
+            artigos_por_chave = ArtigoDAO().listar_artigos_por_chave(sorted(chaves_artigos))
+            chaves = {doc["id"]: chave for chave, doc in artigos_por_chave.items()}
+
+            indexados += index.index_documents(list(artigos_por_chave.values()), keys=chaves, refresh=True)
+            # Publicações apagadas (ou recriadas com outro ID) deixam documentos antigos com a mesma chave
+            removidos += index.delete_documents(index.ids_for_keys(chaves_artigos) - set(chaves))
+
+        if pesquisadores_atualizados or pesquisadores_removidos:
+            index = self.indices["pesquisador"]
+            pesquisadores = (
+                PesquisadorDAO().listar_pesquisadores_por_ids(sorted(pesquisadores_atualizados))
+                if pesquisadores_atualizados else []
+            )
+            encontrados = {doc["id"] for doc in pesquisadores}
 
-        self.index_documents(artigos, tipo="artigo")        
-        self.index_documents(pesquisadores, tipo="pesquisador")
+            indexados += index.index_documents(pesquisadores, refresh=True)
+            removidos += index.delete_documents(
+                (pesquisadores_atualizados - encontrados) | pesquisadores_removidos
+            )
 
-        logger.info(f"{len(artigos)} artigos e {len(pesquisadores)} pesquisadores indexados para busca semântica.")
+        self.persist()
+        logger.info(f"Busca semântica atualizada: {indexados} documentos (re)indexados, {removidos} removidos.")
 
 
-    def semantic_search(self, query: str, k: int = 10, tipo: str = 'artigo'):
+    def document_vectors(self, tipo: str, ids: List[str]) -> Dict[str, List[float]]:
+        """
+        Vetores já indexados dos documentos, por ID, para quem precisa comparar documentos
+        com uma consulta sem gerar os embeddings de novo (filtros de relevância dos resumos).
+        IDs fora do índice não aparecem no resultado.
+        """
+        index = self.indices.get(tipo)
+        if index is None or not ids:
+            return {}
+        return index.get_vectors(ids)
+
+
+    def persist(self, force: bool = False):
+        for index in self.indices.values():
+            index.persist(force=force)
+
+
+    def semantic_search(
+        self,
+        query: str,
+        k: int = 10,
+        tipo: str = 'artigo',
+        ano_inicio: Optional[int] = None,
+        ano_fim: Optional[int] = None,
+        qualis: Optional[List[str]] = None,
+        id_instituicao: Optional[str] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None
+    ):
+        """
+        Documentos mais próximos da consulta, como (documento, score). `nprobe` (IVF) e
+        `ef_search` (HNSW) ajustam recall x latência só desta busca.
+        """
         index = self.indices.get(tipo)
-        resultados  = index.similarity_search_with_score(query, k=k)
+        resultados = index.search(
+            query, k,
+            ano_inicio=ano_inicio,
+            ano_fim=ano_fim,
+            qualis=qualis,
+            id_instituicao=id_instituicao,
+            nprobe=nprobe,
+            ef_search=ef_search
+        )
 
         # Define um limiar de corte
         SCORE_THRESHOLD = 0.0
 
-        resultados_filtrados = []
-        for doc, score in resultados:
-            score = float(score)
-            score_similaridade = 1 / (1 + score)
+        return [(doc, score) for doc, score in resultados if score >= SCORE_THRESHOLD]
 
-            if score_similaridade >= SCORE_THRESHOLD:
-                resultados_filtrados.append((doc, score_similaridade))
-                # resultados_filtrados.append((doc, round(score_similaridade, 4)))
 
-        return [(doc.metadata['doc'], score) for doc, score in resultados_filtrados]
\ No newline at end of file
+# Instância única: controllers e fila de indexação compartilham os mesmos índices
+semantic_search_service = SemanticSearchService()
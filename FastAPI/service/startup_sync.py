@@ -0,0 +1,161 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import argparse
+import logging
+import threading
+import time
+
+from banco.conexao_db import Conexao
+from dao.artigo_dao import ArtigoDAO
+from dao.pesquisador_dao import PesquisadorDAO
+from service.semantic_search import semantic_search_service
+
+
+logger = logging.getLogger(__name__)
+
+# Espera antes de tentar de novo uma etapa que falhou, multiplicada pelo número da tentativa
+RETRY_SECONDS = 60.0
+# Tentativas por etapa; depois disso ela fica como "falhou" até a próxima inicialização
+MAX_ATTEMPTS = 3
+
+# Etapa: recebe uma função para informar o andamento (ex.: {"processados": 10, "total": 200})
+Etapa = Callable[[Callable[[Dict], None]], Optional[Dict]]
+
+
+class StartupSync:
+    """
+    Sincronização dos dados externos que antes bloqueava a inicialização da API:
+    resumos do OpenAlex, fotos do Lattes e indexação semântica.
+
+    As etapas rodam em ordem numa thread supervisionada, depois que a API já está
+    aceitando requisições: uma etapa que falha é tentada de novo (até MAX_ATTEMPTS)
+    sem impedir as seguintes, e o andamento de cada uma aparece em `GET /health/ready`
+    e `GET /metricas`. As mesmas etapas podem rodar fora da API, como processo
+    separado (`python -m service.startup_sync`).
+    """
+
+    def __init__(self):
+        self._etapas: List[Tuple[str, Etapa]] = []
+        self._estado: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def adicionar(self, nome: str, etapa: Etapa) -> None:
+        """Registra uma etapa, executada na ordem em que foi adicionada"""
+        self._etapas.append((nome, etapa))
+        with self._lock:
+            self._estado[nome] = {"status": "pendente", "tentativas": 0}
+
+    def start(self) -> None:
+        """Executa as etapas numa thread em segundo plano e retorna logo"""
+        if self._thread is not None:
+            return
+        self._parar.clear()
+        self._thread = threading.Thread(target=self.executar, name="startup-sync", daemon=True)
+        self._thread.start()
+        logger.info(f"Sincronização em segundo plano iniciada: {', '.join(self.nomes())}.")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Não começa novas etapas nem tentativas. A etapa em andamento não é interrompida:
+        o que ela não gravou continua pendente no banco e é retomado na próxima execução.
+        """
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning("Sincronização ainda em andamento ao encerrar; será retomada na próxima inicialização.")
+            self._thread = None
+
+    def nomes(self) -> List[str]:
+        return [nome for nome, _ in self._etapas]
+
+    def executar(self, nomes: Optional[Iterable[str]] = None) -> bool:
+        """
+        Executa as etapas (todas, ou só as de `nomes`) na thread atual;
+        retorna False se alguma falhou em todas as tentativas.
+        """
+        nomes = set(nomes) if nomes else None
+        sucesso = True
+        for nome, etapa in self._etapas:
+            if self._parar.is_set():
+                break
+            if nomes is not None and nome not in nomes:
+                continue
+            sucesso = self._executar_etapa(nome, etapa) and sucesso
+        return sucesso
+
+    def _executar_etapa(self, nome: str, etapa: Etapa) -> bool:
+        for tentativa in range(1, MAX_ATTEMPTS + 1):
+            self._atualizar(nome, status="executando", tentativas=tentativa, inicio=time.time(),
+                            fim=None, progresso=None, proxima_tentativa=None)
+            inicio = time.monotonic()
+            try:
+                resultado = etapa(lambda progresso: self._atualizar(nome, progresso=progresso))
+            except Exception as e:
+                logger.exception(f"Erro na sincronização '{nome}' (tentativa {tentativa} de {MAX_ATTEMPTS})")
+                ultima = tentativa == MAX_ATTEMPTS
+                espera = RETRY_SECONDS * tentativa
+                self._atualizar(
+                    nome, status="falhou" if ultima else "aguardando", fim=time.time(), erro=str(e) or repr(e),
+                    proxima_tentativa=None if ultima else time.time() + espera
+                )
+                # Espera interrompível: ao encerrar a API, não fica esperando para tentar de novo
+                if ultima or self._parar.wait(espera):
+                    return False
+                continue
+
+            duracao = time.monotonic() - inicio
+            self._atualizar(nome, status="concluida", fim=time.time(),
+                            duracao_s=round(duracao, 1), resultado=resultado)
+            logger.info(f"Sincronização '{nome}' concluída em {duracao:.1f}s.")
+            return True
+        return False
+
+    def _atualizar(self, nome: str, **campos) -> None:
+        with self._lock:
+            self._estado[nome].update(campos)
+
+    def metricas(self) -> Dict:
+        with self._lock:
+            etapas = {nome: dict(estado) for nome, estado in self._estado.items()}
+        status = [estado["status"] for estado in etapas.values()]
+        if all(s == "concluida" for s in status):
+            geral = "concluida"
+        elif "executando" in status or "aguardando" in status:
+            geral = "executando"
+        elif "falhou" in status and "pendente" not in status:
+            geral = "falhou"
+        else:
+            geral = "pendente"
+        return {"status": geral, "etapas": etapas}
+
+
+# Instância única: a API a executa em segundo plano e publica o andamento; o CLI a executa direto.
+# A indexação vem por último porque usa os resumos sincronizados antes
+startup_sync = StartupSync()
+startup_sync.adicionar("resumos_openalex", lambda progresso: ArtigoDAO().sincronizar_resumos(progresso))
+startup_sync.adicionar("fotos_lattes", lambda progresso: PesquisadorDAO().sincronizar_fotos(progresso))
+startup_sync.adicionar("indexacao_semantica", semantic_search_service.index_all)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sincroniza resumos do OpenAlex, fotos do Lattes e a busca semântica fora da API."
+    )
+    parser.add_argument("--etapa", action="append", choices=startup_sync.nomes(),
+                        help="Executa só esta etapa (pode repetir; padrão: todas)")
+    argumentos = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    Conexao.inicializar_pool()
+    try:
+        sucesso = startup_sync.executar(argumentos.etapa)
+    finally:
+        Conexao.fechar_todas_conexoes()
+    raise SystemExit(0 if sucesso else 1)
+
+
+if __name__ == "__main__":
+    main()
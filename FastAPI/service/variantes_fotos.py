@@ -0,0 +1,119 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Larguras das miniaturas (px); um pedido com ?w= recebe a menor que o atende
+LARGURAS = (96, 192, 384, 768)
+QUALIDADE_JPEG = 85
+QUALIDADE_WEBP = 80
+# Variantes ficam em imagens/pesquisadores/variantes/{id_lattes}-{largura}.{jpg,webp}
+SUBDIRETORIO = "variantes"
+
+_geracao_lock = threading.Lock()
+_pillow_ausente_avisado = False
+
+
+def largura_variante(largura: Optional[int]) -> Optional[int]:
+    """Menor largura gerada que atende ao pedido; None para o tamanho original"""
+    if not largura:
+        return None
+    for largura_gerada in LARGURAS:
+        if largura_gerada >= largura:
+            return largura_gerada
+    return None
+
+
+def caminho_variante(original: Path, largura: Optional[int], formato: str) -> Path:
+    nome = f"{original.stem}-{largura}.{formato}" if largura else f"{original.stem}.{formato}"
+    return original.parent / SUBDIRETORIO / nome
+
+
+def gerar_variantes(original: Path) -> int:
+    """
+    Gera as miniaturas (JPEG e WebP) e a versão WebP do tamanho original da foto.
+    Retorna quantas variantes foram gravadas; 0 se o Pillow não estiver instalado
+    (as fotos continuam sendo servidas no original).
+    """
+    global _pillow_ausente_avisado
+    try:
+        # Pillow é opcional: só é importado quando há variantes a gerar
+        from PIL import Image
+    except ImportError:
+        if not _pillow_ausente_avisado:
+            logger.warning("Pillow não instalado: fotos servidas sem miniaturas nem WebP.")
+            _pillow_ausente_avisado = True
+        return 0
+
+    destino = original.parent / SUBDIRETORIO
+    destino.mkdir(parents=True, exist_ok=True)
+    gravadas = 0
+
+    with Image.open(original) as imagem:
+        imagem = imagem.convert("RGB")
+        _salvar(imagem, caminho_variante(original, None, "webp"), "WEBP", QUALIDADE_WEBP)
+        gravadas += 1
+
+        for largura in LARGURAS:
+            miniatura = imagem.copy()
+            # thumbnail mantém a proporção e nunca amplia a foto
+            miniatura.thumbnail((largura, largura * 4), Image.LANCZOS)
+            _salvar(miniatura, caminho_variante(original, largura, "jpg"), "JPEG", QUALIDADE_JPEG)
+            _salvar(miniatura, caminho_variante(original, largura, "webp"), "WEBP", QUALIDADE_WEBP)
+            gravadas += 2
+
+    return gravadas
+
+
+def _salvar(imagem, arquivo: Path, formato: str, qualidade: int) -> None:
+    # Arquivo temporário + troca: nunca se serve uma variante pela metade
+    temporario = arquivo.with_name(arquivo.name + ".tmp")
+    imagem.save(temporario, formato, quality=qualidade, optimize=True)
+    temporario.replace(arquivo)
+
+
+def obter_variante(original: Path, largura: Optional[int], webp: bool) -> Path:
+    """
+    Arquivo a servir para o pedido: a variante da largura e do formato pedidos ou o original.
+    Variantes que faltam (fotos baixadas antes delas existirem) ou mais antigas que a foto
+    são geradas na hora, uma vez.
+    """
+    largura = largura_variante(largura)
+    if largura is None and not webp:
+        return original
+
+    variante = caminho_variante(original, largura, "webp" if webp else "jpg")
+    if _atualizada(variante, original):
+        return variante
+
+    with _geracao_lock:
+        if not _atualizada(variante, original):
+            try:
+                gerar_variantes(original)
+            except Exception:
+                logger.exception(f"Erro ao gerar variantes da foto {original.name}")
+
+    return variante if _atualizada(variante, original) else original
+
+
+def _atualizada(variante: Path, original: Path) -> bool:
+    try:
+        return variante.stat().st_mtime_ns >= original.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def etag_arquivo(arquivo: Path) -> str:
+    """ETag forte (SHA-256 do conteúdo); o hash é recalculado só quando o arquivo muda"""
+    estado = arquivo.stat()
+    return _etag(str(arquivo), estado.st_mtime_ns, estado.st_size)
+
+
+@lru_cache(maxsize=4096)
+def _etag(caminho: str, mtime_ns: int, tamanho: int) -> str:
+    return '"' + hashlib.sha256(Path(caminho).read_bytes()).hexdigest()[:32] + '"'
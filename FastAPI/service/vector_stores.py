@@ -0,0 +1,114 @@
+from typing import Iterable, List, Dict, Optional, Set, Tuple
+import hashlib
+import logging
+
+from langchain_core.embeddings import Embeddings
+
+from config import configuracoes
+from dao.embedding_dao import EmbeddingDAO
+
+
+logger = logging.getLogger(__name__)
+
+
+def document_text(doc: Dict, tipo: str) -> str:
+    """Texto de um documento usado para gerar seu embedding"""
+    if tipo == "pesquisador":
+        return f"{doc['name']}: {doc.get('title','')}"
+    return f"{doc['title']} - {doc.get('abstract','')}"
+
+
+def content_hash(text: str) -> str:
+    """Hash SHA-256 do texto indexado, para detectar documentos alterados"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def matches_filters(doc: Dict, ano_inicio: Optional[int] = None, ano_fim: Optional[int] = None,
+                    qualis: Optional[List[str]] = None) -> bool:
+    """Aplica em Python os filtros de artigo (ano e Qualis) sobre os metadados do documento"""
+    year = doc.get("year")
+    if ano_inicio is not None and (year is None or year < ano_inicio):
+        return False
+    if ano_fim is not None and (year is None or year > ano_fim):
+        return False
+    if qualis and (doc.get("qualis") or "").upper() not in {q.upper() for q in qualis}:
+        return False
+    return True
+
+
+class PgVectorStore:
+    """
+    Índice vetorial no PostgreSQL (pgvector): os embeddings ficam na tabela
+    embedding_documento e a busca é uma consulta KNN no índice HNSW.
+    Todos os processos da API consultam o mesmo índice.
+    """
+
+    def __init__(self, tipo: str, embedder: Embeddings):
+        self.tipo = tipo
+        self.embedder = embedder
+        self.dao = EmbeddingDAO()
+
+    def index_documents(self, docs: List[Dict], keys: Optional[Dict[str, str]] = None,
+                        refresh: bool = False) -> int:
+        """
+        Gera e grava embeddings apenas de documentos novos ou com texto alterado.
+        `keys` associa o ID de cada documento à chave da sua publicação (artigos).
+        Documentos com o mesmo texto só têm os metadados regravados se a chave mudou,
+        ou sempre, com `refresh` (alterações vindas da fila de indexação).
+        Retorna a quantidade de documentos (re)embedados.
+        """
+        keys = keys or {}
+        indexed = self.dao.listar_hashes(self.tipo, [doc["id"] for doc in docs])
+        model = self.embedder.model
+
+        pending, unchanged = [], []
+        for doc in docs:
+            text = document_text(doc, self.tipo)
+            text_hash = content_hash(text)
+            stored = indexed.get(doc["id"])
+            if stored is None or stored[:2] != (model, text_hash):
+                pending.append((doc, text, text_hash))
+            elif refresh or stored[2] != keys.get(doc["id"]):
+                unchanged.append((doc, keys.get(doc["id"])))
+
+        batch_size = configuracoes.EMBEDDING_LOTE
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            vectors = self.embedder.embed_documents([text for _, text, _ in batch])
+            self.dao.salvar_embeddings(
+                self.tipo, model,
+                [(doc, text_hash, vector, keys.get(doc["id"]))
+                 for (doc, _, text_hash), vector in zip(batch, vectors)]
+            )
+
+        self.dao.atualizar_documentos(self.tipo, unchanged)
+        return len(pending)
+
+    def delete_documents(self, ids: Iterable[str]) -> int:
+        """Remove do índice os documentos informados"""
+        return self.dao.remover(self.tipo, list(ids))
+
+    def get_vectors(self, ids: Iterable[str]) -> Dict[str, List[float]]:
+        """Vetores já indexados (com o modelo atual) dos documentos informados, por ID"""
+        return self.dao.buscar_vetores(self.tipo, self.embedder.model, list(ids))
+
+    def ids_for_keys(self, keys: Iterable[str]) -> Set[str]:
+        """IDs dos documentos indexados com alguma das chaves de publicação"""
+        return self.dao.ids_por_chaves(self.tipo, list(keys))
+
+    def remove_missing(self, current_ids: List[str]) -> int:
+        """Remove do índice os documentos que não existem mais"""
+        return self.dao.remover_ausentes(self.tipo, current_ids)
+
+    def persist(self, force: bool = False) -> None:
+        # Cada escrita já é gravada no banco
+        pass
+
+    def search(self, query: str, k: int, nprobe: Optional[int] = None, ef_search: Optional[int] = None,
+               **filtros) -> List[Tuple[Dict, float]]:
+        """
+        Retorna (documento, similaridade de cosseno) dos k documentos mais próximos.
+        O índice do pgvector é HNSW: `ef_search` vale para esta busca e `nprobe` (IVF) não se aplica.
+        """
+        vector = self.embedder.embed_query(query)
+        return self.dao.buscar_similares(self.tipo, vector, k, ef_search=ef_search, **filtros)
@@ -9,9 +9,11 @@ interface SearchSummaryProps {
   searchTerm: string;
   aiSummary?: string;
   tags?: string[];
+  // Resumo ainda chegando em partes (streaming): não mostra os textos de fallback
+  isStreaming?: boolean;
 }
 
-const SearchSummary = ({ totalResults, topKeyword, searchTerm, aiSummary, tags = [] }: SearchSummaryProps) => {
+const SearchSummary = ({ totalResults, topKeyword, searchTerm, aiSummary, tags = [], isStreaming = false }: SearchSummaryProps) => {
   // Tags fallback caso não venham do backend
   const fallbackTags = [
     'systems',
@@ -21,10 +23,10 @@ const SearchSummary = ({ totalResults, topKeyword, searchTerm, aiSummary, tags =
   ];
 
   // Usar as tags do backend se disponíveis, senão usar fallback
-  const displayTags = tags.length > 0 ? tags : fallbackTags;
+  const displayTags = tags.length > 0 ? tags : isStreaming ? [] : fallbackTags;
 
   // Usar o resumo da IA se disponível, senão usar o resumo padrão
-  const summaryText = aiSummary || `A busca por "${searchTerm}" retornou ${totalResults} documentos científicos relevantes. Os resultados abrangem principalmente pesquisas relacionadas a ${topKeyword} e suas aplicações em diferentes áreas. A análise dos documentos mostra uma concentração de estudos em métodos computacionais avançados e suas implementações práticas na área da saúde e medicina.`;
+  const summaryText = (aiSummary || isStreaming) ? aiSummary : `A busca por "${searchTerm}" retornou ${totalResults} documentos científicos relevantes. Os resultados abrangem principalmente pesquisas relacionadas a ${topKeyword} e suas aplicações em diferentes áreas. A análise dos documentos mostra uma concentração de estudos em métodos computacionais avançados e suas implementações práticas na área da saúde e medicina.`;
 
   return (
     <Card className="w-full mb-6 shadow-md border-0 bg-card">
@@ -44,6 +46,9 @@ const SearchSummary = ({ totalResults, topKeyword, searchTerm, aiSummary, tags =
           <div className="lg:col-span-2">
             <p className="text-sm text-muted-foreground leading-relaxed">
               {summaryText}
+              {isStreaming && (
+                <span className="animate-pulse">{summaryText ? ' ▍' : 'Gerando resumo...'}</span>
+              )}
             </p>
           </div>
           
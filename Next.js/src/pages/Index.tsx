@@ -1,4 +1,4 @@
-import React, { useState } from "react";
+import React, { useEffect, useRef, useState } from "react";
 import { useNavigate } from "react-router-dom";
 import SearchInterface, { SearchMode } from "@/components/SearchInterface";
 import SearchSummary from "@/components/SearchSummary";
@@ -11,7 +11,7 @@ import ResearcherCard from "@/components/ResearcherCard";
 import ArticleOverlay from "@/components/ArticleOverlay";
 import SearchPagination from "@/components/SearchPagination";
 import { ApiService } from "@/services/apiService";
-import { ArticleData, ResearcherData, CombinedSearchData, SemanticSearchResult } from "@/types";
+import { ArticleData, ResearcherData, SemanticSearchResult } from "@/types";
 
 const Index = () => {
   const navigate = useNavigate();
@@ -24,15 +24,28 @@ const Index = () => {
   const [researchers, setResearchers] = useState<ResearcherData[]>([]);
   const [aiSummary, setAiSummary] = useState<string>("");
   const [tags, setTags] = useState<string[]>([]);
+  const [isSummaryStreaming, setIsSummaryStreaming] = useState(false);
+  // Encerra o stream do resumo da busca anterior
+  const closeSummaryStream = useRef<(() => void) | null>(null);
   const [selectedArticle, setSelectedArticle] =
     useState<ArticleData | null>(null);
   const [isOverlayOpen, setIsOverlayOpen] = useState(false);
   const [currentPage, setCurrentPage] = useState(1);
   const [totalPages, setTotalPages] = useState(1);
 
+  useEffect(() => () => closeSummaryStream.current?.(), []);
+
+  const stopSummaryStream = () => {
+    closeSummaryStream.current?.();
+    closeSummaryStream.current = null;
+    setIsSummaryStreaming(false);
+  };
+
   const handleSearch = async (query: string, mode: SearchMode) => {
     if (!query.trim()) return;
 
+    stopSummaryStream();
+
     setSearchTerm(query);
     setSearchMode(mode);
     setIsLoading(true);
@@ -41,21 +54,40 @@ const Index = () => {
 
     try {
       if (mode === "articles") {
-        const combinedResults = await ApiService.searchArticlesCombined(query);
+        setAiSummary("");
+        setTags([]);
+        setIsSummaryStreaming(true);
+
+        // Os resultados por termo chegam primeiro; o resumo e as tags continuam chegando depois
+        const termResults = new Promise<ArticleData[]>((resolve, reject) => {
+          closeSummaryStream.current = ApiService.streamArticleSearch(query, {
+            onResults: resolve,
+            onSummaryToken: (token) => setAiSummary((previous) => previous + token),
+            onTags: setTags,
+            onError: (detail) => {
+              console.error("Erro no resumo da busca:", detail);
+              reject(new Error(detail));
+            },
+            onDone: () => setIsSummaryStreaming(false),
+          });
+        });
+
+        const [termoBusca, buscaSemantica] = await Promise.all([
+          termResults,
+          ApiService.searchArticlesSemantic(query),
+        ]);
         
         // Definir resultados da busca por termo
-        setResults(combinedResults.termo_busca.resultados);
-        setAiSummary(combinedResults.termo_busca.resumo_ia);
-        setTags(combinedResults.termo_busca.tags || []);
+        setResults(termoBusca);
         
         // Definir resultados da busca semântica
-        setSemanticResults(combinedResults.busca_semantica.resultados);
+        setSemanticResults(buscaSemantica.resultados);
         
         // Limpar dados de pesquisadores
         setResearchers([]);
         
         // Calcular paginação baseada nos resultados totais
-        const totalResults = combinedResults.termo_busca.resultados.length + combinedResults.busca_semantica.resultados.length;
+        const totalResults = termoBusca.length + buscaSemantica.resultados.length;
         setTotalPages(Math.ceil(totalResults / 10));
       } else {
         const searchResearchers = await ApiService.searchResearchers(query);
@@ -68,6 +100,7 @@ const Index = () => {
       }
     } catch (error) {
       console.error("Erro na busca:", error);
+      stopSummaryStream();
       // Em caso de erro, limpar os resultados
       setResults([]);
       setSemanticResults([]);
@@ -100,6 +133,7 @@ const Index = () => {
   };
 
   const handleLogoClick = () => {
+    stopSummaryStream();
     // Limpar todos os estados da pesquisa
     setHasSearched(false);
     setSearchTerm("");
@@ -236,6 +270,7 @@ const Index = () => {
                     searchTerm={searchTerm}
                     aiSummary={aiSummary}
                     tags={tags}
+                    isStreaming={isSummaryStreaming}
                   />
                 )}
 
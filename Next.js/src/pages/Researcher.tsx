@@ -10,6 +10,10 @@ import SearchResult from '@/components/SearchResult';
 import { ResearcherProfileData, ResumeData } from '@/types/researcher';
 import { ApiService } from '@/services/apiService';
 
+// O resumo é gerado em segundo plano: enquanto estiver pendente, consulta de novo
+const RESUME_POLL_INTERVAL_MS = 3000;
+const RESUME_POLL_ATTEMPTS = 10;
+
 const Researcher = () => {
   const { id } = useParams();
   const navigate = useNavigate();
@@ -49,10 +53,14 @@ const Researcher = () => {
   }, [id]);
 
   const handleToggleResume = async () => {
-    if (!showResume && !resumeData && id) {
+    if (!showResume && id && (!resumeData || (resumeData.status === 'pendente' && !resumeData.resumo_ia))) {
       setLoadingResume(true);
       try {
-        const summary = await ApiService.getResearcherSummary(id);
+        let summary = await ApiService.getResearcherSummary(id);
+        for (let attempt = 1; summary?.status === 'pendente' && !summary.resumo_ia && attempt < RESUME_POLL_ATTEMPTS; attempt++) {
+          await new Promise((resolve) => setTimeout(resolve, RESUME_POLL_INTERVAL_MS));
+          summary = await ApiService.getResearcherSummary(id);
+        }
         if (summary) {
           setResumeData(summary);
         }
@@ -172,6 +180,9 @@ const Researcher = () => {
           </CardHeader>
           {showResume && resumeData && (
             <CardContent className="space-y-4">
+              {resumeData.status === 'pendente' && !resumeData.resumo_ia && (
+                <p className="text-slate-500 italic">O resumo ainda está sendo gerado. Tente novamente em instantes.</p>
+              )}
               {resumeData.resumo_ia && (
                 <div>
                   <h3 className="font-semibold text-slate-800 mb-2">Resumo da Pesquisa</h3>
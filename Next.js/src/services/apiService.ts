@@ -6,6 +6,15 @@ import { ResearcherProfileData, ResumeData } from '../types/researcher';
 // Constante para facilitar a troca quando a API estiver pronta
 const API_BASE_URL = "http://127.0.0.1:8000";
 
+// Callbacks da busca de artigos em streaming (SSE)
+export interface ArticleSearchStreamHandlers {
+  onResults: (resultados: ArticleData[]) => void;
+  onSummaryToken: (token: string) => void;
+  onTags: (tags: string[]) => void;
+  onError?: (detail: string) => void;
+  onDone?: () => void;
+}
+
 export class ApiService {
   /**
    * Busca artigos baseado no termo de pesquisa
@@ -24,6 +33,16 @@ export class ApiService {
       const data = await response.json();
       console.log('Dados recebidos do backend:', data);
       
+      // Busca em duas fases: os resultados vêm com um token, resolvido à parte em resumo e tags
+      if (data.token_resumo) {
+        const summary = await this.getArticleSearchSummary(data.token_resumo);
+        return {
+          resultados: data.resultados,
+          resumo_ia: summary?.resumo_ia || "",
+          tags: summary?.tags || []
+        };
+      }
+      
       // Verificar se a resposta já está no formato correto
       if (data.resultados && typeof data.resumo_ia !== 'undefined') {
         console.log('Resposta já no formato correto:', data);
@@ -52,6 +71,57 @@ export class ApiService {
     }
   }
 
+  /**
+   * Resolve o token de resumo de uma busca de artigos em resumo e tags.
+   * Retorna null se o resumo não puder ser gerado.
+   */
+  static async getArticleSearchSummary(token: string): Promise<{ resumo_ia: string; tags: string[] } | null> {
+    try {
+      const response = await fetch(`${API_BASE_URL}/artigos/buscar/resumo/${encodeURIComponent(token)}`);
+      
+      if (!response.ok) {
+        console.error(`Erro ao obter resumo da busca: ${response.status} ${response.statusText}`);
+        return null;
+      }
+      
+      return await response.json();
+    } catch (error) {
+      console.error('Erro ao obter resumo da busca:', error);
+      return null;
+    }
+  }
+
+  /**
+   * Busca artigos com o resumo da IA em streaming (Server-Sent Events): os resultados chegam
+   * logo após a consulta e o resumo chega em partes, à medida que é gerado.
+   * Retorna uma função que encerra o stream.
+   */
+  static streamArticleSearch(searchTerm: string, handlers: ArticleSearchStreamHandlers): () => void {
+    const source = new EventSource(
+      `${API_BASE_URL}/artigos/buscar/stream?termo=${encodeURIComponent(searchTerm)}`
+    );
+    const parse = (event: Event) => JSON.parse((event as MessageEvent).data);
+
+    source.addEventListener('resultados', (event) => handlers.onResults(parse(event)));
+    source.addEventListener('resumo', (event) => handlers.onSummaryToken(parse(event)));
+    source.addEventListener('tags', (event) => handlers.onTags(parse(event)));
+    source.addEventListener('erro', (event) => handlers.onError?.(parse(event).detail));
+    source.addEventListener('fim', () => {
+      source.close();
+      handlers.onDone?.();
+    });
+    // Sem fechar, o EventSource reconectaria sozinho e repetiria a busca
+    source.onerror = () => {
+      if (source.readyState !== EventSource.CLOSED) {
+        source.close();
+        handlers.onError?.('Conexão com o servidor interrompida');
+        handlers.onDone?.();
+      }
+    };
+
+    return () => source.close();
+  }
+
   /**
    * Busca semântica de artigos baseado no termo de pesquisa
    */
@@ -20,6 +20,9 @@ export interface ResearcherProfileData {
 }
 
 export interface ResumeData {
-  resumo_ia: string;
+  // "pendente" enquanto o resumo é gerado em segundo plano (resposta 202)
+  status?: 'pronto' | 'pendente' | 'erro';
+  resumo_ia: string | null;
   tags: string[];
+  gerado_em?: string | null;
 }
\ No newline at end of file
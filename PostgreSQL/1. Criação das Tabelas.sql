@@ -1,6 +1,25 @@
 CREATE EXTENSION IF NOT EXISTS unaccent;
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- unaccent() é STABLE e não pode ser usada em colunas geradas nem em índices;
+-- este wrapper fixa o dicionário e pode ser marcado como IMMUTABLE
+CREATE OR REPLACE FUNCTION f_unaccent(texto TEXT)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, texto) $$;
+
+-- Chave canônica de uma publicação: o DOI normalizado (minúsculas, sem prefixo de URL) ou,
+-- sem DOI, a impressão digital do título (só letras e dígitos, sem acentos) com ano e periódico
+CREATE OR REPLACE FUNCTION f_chave_publicacao(doi TEXT, nome TEXT, ano INTEGER, id_periodico UUID)
+RETURNS TEXT
+LANGUAGE sql IMMUTABLE PARALLEL SAFE
+AS $$
+	SELECT coalesce(
+		'doi:' || nullif(regexp_replace(lower(trim(doi)), '^(https?://(dx[.])?doi[.]org/|doi:)', ''), ''),
+		'titulo:' || regexp_replace(lower(f_unaccent(nome)), '[^a-z0-9]+', '', 'g') || '|' || ano || '|' || id_periodico
+	)
+$$;
+
 CREATE TABLE IF NOT EXISTS instituicao (
 	id_instituicao UUID NOT NULL DEFAULT uuid_generate_v4(),
 	nome VARCHAR(200) NOT NULL,
@@ -22,6 +41,10 @@ CREATE TABLE IF NOT EXISTS pesquisador (
 	resumo TEXT,
 	citacoes TEXT,
 	foto_sincronizada BOOLEAN NOT NULL DEFAULT FALSE,
+	foto_sincronizada_em TIMESTAMPTZ,
+	foto_codigo_k VARCHAR(10),
+	foto_etag TEXT,
+	foto_hash VARCHAR(64),
 	id_orcid VARCHAR(19),
 	id_lattes VARCHAR(16) NOT NULL,
 	id_instituicao UUID NOT NULL,
@@ -33,27 +56,46 @@ CREATE TABLE IF NOT EXISTS pesquisador (
 		ON DELETE NO ACTION
 );
 
-CREATE TABLE IF NOT EXISTS artigo (
-	id_artigo UUID NOT NULL DEFAULT uuid_generate_v4(),
+-- Cada publicação aparece uma única vez, seja qual for o número de autores cadastrados
+CREATE TABLE IF NOT EXISTS publicacao (
+	id_publicacao UUID NOT NULL DEFAULT uuid_generate_v4(),
 	nome TEXT NOT NULL,
 	ano INTEGER NOT NULL, 
 	doi VARCHAR(100),
 	resumo TEXT,
 	resumo_sincronizado BOOLEAN NOT NULL DEFAULT FALSE,
-	id_pesquisador UUID NOT NULL,
 	id_periodico UUID NOT NULL,
+	chave TEXT GENERATED ALWAYS AS (f_chave_publicacao(doi, nome, ano, id_periodico)) STORED,
+	PRIMARY KEY (id_publicacao), 
+	CONSTRAINT uq_publicacao_chave UNIQUE (chave),
+	CONSTRAINT fk_publicacao_periodico
+		FOREIGN KEY (id_periodico)
+		REFERENCES periodico (id_periodico) 
+		ON UPDATE NO ACTION 
+		ON DELETE NO ACTION
+);
+
+-- Pesquisadores autores de cada publicação. As rotas /artigos criam, alteram e apagam
+-- autorias pelo par (publicação, pesquisador); id_artigo é só a chave interna da tabela
+CREATE TABLE IF NOT EXISTS autoria (
+	id_artigo UUID NOT NULL DEFAULT uuid_generate_v4(),
+	id_publicacao UUID NOT NULL,
+	id_pesquisador UUID NOT NULL,
 	PRIMARY KEY (id_artigo), 
-	CONSTRAINT fk_artigo_pesquisador 
+	CONSTRAINT uq_autoria UNIQUE (id_publicacao, id_pesquisador),
+	CONSTRAINT fk_autoria_publicacao 
+		FOREIGN KEY (id_publicacao)
+		REFERENCES publicacao (id_publicacao) 
+		ON UPDATE NO ACTION 
+		ON DELETE CASCADE,
+	CONSTRAINT fk_autoria_pesquisador
 		FOREIGN KEY (id_pesquisador)
 		REFERENCES pesquisador (id_pesquisador) 
 		ON UPDATE NO ACTION 
-		ON DELETE NO ACTION,
-	CONSTRAINT fk_artigo_periodico
-		FOREIGN KEY (id_periodico)
-		REFERENCES periodico (id_periodico) 
-		ON UPDATE NO ACTION 
 		ON DELETE NO ACTION
 );
+
+CREATE INDEX IF NOT EXISTS idx_autoria_pesquisador ON autoria (id_pesquisador);
 	
 CREATE TABLE IF NOT EXISTS livro (
 	id_livro UUID NOT NULL DEFAULT uuid_generate_v4(),
@@ -97,4 +139,110 @@ CREATE TABLE IF NOT EXISTS software (
 		REFERENCES pesquisador (id_pesquisador) 
 		ON UPDATE NO ACTION 
 		ON DELETE NO ACTION
-);
\ No newline at end of file
+);
+
+-- Busca textual (full-text) em artigos
+
+-- Léxicos do título (peso A) e do resumo (peso B) em português e inglês,
+-- recalculados pelo próprio PostgreSQL quando nome ou resumo mudam
+ALTER TABLE publicacao ADD COLUMN IF NOT EXISTS busca_tsv TSVECTOR
+	GENERATED ALWAYS AS (
+		setweight(to_tsvector('portuguese', f_unaccent(coalesce(nome, ''))), 'A') ||
+		setweight(to_tsvector('english', f_unaccent(coalesce(nome, ''))), 'A') ||
+		setweight(to_tsvector('portuguese', f_unaccent(coalesce(resumo, ''))), 'B') ||
+		setweight(to_tsvector('english', f_unaccent(coalesce(resumo, ''))), 'B')
+	) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_publicacao_busca_tsv ON publicacao USING GIN (busca_tsv);
+
+
+-- Busca aproximada (trigramas) por nome de pesquisador e nomes de citação
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_pesquisador_nome_trgm
+	ON pesquisador USING GIN (f_unaccent(lower(nome)) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_pesquisador_citacoes_trgm
+	ON pesquisador USING GIN (f_unaccent(lower(citacoes)) gin_trgm_ops);
+
+
+-- Busca semântica (pgvector): um embedding por publicação ou pesquisador
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE TABLE IF NOT EXISTS embedding_documento (
+	tipo VARCHAR(20) NOT NULL,
+	id_documento UUID NOT NULL,
+	modelo VARCHAR(100) NOT NULL,
+	hash_conteudo CHAR(64) NOT NULL,
+	documento JSONB NOT NULL,
+	embedding VECTOR(1536) NOT NULL,
+	atualizado_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+	-- Chave da publicação (artigos), para localizar documentos de publicações alteradas
+	chave TEXT,
+	PRIMARY KEY (tipo, id_documento)
+);
+
+CREATE INDEX IF NOT EXISTS idx_embedding_chave
+	ON embedding_documento (tipo, chave);
+
+CREATE INDEX IF NOT EXISTS idx_embedding_artigo_hnsw
+	ON embedding_documento USING hnsw (embedding vector_cosine_ops)
+	WHERE tipo = 'artigo';
+
+CREATE INDEX IF NOT EXISTS idx_embedding_pesquisador_hnsw
+	ON embedding_documento USING hnsw (embedding vector_cosine_ops)
+	WHERE tipo = 'pesquisador';
+
+-- Cache de embeddings por (modelo, hash do texto), compartilhado pelos processos da API
+CREATE TABLE IF NOT EXISTS cache_embedding (
+	modelo VARCHAR(100) NOT NULL,
+	hash_texto CHAR(64) NOT NULL,
+	embedding REAL[] NOT NULL,
+	ultimo_acesso TIMESTAMPTZ NOT NULL DEFAULT now(),
+	PRIMARY KEY (modelo, hash_texto)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_embedding_acesso
+	ON cache_embedding (ultimo_acesso);
+
+-- Cache das respostas do LLM (resumos e tags), com validade e escopo para invalidação
+CREATE TABLE IF NOT EXISTS cache_llm (
+	chave CHAR(64) PRIMARY KEY,
+	template VARCHAR(50) NOT NULL,
+	escopo VARCHAR(100),
+	resposta TEXT NOT NULL,
+	criado_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+	expira_em TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_cache_llm_escopo
+	ON cache_llm (escopo);
+
+CREATE INDEX IF NOT EXISTS idx_cache_llm_expira
+	ON cache_llm (expira_em);
+
+-- Resumos e tags dos pesquisadores gerados pelo LLM em segundo plano;
+-- cada linha é também a tarefa de geração (pendente, processando, pronto ou erro)
+CREATE TABLE IF NOT EXISTS resumo_pesquisador (
+	id_pesquisador UUID NOT NULL,
+	resumo_ia TEXT,
+	tags TEXT[],
+	status VARCHAR(12) NOT NULL DEFAULT 'pendente',
+	versao INTEGER NOT NULL DEFAULT 1,
+	tentativas INTEGER NOT NULL DEFAULT 0,
+	erro TEXT,
+	solicitado_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+	disponivel_em TIMESTAMPTZ NOT NULL DEFAULT now(),
+	iniciado_em TIMESTAMPTZ,
+	gerado_em TIMESTAMPTZ,
+	PRIMARY KEY (id_pesquisador),
+	CONSTRAINT fk_resumo_pesquisador
+		FOREIGN KEY (id_pesquisador)
+		REFERENCES pesquisador (id_pesquisador)
+		ON UPDATE NO ACTION
+		ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_resumo_pesquisador_fila
+	ON resumo_pesquisador (disponivel_em)
+	WHERE status IN ('pendente', 'processando');
@@ -1,9 +1,11 @@
 SELECT 
   a.nome, a.ano, a.doi, 
   p.nome
-FROM artigo AS a
+FROM publicacao AS a
+JOIN autoria AS au
+  ON au.id_publicacao = a.id_publicacao
 JOIN pesquisador AS p
-  ON a.id_pesquisador = p.id_pesquisador
+  ON au.id_pesquisador = p.id_pesquisador
 WHERE 
      a.doi = '10.1186/s12939-2023-01857-y'
  OR  a.doi = '10.9771/cp.v12i5 Especial.34453'